@@ -11,6 +11,7 @@ from strictdoc.backend.reqif.p01_sdoc.sdoc_to_reqif_converter import (
 from strictdoc.backend.reqif.sdoc_reqif_fields import ReqIFProfile
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.core.traceability_index import TraceabilityIndex
+from strictdoc.helpers.output_writer import OutputWriter
 
 
 class ReqIFExport:
@@ -40,8 +41,7 @@ class ReqIFExport:
                 output_reqif_root, "output.reqif"
             )
             reqif_content: str = ReqIFUnparser.unparse(reqif_bundle)
-            with open(output_file_path, "w", encoding="utf8") as output_file:
-                output_file.write(reqif_content)
+            OutputWriter.get_instance().write(output_file_path, reqif_content)
         else:
             output_file_path: str = os.path.join(
                 output_reqif_root, "output.reqifz"
@@ -51,5 +51,6 @@ class ReqIFExport:
                 attachments={},
             )
             reqifz_content_bytes = ReqIFZUnparser.unparse(reqifz_bundle)
-            with open(output_file_path, "wb") as output_file:
-                output_file.write(reqifz_content_bytes)
+            OutputWriter.get_instance().write(
+                output_file_path, reqifz_content_bytes
+            )
@@ -0,0 +1,134 @@
+import glob
+import hashlib
+import lzma
+import os
+import struct
+import zlib
+from typing import Any, Optional, Tuple
+
+import strictdoc
+from strictdoc.helpers.pickle import pickle_dump, pickle_load
+
+
+class CacheCompression:
+    NONE = "none"
+    ZLIB = "zlib"
+    LZMA = "lzma"
+
+    ALL = (NONE, ZLIB, LZMA)
+
+
+class CacheFormat:
+    """
+    Version 2 of the format of the cached artifacts.
+
+    Every cached blob starts with a fixed-size header:
+
+    - magic bytes "SDOCCACHE",
+    - format version (one byte),
+    - compression: b"n" (none), b"z" (zlib) or b"x" (lzma),
+    - the schema key: an MD5 hex digest of the StrictDoc version and of the
+      source code of the cached model classes.
+
+    A blob whose header does not match the running StrictDoc is a cache miss.
+    This includes the blobs written by older StrictDoc versions, which were
+    plain protocol 0 pickles without a header.
+    """
+
+    MAGIC = b"SDOCCACHE"
+    VERSION = 2
+    HEADER = struct.Struct(">9sBc32s")
+
+    COMPRESSION_MARKERS = {
+        CacheCompression.NONE: b"n",
+        CacheCompression.ZLIB: b"z",
+        CacheCompression.LZMA: b"x",
+    }
+
+    # The source files that define the shape of the cached objects. When any
+    # of them changes, the previously cached objects cannot be trusted.
+    SCHEMA_SOURCE_GLOBS = (
+        "backend/sdoc/*reader.py",
+        "backend/sdoc/grammar/*.py",
+        "backend/sdoc/line_parser.py",
+        "backend/sdoc/models/*.py",
+        "backend/sdoc/processor.py",
+        "backend/sdoc_source_code/*.py",
+        "backend/sdoc_source_code/models/*.py",
+    )
+
+    _schema_key: Optional[bytes] = None
+
+    @staticmethod
+    def encode(content: Any, compression: str = CacheCompression.NONE) -> bytes:
+        payload: bytes = pickle_dump(content)
+        if compression == CacheCompression.ZLIB:
+            payload = zlib.compress(payload, 1)
+        elif compression == CacheCompression.LZMA:
+            payload = lzma.compress(payload, preset=0)
+        else:
+            assert compression == CacheCompression.NONE, compression
+
+        header = CacheFormat.HEADER.pack(
+            CacheFormat.MAGIC,
+            CacheFormat.VERSION,
+            CacheFormat.COMPRESSION_MARKERS[compression],
+            CacheFormat.get_schema_key(),
+        )
+        return header + payload
+
+    @staticmethod
+    def decode(blob: bytes) -> Optional[Any]:
+        """
+        Returns None if the blob was not written by this StrictDoc version.
+        """
+
+        if len(blob) < CacheFormat.HEADER.size:
+            return None
+        magic, version, compression_marker, schema_key = (
+            CacheFormat.HEADER.unpack_from(blob)
+        )
+        if (
+            magic != CacheFormat.MAGIC
+            or version != CacheFormat.VERSION
+            or schema_key != CacheFormat.get_schema_key()
+        ):
+            return None
+
+        payload = memoryview(blob)[CacheFormat.HEADER.size :]
+        if compression_marker == b"z":
+            payload = memoryview(zlib.decompress(payload))
+        elif compression_marker == b"x":
+            payload = memoryview(lzma.decompress(payload))
+        else:
+            assert compression_marker == b"n", compression_marker
+
+        return pickle_load(payload)
+
+    @staticmethod
+    def get_schema_key() -> bytes:
+        if CacheFormat._schema_key is None:
+            schema_hash = hashlib.md5(strictdoc.__version__.encode("utf-8"))
+            CacheFormat.hash_source_files(
+                schema_hash, CacheFormat.SCHEMA_SOURCE_GLOBS
+            )
+            CacheFormat._schema_key = schema_hash.hexdigest().encode("ascii")
+        return CacheFormat._schema_key
+
+    @staticmethod
+    def hash_source_files(hash_: Any, source_globs: Tuple[str, ...]) -> None:
+        """
+        Updates the hash with the content of StrictDoc's own source files that
+        match the globs. The globs are relative to the strictdoc package.
+        """
+
+        path_to_strictdoc = os.path.dirname(strictdoc.__file__)
+        for source_glob_ in source_globs:
+            for path_to_source_ in sorted(
+                glob.glob(
+                    os.path.join(path_to_strictdoc, source_glob_),
+                    recursive=True,
+                )
+            ):
+                with open(path_to_source_, "rb") as source_file_:
+                    hash_.update(source_file_.read())
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from strictdoc.core.cache_backend import CacheBackend
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.helpers.md5 import get_file_md5
+from strictdoc.helpers.pickle import pickle_dump, pickle_load
+
+# The stat() signature of a file: size, mtime_ns and inode, plus its MD5.
+CacheManifestEntry = Tuple[int, int, int, str]
+
+
+class CacheManifest:
+    """
+    Maps the full paths of input files to their last seen stat() signature
+    and content hash.
+
+    A cache lookup needs the content hash of a file to build the cache key.
+    Hashing means reading the whole file, which a warm run with no changes
+    should not have to do. A file is only re-hashed when its size, mtime or
+    inode differs from what the manifest has recorded.
+
+    A file that was modified within the last second before hashing is not
+    recorded: another write in the same mtime tick would go unnoticed.
+    """
+
+    FILE_NAME = "manifest.pickle"
+
+    RACY_WINDOW_NS = 1_000_000_000
+
+    _instances: Dict[str, "CacheManifest"] = {}
+
+    def __init__(self, path_to_manifest: str) -> None:
+        self.path_to_manifest: str = path_to_manifest
+        self.entries: Dict[str, CacheManifestEntry] = {}
+        self.needs_save: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def get_instance(project_config: ProjectConfig) -> "CacheManifest":
+        """
+        The manifest is loaded once per process and then kept in memory.
+        Worker processes created with fork() inherit the parent's copy.
+        """
+
+        path_to_manifest = os.path.join(
+            project_config.get_path_to_cache_dir(), CacheManifest.FILE_NAME
+        )
+        manifest: Optional[CacheManifest] = CacheManifest._instances.get(
+            path_to_manifest
+        )
+        if manifest is None:
+            manifest = CacheManifest(path_to_manifest)
+            manifest.load()
+            CacheManifest._instances[path_to_manifest] = manifest
+        return manifest
+
+    def load(self) -> None:
+        if not os.path.isfile(self.path_to_manifest):
+            return
+        with open(self.path_to_manifest, "rb") as manifest_file:
+            manifest_content = manifest_file.read()
+        try:
+            entries = pickle_load(manifest_content)
+        except Exception:
+            # A damaged manifest only means that all files get re-hashed.
+            entries = None
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def save(self) -> None:
+        if not self.needs_save:
+            return
+        path_to_manifest_dir = os.path.dirname(self.path_to_manifest)
+        if CacheBackend.is_read_only(path_to_manifest_dir):
+            return
+        Path(path_to_manifest_dir).mkdir(parents=True, exist_ok=True)
+
+        # Parallel StrictDoc runs may share the cache folder, so the manifest
+        # is replaced atomically. The last writer wins, and entries that get
+        # lost this way are simply re-hashed next time.
+        file_descriptor, path_to_tmp_file = tempfile.mkstemp(
+            dir=path_to_manifest_dir, prefix=CacheManifest.FILE_NAME
+        )
+        with os.fdopen(file_descriptor, "wb") as manifest_file:
+            manifest_file.write(pickle_dump(self.entries))
+        os.replace(path_to_tmp_file, self.path_to_manifest)
+        self.needs_save = False
+
+    def get_file_md5(self, path_to_file: str) -> str:
+        full_path_to_file = os.path.abspath(path_to_file)
+        file_stat = os.stat(full_path_to_file)
+        size, mtime_ns, inode = (
+            file_stat.st_size,
+            file_stat.st_mtime_ns,
+            file_stat.st_ino,
+        )
+
+        entry: Optional[CacheManifestEntry] = self.entries.get(
+            full_path_to_file
+        )
+        if entry is not None and entry[:3] == (size, mtime_ns, inode):
+            self.hits += 1
+            return entry[3]
+
+        self.misses += 1
+        file_md5 = get_file_md5(full_path_to_file)
+        if time.time_ns() - mtime_ns > CacheManifest.RACY_WINDOW_NS:
+            self.entries[full_path_to_file] = (size, mtime_ns, inode, file_md5)
+            self.needs_save = True
+        elif entry is not None:
+            del self.entries[full_path_to_file]
+            self.needs_save = True
+        return file_md5
+
+    def refresh(self, paths_to_files: Iterable[str]) -> None:
+        """
+        Bring the entries of the given files up to date and persist them.
+        """
+
+        for path_to_file_ in paths_to_files:
+            self.get_file_md5(path_to_file_)
+        self.save()
+
+    def reset_statistics(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics_message(self) -> str:
+        return f"Cache manifest: {self.hits} hits, {self.misses} misses."
@@ -1,30 +1,29 @@
 # mypy: disable-error-code="no-untyped-call,no-untyped-def"
 from typing import Tuple
 
-from textx import metamodel_from_str
-
 from strictdoc.backend.sdoc.grammar.grammar_builder import SDocGrammarBuilder
 from strictdoc.backend.sdoc.models.anchor import Anchor
 from strictdoc.backend.sdoc.models.free_text import FreeTextContainer
 from strictdoc.backend.sdoc.models.inline_link import InlineLink
 from strictdoc.backend.sdoc.processor import ParseContext
-from strictdoc.helpers.textx import drop_textx_meta
+from strictdoc.helpers.textx import LazyMetaModel, drop_textx_meta
 
 
 class SDFreeTextReader:
+    meta_model = LazyMetaModel(
+        SDocGrammarBuilder.create_free_text_grammar,
+        classes=[FreeTextContainer, InlineLink, Anchor],
+    )
+
     @staticmethod
     def _read(
         input_string, file_path=None
     ) -> Tuple[FreeTextContainer, ParseContext]:
-        meta_model = metamodel_from_str(
-            SDocGrammarBuilder.create_free_text_grammar(),
-            classes=[FreeTextContainer, InlineLink, Anchor],
-            use_regexp_group=True,
-        )
-
         parse_context = ParseContext(file_path)
 
-        document = meta_model.model_from_str(input_string, file_name=file_path)
+        document = SDFreeTextReader.meta_model.model_from_str(
+            input_string, file_name=file_path
+        )
         parse_context.document_reference.set_document(document)
 
         # HACK:
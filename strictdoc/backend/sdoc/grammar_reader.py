@@ -2,8 +2,6 @@ import sys
 import traceback
 from typing import Optional
 
-from textx import metamodel_from_str
-
 from strictdoc.backend.sdoc.error_handling import StrictDocSemanticError
 from strictdoc.backend.sdoc.grammar.grammar_builder import SDocGrammarBuilder
 from strictdoc.backend.sdoc.models.constants import GRAMMAR_MODELS
@@ -15,31 +13,31 @@ from strictdoc.backend.sdoc.pickle_cache import PickleCache
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.helpers.cast import assert_optional_cast
 from strictdoc.helpers.textx import (
+    LazyMetaModel,
     drop_textx_meta,
+    model_from_str_with_processors,
     preserve_source_location_data,
 )
 
 
 class SDocGrammarReader:
-    meta_model = metamodel_from_str(
-        SDocGrammarBuilder.create_grammar_grammar(),
+    meta_model = LazyMetaModel(
+        SDocGrammarBuilder.create_grammar_grammar,
         classes=GRAMMAR_MODELS + [DocumentGrammarWrapper],
-        use_regexp_group=True,
     )
 
     @staticmethod
     def read(
         input_string: str, file_path: Optional[str] = None
     ) -> DocumentGrammar:
-        SDocGrammarReader.meta_model.register_obj_processors(
-            {
-                "GrammarElement": preserve_source_location_data,
-            }
-        )
-
         grammar_wrapper: DocumentGrammarWrapper = (
-            SDocGrammarReader.meta_model.model_from_str(
-                input_string, file_name=file_path
+            model_from_str_with_processors(
+                SDocGrammarReader.meta_model,
+                {
+                    "GrammarElement": preserve_source_location_data,
+                },
+                input_string,
+                file_name=file_path,
             )
         )
         grammar: DocumentGrammar = grammar_wrapper.grammar
@@ -0,0 +1,787 @@
+"""
+A hand-written, single-pass parser for the SDoc format.
+
+The SDoc format is strictly line-oriented: every construct starts at a line
+boundary and most lines are "KEY: value" pairs. This parser walks the input
+line by line and creates the same model objects as the textX grammar does
+(see SDocGrammarBuilder). The object processors of SDocParsingProcessor are
+called in the same post-order sequence as textX calls them, after the whole
+input has been scanned.
+
+The textX grammar remains the reference implementation. Whenever this parser
+encounters an input it does not support or that is not valid SDoc, it raises
+SDocLineParserError and the caller re-parses the input with textX, which then
+either succeeds or produces the canonical syntax error message.
+"""
+
+# mypy: disable-error-code="attr-defined,no-untyped-call,no-untyped-def,union-attr"
+import bisect
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+from strictdoc.backend.sdoc.grammar.grammar import REGEX_UID
+from strictdoc.backend.sdoc.models.anchor import Anchor
+from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.backend.sdoc.models.document_config import DocumentConfig
+from strictdoc.backend.sdoc.models.document_from_file import DocumentFromFile
+from strictdoc.backend.sdoc.models.document_grammar import (
+    DocumentGrammar,
+    GrammarElement,
+)
+from strictdoc.backend.sdoc.models.inline_link import InlineLink
+from strictdoc.backend.sdoc.models.node import (
+    SDocCompositeNode,
+    SDocNode,
+    SDocNodeField,
+)
+from strictdoc.backend.sdoc.models.reference import (
+    ChildReqReference,
+    FileReference,
+    ParentReqReference,
+    Reference,
+)
+from strictdoc.backend.sdoc.models.section import SDocSection
+from strictdoc.backend.sdoc.models.type_system import (
+    FileEntry,
+    GrammarElementFieldMultipleChoice,
+    GrammarElementFieldSingleChoice,
+    GrammarElementFieldString,
+    GrammarElementFieldTag,
+    GrammarElementRelationChild,
+    GrammarElementRelationFile,
+    GrammarElementRelationParent,
+)
+from strictdoc.backend.sdoc.processor import ParseContext, SDocParsingProcessor
+
+RE_UID = re.compile(REGEX_UID)
+RE_SINGLE_LINE_STRING = re.compile(r"(?!>>>$)\S.*")
+RE_FIELD_NAME = re.compile(r"[A-Z]+[A-Z_]*")
+RE_NODE_TYPE = re.compile(r"[A-Z]+(_[A-Z]+)*")
+RE_CHOICE_OPTION = re.compile(r"[\w\/-]+( *[\w\/-]+)*")
+RE_FILE_ENTRY_FORMAT = re.compile(r"[A-Z]+[A-Z_]*")
+RE_ANCHOR_TITLE = re.compile(r"\w+[\s\w+]*")
+RE_ANCHOR_END = re.compile(r"\](\Z|\n)")
+RE_INLINE_MARKUP = re.compile(r"\[LINK: |^\[ANCHOR: ", re.MULTILINE)
+RE_MULTILINE_END = re.compile(r"^<<<", re.MULTILINE)
+
+# Node types that the textX grammar excludes with its ReservedKeyword and
+# negative lookahead rules. Such inputs are delegated to textX.
+RESERVED_NODE_TYPE_PREFIXES = ("DOCUMENT", "GRAMMAR", "SECTION", "COMPOSITE_")
+
+BOOLEAN_CHOICES = ("True", "False")
+
+
+class SDocLineParserError(Exception):
+    pass
+
+
+class SDocSourcePositions:
+    """
+    Converts character offsets to (line, column) pairs the same way the
+    Arpeggio parser behind textX does it.
+
+    The parsed document gets an instance of this class as its _tx_parser, so
+    that the processor hooks that resolve source locations via
+    get_model(...)._tx_parser work unchanged for both parsers.
+    """
+
+    def __init__(self, input_string: str) -> None:
+        self.input: str = input_string
+        self.line_ends: List[int] = [
+            match_.start() for match_ in re.finditer("\n", input_string)
+        ]
+
+    def pos_to_linecol(self, pos: int) -> Tuple[int, int]:
+        line = bisect.bisect_left(self.line_ends, pos)
+        col = pos
+        if line > 0:
+            col -= self.line_ends[line - 1]
+            if self.input[self.line_ends[line - 1]] in "\n\r":
+                col -= 1
+        return line + 1, col + 1
+
+
+class SDocLineParser:
+    def __init__(self, input_string: str, parse_context: ParseContext):
+        self.input: str = input_string
+        self.length: int = len(input_string)
+        # textX skips whitespace before matching the end of the input.
+        self.content_length: int = len(input_string.rstrip("\t\n\r "))
+        self.pos: int = 0
+        self.parse_context: ParseContext = parse_context
+        # Objects in the order in which textX would call the object
+        # processors for them: children first, then the parent.
+        self.processing_queue: List[Tuple[str, Any]] = []
+
+    def parse(self) -> SDocDocument:
+        document: SDocDocument = self._parse_document()
+
+        processors = SDocParsingProcessor(
+            parse_context=self.parse_context
+        ).get_default_processors()
+        for rule_name_, object_ in self.processing_queue:
+            processors[rule_name_](object_)
+
+        return document
+
+    #
+    # Line-level primitives.
+    #
+
+    def _error(self, reason: str) -> SDocLineParserError:
+        line, col = SDocSourcePositions(self.input).pos_to_linecol(self.pos)
+        return SDocLineParserError(f"{line}:{col}: {reason}")
+
+    def _peek_line(self) -> Optional[str]:
+        """
+        Returns the current line without its newline character or None if the
+        current line is not terminated with a newline.
+        """
+        line_end = self.input.find("\n", self.pos)
+        if line_end == -1:
+            return None
+        return self.input[self.pos : line_end]
+
+    def _consume_line(self, line: str) -> None:
+        self.pos += len(line) + 1
+
+    def _expect_line(self, expected_line: str) -> None:
+        if self._peek_line() != expected_line:
+            raise self._error(f"Expected '{expected_line}'")
+        self._consume_line(expected_line)
+
+    def _at_line_starting_with(self, prefix: str) -> bool:
+        line = self._peek_line()
+        return line is not None and line.startswith(prefix)
+
+    def _at_blank_line(self) -> bool:
+        return self.pos < self.length and self.input[self.pos] == "\n"
+
+    def _at_trailing_whitespace(self) -> bool:
+        return self.pos >= self.content_length
+
+    def _read_value(self, prefix: str) -> Optional[str]:
+        line = self._peek_line()
+        if line is None or not line.startswith(prefix):
+            return None
+        self._consume_line(line)
+        return line[len(prefix) :]
+
+    def _read_single_line_string(self, prefix: str) -> Optional[str]:
+        line = self._peek_line()
+        if line is None or not line.startswith(prefix):
+            return None
+        value = line[len(prefix) :]
+        if RE_SINGLE_LINE_STRING.fullmatch(value) is None:
+            raise self._error(f"Invalid single-line string after '{prefix}'")
+        self._consume_line(line)
+        return value
+
+    def _read_regex_value(self, prefix: str, regex) -> Optional[str]:
+        line = self._peek_line()
+        if line is None or not line.startswith(prefix):
+            return None
+        value = line[len(prefix) :]
+        if regex.fullmatch(value) is None:
+            raise self._error(f"Invalid value after '{prefix}'")
+        self._consume_line(line)
+        return value
+
+    def _read_choice(self, prefix: str, choices: Tuple[str, ...]):
+        line = self._peek_line()
+        if line is None or not line.startswith(prefix):
+            return None
+        value = line[len(prefix) :]
+        if value not in choices:
+            raise self._error(f"Invalid choice after '{prefix}'")
+        self._consume_line(line)
+        return value
+
+    def _read_non_empty_value(self, prefix: str) -> Optional[str]:
+        value = self._read_value(prefix)
+        if value is not None and len(value) == 0:
+            raise self._error(f"Empty value after '{prefix}'")
+        return value
+
+    def _set_position(self, textx_object: Any, start: int) -> None:
+        textx_object._tx_position = start
+        textx_object._tx_position_end = self.pos
+
+    #
+    # Document header and options.
+    #
+
+    def _parse_document(self) -> SDocDocument:
+        self._expect_line("[DOCUMENT]")
+        mid = self._read_single_line_string("MID: ")
+        title = self._read_single_line_string("TITLE: ")
+        if title is None:
+            raise self._error("Expected 'TITLE: '")
+
+        config_start = self.pos
+        config_values = self._parse_document_config()
+
+        if self._peek_line() == "VIEWS:":
+            # Document views are rare and are left to the textX parser.
+            raise self._error("[DOCUMENT].VIEWS is not supported")
+
+        document = SDocDocument(
+            mid=mid,
+            title=title,
+            config=None,
+            view=None,
+            grammar=None,
+            section_contents=[],
+        )
+        document._tx_parser = SDocSourcePositions(self.input)
+        document._tx_filename = self.parse_context.path_to_sdoc_file
+
+        if config_values is not None:
+            document.config = DocumentConfig(parent=document, **config_values)
+        # textX calls the processors for whatever objects end up in the
+        # document's config and view attributes, including the default ones
+        # created by SDocDocument when the input has no config or views.
+        self._set_position(document.config, config_start)
+        self.processing_queue.append(("DocumentConfig", document.config))
+        self._set_position(document.view, self.pos)
+        self.processing_queue.append(("DocumentView", document.view))
+
+        if self.input.startswith("\n[GRAMMAR]\n", self.pos):
+            self.pos += 1
+            document.grammar = self._parse_grammar(document)
+
+        while not self._at_trailing_whitespace():
+            if not self._at_blank_line():
+                raise self._error("Expected an empty line")
+            self.pos += 1
+            document.section_contents.append(
+                self._parse_section_or_node(document)
+            )
+
+        self._set_position(document, 0)
+        self.processing_queue.append(("SDocDocument", document))
+        return document
+
+    def _parse_document_config(self):
+        config_start = self.pos
+        config_values = {
+            "uid": self._read_regex_value("UID: ", RE_UID),
+            "version": self._read_single_line_string("VERSION: "),
+            "date": self._read_single_line_string("DATE: "),
+            "classification": self._read_single_line_string("CLASSIFICATION: "),
+            "requirement_prefix": self._read_single_line_string("REQ_PREFIX: "),
+            "root": self._read_choice("ROOT: ", BOOLEAN_CHOICES),
+            "enable_mid": None,
+            "markup": None,
+            "auto_levels": None,
+            "layout": None,
+            "requirement_style": None,
+            "requirement_in_toc": None,
+            "default_view": None,
+        }
+        if self._peek_line() == "OPTIONS:":
+            self._consume_line("OPTIONS:")
+            config_values.update(
+                {
+                    "enable_mid": self._read_choice(
+                        "  ENABLE_MID: ", BOOLEAN_CHOICES
+                    ),
+                    "markup": self._read_choice(
+                        "  MARKUP: ", ("RST", "Text", "HTML")
+                    ),
+                    "auto_levels": self._read_choice(
+                        "  AUTO_LEVELS: ", ("On", "Off")
+                    ),
+                    "layout": self._read_choice(
+                        "  LAYOUT: ", ("Default", "Website")
+                    ),
+                    "requirement_style": self._read_choice(
+                        "  REQUIREMENT_STYLE: ",
+                        ("Inline", "Simple", "Table", "Zebra"),
+                    ),
+                    "requirement_in_toc": self._read_choice(
+                        "  REQUIREMENT_IN_TOC: ", BOOLEAN_CHOICES
+                    ),
+                    "default_view": self._read_single_line_string(
+                        "  DEFAULT_VIEW: "
+                    ),
+                }
+            )
+        if self.pos == config_start:
+            return None
+        return config_values
+
+    #
+    # Document grammar.
+    #
+
+    def _parse_grammar(self, document: SDocDocument) -> DocumentGrammar:
+        grammar_start = self.pos
+        self._expect_line("[GRAMMAR]")
+
+        elements: List[GrammarElement] = []
+        import_from_file: Optional[str] = None
+        if self._peek_line() == "ELEMENTS:":
+            self._consume_line("ELEMENTS:")
+            while self._at_line_starting_with("- TAG: "):
+                elements.append(self._parse_grammar_element())
+            if len(elements) == 0:
+                raise self._error("Expected at least one grammar element")
+        else:
+            import_from_file = self._read_non_empty_value("IMPORT_FROM_FILE: ")
+            if import_from_file is None:
+                raise self._error("Expected 'ELEMENTS:' or 'IMPORT_FROM_FILE:'")
+
+        grammar = DocumentGrammar(
+            parent=document,
+            elements=elements,
+            import_from_file=import_from_file,
+        )
+        for element_ in elements:
+            element_.parent = grammar
+        self._set_position(grammar, grammar_start)
+        self.processing_queue.append(("DocumentGrammar", grammar))
+        return grammar
+
+    def _parse_grammar_element(self) -> GrammarElement:
+        element_start = self.pos
+        tag = self._read_node_type("- TAG: ", "")
+
+        self._expect_line("  FIELDS:")
+        fields = []
+        while self._at_line_starting_with("  - TITLE: "):
+            fields.append(self._parse_grammar_element_field())
+        if len(fields) == 0:
+            raise self._error("Expected at least one grammar field")
+
+        relations = []
+        if self._peek_line() == "  RELATIONS:":
+            self._consume_line("  RELATIONS:")
+            while self._at_line_starting_with("  - TYPE: "):
+                relations.append(self._parse_grammar_element_relation())
+            if len(relations) == 0:
+                raise self._error("Expected at least one grammar relation")
+
+        element = GrammarElement(
+            parent=None, tag=tag, fields=fields, relations=relations
+        )
+        for field_ in fields:
+            field_.parent = element
+        for relation_ in element.relations:
+            relation_.parent = element
+        self._set_position(element, element_start)
+        self.processing_queue.append(("GrammarElement", element))
+        return element
+
+    def _parse_grammar_element_field(self):
+        title = self._read_regex_value("  - TITLE: ", RE_FIELD_NAME)
+        if title is None:
+            raise self._error("Expected '  - TITLE: '")
+        human_title = self._read_single_line_string("    HUMAN_TITLE: ")
+
+        field_type = self._read_value("    TYPE: ")
+        if field_type is None:
+            raise self._error("Expected '    TYPE: '")
+
+        options: Optional[List[str]] = None
+        for choice_type_ in ("SingleChoice", "MultipleChoice"):
+            if field_type.startswith(
+                choice_type_ + "("
+            ) and field_type.endswith(")"):
+                options = self._parse_choice_options(
+                    field_type[len(choice_type_) + 1 : -1]
+                )
+                field_type = choice_type_
+                break
+
+        required = self._read_choice("    REQUIRED: ", BOOLEAN_CHOICES)
+        if required is None:
+            raise self._error("Expected '    REQUIRED: '")
+
+        if field_type == "String":
+            return GrammarElementFieldString(
+                parent=None,
+                title=title,
+                human_title=human_title,
+                required=required,
+            )
+        if field_type == "Tag":
+            return GrammarElementFieldTag(
+                parent=None,
+                title=title,
+                human_title=human_title,
+                required=required,
+            )
+        if field_type in ("SingleChoice", "MultipleChoice") and options is None:
+            raise self._error(f"Expected the options of {field_type}(...)")
+        if field_type == "SingleChoice":
+            assert options is not None
+            return GrammarElementFieldSingleChoice(
+                parent=None,
+                title=title,
+                human_title=human_title,
+                options=options,
+                required=required,
+            )
+        if field_type == "MultipleChoice":
+            assert options is not None
+            return GrammarElementFieldMultipleChoice(
+                parent=None,
+                title=title,
+                human_title=human_title,
+                options=options,
+                required=required,
+            )
+        raise self._error(f"Unknown grammar field type: {field_type}")
+
+    def _parse_choice_options(self, options_string: str) -> List[str]:
+        options = options_string.split(", ")
+        for option_ in options:
+            if RE_CHOICE_OPTION.fullmatch(option_) is None:
+                raise self._error(f"Invalid choice option: '{option_}'")
+        return options
+
+    def _parse_grammar_element_relation(self):
+        relation_type = self._read_choice(
+            "  - TYPE: ", ("Parent", "Child", "File")
+        )
+        relation_role = self._read_non_empty_value("    ROLE: ")
+        relation_class = {
+            "Parent": GrammarElementRelationParent,
+            "Child": GrammarElementRelationChild,
+            "File": GrammarElementRelationFile,
+        }[relation_type]
+        return relation_class(
+            parent=None,
+            relation_type=relation_type,
+            relation_role=relation_role,
+        )
+
+    #
+    # [SECTION], [DOCUMENT_FROM_FILE], [<NODE>], [COMPOSITE_<NODE>]
+    #
+
+    def _parse_section_or_node(
+        self, parent
+    ) -> Union[SDocSection, DocumentFromFile, SDocNode]:
+        line = self._peek_line()
+        if line == "[SECTION]":
+            return self._parse_section(parent)
+        if line == "[DOCUMENT_FROM_FILE]":
+            return self._parse_document_from_file(parent)
+        return self._parse_node(parent)
+
+    def _parse_section(self, parent) -> SDocSection:
+        section_start = self.pos
+        self._expect_line("[SECTION]")
+        mid = self._read_single_line_string("MID: ")
+        uid = self._read_regex_value("UID: ", RE_UID)
+        custom_level = self._read_single_line_string("LEVEL: ")
+        title = self._read_single_line_string("TITLE: ")
+        if title is None:
+            raise self._error("Expected 'TITLE: '")
+        requirement_prefix = self._read_single_line_string("REQ_PREFIX: ")
+
+        section = SDocSection(
+            parent=parent,
+            mid=mid,
+            uid=uid,
+            custom_level=custom_level,
+            title=title,
+            requirement_prefix=requirement_prefix,
+            section_contents=[],
+        )
+
+        while not self.input.startswith("\n[/SECTION]\n", self.pos):
+            if not self._at_blank_line():
+                raise self._error("Expected an empty line")
+            self.pos += 1
+            section.section_contents.append(
+                self._parse_section_or_node(section)
+            )
+        self.pos += len("\n[/SECTION]\n")
+
+        self._set_position(section, section_start)
+        self.processing_queue.append(("SDocSection", section))
+        return section
+
+    def _parse_document_from_file(self, parent) -> DocumentFromFile:
+        document_from_file_start = self.pos
+        self._expect_line("[DOCUMENT_FROM_FILE]")
+        file = self._read_non_empty_value("FILE: ")
+        if file is None:
+            raise self._error("Expected 'FILE: '")
+
+        document_from_file = DocumentFromFile(parent=parent, file=file)
+        self._set_position(document_from_file, document_from_file_start)
+        self.processing_queue.append(("DocumentFromFile", document_from_file))
+        return document_from_file
+
+    def _read_node_type(self, prefix: str, suffix: str) -> str:
+        line = self._peek_line()
+        if (
+            line is None
+            or not line.startswith(prefix)
+            or not line.endswith(suffix)
+        ):
+            raise self._error("Expected a node")
+        node_type = line[len(prefix) : len(line) - len(suffix)]
+        if RE_NODE_TYPE.fullmatch(node_type) is None or node_type.startswith(
+            RESERVED_NODE_TYPE_PREFIXES
+        ):
+            raise self._error(f"Invalid node type: '{node_type}'")
+        self._consume_line(line)
+        return node_type
+
+    def _parse_node(self, parent) -> SDocNode:
+        node_start = self.pos
+        is_composite = self.input.startswith("[COMPOSITE_", self.pos)
+        node_type = self._read_node_type(
+            "[COMPOSITE_" if is_composite else "[", "]"
+        )
+
+        fields: List[SDocNodeField] = []
+        while True:
+            line = self._peek_line()
+            if line is None or len(line) == 0 or line == "RELATIONS:":
+                break
+            fields.append(self._parse_node_field(line))
+
+        relations: List[Reference] = []
+        if self._peek_line() == "RELATIONS:":
+            self._consume_line("RELATIONS:")
+            while self._at_line_starting_with("- TYPE: "):
+                reference_line = self._peek_line()
+                assert reference_line is not None
+                relations.append(self._parse_reference(reference_line))
+            if len(relations) == 0:
+                raise self._error("Expected at least one relation")
+
+        node: SDocNode
+        if is_composite:
+            node = SDocCompositeNode(
+                parent,
+                node_type=node_type,
+                fields=fields,
+                relations=relations,
+                requirements=[],
+            )
+        else:
+            node = SDocNode(
+                parent,
+                node_type=node_type,
+                fields=fields,
+                relations=relations,
+            )
+        for field_ in fields:
+            field_.parent = node
+        for relation_ in relations:
+            relation_.parent = node
+
+        if is_composite:
+            while not self.input.startswith(
+                "\n[/COMPOSITE_REQUIREMENT]\n", self.pos
+            ):
+                if not self._at_blank_line():
+                    raise self._error("Expected an empty line")
+                self.pos += 1
+                node.requirements.append(self._parse_node(node))
+            self.pos += len("\n[/COMPOSITE_REQUIREMENT]\n")
+
+        self._set_position(node, node_start)
+        self.processing_queue.append(
+            ("SDocCompositeNode" if is_composite else "SDocNode", node)
+        )
+        return node
+
+    def _parse_node_field(self, line: str) -> SDocNodeField:
+        field_start = self.pos
+
+        field_name_match = RE_FIELD_NAME.match(line)
+        if field_name_match is None:
+            raise self._error("Expected a field name")
+        field_name = field_name_match.group(0)
+        field_value = line[len(field_name) :]
+        if not field_value.startswith(": "):
+            raise self._error("Expected ': '")
+        field_value = field_value[2:]
+
+        parts: List[Any]
+        multiline__ = ""
+        if field_name == "MID" and field_value != ">>>":
+            if RE_SINGLE_LINE_STRING.fullmatch(field_value) is None:
+                raise self._error("Invalid MID value")
+            self._consume_line(line)
+            parts = [field_value]
+        elif field_name.startswith("UID"):
+            if field_name != "UID" or RE_UID.fullmatch(field_value) is None:
+                raise self._error("Invalid UID value")
+            self._consume_line(line)
+            parts = [field_value]
+        elif field_name.startswith("RELATIONS"):
+            raise self._error("Invalid field name")
+        elif field_value == ">>>":
+            self._consume_line(line)
+            multiline__ = ">>>\n"
+            parts = self._parse_multiline_text_parts()
+        else:
+            if RE_SINGLE_LINE_STRING.fullmatch(field_value) is None:
+                raise self._error("Invalid single-line field value")
+            self._consume_line(line)
+            parts = [field_value]
+            if field_value.startswith("[LINK: "):
+                link_start = field_start + len(field_name) + 2
+                inline_link = self._match_inline_link(link_start)
+                if inline_link is not None:
+                    if inline_link._tx_position_end != self.pos - 1:
+                        raise self._error("Unexpected text after [LINK: ...]")
+                    parts = [inline_link]
+
+        node_field = SDocNodeField(
+            parent=None,
+            field_name=field_name,
+            parts=parts,
+            multiline__=multiline__,
+        )
+        for part_ in parts:
+            if not isinstance(part_, str):
+                part_.parent = node_field
+        self._set_position(node_field, field_start)
+        self.processing_queue.append(("SDocNodeField", node_field))
+        return node_field
+
+    def _match_inline_link(self, link_start: int) -> Optional[InlineLink]:
+        """
+        Matches '[LINK: ' value = /REGEX_UID/ ']' at the given position.
+        Returns None if the text is not a complete inline link.
+        """
+        uid_start = link_start + len("[LINK: ")
+        uid_match = RE_UID.match(self.input, uid_start)
+        if uid_match is None or not self.input.startswith("]", uid_match.end()):
+            return None
+        inline_link = InlineLink(parent=None, value=uid_match.group(0))
+        inline_link._tx_position = link_start
+        inline_link._tx_position_end = uid_match.end() + 1
+        return inline_link
+
+    def _match_anchor(self, anchor_start: int) -> Optional[Anchor]:
+        uid_start = anchor_start + len("[ANCHOR: ")
+        uid_match = RE_UID.match(self.input, uid_start)
+        if uid_match is None:
+            return None
+        cursor = uid_match.end()
+        title = ""
+        if self.input.startswith(", ", cursor):
+            title_match = RE_ANCHOR_TITLE.match(self.input, cursor + 2)
+            if title_match is not None:
+                title = title_match.group(0)
+                cursor = title_match.end()
+        anchor_end_match = RE_ANCHOR_END.match(self.input, cursor)
+        if anchor_end_match is None:
+            raise self._error("Expected ']' after [ANCHOR: ...")
+        # Like textX, the parser passes an untyped parent. It is set to the
+        # SDocNodeField when the field is created from its parts.
+        anchor_parent: Any = None
+        anchor = Anchor(
+            parent=anchor_parent, value=uid_match.group(0), title=title
+        )
+        anchor._tx_position = anchor_start
+        anchor._tx_position_end = anchor_end_match.end()
+        return anchor
+
+    def _parse_multiline_text_parts(self) -> List[Any]:
+        end_match = RE_MULTILINE_END.search(self.input, self.pos)
+        if end_match is None:
+            raise self._error("Expected '<<<'")
+        text_end = end_match.start()
+        if not self.input.startswith("<<<\n", text_end):
+            raise self._error("Expected a new line after '<<<'")
+        if text_end == self.pos:
+            raise self._error("Multiline field cannot be empty")
+
+        parts: List[Any] = []
+        text_start = self.pos
+        cursor = self.pos
+        while cursor < text_end:
+            markup_match = RE_INLINE_MARKUP.search(self.input, cursor, text_end)
+            if markup_match is None:
+                break
+            markup_start = markup_match.start()
+            markup: Union[InlineLink, Anchor, None]
+            if markup_match.group(0) == "[LINK: ":
+                markup = self._match_inline_link(markup_start)
+                # The textX grammar does not let a plain text consume
+                # "[LINK: <UID>", so an unterminated link is an error.
+                if markup is None and RE_UID.match(
+                    self.input, markup_start + len("[LINK: ")
+                ):
+                    raise self._error("Expected ']' after [LINK: ...")
+            else:
+                markup = self._match_anchor(markup_start)
+            if markup is None:
+                cursor = markup_start + 1
+                continue
+            if markup._tx_position_end > text_end:
+                raise self._error("Inline markup overlaps with '<<<'")
+            if markup_start > text_start:
+                parts.append(self.input[text_start:markup_start])
+            parts.append(markup)
+            text_start = markup._tx_position_end
+            cursor = text_start
+        if text_start < text_end:
+            parts.append(self.input[text_start:text_end])
+
+        self.pos = text_end + len("<<<\n")
+        return parts
+
+    def _parse_reference(self, line: str) -> Reference:
+        reference_start = self.pos
+        reference: Reference
+        if line in ("- TYPE: Parent", "- TYPE: Child"):
+            self._consume_line(line)
+            ref_uid = self._read_value("  VALUE: ")
+            if ref_uid is None:
+                raise self._error("Expected '  VALUE: '")
+            role = self._read_non_empty_value("  ROLE: ")
+            if line == "- TYPE: Parent":
+                reference = ParentReqReference(
+                    parent=None, ref_uid=ref_uid, role=role
+                )
+            else:
+                # textX passes an empty string when a ROLE is not provided.
+                reference = ChildReqReference(
+                    parent=None,
+                    ref_uid=ref_uid,
+                    role=role if role is not None else "",
+                )
+        elif line == "- TYPE: File":
+            self._consume_line(line)
+            role = self._read_non_empty_value("  ROLE: ")
+            file_entry_start = self.pos
+            file_format = self._read_value("  FORMAT: ")
+            if (
+                file_format is not None
+                and file_format not in ("Sourcecode", "Python")
+                and RE_FILE_ENTRY_FORMAT.fullmatch(file_format) is None
+            ):
+                raise self._error("Invalid file format")
+            file_path = self._read_value("  VALUE: ")
+            if file_path is None:
+                raise self._error("Expected '  VALUE: '")
+            file_entry = FileEntry(
+                parent=None,
+                g_file_format=file_format,
+                g_file_path=file_path,
+                g_line_range=self._read_value("  LINE_RANGE: "),
+                function=self._read_value("  FUNCTION: "),
+                clazz=self._read_value("  CLASS: "),
+            )
+            self._set_position(file_entry, file_entry_start)
+            reference = FileReference(
+                parent=None, g_file_entry=file_entry, role=role
+            )
+            file_entry.parent = reference
+        else:
+            raise self._error(f"Unknown relation type: '{line}'")
+        self._set_position(reference, reference_start)
+        return reference
@@ -1,35 +1,111 @@
-import hashlib
 import os
-from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
+from strictdoc.backend.sdoc.cache_format import CacheFormat
+from strictdoc.backend.sdoc.cache_manifest import CacheManifest
+from strictdoc.core.cache_backend import CacheBackend
 from strictdoc.core.project_config import ProjectConfig
-from strictdoc.helpers.md5 import get_file_md5
-from strictdoc.helpers.pickle import pickle_dump, pickle_load
+
+
+class ParsedContentMemo:
+    """
+    Keeps the cached parse results of the files read by a process in memory,
+    keyed by the path to a file and the cache key, which includes the MD5
+    hash of the file's content.
+
+    When a file is read again by the same process, e.g., when the server
+    rebuilds the traceability index after an edit, or when another export
+    format builds its own index, neither the cache backend nor the parser
+    is involved. Every read unpickles its own copy of the parse result, so
+    the readers never share mutable objects.
+
+    Only the latest content of each file is kept.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(
+        self, content_kind: str, file_path: str, cache_key: str
+    ) -> Optional[bytes]:
+        entry: Optional[Tuple[str, bytes]] = self.entries.get(
+            (content_kind, file_path)
+        )
+        if entry is not None and entry[0] == cache_key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        content_kind: str,
+        file_path: str,
+        cache_key: str,
+        pickled_content: bytes,
+    ) -> None:
+        self.entries[(content_kind, file_path)] = (cache_key, pickled_content)
+
+    def reset_statistics(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_statistics_message(hits: int, misses: int) -> str:
+        return (
+            f"Parsed document memo: {hits} re-parses avoided, {misses} misses."
+        )
 
 
 class PickleCache:
+    # The kinds of content that are read repeatedly by the same process and
+    # are small enough to be kept in memory.
+    MEMOIZED_CONTENT_KINDS = ("sdoc", "grammar")
+
+    memo: ParsedContentMemo = ParsedContentMemo()
+
     @staticmethod
     def read_from_cache(
-        file_path: str, project_config: ProjectConfig, content_kind: str
+        file_path: str,
+        project_config: ProjectConfig,
+        content_kind: str,
+        content_variant: str = "",
     ) -> Any:
-        path_to_cached_file: str = PickleCache.get_cached_file_path(
-            file_path, project_config, content_kind
+        cache_key: str = PickleCache.get_cache_key(
+            file_path, project_config, content_variant
         )
-        if os.path.isfile(path_to_cached_file):
-            with open(path_to_cached_file, "rb") as cache_file:
-                unpickled_content = cache_file.read()
-            try:
-                return pickle_load(unpickled_content)
-            except Exception as exception_:
-                raise AssertionError(
-                    "MUST NOT REACH HERE: "
-                    f"Error when unpickling a cache file: {path_to_cached_file}. "
-                    "To fix the issue, simply remove the cache file or the whole cache folder. "
-                    "Please report this exception to StrictDoc developers: "
-                    f"https://github.com/strictdoc-project/strictdoc/issues/new"
-                ) from exception_
-        return None
+        is_memoized = content_kind in PickleCache.MEMOIZED_CONTENT_KINDS
+        unpickled_content: Optional[bytes] = None
+        if is_memoized:
+            unpickled_content = PickleCache.memo.get(
+                content_kind, os.path.abspath(file_path), cache_key
+            )
+        if unpickled_content is None:
+            unpickled_content = CacheBackend.get_instance(project_config).get(
+                content_kind, cache_key
+            )
+            if unpickled_content is None:
+                return None
+            if is_memoized:
+                PickleCache.memo.put(
+                    content_kind,
+                    os.path.abspath(file_path),
+                    cache_key,
+                    unpickled_content,
+                )
+        try:
+            return CacheFormat.decode(unpickled_content)
+        except Exception as exception_:
+            raise AssertionError(
+                "MUST NOT REACH HERE: "
+                "Error when unpickling a cache entry: "
+                f"{content_kind}/{cache_key}. "
+                "To fix the issue, simply remove the cache file or the whole cache folder. "
+                "Please report this exception to StrictDoc developers: "
+                f"https://github.com/strictdoc-project/strictdoc/issues/new"
+            ) from exception_
 
     @staticmethod
     def save_to_cache(
@@ -37,21 +113,41 @@ class PickleCache:
         file_path: str,
         project_config: ProjectConfig,
         content_kind: str,
+        content_variant: str = "",
     ) -> None:
-        path_to_cached_file: str = PickleCache.get_cached_file_path(
-            file_path, project_config, content_kind
+        pickled_content: bytes = CacheFormat.encode(
+            content, project_config.cache_compression
+        )
+        cache_key: str = PickleCache.get_cache_key(
+            file_path, project_config, content_variant
+        )
+        CacheBackend.get_instance(project_config).put(
+            content_kind, cache_key, pickled_content
         )
-        path_to_cached_file_dir: str = os.path.dirname(path_to_cached_file)
-        Path(path_to_cached_file_dir).mkdir(parents=True, exist_ok=True)
-        pickled_content: Any = pickle_dump(content)
-        with open(path_to_cached_file, "wb") as cache_file:
-            cache_file.write(pickled_content)
+        if content_kind in PickleCache.MEMOIZED_CONTENT_KINDS:
+            PickleCache.memo.put(
+                content_kind,
+                os.path.abspath(file_path),
+                cache_key,
+                pickled_content,
+            )
 
     @staticmethod
-    def get_cached_file_path(
-        file_path: str, project_config: ProjectConfig, content_kind: str
+    def get_cache_key(
+        file_path: str, project_config: ProjectConfig, content_variant: str
     ) -> str:
-        path_to_tmp_dir = project_config.get_path_to_cache_dir()
+        """
+        The cache is content-addressed: the key is the MD5 hash of the file's
+        content and the schema key of the parser that has produced the
+        cached object. The key does not depend on the path of the file or on
+        the output folder, so the builds of the same files into different
+        output folders, from different checkouts, or by different CI jobs
+        can share one cache folder.
+
+        The content variant distinguishes the results of different parsers
+        for the same content, e.g., of the language-aware source file
+        parsers.
+        """
 
         full_path_to_file = (
             file_path
@@ -59,24 +155,12 @@ class PickleCache:
             else os.path.abspath(file_path)
         )
 
-        file_md5: str = get_file_md5(file_path)
-
-        # File name contains an MD5 hash of its full path to ensure the
-        # uniqueness of the cached items. Additionally, the unique file name
-        # contains a full path to the output root to prevent collisions
-        # between StrictDoc invocations running against the same set of SDoc
-        # files in parallel.
-        unique_identifier = project_config.output_dir + full_path_to_file
-        unique_identifier_md5 = hashlib.md5(
-            unique_identifier.encode("utf-8")
-        ).hexdigest()
-        file_name = os.path.basename(full_path_to_file)
-        file_name += "_" + unique_identifier_md5 + "_" + file_md5
-
-        path_to_cached_file = os.path.join(
-            path_to_tmp_dir,
-            content_kind,
-            file_name,
+        file_md5: str = CacheManifest.get_instance(project_config).get_file_md5(
+            full_path_to_file
         )
-
-        return path_to_cached_file
+        cache_key = (
+            file_md5 + "_" + CacheFormat.get_schema_key().decode("ascii")
+        )
+        if len(content_variant) > 0:
+            cache_key += "_" + content_variant
+        return cache_key
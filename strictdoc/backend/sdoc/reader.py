@@ -1,40 +1,63 @@
 # mypy: disable-error-code="no-any-return,no-untyped-call,no-untyped-def"
+import os
 import sys
 import traceback
 from typing import Tuple
 
-from textx import metamodel_from_str
-
 from strictdoc.backend.sdoc.error_handling import StrictDocSemanticError
 from strictdoc.backend.sdoc.grammar.grammar_builder import SDocGrammarBuilder
+from strictdoc.backend.sdoc.line_parser import (
+    SDocLineParser,
+    SDocLineParserError,
+)
 from strictdoc.backend.sdoc.models.constants import DOCUMENT_MODELS
 from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.backend.sdoc.models.document_from_file import DocumentFromFile
 from strictdoc.backend.sdoc.pickle_cache import PickleCache
 from strictdoc.backend.sdoc.processor import ParseContext, SDocParsingProcessor
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.helpers.cast import assert_cast
 from strictdoc.helpers.exception import StrictDocException
-from strictdoc.helpers.textx import drop_textx_meta
+from strictdoc.helpers.textx import (
+    LazyMetaModel,
+    drop_textx_meta,
+    model_from_str_with_processors,
+)
 
 
 class SDReader:
-    meta_model = metamodel_from_str(
-        SDocGrammarBuilder.create_grammar(),
-        classes=DOCUMENT_MODELS,
-        use_regexp_group=True,
+    meta_model = LazyMetaModel(
+        SDocGrammarBuilder.create_grammar, classes=DOCUMENT_MODELS
     )
 
     @staticmethod
-    def _read(input_string, file_path=None):
+    def _read(input_string, file_path=None, use_line_parser: bool = True):
+        if use_line_parser:
+            parse_context = ParseContext(path_to_sdoc_file=file_path)
+            try:
+                document: SDocDocument = SDocLineParser(
+                    input_string, parse_context
+                ).parse()
+                return SDReader._finalize(document, parse_context)
+            except SDocLineParserError:
+                # The input is either invalid or uses a construct that the
+                # line parser does not support. The textX grammar is the
+                # reference: it either parses the input or reports the
+                # syntax error.
+                pass
+
         parse_context = ParseContext(path_to_sdoc_file=file_path)
         processor = SDocParsingProcessor(parse_context=parse_context)
-        SDReader.meta_model.register_obj_processors(
-            processor.get_default_processors()
+        document = model_from_str_with_processors(
+            SDReader.meta_model,
+            processor.get_default_processors(),
+            input_string,
+            file_name=file_path,
         )
+        return SDReader._finalize(document, parse_context)
 
-        document: SDocDocument = SDReader.meta_model.model_from_str(
-            input_string, file_name=file_path
-        )
+    @staticmethod
+    def _finalize(document: SDocDocument, parse_context: ParseContext):
         parse_context.document_reference.set_document(document)
         document.ng_has_requirements = parse_context.document_has_requirements
 
@@ -52,6 +75,31 @@ class SDReader:
         document, parse_context = SDReader._read(input_string, file_path)
         return document, parse_context
 
+    @staticmethod
+    def _resolve_fragments_from_files(
+        document: SDocDocument, file_path: str
+    ) -> bool:
+        """
+        A cached document may have been parsed from a file with the same
+        content at another location, e.g., in another checkout. The paths to
+        the included documents are resolved again for this file. Returns
+        False if an included document does not exist at this location, in
+        which case the file is parsed again to report the error.
+        """
+
+        path_to_sdoc_dir = os.path.dirname(file_path)
+        for document_from_file_ in document.fragments_from_files:
+            assert isinstance(document_from_file_, DocumentFromFile)
+            resolved_path_to_fragment_file = os.path.abspath(
+                os.path.join(path_to_sdoc_dir, document_from_file_.file)
+            )
+            if not os.path.isfile(resolved_path_to_fragment_file):
+                return False
+            document_from_file_.resolved_full_path_to_document_file = (
+                resolved_path_to_fragment_file
+            )
+        return True
+
     def read_from_file(
         self, file_path: str, project_config: ProjectConfig
     ) -> SDocDocument:
@@ -63,8 +111,10 @@ class SDReader:
         unpickled_content = PickleCache.read_from_cache(
             file_path, project_config, "sdoc"
         )
-        if unpickled_content:
-            return assert_cast(unpickled_content, SDocDocument)
+        if unpickled_content is not None:
+            document = assert_cast(unpickled_content, SDocDocument)
+            if SDReader._resolve_fragments_from_files(document, file_path):
+                return document
 
         with open(file_path, encoding="utf8") as file:
             sdoc_content = file.read()
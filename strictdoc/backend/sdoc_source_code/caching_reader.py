@@ -21,8 +21,15 @@ class SourceFileTraceabilityCachingReader:
     def read_from_file(
         path_to_file: str, project_config: ProjectConfig
     ) -> Optional[SourceFileTraceabilityInfo]:
+        reader = SourceFileTraceabilityCachingReader._get_reader(
+            path_to_file, project_config
+        )
+        # The language-aware parsers and the general parser produce different
+        # results for the same file content.
+        content_variant = reader.__class__.__name__
+
         unpickled_content = PickleCache.read_from_cache(
-            path_to_file, project_config, "source_file"
+            path_to_file, project_config, "source_file", content_variant
         )
         if unpickled_content is not None:
             assert isinstance(unpickled_content, SourceFileTraceabilityInfo), (
@@ -31,9 +38,6 @@ class SourceFileTraceabilityCachingReader:
             )
             return unpickled_content
 
-        reader = SourceFileTraceabilityCachingReader._get_reader(
-            path_to_file, project_config
-        )
         try:
             if (
                 traceability_info := reader.read_from_file(path_to_file)
@@ -43,6 +47,7 @@ class SourceFileTraceabilityCachingReader:
                     path_to_file,
                     project_config,
                     "source_file",
+                    content_variant,
                 )
         except UnicodeDecodeError:
             print(  # noqa: T201
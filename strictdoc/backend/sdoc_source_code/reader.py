@@ -4,7 +4,7 @@ import traceback
 from functools import partial
 from typing import List, Optional
 
-from textx import get_location, metamodel_from_str
+from textx import get_location
 
 from strictdoc.backend.sdoc.error_handling import StrictDocSemanticError
 from strictdoc.backend.sdoc_source_code.grammar import SOURCE_FILE_GRAMMAR
@@ -21,7 +21,11 @@ from strictdoc.backend.sdoc_source_code.models.source_file_info import (
 )
 from strictdoc.backend.sdoc_source_code.parse_context import ParseContext
 from strictdoc.helpers.file_stats import SourceFileStats
-from strictdoc.helpers.textx import drop_textx_meta
+from strictdoc.helpers.textx import (
+    LazyMetaModel,
+    drop_textx_meta,
+    model_from_str_with_processors,
+)
 
 
 def req_processor(req: Req):
@@ -233,12 +237,9 @@ class SourceFileTraceabilityReader:
         RangeMarker,
     ]
 
-    def __init__(self) -> None:
-        self.meta_model = metamodel_from_str(
-            SOURCE_FILE_GRAMMAR,
-            classes=SourceFileTraceabilityReader.SOURCE_FILE_MODELS,
-            use_regexp_group=True,
-        )
+    meta_model = LazyMetaModel(
+        lambda: SOURCE_FILE_GRAMMAR, classes=SOURCE_FILE_MODELS
+    )
 
     def read(self, input_string, file_path=None) -> SourceFileTraceabilityInfo:
         # TODO: This might be possible to handle directly in the textx grammar.
@@ -272,12 +273,13 @@ class SourceFileTraceabilityReader:
             "SourceFileTraceabilityInfo": parse_source_traceability_processor,
         }
 
-        self.meta_model.register_obj_processors(obj_processors)
-
         try:
             source_file_traceability_info: SourceFileTraceabilityInfo = (
-                self.meta_model.model_from_str(
-                    input_string, file_name=file_path
+                model_from_str_with_processors(
+                    self.meta_model,
+                    obj_processors,
+                    input_string,
+                    file_name=file_path,
                 )
             )
             source_file_traceability_info.ng_map_reqs_to_markers = (
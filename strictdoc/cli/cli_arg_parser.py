@@ -1,6 +1,6 @@
 # mypy: disable-error-code="no-untyped-call,no-untyped-def"
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from strictdoc.cli.command_parser_builder import CommandParserBuilder
 from strictdoc.helpers.auto_described import auto_described
@@ -129,6 +129,8 @@ class ExportCommandConfig:
         fields,
         generate_bundle_document: bool,
         no_parallelization: bool,
+        jobs: Optional[int],
+        shard: Optional[Tuple[int, int]],
         enable_mathjax: bool,
         included_documents: bool,
         filter_requirements: Optional[str],
@@ -148,6 +150,8 @@ class ExportCommandConfig:
         self.fields = fields
         self.generate_bundle_document: bool = generate_bundle_document
         self.no_parallelization: bool = no_parallelization
+        self.jobs: Optional[int] = jobs
+        self.shard: Optional[Tuple[int, int]] = shard
         self.enable_mathjax: bool = enable_mathjax
         self.included_documents: bool = included_documents
         self.filter_requirements: Optional[str] = filter_requirements
@@ -187,6 +191,11 @@ class ExportCommandConfig:
                     "Provided path to a configuration file does not exist: "
                     f"{self._config_path}"
                 )
+        if self.shard is not None and self.formats != ["html"]:
+            raise CLIValidationError(
+                "Only the HTML export can be sharded: "
+                "--shard requires --formats=html."
+            )
 
 
 class DumpGrammarCommandConfig:
@@ -206,6 +215,26 @@ class DiffCommandConfig:
         self.output_dir: Optional[str] = output_dir
 
 
+class CacheCommandConfig:
+    def __init__(self, *, subcommand: str, config_path: Optional[str]):
+        self.subcommand: str = subcommand
+        self._config_path: Optional[str] = config_path
+
+    def get_path_to_config(self) -> str:
+        return (
+            self._config_path if self._config_path is not None else os.getcwd()
+        )
+
+    def validate(self) -> None:
+        if self._config_path is not None and not os.path.exists(
+            self._config_path
+        ):
+            raise CLIValidationError(
+                "Provided path to a configuration file does not exist: "
+                f"{self._config_path}"
+            )
+
+
 class SDocArgsParser:
     def __init__(self, args):
         self.args = args
@@ -222,6 +251,10 @@ class SDocArgsParser:
     def is_export_command(self):
         return self.args.command == "export"
 
+    @property
+    def is_export_merge_command(self):
+        return self.args.command == "export-merge"
+
     @property
     def is_import_command_reqif(self):
         return (
@@ -250,6 +283,10 @@ class SDocArgsParser:
     def is_diff_command(self):
         return self.args.command == "diff"
 
+    @property
+    def is_cache_command(self):
+        return self.args.command == "cache"
+
     @property
     def is_manage_autouid_command(self):
         return (
@@ -273,6 +310,8 @@ class SDocArgsParser:
             self.args.fields,
             self.args.generate_bundle_document,
             self.args.no_parallelization,
+            self.args.jobs,
+            self.args.shard,
             self.args.enable_mathjax,
             self.args.included_documents,
             self.args.filter_requirements,
@@ -284,6 +323,17 @@ class SDocArgsParser:
             self.args.chromedriver,
         )
 
+    def get_shard_output_dirs(self) -> List[str]:
+        shard_output_dirs: List[str] = []
+        for shard_output_dir_ in self.args.shard_output_dirs:
+            if not os.path.isdir(shard_output_dir_):
+                raise CLIValidationError(
+                    "Provided shard output folder does not exist: "
+                    f"{shard_output_dir_}"
+                )
+            shard_output_dirs.append(os.path.abspath(shard_output_dir_))
+        return shard_output_dirs
+
     def get_import_config_reqif(self, _) -> ImportReqIFCommandConfig:
         return ImportReqIFCommandConfig(
             self.args.input_path,
@@ -318,6 +368,11 @@ class SDocArgsParser:
     def get_dump_grammar_config(self) -> DumpGrammarCommandConfig:
         return DumpGrammarCommandConfig(output_file=self.args.output_file)
 
+    def get_cache_config(self) -> CacheCommandConfig:
+        return CacheCommandConfig(
+            subcommand=self.args.subcommand, config_path=self.args.config
+        )
+
     def get_diff_config(self) -> DiffCommandConfig:
         return DiffCommandConfig(
             path_to_lhs_tree=self.args.path_to_lhs_tree,
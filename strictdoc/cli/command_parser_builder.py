@@ -60,6 +60,17 @@ def _check_reqif_import_markup(markup):
     return markup
 
 
+def _parse_shard(shard):
+    message = f"invalid shard: '{shard}' (expected K/N with 1 <= K <= N)"
+    try:
+        shard_number, shard_count = map(int, shard.split("/"))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(message) from exc
+    if not 1 <= shard_number <= shard_count:
+        raise argparse.ArgumentTypeError(message)
+    return shard_number, shard_count
+
+
 def _parse_fields(fields):
     fields_array = fields.split(",")
     return fields_array
@@ -115,6 +126,7 @@ class CommandParserBuilder:
 
         self.add_about_command(command_subparsers)
         self.add_export_command(command_subparsers)
+        self.add_export_merge_command(command_subparsers)
         self.add_server_command(command_subparsers)
         self.add_manage_command(command_subparsers)
         self.add_import_command(command_subparsers)
@@ -122,6 +134,7 @@ class CommandParserBuilder:
         self.add_passthrough_command(command_subparsers)
         self.add_dump_command(command_subparsers)
         self.add_diff_command(command_subparsers)
+        self.add_cache_command(command_subparsers)
 
         return main_parser
 
@@ -147,6 +160,56 @@ class CommandParserBuilder:
             ),
             formatter_class=formatter,
         )
+        CommandParserBuilder.add_export_arguments(command_parser_export)
+        command_parser_export.add_argument(
+            "--shard",
+            type=_parse_shard,
+            default=None,
+            help=(
+                "Export only the K-th of N slices of the documents and source "
+                "files, e.g., 2/8. Only the HTML format can be sharded. The "
+                "outputs of all shards are assembled by the export-merge "
+                "command."
+            ),
+        )
+
+    @staticmethod
+    def add_export_merge_command(parent_command_parser):
+        # Command – Export merge
+        command_parser_export_merge = parent_command_parser.add_parser(
+            "export-merge",
+            help="Assemble the HTML outputs of a sharded export.",
+            description=(
+                "Export merge command: "
+                "the HTML outputs of the shards exported with "
+                "'export --shard K/N' are copied to the output folder, and the "
+                "project tree, the traceability matrix, the statistics and the "
+                "assets are generated. The arguments must be the same as the "
+                "ones of the sharded export."
+            ),
+            formatter_class=formatter,
+        )
+        CommandParserBuilder.add_export_arguments(command_parser_export_merge)
+        command_parser_export_merge.add_argument(
+            "--shard-output-dir",
+            type=str,
+            action="append",
+            dest="shard_output_dirs",
+            default=[],
+            help=(
+                "The output folder of a shard. The option is repeated for "
+                "every shard. Without this option, the shards are expected "
+                "to be exported to the output folder already."
+            ),
+        )
+        # Hidden default value to make the export-merge parser compatible
+        # with SDocArgsParser.get_export_config.
+        command_parser_export_merge.add_argument(
+            "--shard", default=None, help=argparse.SUPPRESS
+        )
+
+    @staticmethod
+    def add_export_arguments(command_parser_export):
         command_parser_export.add_argument(
             "input_paths",
             type=str,
@@ -191,6 +254,17 @@ class CommandParserBuilder:
                 "This option may be useful for debugging."
             ),
         )
+        command_parser_export.add_argument(
+            "--jobs",
+            type=IntRange(1),
+            default=None,
+            help=(
+                "The number of parallel worker processes. "
+                "By default, as many as there are CPUs available to StrictDoc, "
+                "taking the CPU affinity and the cgroup CPU quota of a "
+                "container into account."
+            ),
+        )
         command_parser_export.add_argument(
             "--enable-mathjax",
             action="store_true",
@@ -453,6 +527,16 @@ class CommandParserBuilder:
             default=False,
             help=argparse.SUPPRESS,
         )
+        command_parser_passthrough.add_argument(
+            "--jobs",
+            default=None,
+            help=argparse.SUPPRESS,
+        )
+        command_parser_passthrough.add_argument(
+            "--shard",
+            default=None,
+            help=argparse.SUPPRESS,
+        )
         command_parser_passthrough.add_argument(
             "--enable-mathjax",
             default=False,
@@ -559,3 +643,44 @@ class CommandParserBuilder:
             type=str,
             help="A directory where to output the files to.",
         )
+
+    @staticmethod
+    def add_cache_command(parent_command_parser):
+        cache_command_parser = parent_command_parser.add_parser(
+            "cache",
+            help="Inspect and clean up the StrictDoc cache directory.",
+            description=(
+                "See subcommands to inspect and clean up the StrictDoc "
+                "cache directory."
+            ),
+            formatter_class=formatter,
+        )
+        cache_command_subparsers = cache_command_parser.add_subparsers(
+            title="subcommand", dest="subcommand"
+        )
+        cache_command_subparsers.required = True
+
+        command_parser_stats = cache_command_subparsers.add_parser(
+            "stats",
+            help="Print the number and size of the cached entries.",
+            formatter_class=formatter,
+        )
+        add_config_argument(command_parser_stats)
+
+        command_parser_prune = cache_command_subparsers.add_parser(
+            "prune",
+            help=(
+                "Remove the least recently used entries until the cache fits "
+                "into the limits set by the cache_max_size_mb and "
+                "cache_max_entries options."
+            ),
+            formatter_class=formatter,
+        )
+        add_config_argument(command_parser_prune)
+
+        command_parser_clear = cache_command_subparsers.add_parser(
+            "clear",
+            help="Remove all cached entries.",
+            formatter_class=formatter,
+        )
+        add_config_argument(command_parser_clear)
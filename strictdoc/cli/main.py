@@ -6,6 +6,7 @@
 import multiprocessing
 import os
 import sys
+from typing import List
 
 strictdoc_root_path = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "..")
@@ -16,6 +17,7 @@ sys.path.append(strictdoc_root_path)
 
 from strictdoc import environment
 from strictdoc.cli.cli_arg_parser import (
+    CacheCommandConfig,
     CLIValidationError,
     DiffCommandConfig,
     DumpGrammarCommandConfig,
@@ -26,14 +28,17 @@ from strictdoc.cli.cli_arg_parser import (
     create_sdoc_args_parser,
 )
 from strictdoc.commands.about_command import AboutCommand
+from strictdoc.commands.cache_command import CacheCommand
 from strictdoc.commands.diff_command import DiffCommand
 from strictdoc.commands.dump_grammar_command import DumpGrammarCommand
 from strictdoc.commands.manage_autouid_command import ManageAutoUIDCommand
 from strictdoc.commands.version_command import VersionCommand
 from strictdoc.core.actions.export_action import ExportAction
 from strictdoc.core.actions.import_action import ImportAction
+from strictdoc.core.cache_index import CacheIndex
 from strictdoc.core.project_config import ProjectConfig, ProjectConfigLoader
 from strictdoc.helpers.exception import StrictDocException
+from strictdoc.helpers.output_writer import OutputWriter
 from strictdoc.helpers.parallelizer import Parallelizer
 from strictdoc.server.server import run_strictdoc_server
 
@@ -43,15 +48,22 @@ def _main(parallelizer: Parallelizer) -> None:
 
     project_config: ProjectConfig
 
-    if parser.is_passthrough_command or parser.is_export_command:
+    if (
+        parser.is_passthrough_command
+        or parser.is_export_command
+        or parser.is_export_merge_command
+    ):
         if parser.is_passthrough_command:
             print(  # noqa: T201
                 "warning: passthrough is deprecated, use strictdoc "
                 "export --formats sdoc instead."
             )
         export_config: ExportCommandConfig = parser.get_export_config()
+        shard_output_dirs: List[str] = []
         try:
             export_config.validate()
+            if parser.is_export_merge_command:
+                shard_output_dirs = parser.get_shard_output_dirs()
         except CLIValidationError as exception_:
             print(f"error: {exception_.args[0]}")  # noqa: T201
             sys.exit(1)
@@ -61,6 +73,9 @@ def _main(parallelizer: Parallelizer) -> None:
         )
         project_config.integrate_export_config(export_config)
 
+        if export_config.jobs is not None:
+            parallelizer.set_jobs(export_config.jobs)
+        OutputWriter.enable_write_behind()
         parallelization_value = (
             "Disabled" if export_config.no_parallelization else "Enabled"
         )
@@ -70,9 +85,15 @@ def _main(parallelizer: Parallelizer) -> None:
         export_action = ExportAction(
             project_config=project_config,
             parallelizer=parallelizer,
+            shard=export_config.shard,
         )
         export_action.build_index()
-        export_action.export()
+        if parser.is_export_merge_command:
+            export_action.merge_shards(shard_output_dirs)
+        else:
+            export_action.export()
+
+        CacheIndex.prune_if_due(project_config)
 
     elif parser.is_server_command:
         server_config = parser.get_server_config()
@@ -152,7 +173,24 @@ def _main(parallelizer: Parallelizer) -> None:
             environment=environment,
         )
         DiffCommand.execute(
-            project_config=project_config, diff_config=diff_config
+            project_config=project_config,
+            diff_config=diff_config,
+            parallelizer=parallelizer,
+        )
+
+    elif parser.is_cache_command:
+        cache_config: CacheCommandConfig = parser.get_cache_config()
+        try:
+            cache_config.validate()
+        except CLIValidationError as exception_:
+            print(f"error: {exception_.args[0]}")  # noqa: T201
+            sys.exit(1)
+        project_config = ProjectConfigLoader.load_from_path_or_get_default(
+            path_to_config=cache_config.get_path_to_config(),
+            environment=environment,
+        )
+        CacheCommand.execute(
+            project_config=project_config, cache_config=cache_config
         )
 
     else:
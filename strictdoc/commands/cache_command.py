@@ -0,0 +1,41 @@
+from strictdoc.cli.cli_arg_parser import CacheCommandConfig
+from strictdoc.core.cache_index import CacheIndex
+from strictdoc.core.project_config import ProjectConfig
+
+
+def format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class CacheCommand:
+    @staticmethod
+    def execute(
+        *, project_config: ProjectConfig, cache_config: CacheCommandConfig
+    ) -> None:
+        path_to_cache_dir = project_config.get_path_to_cache_dir()
+        cache_index = CacheIndex.create(path_to_cache_dir)
+
+        if cache_config.subcommand == "stats":
+            print(f"Cache directory: {path_to_cache_dir}")  # noqa: T201
+            for kind_, (count_, size_) in cache_index.get_statistics().items():
+                print(  # noqa: T201
+                    f"{kind_:<16}{count_:>10} entries{format_size(size_):>14}"
+                )
+            print(  # noqa: T201
+                f"{'total':<16}{len(cache_index.entries):>10} entries"
+                f"{format_size(cache_index.get_total_size()):>14}"
+            )
+        elif cache_config.subcommand == "prune":
+            removed_entries, removed_size = cache_index.prune(
+                project_config.get_cache_max_size(),
+                project_config.get_cache_max_entries(),
+            )
+            print(  # noqa: T201
+                f"Removed {removed_entries} entries "
+                f"({format_size(removed_size)}) from {path_to_cache_dir}."
+            )
+        elif cache_config.subcommand == "clear":
+            cache_index.clear()
+            print(f"Cleared {path_to_cache_dir}.")  # noqa: T201
+        else:
+            raise NotImplementedError(cache_config.subcommand)
@@ -11,12 +11,16 @@ from strictdoc.export.html.generators.view_objects.diff_screen_results_view_obje
 from strictdoc.export.html.html_generator import HTMLGenerator
 from strictdoc.export.html.html_templates import HTMLTemplates
 from strictdoc.git.change_generator import ChangeContainer, ChangeGenerator
+from strictdoc.helpers.parallelizer import Parallelizer
 
 
 class DiffCommand:
     @staticmethod
     def execute(
-        *, project_config: ProjectConfig, diff_config: DiffCommandConfig
+        *,
+        project_config: ProjectConfig,
+        diff_config: DiffCommandConfig,
+        parallelizer: Parallelizer,
     ):
         if not project_config.is_activated_diff():
             raise RuntimeError(
@@ -58,6 +62,7 @@ class DiffCommand:
         change_container: ChangeContainer = ChangeGenerator.generate(
             lhs_project_config=project_config_copy_lhs,
             rhs_project_config=project_config_copy_rhs,
+            parallelizer=parallelizer,
         )
 
         html_templates = HTMLTemplates.create(
@@ -1,8 +1,9 @@
 # mypy: disable-error-code="arg-type,no-untyped-call,no-untyped-def,operator"
 import os
 import sys
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from strictdoc.backend.excel.export.excel_generator import ExcelGenerator
 from strictdoc.backend.reqif.reqif_export import ReqIFExport
@@ -20,7 +21,14 @@ from strictdoc.export.html2pdf.html2pdf_generator import HTML2PDFGenerator
 from strictdoc.export.json.json_generator import JSONGenerator
 from strictdoc.export.rst.document_rst_generator import DocumentRSTGenerator
 from strictdoc.export.spdx.spdx_generator import SPDXGenerator
-from strictdoc.helpers.parallelizer import NullParallelizer
+from strictdoc.helpers.exception import StrictDocException
+from strictdoc.helpers.file_system import sync_dir
+from strictdoc.helpers.output_writer import OutputWriter
+from strictdoc.helpers.parallelizer import (
+    NamedTaskType,
+    NullParallelizer,
+    TaskResult,
+)
 from strictdoc.helpers.timing import timing_decorator
 
 
@@ -29,10 +37,15 @@ class ExportAction:
         self,
         project_config: ProjectConfig,
         parallelizer,
+        shard: Optional[Tuple[int, int]] = None,
     ):
         assert parallelizer
         self.project_config: ProjectConfig = project_config
         self.parallelizer = parallelizer
+        # The shard K/N is not a part of the project config: the shards
+        # share the traceability index snapshot, which is looked up by the
+        # project config.
+        self.shard: Optional[Tuple[int, int]] = shard
         self.traceability_index: Optional[TraceabilityIndex] = None
 
     @timing_decorator("Parse SDoc project tree")
@@ -51,16 +64,111 @@ class ExportAction:
 
     @timing_decorator("Export SDoc")
     def export(self) -> None:
+        """
+        The export formats are independent of each other and only read the
+        traceability index, so they are exported at the same time, each in its
+        own process. A failed format does not stop the other formats. All
+        failures are reported after every format has finished.
+        """
+
+        assert self.traceability_index is not None, (
+            "The index must be built at this point."
+        )
+        export_results: List[TaskResult] = self.parallelizer.run_tasks_forked(
+            self.get_export_tasks()
+        )
+        # The formats exported by the main process may still have pending
+        # writes.
+        OutputWriter.flush_and_report()
+
+        for export_result_ in export_results:
+            export_status = (
+                "completed"
+                if export_result_.succeeded
+                else f"failed with exit code {export_result_.exitcode}"
+            )
+            print(  # noqa: T201
+                f"Export format '{export_result_.name}' {export_status} "
+                f"in {export_result_.duration:.2f}s.",
+                flush=True,
+            )
+        failed_formats = [
+            export_result_.name
+            for export_result_ in export_results
+            if not export_result_.succeeded
+        ]
+        if len(failed_formats) > 0:
+            print(  # noqa: T201
+                "error: Export has failed for the formats: "
+                f"{', '.join(failed_formats)}."
+            )
+            sys.exit(1)
+
+    @timing_decorator("Merge SDoc export shards")
+    def merge_shards(self, shard_output_dirs: List[str]) -> None:
+        """
+        Assembles the HTML export from the outputs of the shards exported with
+        --shard K/N: the documents and source files of the shards are copied
+        to the output folder, and the pages that cover the whole project are
+        generated.
+        """
+
         assert self.traceability_index is not None, (
             "The index must be built at this point."
         )
+        for shard_output_dir_ in shard_output_dirs:
+            shard_output_html_root = os.path.join(shard_output_dir_, "html")
+            if not os.path.isdir(shard_output_html_root):
+                print(  # noqa: T201
+                    "error: Shard output folder has no HTML export: "
+                    f"{shard_output_dir_}"
+                )
+                sys.exit(1)
+            sync_dir(
+                shard_output_html_root,
+                self.project_config.export_output_html_root,
+                message=f"Copying shard output {shard_output_dir_}",
+            )
+
+        html_templates = HTMLTemplates.create(
+            project_config=self.project_config,
+            enable_caching=not self.traceability_index.is_small_project(),
+            strictdoc_last_update=self.traceability_index.strictdoc_last_update,
+        )
+        html_generator = HTMLGenerator(self.project_config, html_templates)
+        try:
+            html_generator.export_merged_tree(
+                traceability_index=self.traceability_index
+            )
+        except StrictDocException as exception_:
+            print(f"error: {exception_.args[0]}")  # noqa: T201
+            sys.exit(1)
+        if self.project_config.generate_bundle_document:
+            traceability_index_copy, bundle_document = (
+                self.traceability_index.clone_to_bundle_document(
+                    self.project_config
+                )
+            )
+            html_generator.export_single_document(
+                document=bundle_document,
+                traceability_index=traceability_index_copy,
+                specific_documents=(DocumentType.DOCUMENT,),
+            )
+        OutputWriter.flush_and_report()
+
+    def get_export_tasks(self) -> List[NamedTaskType]:
+        assert self.traceability_index is not None
+        export_formats = self.project_config.export_formats
+        export_tasks: List[NamedTaskType] = []
+
         if (
-            "html" in self.project_config.export_formats
-            or "html-standalone" in self.project_config.export_formats
-            or "html2pdf" in self.project_config.export_formats
+            "html" in export_formats
+            or "html-standalone" in export_formats
+            or "html2pdf" in export_formats
         ):
             is_small_project = self.traceability_index.is_small_project()
 
+            # The templates are compiled once, before the formats are forked.
             html_templates = HTMLTemplates.create(
                 project_config=self.project_config,
                 enable_caching=not is_small_project,
@@ -68,121 +176,158 @@ class ExportAction:
             )
 
             # The bundle document is generated only when the option is provided.
+            # A sharded export leaves it to the merge step.
             traceability_index_copy: Optional[TraceabilityIndex] = None
             bundle_document: Optional[SDocDocument] = None
-            if self.project_config.generate_bundle_document:
+            if (
+                self.project_config.generate_bundle_document
+                and self.shard is None
+            ):
                 traceability_index_copy, bundle_document = (
                     self.traceability_index.clone_to_bundle_document(
                         self.project_config
                     )
                 )
 
-            if (
-                "html" in self.project_config.export_formats
-                or "html-standalone" in self.project_config.export_formats
-            ):
-                html_generator = HTMLGenerator(
-                    self.project_config, html_templates
-                )
-                html_generator.export_complete_tree(
-                    traceability_index=self.traceability_index,
-                    parallelizer=self.parallelizer,
-                )
-                if self.project_config.generate_bundle_document:
-                    html_generator.export_single_document(
-                        document=bundle_document,
-                        traceability_index=traceability_index_copy,
-                        specific_documents=(DocumentType.DOCUMENT,),
+            if "html" in export_formats or "html-standalone" in export_formats:
+                export_tasks.append(
+                    (
+                        "html",
+                        partial(
+                            self.export_html,
+                            html_templates,
+                            traceability_index_copy,
+                            bundle_document,
+                        ),
                     )
-
-            if "html2pdf" in self.project_config.export_formats:
-                output_html2pdf_root = os.path.join(
-                    self.project_config.output_dir, "html2pdf"
-                )
-                Path(output_html2pdf_root).mkdir(parents=True, exist_ok=True)
-                HTML2PDFGenerator.export_tree(
-                    self.project_config,
-                    self.traceability_index,
-                    html_templates,
-                    output_html2pdf_root,
                 )
-
-                if self.project_config.generate_bundle_document:
-                    HTML2PDFGenerator.export_tree(
-                        self.project_config,
-                        traceability_index_copy,
-                        html_templates,
-                        output_html2pdf_root,
-                        flat_assets=True,
+            if "html2pdf" in export_formats:
+                export_tasks.append(
+                    (
+                        "html2pdf",
+                        partial(
+                            self.export_html2pdf,
+                            html_templates,
+                            traceability_index_copy,
+                        ),
                     )
+                )
 
-        if "rst" in self.project_config.export_formats:
-            output_rst_root = os.path.join(
-                self.project_config.output_dir, "rst"
+        if "rst" in export_formats:
+            export_tasks.append(("rst", self.export_rst))
+        if "excel" in export_formats:
+            export_tasks.append(("excel", self.export_excel))
+        if "reqif-sdoc" in export_formats:
+            export_tasks.append(
+                ("reqif-sdoc", partial(self.export_reqif, reqifz=False))
             )
-            Path(output_rst_root).mkdir(parents=True, exist_ok=True)
-            DocumentRSTGenerator.export_tree(
-                self.traceability_index, output_rst_root
+        if "reqifz-sdoc" in export_formats:
+            export_tasks.append(
+                ("reqifz-sdoc", partial(self.export_reqif, reqifz=True))
             )
+        if "sdoc" in export_formats:
+            export_tasks.append(("sdoc", self.export_sdoc))
+        if "doxygen" in export_formats:
+            export_tasks.append(("doxygen", self.export_doxygen))
+        if "spdx" in export_formats:
+            export_tasks.append(("spdx", self.export_spdx))
+        if "json" in export_formats:
+            export_tasks.append(("json", self.export_json))
+        return export_tasks
 
-        if "excel" in self.project_config.export_formats:
-            output_excel_root = f"{self.project_config.output_dir}/excel"
-            ExcelGenerator.export_tree(
-                self.traceability_index,
-                output_excel_root,
-                project_config=self.project_config,
+    def export_html(
+        self,
+        html_templates: HTMLTemplates,
+        traceability_index_copy: Optional[TraceabilityIndex],
+        bundle_document: Optional[SDocDocument],
+    ) -> None:
+        html_generator = HTMLGenerator(self.project_config, html_templates)
+        html_generator.export_complete_tree(
+            traceability_index=self.traceability_index,
+            parallelizer=self.parallelizer,
+            shard=self.shard,
+        )
+        if bundle_document is not None:
+            html_generator.export_single_document(
+                document=bundle_document,
+                traceability_index=traceability_index_copy,
+                specific_documents=(DocumentType.DOCUMENT,),
             )
 
-        if "reqif-sdoc" in self.project_config.export_formats:
-            output_reqif_root = f"{self.project_config.output_dir}/reqif"
-            ReqIFExport.export(
-                project_config=self.project_config,
-                traceability_index=self.traceability_index,
-                output_reqif_root=output_reqif_root,
-                reqifz=False,
-            )
+    def export_html2pdf(
+        self,
+        html_templates: HTMLTemplates,
+        traceability_index_copy: Optional[TraceabilityIndex],
+    ) -> None:
+        output_html2pdf_root = os.path.join(
+            self.project_config.output_dir, "html2pdf"
+        )
+        Path(output_html2pdf_root).mkdir(parents=True, exist_ok=True)
+        HTML2PDFGenerator.export_tree(
+            self.project_config,
+            self.traceability_index,
+            html_templates,
+            output_html2pdf_root,
+            parallelizer=self.parallelizer,
+        )
 
-        if "reqifz-sdoc" in self.project_config.export_formats:
-            output_reqif_root = f"{self.project_config.output_dir}/reqif"
-            ReqIFExport.export(
-                project_config=self.project_config,
-                traceability_index=self.traceability_index,
-                output_reqif_root=output_reqif_root,
-                reqifz=True,
+        if self.project_config.generate_bundle_document:
+            HTML2PDFGenerator.export_tree(
+                self.project_config,
+                traceability_index_copy,
+                html_templates,
+                output_html2pdf_root,
+                flat_assets=True,
+                parallelizer=self.parallelizer,
             )
 
-        if "sdoc" in self.project_config.export_formats:
-            self.export_sdoc()
+    def export_rst(self) -> None:
+        output_rst_root = os.path.join(self.project_config.output_dir, "rst")
+        Path(output_rst_root).mkdir(parents=True, exist_ok=True)
+        DocumentRSTGenerator.export_tree(
+            self.traceability_index, output_rst_root
+        )
 
-        if "doxygen" in self.project_config.export_formats:
-            output_doxygen_root = os.path.join(
-                self.project_config.output_dir, "doxygen"
-            )
-            doxygen_generator = DoxygenGenerator(
-                project_config=self.project_config
-            )
-            doxygen_generator.export(
-                traceability_index=self.traceability_index,
-                path_to_output_dir=output_doxygen_root,
-            )
+    def export_excel(self) -> None:
+        output_excel_root = f"{self.project_config.output_dir}/excel"
+        ExcelGenerator.export_tree(
+            self.traceability_index,
+            output_excel_root,
+            project_config=self.project_config,
+        )
 
-        if "spdx" in self.project_config.export_formats:
-            output_dot_root = os.path.join(
-                self.project_config.output_dir, "spdx"
-            )
-            Path(output_dot_root).mkdir(parents=True, exist_ok=True)
-            SPDXGenerator().export_tree(
-                self.project_config, self.traceability_index, output_dot_root
-            )
+    def export_reqif(self, reqifz: bool) -> None:
+        output_reqif_root = f"{self.project_config.output_dir}/reqif"
+        ReqIFExport.export(
+            project_config=self.project_config,
+            traceability_index=self.traceability_index,
+            output_reqif_root=output_reqif_root,
+            reqifz=reqifz,
+        )
 
-        if "json" in self.project_config.export_formats:
-            output_json_root = os.path.join(
-                self.project_config.output_dir, "json"
-            )
-            Path(output_json_root).mkdir(parents=True, exist_ok=True)
-            JSONGenerator().export_tree(
-                self.traceability_index, self.project_config, output_json_root
-            )
+    def export_doxygen(self) -> None:
+        output_doxygen_root = os.path.join(
+            self.project_config.output_dir, "doxygen"
+        )
+        doxygen_generator = DoxygenGenerator(project_config=self.project_config)
+        doxygen_generator.export(
+            traceability_index=self.traceability_index,
+            path_to_output_dir=output_doxygen_root,
+        )
+
+    def export_spdx(self) -> None:
+        output_dot_root = os.path.join(self.project_config.output_dir, "spdx")
+        Path(output_dot_root).mkdir(parents=True, exist_ok=True)
+        SPDXGenerator().export_tree(
+            self.project_config, self.traceability_index, output_dot_root
+        )
+
+    def export_json(self) -> None:
+        output_json_root = os.path.join(self.project_config.output_dir, "json")
+        Path(output_json_root).mkdir(parents=True, exist_ok=True)
+        JSONGenerator().export_tree(
+            self.traceability_index, self.project_config, output_json_root
+        )
 
     def export_sdoc(self):
         assert self.project_config.input_paths
@@ -223,14 +368,12 @@ class ExportAction:
                 path_to_output_file_dir, document.meta.document_filename_base
             )
             path_to_output_file += ".sdoc"
-            with open(path_to_output_file, "w", encoding="utf8") as file:
-                file.write(output)
+            OutputWriter.get_instance().write(path_to_output_file, output)
 
             for fragment_path_, fragment_content_ in fragments_dict.items():
                 path_to_output_fragment = os.path.join(
                     path_to_output_file_dir, fragment_path_
                 )
-                with open(
-                    path_to_output_fragment, "w", encoding="utf8"
-                ) as file_:
-                    file_.write(fragment_content_)
+                OutputWriter.get_instance().write(
+                    path_to_output_fragment, fragment_content_
+                )
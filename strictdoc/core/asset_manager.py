@@ -1,6 +1,6 @@
 # mypy: disable-error-code="no-untyped-def"
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 from strictdoc.helpers.paths import SDocRelativePath
 
@@ -27,5 +27,5 @@ class AssetManager:
 
         self.asset_dirs_lookup[relative_path] = asset_dir
 
-    def iterate(self):
+    def iterate(self) -> Iterator[AssetDir]:
         yield from self.asset_dirs
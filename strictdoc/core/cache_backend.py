@@ -0,0 +1,365 @@
+import atexit
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from strictdoc.core.project_config import CacheBackendType, ProjectConfig
+from strictdoc.helpers.parallelizer import Parallelizer
+
+
+class CacheBackend(ABC):
+    """
+    A key-value store for the cached artifacts: parsed documents and source
+    files, RST fragments rendered to HTML and the file dependencies.
+
+    A namespace corresponds to one kind of the cached content, e.g., "sdoc" or
+    "rst". A key is unique within its namespace and may contain slashes.
+
+    A backend instance is shared by all users in a process. The parallel
+    workers and parallel StrictDoc runs may access the same cache at the same
+    time, so every backend must tolerate concurrent readers and writers.
+    """
+
+    _instances: Dict[Tuple[str, str], "CacheBackend"] = {}
+
+    # Set by every backend, see is_read_only().
+    read_only: bool
+
+    @staticmethod
+    def get_instance(project_config: ProjectConfig) -> "CacheBackend":
+        return CacheBackend.create(
+            project_config.get_path_to_cache_dir(),
+            project_config.cache_backend,
+        )
+
+    @staticmethod
+    def create(path_to_cache_dir: str, backend_type: str) -> "CacheBackend":
+        backend: Optional[CacheBackend] = CacheBackend._instances.get(
+            (path_to_cache_dir, backend_type)
+        )
+        if backend is None:
+            read_only = CacheBackend.is_read_only(path_to_cache_dir)
+            if backend_type == CacheBackendType.SQLITE:
+                backend = SQLiteCacheBackend(
+                    os.path.join(
+                        path_to_cache_dir, SQLiteCacheBackend.FILE_NAME
+                    ),
+                    read_only=read_only,
+                )
+            else:
+                assert backend_type == CacheBackendType.DIRECTORY, backend_type
+                backend = DirectoryCacheBackend(
+                    path_to_cache_dir, read_only=read_only
+                )
+            CacheBackend._instances[(path_to_cache_dir, backend_type)] = backend
+        return backend
+
+    @staticmethod
+    def is_read_only(path_to_cache_dir: str) -> bool:
+        """
+        A cache folder populated by another build, e.g., by a CI job, can be
+        shared read-only. StrictDoc then reads from it but never writes to it.
+        """
+
+        return os.path.isdir(path_to_cache_dir) and not os.access(
+            path_to_cache_dir, os.W_OK
+        )
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Returns the values of the keys that exist in the cache.
+        """
+
+        values: Dict[str, bytes] = {}
+        for key_ in keys:
+            value = self.get(namespace, key_)
+            if value is not None:
+                values[key_] = value
+        return values
+
+    @abstractmethod
+    def put(self, namespace: str, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Make the buffered writes visible to other processes.
+        """
+
+        raise NotImplementedError
+
+
+class DirectoryCacheBackend(CacheBackend):
+    """
+    Every value is stored in its own file: <cache dir>/<namespace>/<key>.
+    """
+
+    def __init__(self, path_to_cache_dir: str, read_only: bool = False) -> None:
+        self.path_to_cache_dir: str = path_to_cache_dir
+        self.read_only: bool = read_only
+
+    def get_path(self, namespace: str, key: str) -> str:
+        return os.path.join(self.path_to_cache_dir, namespace, key)
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        path_to_value = self.get_path(namespace, key)
+        try:
+            with open(path_to_value, "rb") as value_file:
+                value = value_file.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        # The mtime serves as the access timestamp for the LRU eviction.
+        if not self.read_only:
+            try:
+                os.utime(path_to_value)
+            except OSError:
+                # Removed by a parallel process.
+                pass
+        return value
+
+    def put(self, namespace: str, key: str, value: bytes) -> None:
+        if self.read_only:
+            return
+        path_to_value = self.get_path(namespace, key)
+        path_to_value_dir = os.path.dirname(path_to_value)
+        Path(path_to_value_dir).mkdir(parents=True, exist_ok=True)
+
+        # Writing to a temporary file and renaming it ensures that a parallel
+        # reader never sees a partially written value.
+        file_descriptor, path_to_tmp_file = tempfile.mkstemp(
+            dir=path_to_value_dir
+        )
+        with os.fdopen(file_descriptor, "wb") as value_file:
+            value_file.write(value)
+        os.replace(path_to_tmp_file, path_to_value)
+
+    def flush(self) -> None:
+        # Every value is written to its file immediately.
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    All values are stored in a single SQLite database in WAL mode, which
+    allows one writer and many concurrent readers across processes.
+
+    Writes and access timestamp updates are buffered and committed in
+    batches. A parallel worker commits its buffer after every task, before
+    the task result is reported back to the main process.
+
+    SQLite connections must not be used across fork(), so every process opens
+    its own connection on first use.
+
+    The WAL mode does not work on network file systems, see
+    https://www.sqlite.org/wal.html.
+    """
+
+    FILE_NAME = "cache.sqlite3"
+
+    BATCH_SIZE = 256
+
+    # SQLite allows up to 999 host parameters per statement in older
+    # versions.
+    MAX_KEYS_PER_QUERY = 500
+
+    def __init__(self, path_to_database: str, read_only: bool = False) -> None:
+        self.path_to_database: str = path_to_database
+        self.read_only: bool = read_only
+        self.connection: Optional[sqlite3.Connection] = None
+        self.connection_pid: Optional[int] = None
+        self.pending_writes: List[Tuple[str, str, bytes, int, float]] = []
+        self.pending_touches: List[Tuple[float, str, str]] = []
+
+        Parallelizer.register_after_task_hook(self.flush)
+        atexit.register(self.close)
+
+    def get_connection(self) -> sqlite3.Connection:
+        if self.connection is None or self.connection_pid != os.getpid():
+            # A connection inherited from the parent process is abandoned,
+            # not closed: closing it could affect the parent's connection.
+            self.pending_writes = []
+            self.pending_touches = []
+            self.connection = (
+                SQLiteCacheBackend._connect_read_only(self.path_to_database)
+                if self.read_only
+                else SQLiteCacheBackend._connect(self.path_to_database)
+            )
+            self.connection_pid = os.getpid()
+        return self.connection
+
+    @staticmethod
+    def _connect_read_only(path_to_database: str) -> sqlite3.Connection:
+        if not os.path.isfile(path_to_database):
+            # An empty in-memory database stands in for a missing one.
+            connection = sqlite3.connect(":memory:")
+            SQLiteCacheBackend._create_table(connection)
+            return connection
+        # The immutable flag tells SQLite that nobody writes to the database,
+        # so it does not try to create the WAL and shared memory files.
+        return sqlite3.connect(
+            Path(os.path.abspath(path_to_database)).as_uri() + "?immutable=1",
+            uri=True,
+        )
+
+    @staticmethod
+    def _connect(path_to_database: str) -> sqlite3.Connection:
+        Path(os.path.dirname(path_to_database)).mkdir(
+            parents=True, exist_ok=True
+        )
+        connection = sqlite3.connect(
+            path_to_database, timeout=60, isolation_level=None
+        )
+        # Freed pages are released by the prune command.
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        SQLiteCacheBackend._create_table(connection)
+        return connection
+
+    @staticmethod
+    def _create_table(connection: sqlite3.Connection) -> None:
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID
+            """
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        connection = self.get_connection()
+        for pending_write_ in reversed(self.pending_writes):
+            if pending_write_[0] == namespace and pending_write_[1] == key:
+                return pending_write_[2]
+        row = connection.execute(
+            "SELECT value FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        self._touch(namespace, key)
+        return bytes(row[0])
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        connection = self.get_connection()
+        all_keys = list(keys)
+        values: Dict[str, bytes] = {}
+        for chunk_start_ in range(
+            0, len(all_keys), SQLiteCacheBackend.MAX_KEYS_PER_QUERY
+        ):
+            chunk = all_keys[
+                chunk_start_ : chunk_start_
+                + SQLiteCacheBackend.MAX_KEYS_PER_QUERY
+            ]
+            placeholders = ",".join("?" * len(chunk))
+            for key_, value_ in connection.execute(
+                "SELECT key, value FROM entries "
+                f"WHERE namespace = ? AND key IN ({placeholders})",
+                (namespace, *chunk),
+            ):
+                values[key_] = bytes(value_)
+                self._touch(namespace, key_)
+        if len(self.pending_writes) > 0:
+            requested_keys = set(all_keys)
+            # The latest pending write of a key wins, like in get().
+            for pending_write_ in self.pending_writes:
+                if (
+                    pending_write_[0] == namespace
+                    and pending_write_[1] in requested_keys
+                ):
+                    values[pending_write_[1]] = pending_write_[2]
+        return values
+
+    def put(self, namespace: str, key: str, value: bytes) -> None:
+        if self.read_only:
+            return
+        self.get_connection()
+        self.pending_writes.append(
+            (namespace, key, value, len(value), time.time())
+        )
+        if len(self.pending_writes) >= SQLiteCacheBackend.BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.connection_pid != os.getpid() or (
+            len(self.pending_writes) == 0 and len(self.pending_touches) == 0
+        ):
+            return
+        connection = self.get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(namespace, key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self.pending_writes,
+            )
+            connection.executemany(
+                "UPDATE entries SET last_access = ? "
+                "WHERE namespace = ? AND key = ?",
+                self.pending_touches,
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self.pending_writes = []
+        self.pending_touches = []
+
+    def close(self) -> None:
+        """
+        Closing the last connection checkpoints the write-ahead log into the
+        database file, so that the database can be copied or shared
+        read-only as a single file.
+        """
+
+        if self.connection is None or self.connection_pid != os.getpid():
+            return
+        self.flush()
+        self.connection.close()
+        self.connection = None
+
+    def get_entries(self) -> List[Tuple[str, str, int, float]]:
+        """
+        Returns (namespace, key, size, last access) of all entries.
+        """
+
+        self.flush()
+        return list(
+            self.get_connection().execute(
+                "SELECT namespace, key, size, last_access FROM entries"
+            )
+        )
+
+    def delete_many(self, namespaces_and_keys: List[Tuple[str, str]]) -> None:
+        self.flush()
+        connection = self.get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        connection.executemany(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?",
+            namespaces_and_keys,
+        )
+        connection.execute("COMMIT")
+        connection.execute("PRAGMA incremental_vacuum")
+
+    def _touch(self, namespace: str, key: str) -> None:
+        if self.read_only:
+            return
+        self.pending_touches.append((time.time(), namespace, key))
+        if len(self.pending_touches) >= SQLiteCacheBackend.BATCH_SIZE:
+            self.flush()
@@ -0,0 +1,253 @@
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from strictdoc.core.cache_backend import CacheBackend, SQLiteCacheBackend
+from strictdoc.core.project_config import CacheBackendType, ProjectConfig
+from strictdoc.helpers.timing import measure_performance
+
+
+@dataclass
+class CacheEntry:
+    kind: str
+    path: str
+    size: int
+    last_access: float
+    # Only set for the entries stored in the SQLite database, in which case
+    # the path is the path to the database.
+    key: Optional[str] = None
+
+
+class CacheIndex:
+    """
+    An index of everything stored in the cache directory, used for the LRU
+    garbage collection.
+
+    The access timestamp of a cache entry is the modification time of its
+    file or folder. The caches update it with touch() on every hit. Keeping
+    the timestamps in the file system, instead of a shared index file, means
+    that the parallel workers never have to coordinate their cache reads.
+    The index itself is built by scanning the cache directory, which only
+    happens when the cache is pruned or inspected.
+
+    The entries of "git" (Git worktrees) and "jinja" (compiled templates) are
+    whole folders. For all other kinds, e.g., "sdoc", "source_file" and
+    "rst", every file is a cache entry. Files in the root of the cache
+    directory, such as the cache manifest, are bookkeeping, not entries.
+
+    When the SQLite cache backend is used, every row of its database is an
+    entry, and the access timestamps are stored in the database.
+    """
+
+    FOLDER_ENTRY_KINDS = ("git", "jinja")
+
+    # The Chrome driver downloaded by HTML2PDF is not managed by StrictDoc.
+    IGNORED_KINDS = ("html2pdf",)
+
+    PRUNE_STAMP_FILE_NAME = "last_prune"
+    PRUNE_INTERVAL_SECONDS = 24 * 60 * 60
+
+    def __init__(self, path_to_cache_dir: str, entries: List[CacheEntry]):
+        self.path_to_cache_dir: str = path_to_cache_dir
+        self.entries: List[CacheEntry] = entries
+
+    @staticmethod
+    def create(path_to_cache_dir: str) -> "CacheIndex":
+        entries: List[CacheEntry] = []
+        if os.path.isdir(path_to_cache_dir):
+            for kind_dir_ in os.scandir(path_to_cache_dir):
+                if (
+                    not kind_dir_.is_dir(follow_symlinks=False)
+                    or kind_dir_.name in CacheIndex.IGNORED_KINDS
+                ):
+                    continue
+                if kind_dir_.name in CacheIndex.FOLDER_ENTRY_KINDS:
+                    for entry_dir_ in os.scandir(kind_dir_.path):
+                        entries.append(
+                            CacheEntry(
+                                kind=kind_dir_.name,
+                                path=entry_dir_.path,
+                                size=CacheIndex._get_size(entry_dir_.path),
+                                last_access=entry_dir_.stat(
+                                    follow_symlinks=False
+                                ).st_mtime,
+                            )
+                        )
+                    continue
+                for root_, _, files_ in os.walk(kind_dir_.path):
+                    for file_ in files_:
+                        path_to_file = os.path.join(root_, file_)
+                        try:
+                            file_stat = os.stat(path_to_file)
+                        except FileNotFoundError:
+                            # Removed by a parallel StrictDoc process.
+                            continue
+                        entries.append(
+                            CacheEntry(
+                                kind=kind_dir_.name,
+                                path=path_to_file,
+                                size=file_stat.st_size,
+                                last_access=file_stat.st_mtime,
+                            )
+                        )
+        path_to_database = os.path.join(
+            path_to_cache_dir, SQLiteCacheBackend.FILE_NAME
+        )
+        if os.path.isfile(path_to_database):
+            sqlite_backend = CacheBackend.create(
+                path_to_cache_dir, CacheBackendType.SQLITE
+            )
+            assert isinstance(sqlite_backend, SQLiteCacheBackend)
+            for (
+                namespace_,
+                key_,
+                size_,
+                last_access_,
+            ) in sqlite_backend.get_entries():
+                entries.append(
+                    CacheEntry(
+                        kind=namespace_,
+                        path=path_to_database,
+                        size=size_,
+                        last_access=last_access_,
+                        key=key_,
+                    )
+                )
+        return CacheIndex(path_to_cache_dir, entries)
+
+    @staticmethod
+    def touch(path_to_entry: str) -> None:
+        """
+        Mark a cache entry as recently used.
+        """
+
+        try:
+            os.utime(path_to_entry)
+        except OSError:
+            # The entry is removed by a parallel process, or the cache is
+            # mounted read-only. Neither is a reason to fail the build.
+            pass
+
+    def get_total_size(self) -> int:
+        return sum(entry_.size for entry_ in self.entries)
+
+    def get_statistics(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the number of entries and their total size per kind.
+        """
+
+        statistics: Dict[str, Tuple[int, int]] = {}
+        for entry_ in self.entries:
+            count, size = statistics.get(entry_.kind, (0, 0))
+            statistics[entry_.kind] = (count + 1, size + entry_.size)
+        return dict(sorted(statistics.items()))
+
+    def prune(
+        self, max_size: Optional[int], max_entries: Optional[int]
+    ) -> Tuple[int, int]:
+        """
+        Remove the least recently used entries until the cache fits into the
+        given limits. Returns the number and the total size of the removed
+        entries.
+        """
+
+        self.entries.sort(key=lambda entry_: entry_.last_access)
+        total_size = self.get_total_size()
+        total_entries = len(self.entries)
+
+        removed_entries, removed_size = 0, 0
+        removed_database_rows: List[Tuple[str, str]] = []
+        for entry_ in self.entries:
+            if (max_size is None or total_size <= max_size) and (
+                max_entries is None or total_entries <= max_entries
+            ):
+                break
+            if entry_.key is not None:
+                removed_database_rows.append((entry_.kind, entry_.key))
+            else:
+                CacheIndex._remove(entry_.path)
+            total_size -= entry_.size
+            total_entries -= 1
+            removed_entries += 1
+            removed_size += entry_.size
+
+        if len(removed_database_rows) > 0:
+            sqlite_backend = CacheBackend.create(
+                self.path_to_cache_dir, CacheBackendType.SQLITE
+            )
+            assert isinstance(sqlite_backend, SQLiteCacheBackend)
+            sqlite_backend.delete_many(removed_database_rows)
+
+        self.entries = self.entries[removed_entries:]
+        Path(self.path_to_cache_dir).mkdir(parents=True, exist_ok=True)
+        Path(
+            os.path.join(self.path_to_cache_dir, self.PRUNE_STAMP_FILE_NAME)
+        ).touch()
+        return removed_entries, removed_size
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries together with the bookkeeping files.
+        """
+
+        for entry_ in self.entries:
+            if entry_.key is None:
+                CacheIndex._remove(entry_.path)
+        self.entries = []
+
+        if not os.path.isdir(self.path_to_cache_dir):
+            return
+        for dir_entry_ in os.scandir(self.path_to_cache_dir):
+            if dir_entry_.name in CacheIndex.IGNORED_KINDS:
+                continue
+            CacheIndex._remove(dir_entry_.path)
+
+    @staticmethod
+    def prune_if_due(project_config: ProjectConfig) -> None:
+        """
+        Scanning a large cache directory is not free, so the automatic
+        garbage collection runs at most once per PRUNE_INTERVAL_SECONDS.
+        """
+
+        path_to_cache_dir = project_config.get_path_to_cache_dir()
+        if CacheBackend.is_read_only(path_to_cache_dir):
+            return
+        path_to_stamp = os.path.join(
+            path_to_cache_dir, CacheIndex.PRUNE_STAMP_FILE_NAME
+        )
+        if (
+            os.path.isfile(path_to_stamp)
+            and time.time() - os.path.getmtime(path_to_stamp)
+            < CacheIndex.PRUNE_INTERVAL_SECONDS
+        ):
+            return
+        with measure_performance("Prune cache directory"):
+            cache_index = CacheIndex.create(path_to_cache_dir)
+            cache_index.prune(
+                project_config.get_cache_max_size(),
+                project_config.get_cache_max_entries(),
+            )
+
+    @staticmethod
+    def _get_size(path_to_dir: str) -> int:
+        total_size = 0
+        for root_, _, files_ in os.walk(path_to_dir):
+            for file_ in files_:
+                try:
+                    total_size += os.lstat(os.path.join(root_, file_)).st_size
+                except FileNotFoundError:
+                    continue
+        return total_size
+
+    @staticmethod
+    def _remove(path_to_entry: str) -> None:
+        if os.path.isdir(path_to_entry) and not os.path.islink(path_to_entry):
+            shutil.rmtree(path_to_entry, ignore_errors=True)
+            return
+        try:
+            os.unlink(path_to_entry)
+        except FileNotFoundError:
+            pass
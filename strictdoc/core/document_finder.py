@@ -3,9 +3,11 @@ import sys
 from functools import partial
 from typing import Dict, List, Tuple, Union
 
+from strictdoc.backend.sdoc.cache_manifest import CacheManifest
 from strictdoc.backend.sdoc.grammar_reader import SDocGrammarReader
 from strictdoc.backend.sdoc.models.document import SDocDocument
 from strictdoc.backend.sdoc.models.document_grammar import DocumentGrammar
+from strictdoc.backend.sdoc.pickle_cache import ParsedContentMemo, PickleCache
 from strictdoc.backend.sdoc.reader import SDReader
 from strictdoc.backend.sdoc_source_code.test_reports.junit_xml_reader import (
     JUnitXMLReader,
@@ -33,6 +35,18 @@ class DocumentFinder:
     def find_sdoc_content(
         project_config: ProjectConfig, parallelizer: Parallelizer
     ) -> Tuple[DocumentTree, AssetManager]:
+        file_trees, asset_manager = DocumentFinder.find_sdoc_files(
+            project_config
+        )
+        document_tree = DocumentFinder.read_sdoc_files(
+            file_trees, project_config, parallelizer
+        )
+        return document_tree, asset_manager
+
+    @staticmethod
+    def find_sdoc_files(
+        project_config: ProjectConfig,
+    ) -> Tuple[List[FileTree], AssetManager]:
         assert project_config.input_paths is not None
         for paths_to_files_or_doc in project_config.input_paths:
             if not os.path.exists(paths_to_files_or_doc):
@@ -49,21 +63,47 @@ class DocumentFinder:
             file_tree, asset_manager = DocumentFinder._build_file_tree(
                 project_config=project_config
             )
-        with measure_performance("Completed building document tree"):
-            document_tree = DocumentFinder._build_document_tree(
-                file_tree, project_config, parallelizer
+        # The content hashes of all documents are brought up to date before
+        # the documents are distributed to the parallel workers, so that the
+        # workers see only manifest hits.
+        cache_manifest = CacheManifest.get_instance(project_config)
+        with measure_performance("Completed refreshing cache manifest"):
+            cache_manifest.reset_statistics()
+            cache_manifest.refresh(
+                doc_file_.get_full_path()
+                for file_tree_ in file_tree
+                for _, doc_file_, _ in file_tree_.iterate()
+                if doc_file_.get_full_path().endswith((".sdoc", ".sgra"))
             )
+        print(cache_manifest.get_statistics_message(), flush=True)  # noqa: T201
 
-        return document_tree, asset_manager
+        return file_tree, asset_manager
+
+    @staticmethod
+    def read_sdoc_files(
+        file_trees: List[FileTree],
+        project_config: ProjectConfig,
+        parallelizer: Parallelizer,
+    ) -> DocumentTree:
+        with measure_performance("Completed building document tree"):
+            return DocumentFinder._build_document_tree(
+                file_trees, project_config, parallelizer
+            )
 
     @staticmethod
     def _process_worker_parse_document(
         document_triple: Tuple[Union[Folder, File], File, str],
         project_config: ProjectConfig,
-    ) -> Tuple[File, str, Union[SDocDocument, DocumentGrammar]]:
+    ) -> Tuple[
+        File, str, Union[SDocDocument, DocumentGrammar], Tuple[int, int]
+    ]:
         _, doc_file, file_tree_mount_folder = document_triple
         doc_full_path = doc_file.get_full_path()
 
+        # A parallel worker has its own copy of the memo, so the memo hits and
+        # misses of every document are returned together with the document.
+        memo_hits, memo_misses = PickleCache.memo.hits, PickleCache.memo.misses
+
         with measure_performance(
             f"Reading SDOC: {os.path.basename(doc_full_path)}"
         ):
@@ -90,7 +130,22 @@ class DocumentFinder:
                 raise NotImplementedError
         drop_textx_meta(document_or_grammar)
 
-        return doc_file, file_tree_mount_folder, document_or_grammar
+        return (
+            doc_file,
+            file_tree_mount_folder,
+            document_or_grammar,
+            (
+                PickleCache.memo.hits - memo_hits,
+                PickleCache.memo.misses - memo_misses,
+            ),
+        )
+
+    @staticmethod
+    def _get_document_weight(
+        file_tree_triple: Tuple[Union[Folder, File], File, str],
+    ) -> int:
+        # The size of a document is a good enough estimate of its parsing time.
+        return os.path.getsize(file_tree_triple[1].get_full_path())
 
     @staticmethod
     def _build_document_tree(
@@ -119,11 +174,23 @@ class DocumentFinder:
 
         with measure_performance("Completed parsing all documents"):
             found_documents = parallelizer.run_parallel(
-                file_tree_list, process_document_binding
+                file_tree_list,
+                process_document_binding,
+                weight_func=DocumentFinder._get_document_weight,
             )
+        parallelizer.print_utilization()
+        memo_hits = 0
+        memo_misses = 0
+        for *_, (document_memo_hits_, document_memo_misses_) in found_documents:
+            memo_hits += document_memo_hits_
+            memo_misses += document_memo_misses_
+        print(  # noqa: T201
+            ParsedContentMemo.get_statistics_message(memo_hits, memo_misses),
+            flush=True,
+        )
 
         doc_file: File
-        for doc_file, file_tree_mount_folder, document in found_documents:
+        for doc_file, file_tree_mount_folder, document, _ in found_documents:
             assert isinstance(file_tree_mount_folder, str), (
                 file_tree_mount_folder
             )
@@ -1,5 +1,5 @@
 # mypy: disable-error-code="attr-defined"
-from typing import Iterator, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from strictdoc.backend.sdoc.models.document import SDocDocument
 from strictdoc.backend.sdoc.models.document_from_file import DocumentFromFile
@@ -18,12 +18,45 @@ from strictdoc.backend.sdoc.models.node import (
 from strictdoc.backend.sdoc.models.section import SDocSection
 from strictdoc.helpers.cast import assert_cast
 
+# A node in the pre-order of a document, its level and its title number. The
+# title number is None for the nodes that are not numbered by the iteration.
+NodeEntryType = Tuple[
+    Union[SDocElementIF, DocumentFromFile], int, Optional[str]
+]
+
 
 class DocumentCachingIterator:
+    """
+    Iterates over the nodes of a document in pre-order.
+
+    When a document is iterated for the first time with a given combination
+    of flags, its section tree is flattened into a list of the nodes together
+    with their levels and title numbers. The following iterations go through
+    the cached list. The levels and title numbers are still assigned to the
+    nodes on every iteration because the nodes of an included document are
+    numbered differently in the document itself and in the including
+    documents.
+
+    The cache is not invalidated automatically: invalidate_cache() must be
+    called when the nodes of the document are added, removed, moved,
+    retitled or filtered, including the nodes of the documents it includes.
+    """
+
     def __init__(self, document: SDocDocument) -> None:
         assert isinstance(document, SDocDocument), document
 
         self.document: SDocDocument = document
+        self._cache: Dict[Tuple[bool, bool], List[NodeEntryType]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The cached lists are not saved with the traceability index
+        # snapshot, they are recreated on demand.
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
+
+    def invalidate_cache(self) -> None:
+        self._cache.clear()
 
     def table_of_contents(self) -> Iterator[SDocElementIF]:
         nodes_to_skip = (
@@ -47,24 +80,40 @@ class DocumentCachingIterator:
         print_fragments: bool = False,
         print_fragments_from_files: bool = False,
     ) -> Iterator[SDocElementIF]:
-        root_node = self.document
-
-        yield from self._all_content(
-            root_node,
-            print_fragments=print_fragments,
-            print_fragments_from_files=print_fragments_from_files,
-            level_stack=(),
-            custom_level=not root_node.config.auto_levels,
-        )
+        cache_key = (print_fragments, print_fragments_from_files)
+        node_entries = self._cache.get(cache_key)
+        if node_entries is None:
+            root_node = self.document
+            node_entries = []
+            self._collect_content(
+                root_node,
+                node_entries,
+                print_fragments=print_fragments,
+                print_fragments_from_files=print_fragments_from_files,
+                level_stack=(),
+                custom_level=not root_node.config.auto_levels,
+            )
+            self._cache[cache_key] = node_entries
 
-    def _all_content(
+        for node_, level_, title_number_string_ in node_entries:
+            if title_number_string_ is not None:
+                numbered_node = assert_cast(
+                    node_, (SDocSection, SDocNode, SDocDocument)
+                )
+                numbered_node.context.title_number_string = title_number_string_
+                numbered_node.ng_level = level_
+            yield node_
+
+    def _collect_content(
         self,
         node: Union[SDocElementIF, DocumentFromFile],
+        node_entries: List[NodeEntryType],
+        *,
         print_fragments: bool = False,
         print_fragments_from_files: bool = False,
         level_stack: Tuple[int, ...] = (),
         custom_level: bool = False,
-    ) -> Iterator[SDocElementIF]:
+    ) -> None:
         def get_level_string_(
             node_: Union[SDocSection, SDocNode, SDocCompositeNode],
         ) -> str:
@@ -93,11 +142,9 @@ class DocumentCachingIterator:
             if not node.ng_whitelisted:
                 return
 
-            # FIXME: This will be changed.
-            node.context.title_number_string = get_level_string_(node)
-            node.ng_level = len(level_stack)
-
-            yield node
+            node_entries.append(
+                (node, len(level_stack), get_level_string_(node))
+            )
 
             current_number = 0
             for subnode_ in node.section_contents:
@@ -108,7 +155,7 @@ class DocumentCachingIterator:
                 ):
                     current_number += 1
 
-                yield from self._all_content(
+                self._collect_content(
                     assert_cast(
                         subnode_,
                         (
@@ -119,6 +166,7 @@ class DocumentCachingIterator:
                             SDocDocumentFromFileIF,
                         ),
                     ),
+                    node_entries,
                     print_fragments=print_fragments,
                     print_fragments_from_files=print_fragments_from_files,
                     level_stack=level_stack + (current_number,),
@@ -133,11 +181,9 @@ class DocumentCachingIterator:
             if not node.ng_whitelisted:
                 return
 
-            # FIXME: This will be changed.
-            node.context.title_number_string = get_level_string_(node)
-            node.ng_level = len(level_stack)
-
-            yield node
+            node_entries.append(
+                (node, len(level_stack), get_level_string_(node))
+            )
 
             current_number = 0
             if node.requirements is not None:
@@ -148,8 +194,9 @@ class DocumentCachingIterator:
                     ):
                         current_number += 1
 
-                    yield from self._all_content(
+                    self._collect_content(
                         subnode_,
+                        node_entries,
                         print_fragments=print_fragments,
                         print_fragments_from_files=print_fragments_from_files,
                         level_stack=level_stack + (current_number,),
@@ -164,11 +211,9 @@ class DocumentCachingIterator:
             if not node.ng_whitelisted:
                 return
 
-            # FIXME: This will be changed.
-            node.context.title_number_string = get_level_string_(node)
-            node.ng_level = len(level_stack)
-
-            yield node
+            node_entries.append(
+                (node, len(level_stack), get_level_string_(node))
+            )
 
         elif isinstance(node, SDocDocument):
             if (
@@ -176,12 +221,9 @@ class DocumentCachingIterator:
                 and node.document_is_included()
                 and self.document != node
             ):
-                node.context.title_number_string = ".".join(
-                    map(str, level_stack)
+                node_entries.append(
+                    (node, len(level_stack), ".".join(map(str, level_stack)))
                 )
-                node.ng_level = len(level_stack)
-
-                yield node
 
             current_number = 0
             for subnode_ in node.section_contents:
@@ -190,7 +232,7 @@ class DocumentCachingIterator:
                     and subnode_.node_type == "TEXT"
                 ):
                     current_number += 1
-                yield from self._all_content(
+                self._collect_content(
                     assert_cast(
                         subnode_,
                         (
@@ -201,6 +243,7 @@ class DocumentCachingIterator:
                             SDocDocumentFromFileIF,
                         ),
                     ),
+                    node_entries,
                     print_fragments=print_fragments,
                     print_fragments_from_files=print_fragments_from_files,
                     level_stack=level_stack + (current_number,),
@@ -211,13 +254,14 @@ class DocumentCachingIterator:
         elif isinstance(node, DocumentFromFile):
             if not print_fragments:
                 if print_fragments_from_files:
-                    yield node
+                    node_entries.append((node, len(level_stack), None))
                 return
 
             assert node.resolved_document is not None
 
-            yield from self._all_content(
+            self._collect_content(
                 node.resolved_document,
+                node_entries,
                 print_fragments=print_fragments,
                 print_fragments_from_files=print_fragments_from_files,
                 level_stack=level_stack,
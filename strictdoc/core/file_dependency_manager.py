@@ -2,9 +2,9 @@ import datetime
 import os.path
 from copy import deepcopy
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Dict, Optional, Set
 
+from strictdoc.core.cache_backend import CacheBackend
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.helpers.file_modification_time import (
     get_file_modification_time,
@@ -20,8 +20,11 @@ class FileDependencyEntry:
 
 @dataclass
 class FileDependencyManager:
+    CACHE_NAMESPACE = "file_dependencies"
+    CACHE_KEY = "index"
+
     path_to_cache_dir: str
-    path_to_cache: str
+    cache_backend_type: str
     dependencies_now: Dict[str, FileDependencyEntry]
     dependencies_prev: Dict[str, FileDependencyEntry]
     dependencies_must_renegerate: Set[str]
@@ -31,16 +34,19 @@ class FileDependencyManager:
         project_config: ProjectConfig,
     ) -> "FileDependencyManager":
         path_to_cache_dir = project_config.get_path_to_cache_dir()
-        path_to_cache = os.path.join(path_to_cache_dir, "dependencies")
+        cache_backend_type = project_config.cache_backend
 
-        if not os.path.isfile(path_to_cache):
+        cache_file_bytes: Optional[bytes] = CacheBackend.create(
+            path_to_cache_dir, cache_backend_type
+        ).get(
+            FileDependencyManager.CACHE_NAMESPACE,
+            FileDependencyManager.CACHE_KEY,
+        )
+        if cache_file_bytes is None:
             return FileDependencyManager(
-                path_to_cache_dir, path_to_cache, {}, {}, set()
+                path_to_cache_dir, cache_backend_type, {}, {}, set()
             )
 
-        with open(path_to_cache, "rb") as cache_file:
-            cache_file_bytes = cache_file.read()
-
         unpickled_content: Optional[FileDependencyManager] = pickle_load(
             cache_file_bytes
         )
@@ -53,7 +59,7 @@ class FileDependencyManager:
             return unpickled_content
 
         return FileDependencyManager(
-            path_to_cache_dir, path_to_cache, {}, {}, set()
+            path_to_cache_dir, cache_backend_type, {}, {}, set()
         )
 
     def must_generate(self, path_to_input_file: str) -> bool:
@@ -78,9 +84,15 @@ class FileDependencyManager:
 
         pickled_content = pickle_dump(self)
 
-        Path(self.path_to_cache_dir).mkdir(exist_ok=True, parents=True)
-        with open(self.path_to_cache, "wb") as cache_file:
-            cache_file.write(pickled_content)
+        cache_backend = CacheBackend.create(
+            self.path_to_cache_dir, self.cache_backend_type
+        )
+        cache_backend.put(
+            FileDependencyManager.CACHE_NAMESPACE,
+            FileDependencyManager.CACHE_KEY,
+            pickled_content,
+        )
+        cache_backend.flush()
 
     def resolve_modification_dates(
         self, strictdoc_last_update: datetime.datetime
@@ -1,4 +1,3 @@
-from copy import copy
 from typing import Any, Dict, List, Optional, Tuple
 
 from strictdoc.core.graph.abstract_bucket import ALL_EDGES, AbstractBucket
@@ -13,18 +12,19 @@ class ManyToManySet(AbstractBucket):
         ] = {}
         self._lhs_type: type = lhs_type
         self._rhs_type: type = rhs_type
+        # The counts are maintained on every change, so that counting the
+        # links does not iterate over all of them.
+        self._count: int = 0
+        self._edge_counts: Dict[Optional[str], int] = {}
 
     def has_link(self, *, lhs_node: Any) -> bool:
         assert isinstance(lhs_node, self._lhs_type), lhs_node
         return lhs_node in self._links
 
     def get_count(self, edge: Optional[str] = None) -> int:
-        total_count = 0
-        for _, lhs_node_links in self._links.items():
-            for edge_, lhs_node_edge_links_ in lhs_node_links.items():
-                if edge in (ALL_EDGES, edge_):
-                    total_count += len(lhs_node_edge_links_)
-        return total_count
+        if edge == ALL_EDGES:
+            return self._count
+        return self._edge_counts.get(edge, 0)
 
     def get_link_value(
         self, *, lhs_node: Any, edge: Optional[str] = None
@@ -40,21 +40,21 @@ class ManyToManySet(AbstractBucket):
         assert isinstance(lhs_node, self._lhs_type), lhs_node
         if edge == ALL_EDGES:
             all_values: OrderedSet[Any] = OrderedSet()
-            for _, edge_links_ in self._links.setdefault(lhs_node, {}).items():
+            for _, edge_links_ in self._links.get(lhs_node, {}).items():
                 for edge_link_ in edge_links_:
                     all_values.add(edge_link_)
             return all_values
         else:
-            return self._links.setdefault(lhs_node, {}).setdefault(
-                edge, OrderedSet()
-            )
+            # A read never stores anything: a node without links gets a new
+            # empty set.
+            return self._links.get(lhs_node, {}).get(edge, OrderedSet())
 
     def get_link_values_with_edges(
         self, *, lhs_node: Any, edge: Optional[str] = ALL_EDGES
     ) -> List[Tuple[Any, Optional[str]]]:
         assert isinstance(lhs_node, self._lhs_type), lhs_node
         all_values: List[Tuple[Any, Optional[str]]] = []
-        for edge_, edge_links_ in self._links.setdefault(lhs_node, {}).items():
+        for edge_, edge_links_ in self._links.get(lhs_node, {}).items():
             if edge in (ALL_EDGES, edge_):
                 for edge_link_ in edge_links_:
                     all_values.append((edge_link_, edge_))
@@ -66,15 +66,11 @@ class ManyToManySet(AbstractBucket):
         assert isinstance(rhs_node, self._rhs_type), rhs_node
         if edge == ALL_EDGES:
             all_values: OrderedSet[Any] = OrderedSet()
-            for _, edge_links_ in self._links_reverse.setdefault(
-                rhs_node, {}
-            ).items():
+            for _, edge_links_ in self._links_reverse.get(rhs_node, {}).items():
                 for edge_link_ in edge_links_:
                     all_values.add(edge_link_)
             return all_values
-        return self._links_reverse.setdefault(rhs_node, {}).setdefault(
-            edge, OrderedSet()
-        )
+        return self._links_reverse.get(rhs_node, {}).get(edge, OrderedSet())
 
     def create_link(
         self, *, lhs_node: Any, rhs_node: Any, edge: Optional[str] = None
@@ -101,6 +97,8 @@ class ManyToManySet(AbstractBucket):
         assert lhs_node not in rhs_node_links_for_edge
         rhs_node_links_for_edge.add(lhs_node)
 
+        self._count_links(edge, 1)
+
     def create_link_weak(
         self, *, lhs_node: Any, rhs_node: Any, edge: Optional[str] = None
     ) -> None:
@@ -117,6 +115,8 @@ class ManyToManySet(AbstractBucket):
 
         lhs_node_links = self._links.setdefault(lhs_node, {})
         lhs_node_links_for_edge = lhs_node_links.setdefault(edge, OrderedSet())
+        if rhs_node not in lhs_node_links_for_edge:
+            self._count_links(edge, 1)
         lhs_node_links_for_edge.add(rhs_node)
 
         rhs_node_links = self._links_reverse.setdefault(rhs_node, {})
@@ -138,11 +138,14 @@ class ManyToManySet(AbstractBucket):
 
         lhs_node_links = self._links[lhs_node]
         if edge == ALL_EDGES:
-            for _, edge_links_ in lhs_node_links.items():
-                edge_links_.discard(rhs_node)
+            for edge_, edge_links_ in lhs_node_links.items():
+                if rhs_node in edge_links_:
+                    edge_links_.discard(rhs_node)
+                    self._count_links(edge_, -1)
         else:
             assert edge in lhs_node_links
             lhs_node_links[edge].remove(rhs_node)
+            self._count_links(edge, -1)
 
         rhs_node_links = self._links_reverse[rhs_node]
         if edge == ALL_EDGES:
@@ -161,11 +164,15 @@ class ManyToManySet(AbstractBucket):
         if lhs_node in self._links:
             lhs_node_links = self._links.get(lhs_node, {})
             if edge == ALL_EDGES:
-                for _, edge_links_ in lhs_node_links.items():
-                    edge_links_.discard(rhs_node)
+                for edge_, edge_links_ in lhs_node_links.items():
+                    if rhs_node in edge_links_:
+                        edge_links_.discard(rhs_node)
+                        self._count_links(edge_, -1)
             else:
                 lhs_node_links_for_edge = lhs_node_links.get(edge, OrderedSet())
-                lhs_node_links_for_edge.discard(rhs_node)
+                if rhs_node in lhs_node_links_for_edge:
+                    lhs_node_links_for_edge.discard(rhs_node)
+                    self._count_links(edge, -1)
 
         if rhs_node in self._links_reverse:
             rhs_node_links = self._links_reverse.get(rhs_node, {})
@@ -183,11 +190,17 @@ class ManyToManySet(AbstractBucket):
     ) -> None:
         assert isinstance(lhs_node, self._lhs_type), lhs_node
 
-        assert lhs_node in self._links
+        # The reads do not create the entries of the nodes without links, so
+        # such a node may be missing.
+        lhs_node_links = self._links.pop(lhs_node, None)
+        if lhs_node_links is None:
+            return
 
-        del self._links[lhs_node]
+        for edge_, edge_links_ in lhs_node_links.items():
+            self._count_links(edge_, -len(edge_links_))
+            for rhs_node_ in edge_links_:
+                self._links_reverse[rhs_node_][edge_].discard(lhs_node)
 
-        for existing_rhs_node_ in copy(self._links_reverse):
-            existing_rhs_node_links = self._links_reverse[existing_rhs_node_]
-            for _, edge_links_ in existing_rhs_node_links.items():
-                edge_links_.discard(lhs_node)
+    def _count_links(self, edge: Optional[str], count: int) -> None:
+        self._count += count
+        self._edge_counts[edge] = self._edge_counts.get(edge, 0) + count
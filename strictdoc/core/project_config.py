@@ -11,6 +11,7 @@ import toml
 
 from strictdoc import SDocRuntimeEnvironment
 from strictdoc.backend.reqif.sdoc_reqif_fields import ReqIFProfile
+from strictdoc.backend.sdoc.cache_format import CacheCompression
 from strictdoc.backend.sdoc.constants import SDocMarkup
 from strictdoc.cli.cli_arg_parser import (
     ExportCommandConfig,
@@ -63,11 +64,22 @@ class ProjectFeature(str, Enum):
         return list(map(lambda c: c.value, ProjectFeature))
 
 
+class CacheBackendType:
+    DIRECTORY = "directory"
+    SQLITE = "sqlite"
+
+    ALL = (DIRECTORY, SQLITE)
+
+
 @auto_described
 class ProjectConfig:
     DEFAULT_PROJECT_TITLE = "Untitled Project"
     DEFAULT_DIR_FOR_SDOC_ASSETS = "_static"
     DEFAULT_DIR_FOR_SDOC_CACHE = "$TMPDIR"
+    DEFAULT_CACHE_BACKEND = CacheBackendType.DIRECTORY
+    DEFAULT_CACHE_COMPRESSION = CacheCompression.NONE
+    DEFAULT_CACHE_MAX_SIZE_MB = 2048
+    DEFAULT_CACHE_MAX_ENTRIES = 1_000_000
 
     DEFAULT_FEATURES: List[str] = [
         ProjectFeature.TABLE_SCREEN,
@@ -86,6 +98,10 @@ class ProjectConfig:
         project_title: str,
         dir_for_sdoc_assets: str,
         dir_for_sdoc_cache: str,
+        cache_backend: str,
+        cache_compression: str,
+        cache_max_size_mb: int,
+        cache_max_entries: int,
         project_features: List[str],
         server_host: str,
         server_port: int,
@@ -132,6 +148,10 @@ class ProjectConfig:
             )
 
         self.dir_for_sdoc_cache: str = dir_for_sdoc_cache
+        self.cache_backend: str = cache_backend
+        self.cache_compression: str = cache_compression
+        self.cache_max_size_mb: int = cache_max_size_mb
+        self.cache_max_entries: int = cache_max_entries
 
         self.project_features: List[str] = project_features
         self.server_host: str = server_host
@@ -190,6 +210,10 @@ class ProjectConfig:
             project_title=ProjectConfig.DEFAULT_PROJECT_TITLE,
             dir_for_sdoc_assets=ProjectConfig.DEFAULT_DIR_FOR_SDOC_ASSETS,
             dir_for_sdoc_cache=ProjectConfig.DEFAULT_DIR_FOR_SDOC_CACHE,
+            cache_backend=ProjectConfig.DEFAULT_CACHE_BACKEND,
+            cache_compression=ProjectConfig.DEFAULT_CACHE_COMPRESSION,
+            cache_max_size_mb=ProjectConfig.DEFAULT_CACHE_MAX_SIZE_MB,
+            cache_max_entries=ProjectConfig.DEFAULT_CACHE_MAX_ENTRIES,
             project_features=ProjectConfig.DEFAULT_FEATURES,
             server_host=ProjectConfig.DEFAULT_SERVER_HOST,
             server_port=ProjectConfig.DEFAULT_SERVER_PORT,
@@ -341,6 +365,20 @@ class ProjectConfig:
     def get_path_to_cache_dir(self) -> str:
         return self.dir_for_sdoc_cache
 
+    def get_cache_max_size(self) -> Optional[int]:
+        """
+        The size limit of the cache directory in bytes, or None if the size
+        is not limited.
+        """
+        if self.cache_max_size_mb == 0:
+            return None
+        return self.cache_max_size_mb * 1024 * 1024
+
+    def get_cache_max_entries(self) -> Optional[int]:
+        if self.cache_max_entries == 0:
+            return None
+        return self.cache_max_entries
+
     def get_static_files_path(self) -> str:
         return self.environment.get_static_files_path()
 
@@ -409,6 +447,10 @@ class ProjectConfigLoader:
         project_title = ProjectConfig.DEFAULT_PROJECT_TITLE
         dir_for_sdoc_assets = ProjectConfig.DEFAULT_DIR_FOR_SDOC_ASSETS
         dir_for_sdoc_cache = ProjectConfig.DEFAULT_DIR_FOR_SDOC_CACHE
+        cache_backend = ProjectConfig.DEFAULT_CACHE_BACKEND
+        cache_compression = ProjectConfig.DEFAULT_CACHE_COMPRESSION
+        cache_max_size_mb = ProjectConfig.DEFAULT_CACHE_MAX_SIZE_MB
+        cache_max_entries = ProjectConfig.DEFAULT_CACHE_MAX_ENTRIES
         project_features = ProjectConfig.DEFAULT_FEATURES
         server_host = ProjectConfig.DEFAULT_SERVER_HOST
         server_port = ProjectConfig.DEFAULT_SERVER_PORT
@@ -438,6 +480,41 @@ class ProjectConfigLoader:
             dir_for_sdoc_cache = project_content.get(
                 "cache_dir", dir_for_sdoc_cache
             )
+            cache_backend = project_content.get("cache_backend", cache_backend)
+            if cache_backend not in CacheBackendType.ALL:
+                print(  # noqa: T201
+                    f"error: strictdoc.toml: 'cache_backend': "
+                    f"must be one of {', '.join(CacheBackendType.ALL)}, "
+                    f"got: '{cache_backend}'."
+                )
+                sys.exit(1)
+            cache_compression = project_content.get(
+                "cache_compression", cache_compression
+            )
+            if cache_compression not in CacheCompression.ALL:
+                print(  # noqa: T201
+                    f"error: strictdoc.toml: 'cache_compression': "
+                    f"must be one of {', '.join(CacheCompression.ALL)}, "
+                    f"got: '{cache_compression}'."
+                )
+                sys.exit(1)
+            cache_max_size_mb = project_content.get(
+                "cache_max_size_mb", cache_max_size_mb
+            )
+            cache_max_entries = project_content.get(
+                "cache_max_entries", cache_max_entries
+            )
+            for option_name_, option_value_ in (
+                ("cache_max_size_mb", cache_max_size_mb),
+                ("cache_max_entries", cache_max_entries),
+            ):
+                if not isinstance(option_value_, int) or option_value_ < 0:
+                    print(  # noqa: T201
+                        f"error: strictdoc.toml: '{option_name_}': "
+                        f"must be a non-negative integer, "
+                        f"got: '{option_value_}'."
+                    )
+                    sys.exit(1)
 
             project_features = project_content.get("features", project_features)
             if not isinstance(project_features, list):
@@ -642,6 +719,10 @@ class ProjectConfigLoader:
             project_title=project_title,
             dir_for_sdoc_assets=dir_for_sdoc_assets,
             dir_for_sdoc_cache=dir_for_sdoc_cache,
+            cache_backend=cache_backend,
+            cache_compression=cache_compression,
+            cache_max_size_mb=cache_max_size_mb,
+            cache_max_entries=cache_max_entries,
             project_features=project_features,
             server_host=server_host,
             server_port=server_port,
@@ -33,6 +33,10 @@ BooleanExpression:
   |
   NodeHasChildRequirementsExpression
   |
+  NodeHasAncestorExpression
+  |
+  NodeHasDescendantExpression
+  |
   InExpression
   |
   NotInExpression
@@ -80,6 +84,14 @@ NodeHasChildRequirementsExpression:
   _ = 'node.has_child_requirements'
 ;
 
+NodeHasAncestorExpression:
+  'node.has_ancestor("' uid = /[^"]+/ '")'
+;
+
+NodeHasDescendantExpression:
+  'node.has_descendant("' uid = /[^"]+/ '")'
+;
+
 NodeIsRequirementExpression:
   _ = 'node.is_requirement'
 ;
@@ -0,0 +1,109 @@
+# mypy: disable-error-code="no-untyped-call,no-untyped-def,union-attr"
+from typing import Any, Dict, Optional, Set
+
+from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.backend.sdoc.models.document_grammar import GrammarElement
+from strictdoc.backend.sdoc.models.node import SDocNode
+from strictdoc.backend.sdoc.models.section import SDocSection
+from strictdoc.helpers.cast import assert_cast
+
+# The fields of a section that can be queried.
+SECTION_FIELDS = ("UID", "TITLE")
+
+
+def get_node_field_value(node, field_name: str) -> Optional[str]:
+    """
+    Returns the value of node["FIELD"] in a query.
+    """
+
+    if node.is_requirement and node.node_type == "REQUIREMENT":
+        requirement: SDocNode = assert_cast(node, SDocNode)
+        requirement_document: SDocDocument = assert_cast(
+            requirement.get_document(), SDocDocument
+        )
+        element: GrammarElement = requirement_document.grammar.elements_by_type[
+            requirement.node_type
+        ]
+        if field_name not in element.fields_map:
+            return None
+        return requirement._get_cached_field(field_name, False)
+    elif node.is_section:
+        section: SDocSection = assert_cast(node, SDocSection)
+        if field_name == "UID":
+            return section.reserved_uid
+        elif field_name == "TITLE":
+            return section.title
+        raise AttributeError(f"No such section field: {field_name}.")
+    else:
+        raise NotImplementedError
+
+
+class QueryNodeIndex:
+    """
+    The nodes of all documents, prepared for the query planner: the sets of
+    requirements and sections, and for every field that a query compares,
+    the requirements or sections grouped by the value of the field. The
+    groups of a field are created when the field is queried for the first
+    time.
+
+    The index is created from the same iteration of the documents that the
+    search and the filters go through, so a node that is not in the index is
+    never evaluated. The traceability index drops the query index together
+    with the cached node lists of the documents when a document is edited.
+    """
+
+    def __init__(self, traceability_index: Any) -> None:
+        self.requirements: Set[SDocNode] = set()
+        self.sections: Set[SDocSection] = set()
+        for document_ in traceability_index.document_tree.document_list:
+            document_iterator = traceability_index.get_document_iterator(
+                document_
+            )
+            for node_ in document_iterator.all_content(
+                print_fragments=False, print_fragments_from_files=False
+            ):
+                if isinstance(node_, SDocSection):
+                    self.sections.add(node_)
+                elif (
+                    isinstance(node_, SDocNode)
+                    and node_.node_type == "REQUIREMENT"
+                ):
+                    self.requirements.add(node_)
+        self._requirements_by_field_value: Dict[
+            str, Dict[Optional[str], Set[SDocNode]]
+        ] = {}
+        self._sections_by_field_value: Dict[
+            str, Dict[Optional[str], Set[SDocSection]]
+        ] = {}
+
+    def get_requirements_by_field_value(
+        self, field_name: str
+    ) -> Dict[Optional[str], Set[SDocNode]]:
+        nodes_by_value = self._requirements_by_field_value.get(field_name)
+        if nodes_by_value is None:
+            nodes_by_value = QueryNodeIndex._group_by_field_value(
+                self.requirements, field_name
+            )
+            self._requirements_by_field_value[field_name] = nodes_by_value
+        return nodes_by_value
+
+    def get_sections_by_field_value(
+        self, field_name: str
+    ) -> Dict[Optional[str], Set[SDocSection]]:
+        assert field_name in SECTION_FIELDS, field_name
+        nodes_by_value = self._sections_by_field_value.get(field_name)
+        if nodes_by_value is None:
+            nodes_by_value = QueryNodeIndex._group_by_field_value(
+                self.sections, field_name
+            )
+            self._sections_by_field_value[field_name] = nodes_by_value
+        return nodes_by_value
+
+    @staticmethod
+    def _group_by_field_value(nodes: Set[Any], field_name: str):
+        nodes_by_value: Dict[Optional[str], Set[Any]] = {}
+        for node_ in nodes:
+            nodes_by_value.setdefault(
+                get_node_field_value(node_, field_name), set()
+            ).add(node_)
+        return nodes_by_value
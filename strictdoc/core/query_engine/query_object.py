@@ -1,10 +1,13 @@
 # mypy: disable-error-code="no-any-return,no-untyped-call,no-untyped-def,union-attr,operator"
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
-from strictdoc.backend.sdoc.models.document import SDocDocument
-from strictdoc.backend.sdoc.models.document_grammar import GrammarElement
 from strictdoc.backend.sdoc.models.node import SDocNode, SDocNodeField
 from strictdoc.backend.sdoc.models.section import SDocSection
+from strictdoc.core.query_engine.query_node_index import (
+    SECTION_FIELDS,
+    QueryNodeIndex,
+    get_node_field_value,
+)
 from strictdoc.core.traceability_index import TraceabilityIndex
 from strictdoc.helpers.cast import assert_cast
 
@@ -51,6 +54,18 @@ class NodeHasChildRequirementsExpression:
         self.parent = parent
 
 
+class NodeHasAncestorExpression:
+    def __init__(self, parent, uid: str):
+        self.parent = parent
+        self.uid: str = uid
+
+
+class NodeHasDescendantExpression:
+    def __init__(self, parent, uid: str):
+        self.parent = parent
+        self.uid: str = uid
+
+
 class NodeIsRequirementExpression:
     def __init__(self, parent, _):
         self.parent = parent
@@ -121,111 +136,294 @@ class QueryNullObject:
     def evaluate(self, _) -> bool:
         return True
 
+    def get_candidate_nodes(self) -> Optional[Set[Any]]:
+        return None
+
+
+# A predicate compiled from a boolean expression and a function compiled from
+# a value expression of a query.
+Predicate = Callable[[Any], bool]
+ValueFunction = Callable[[Any], Optional[str]]
+
+# The result of planning an expression: the candidate nodes, i.e., the only
+# nodes for which the expression can be true, or None if the expression
+# cannot be planned, and whether the expression never raises an error for
+# the nodes it is evaluated with.
+PlanType = Tuple[Optional[Set[Any]], bool]
+
 
 class QueryObject:
+    """
+    A query compiled into a tree of Python closures.
+
+    The query is compiled once when the object is created, so evaluating a
+    node does not go through the expressions of the query.
+
+    get_candidate_nodes() narrows the nodes that a query has to be evaluated
+    with, using the sets of requirements and sections and the requirements
+    and sections grouped by field values from the QueryNodeIndex of the
+    traceability index. Every other node evaluates to False, without an
+    error. The candidate nodes still have to be evaluated. The planner is
+    conservative: an expression is only narrowed when skipping the other
+    nodes cannot hide an error that the evaluation would raise, e.g., the
+    error of node.has_parent_requirements evaluated with a section.
+    """
+
     def __init__(self, query: Query, traceability_index: TraceabilityIndex):
         self.query: Query = query
         self.traceability_index: TraceabilityIndex = traceability_index
+        self._predicate: Predicate = self._compile(query.root_expression)
 
     def evaluate(self, node) -> bool:
-        return self._evaluate(node, self.query.root_expression)
-
-    def _evaluate(self, node, expression) -> bool:
+        return self._predicate(node)
+
+    def get_candidate_nodes(self) -> Optional[Set[Any]]:
+        """
+        Returns the nodes for which the query can be true, or None if the
+        query has to be evaluated with every node.
+        """
+
+        node_index: QueryNodeIndex = (
+            self.traceability_index.get_query_node_index()
+        )
+        candidate_nodes, _ = self._plan(
+            self.query.root_expression, node_index, None
+        )
+        return candidate_nodes
+
+    def _compile(self, expression) -> Predicate:
         if isinstance(expression, EqualExpression):
-            return self._evaluate_equal(node, expression)
+            lhs_value = self._compile_value(expression.lhs_expr)
+            rhs_value = self._compile_value(expression.rhs_expr)
+            return lambda node: lhs_value(node) == rhs_value(node)
         if isinstance(expression, NotEqualExpression):
-            return self._evaluate_not_equal(node, expression)
+            lhs_value = self._compile_value(expression.lhs_expr)
+            rhs_value = self._compile_value(expression.rhs_expr)
+            return lambda node: lhs_value(node) != rhs_value(node)
         if isinstance(expression, NodeContainsExpression):
-            return self._evaluate_node_contains(node, expression)
+            string = expression.string
+            return lambda node: self._evaluate_node_contains(node, string)
         if isinstance(expression, NodeContainsAnyFreeTextExpression):
-            return self._evaluate_node_contains_any_text(node)
+            return self._evaluate_node_contains_any_text
         if isinstance(expression, NodeHasParentRequirementsExpression):
-            return self._evaluate_node_has_parent_requirements(node)
+            return self._evaluate_node_has_parent_requirements
         if isinstance(expression, NodeHasChildRequirementsExpression):
-            return self._evaluate_node_has_child_requirements(node)
+            return self._evaluate_node_has_child_requirements
+        if isinstance(expression, NodeHasAncestorExpression):
+            ancestor = self.traceability_index.get_node_by_uid_weak2(
+                expression.uid
+            )
+            return lambda node: self._evaluate_node_has_ancestor(node, ancestor)
+        if isinstance(expression, NodeHasDescendantExpression):
+            descendant = self.traceability_index.get_node_by_uid_weak2(
+                expression.uid
+            )
+            return lambda node: self._evaluate_node_has_descendant(
+                node, descendant
+            )
         if isinstance(expression, NodeIsRequirementExpression):
-            return (
+            return lambda node: (
                 isinstance(node, SDocNode) and node.node_type == "REQUIREMENT"
             )
         if isinstance(expression, NodeIsSectionExpression):
-            return isinstance(node, SDocSection)
+            return lambda node: isinstance(node, SDocSection)
         if isinstance(expression, NodeIsRootExpression):
-            return node.is_root
+            return lambda node: node.is_root
         if isinstance(expression, NotExpression):
-            return not self._evaluate(node, expression.expression)
+            sub_predicate = self._compile(expression.expression)
+            return lambda node: not sub_predicate(node)
         if isinstance(expression, AndExpression):
-            for sub_expression_ in expression.expressions:
-                if not self._evaluate(node, sub_expression_):
-                    return False
-            return True
+            sub_predicates = list(map(self._compile, expression.expressions))
+
+            def evaluate_and_(node) -> bool:
+                for sub_predicate_ in sub_predicates:
+                    if not sub_predicate_(node):
+                        return False
+                return True
+
+            return evaluate_and_
         if isinstance(expression, OrExpression):
-            for sub_expression_ in expression.expressions:
-                if self._evaluate(node, sub_expression_):
-                    return True
-            return False
-        if isinstance(expression, InExpression):
-            rhs_value = self._evaluate_value(node, expression.rhs_expr)
-            if rhs_value is None:
+            sub_predicates = list(map(self._compile, expression.expressions))
+
+            def evaluate_or_(node) -> bool:
+                for sub_predicate_ in sub_predicates:
+                    if sub_predicate_(node):
+                        return True
                 return False
-            return self._evaluate_value(node, expression.lhs_expr) in rhs_value
+
+            return evaluate_or_
+        if isinstance(expression, InExpression):
+            lhs_value = self._compile_value(expression.lhs_expr)
+            rhs_value = self._compile_value(expression.rhs_expr)
+
+            def evaluate_in_(node) -> bool:
+                rhs_value_ = rhs_value(node)
+                if rhs_value_ is None:
+                    return False
+                return lhs_value(node) in rhs_value_
+
+            return evaluate_in_
         if isinstance(expression, NotInExpression):
-            rhs_value = self._evaluate_value(node, expression.rhs_expr)
-            if rhs_value is None:
-                return False
-            return (
-                self._evaluate_value(node, expression.lhs_expr) not in rhs_value
-            )
-        assert 0, expression
+            lhs_value = self._compile_value(expression.lhs_expr)
+            rhs_value = self._compile_value(expression.rhs_expr)
 
-    def _evaluate_equal(self, node, expression: EqualExpression) -> bool:
-        return self._evaluate_value(
-            node, expression.lhs_expr
-        ) == self._evaluate_value(node, expression.rhs_expr)
+            def evaluate_not_in_(node) -> bool:
+                rhs_value_ = rhs_value(node)
+                if rhs_value_ is None:
+                    return False
+                return lhs_value(node) not in rhs_value_
 
-    def _evaluate_not_equal(self, node, expression: NotEqualExpression) -> bool:
-        return self._evaluate_value(
-            node, expression.lhs_expr
-        ) != self._evaluate_value(node, expression.rhs_expr)
+            return evaluate_not_in_
+        raise AssertionError(expression)
 
-    def _evaluate_value(self, node, expression) -> Optional[str]:
+    def _compile_value(self, expression) -> ValueFunction:
         if isinstance(expression, NodeFieldExpression):
-            return self._evaluate_node_field_expression(node, expression)
+            field_name = expression.field_name
+            return lambda node: get_node_field_value(node, field_name)
         if isinstance(expression, StringExpression):
-            return expression.string
+            string = expression.string
+            return lambda _: string
         if isinstance(expression, NoneExpression):
+            return lambda _: None
+        raise AssertionError(expression)
+
+    def _plan(
+        self,
+        expression,
+        node_index: QueryNodeIndex,
+        domain: Optional[Set[Any]],
+    ) -> PlanType:
+        """
+        The domain is the set of nodes that the expression is evaluated with,
+        i.e., the requirements or the sections of the node index, or None if
+        it can be any node.
+        """
+
+        if isinstance(expression, NodeIsRequirementExpression):
+            return node_index.requirements, True
+        if isinstance(expression, NodeIsSectionExpression):
+            return node_index.sections, True
+        if isinstance(expression, AndExpression):
+            candidate_nodes: Optional[Set[Any]] = None
+            for sub_expression_ in expression.expressions:
+                # The later expressions are only planned while the previous
+                # ones never raise: otherwise, skipping a node could hide
+                # the error of a previous expression.
+                sub_candidate_nodes, never_raises = self._plan(
+                    sub_expression_, node_index, domain
+                )
+                if sub_candidate_nodes is None:
+                    return candidate_nodes, False
+                candidate_nodes = (
+                    sub_candidate_nodes
+                    if candidate_nodes is None
+                    else candidate_nodes & sub_candidate_nodes
+                )
+                if not never_raises:
+                    return candidate_nodes, False
+                if isinstance(
+                    sub_expression_,
+                    (NodeIsRequirementExpression, NodeIsSectionExpression),
+                ):
+                    domain = sub_candidate_nodes
+            return candidate_nodes, True
+        if isinstance(expression, OrExpression):
+            candidate_nodes = set()
+            all_never_raise = True
+            for sub_expression_ in expression.expressions:
+                sub_candidate_nodes, never_raises = self._plan(
+                    sub_expression_, node_index, domain
+                )
+                if sub_candidate_nodes is None:
+                    return None, False
+                candidate_nodes |= sub_candidate_nodes
+                all_never_raise = all_never_raise and never_raises
+            return candidate_nodes, all_never_raise
+        if isinstance(expression, (EqualExpression, InExpression)):
+            return self._plan_field_expression(expression, node_index, domain)
+        return None, False
+
+    def _plan_field_expression(
+        self,
+        expression: Union[EqualExpression, InExpression],
+        node_index: QueryNodeIndex,
+        domain: Optional[Set[Any]],
+    ) -> PlanType:
+        # A field is only looked up in the index when the expression is
+        # evaluated with requirements or with sections, because the field of
+        # any other node raises an error.
+        def get_nodes_by_field_value_(
+            field_name_: str,
+        ) -> Optional[Dict[Optional[str], Set[Any]]]:
+            if domain is node_index.requirements:
+                return node_index.get_requirements_by_field_value(field_name_)
+            if domain is node_index.sections and field_name_ in SECTION_FIELDS:
+                return node_index.get_sections_by_field_value(field_name_)
             return None
-        assert 0, expression
-
-    def _evaluate_node_field_expression(
-        self, node, expression: NodeFieldExpression
-    ) -> Optional[str]:
-        field_name = expression.field_name
-        if node.is_requirement and node.node_type == "REQUIREMENT":
-            requirement: SDocNode = assert_cast(node, SDocNode)
-            requirement_document: SDocDocument = assert_cast(
-                requirement.get_document(), SDocDocument
+
+        lhs_expr, rhs_expr = expression.lhs_expr, expression.rhs_expr
+        if isinstance(expression, EqualExpression):
+            field_expr: NodeFieldExpression
+            value_expr: Union[StringExpression, NoneExpression]
+            if isinstance(lhs_expr, NodeFieldExpression) and isinstance(
+                rhs_expr, (StringExpression, NoneExpression)
+            ):
+                field_expr, value_expr = lhs_expr, rhs_expr
+            elif isinstance(rhs_expr, NodeFieldExpression) and isinstance(
+                lhs_expr, (StringExpression, NoneExpression)
+            ):
+                field_expr, value_expr = rhs_expr, lhs_expr
+            else:
+                return None, False
+            nodes_by_value = get_nodes_by_field_value_(field_expr.field_name)
+            if nodes_by_value is None:
+                return None, False
+            value = (
+                value_expr.string
+                if isinstance(value_expr, StringExpression)
+                else None
             )
-            element: GrammarElement = (
-                requirement_document.grammar.elements_by_type[
-                    requirement.node_type
-                ]
+            return nodes_by_value.get(value, set()), True
+
+        # The "in" expressions are evaluated once for every distinct value of
+        # the field instead of once for every node.
+        if isinstance(lhs_expr, StringExpression) and isinstance(
+            rhs_expr, NodeFieldExpression
+        ):
+            nodes_by_value = get_nodes_by_field_value_(rhs_expr.field_name)
+            if nodes_by_value is None:
+                return None, False
+            string = lhs_expr.string
+            return (
+                set().union(
+                    *(
+                        nodes_
+                        for value_, nodes_ in nodes_by_value.items()
+                        if value_ is not None and string in value_
+                    )
+                ),
+                True,
             )
-            grammar_field_titles = list(map(lambda f: f.title, element.fields))
-            if field_name not in grammar_field_titles:
-                return None
-            field_value = requirement._get_cached_field(field_name, False)
-            if field_value is not None:
-                return field_value
-            return None
-        elif node.is_section:
-            section: SDocSection = assert_cast(node, SDocSection)
-            if field_name == "UID":
-                return section.reserved_uid
-            elif field_name == "TITLE":
-                return section.title
-            raise AttributeError(f"No such section field: {field_name}.")
-        else:
-            raise NotImplementedError
+        if isinstance(lhs_expr, NodeFieldExpression) and isinstance(
+            rhs_expr, StringExpression
+        ):
+            nodes_by_value = get_nodes_by_field_value_(lhs_expr.field_name)
+            # An empty field cannot be looked up in a string, so the nodes
+            # with an empty field have to be evaluated to raise the error.
+            if nodes_by_value is None or None in nodes_by_value:
+                return None, False
+            string = rhs_expr.string
+            return (
+                set().union(
+                    *(
+                        nodes_
+                        for value_, nodes_ in nodes_by_value.items()
+                        if value_ in string
+                    )
+                ),
+                True,
+            )
+        return None, False
 
     def _evaluate_node_has_parent_requirements(self, node):
         if not isinstance(node, SDocNode):
@@ -245,19 +443,45 @@ class QueryObject:
             )
         return self.traceability_index.has_children_requirements(node)
 
-    def _evaluate_node_contains(
-        self, node, expression: NodeContainsExpression
-    ) -> bool:
+    def _evaluate_node_has_ancestor(self, node, ancestor) -> bool:
+        if not isinstance(node, SDocNode):
+            raise TypeError(
+                f"node.has_ancestor can be only called on "
+                f"Requirement objects, got: {node.__class__.__name__}. To fix "
+                f"the error, prepend your query with node.is_requirement."
+            )
+        if not isinstance(ancestor, SDocNode):
+            return False
+        # The descendants of the ancestor are computed once for all nodes
+        # that the query is evaluated with.
+        return self.traceability_index.has_descendant_requirement(
+            ancestor, node
+        )
+
+    def _evaluate_node_has_descendant(self, node, descendant) -> bool:
+        if not isinstance(node, SDocNode):
+            raise TypeError(
+                f"node.has_descendant can be only called on "
+                f"Requirement objects, got: {node.__class__.__name__}. To fix "
+                f"the error, prepend your query with node.is_requirement."
+            )
+        if not isinstance(descendant, SDocNode):
+            return False
+        return self.traceability_index.has_ancestor_requirement(
+            descendant, node
+        )
+
+    def _evaluate_node_contains(self, node, string: str) -> bool:
         if isinstance(node, SDocNode):
             requirement = assert_cast(node, SDocNode)
             requirement_field_: SDocNodeField
             for requirement_field_ in requirement.enumerate_fields():
-                if expression.string in requirement_field_.get_text_value():
+                if string in requirement_field_.get_text_value():
                     return True
             return False
         if isinstance(node, SDocSection):
             section = assert_cast(node, SDocSection)
-            if expression.string in section.title:
+            if string in section.title:
                 return True
             return False
         raise NotImplementedError
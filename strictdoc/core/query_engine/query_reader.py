@@ -1,6 +1,4 @@
 # mypy: disable-error-code="no-untyped-call,no-untyped-def"
-from textx import metamodel_from_str
-
 from strictdoc.core.query_engine.grammar import QUERY_GRAMMAR
 from strictdoc.core.query_engine.query_object import (
     AndExpression,
@@ -9,7 +7,9 @@ from strictdoc.core.query_engine.query_object import (
     NodeContainsAnyFreeTextExpression,
     NodeContainsExpression,
     NodeFieldExpression,
+    NodeHasAncestorExpression,
     NodeHasChildRequirementsExpression,
+    NodeHasDescendantExpression,
     NodeHasParentRequirementsExpression,
     NodeIsRequirementExpression,
     NodeIsRootExpression,
@@ -22,6 +22,10 @@ from strictdoc.core.query_engine.query_object import (
     Query,
     StringExpression,
 )
+from strictdoc.helpers.textx import (
+    LazyMetaModel,
+    model_from_str_with_processors,
+)
 
 QUERY_MODELS = [
     AndExpression,
@@ -30,7 +34,9 @@ QUERY_MODELS = [
     NodeContainsExpression,
     NodeContainsAnyFreeTextExpression,
     NodeFieldExpression,
+    NodeHasAncestorExpression,
     NodeHasChildRequirementsExpression,
+    NodeHasDescendantExpression,
     NodeHasParentRequirementsExpression,
     NodeIsRequirementExpression,
     NodeIsRootExpression,
@@ -61,23 +67,20 @@ class QueryParsingProcessor:
 
 
 class QueryReader:
+    meta_model = LazyMetaModel(lambda: QUERY_GRAMMAR, classes=QUERY_MODELS)
+
     def __init__(self, path_to_output_root: str = "NOT_RELEVANT"):
         self.path_to_output_root = path_to_output_root
 
     @staticmethod
     def _read(input_string, file_path=None):
-        meta_model = metamodel_from_str(
-            QUERY_GRAMMAR,
-            classes=QUERY_MODELS,
-            use_regexp_group=True,
-        )
-
         parse_context = QueryParseContext()
         processor = QueryParsingProcessor(parse_context=parse_context)
-        meta_model.register_obj_processors(processor.get_default_processors())
-
-        query: Query = meta_model.model_from_str(
-            input_string, file_name=file_path
+        query: Query = model_from_str_with_processors(
+            QueryReader.meta_model,
+            processor.get_default_processors(),
+            input_string,
+            file_name=file_path,
         )
 
         return query, parse_context
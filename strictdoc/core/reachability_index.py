@@ -0,0 +1,150 @@
+from typing import Any, Dict, Iterator, List, Tuple
+
+from strictdoc.core.constants import GraphLinkType
+from strictdoc.core.graph.abstract_bucket import ALL_EDGES
+from strictdoc.core.graph_database import GraphDatabase
+
+# The reachable nodes are stored as the keys of a dict, which keeps them in
+# the order of traversal and provides a fast membership test.
+ReachableNodes = Dict[Any, None]
+
+
+class ReachabilityIndex:
+    """
+    The transitive closure of the parent and child relations between the
+    nodes: the ancestors and the descendants of every node.
+
+    The closure of a node is computed when it is requested for the first time
+    and is cached afterwards. The computation is a post-order traversal of
+    the relations, so the closures of the parents (or children) are computed
+    first and then merged into the closure of the node. A node that is shared
+    by several branches of the graph is traversed only once, no matter how
+    many nodes it is reachable from.
+
+    The ancestors are ordered like in a depth-first traversal: every parent
+    is followed by its own ancestors, and a node reachable through several
+    parents is listed only once, at its first position.
+
+    A cycle of relations is an error that is reported by the traceability
+    index builder. If the relations contain a cycle nevertheless, e.g., while
+    a document is being edited, the closure of a node is computed by a plain
+    traversal and is not cached.
+
+    When a relation is created or removed, invalidate_relation() drops the
+    cached closures that the relation can change: the ancestors of the child
+    and of its descendants and the descendants of the parent and of its
+    ancestors. The other cached closures are kept.
+    """
+
+    def __init__(self, graph_database: GraphDatabase) -> None:
+        self.graph_database: GraphDatabase = graph_database
+        self._ancestors: Dict[Any, ReachableNodes] = {}
+        self._descendants: Dict[Any, ReachableNodes] = {}
+
+    def get_ancestors(self, node: Any) -> List[Any]:
+        return list(self._get_ancestors(node))
+
+    def get_descendants(self, node: Any) -> List[Any]:
+        return list(self._get_descendants(node))
+
+    def has_ancestor(self, node: Any, ancestor: Any) -> bool:
+        return ancestor in self._get_ancestors(node)
+
+    def has_descendant(self, node: Any, descendant: Any) -> bool:
+        return descendant in self._get_descendants(node)
+
+    def invalidate_relation(self, child: Any, parent: Any) -> None:
+        """
+        Must be called before the relation between the child and the parent
+        is created or removed: the closures are looked up with the relation
+        in the state in which they were cached.
+        """
+
+        for node_ in (child, *self._get_descendants(child)):
+            self._ancestors.pop(node_, None)
+        for node_ in (parent, *self._get_ancestors(parent)):
+            self._descendants.pop(node_, None)
+
+    def clear(self) -> None:
+        self._ancestors.clear()
+        self._descendants.clear()
+
+    def _get_ancestors(self, node: Any) -> ReachableNodes:
+        return self._get_reachable_nodes(
+            node, GraphLinkType.NODE_TO_PARENT_NODES, self._ancestors
+        )
+
+    def _get_descendants(self, node: Any) -> ReachableNodes:
+        return self._get_reachable_nodes(
+            node, GraphLinkType.NODE_TO_CHILD_NODES, self._descendants
+        )
+
+    def _get_related_nodes(
+        self, node: Any, link_type: GraphLinkType
+    ) -> Iterator[Any]:
+        return iter(
+            self.graph_database.get_link_values(
+                link_type=link_type, lhs_node=node, edge=ALL_EDGES
+            )
+        )
+
+    def _get_reachable_nodes(
+        self,
+        node: Any,
+        link_type: GraphLinkType,
+        cache: Dict[Any, ReachableNodes],
+    ) -> ReachableNodes:
+        reachable_nodes = cache.get(node)
+        if reachable_nodes is not None:
+            return reachable_nodes
+
+        computed_nodes: List[Any] = []
+        nodes_on_stack: Dict[Any, None] = {node: None}
+        stack: List[Tuple[Any, Iterator[Any]]] = [
+            (node, self._get_related_nodes(node, link_type))
+        ]
+        while len(stack) > 0:
+            current_node, related_nodes = stack[-1]
+            for related_node_ in related_nodes:
+                if related_node_ in cache:
+                    continue
+                if related_node_ in nodes_on_stack:
+                    # A cycle: the closures computed so far may be missing
+                    # the nodes of the cycle.
+                    for computed_node_ in computed_nodes:
+                        del cache[computed_node_]
+                    return self._traverse(node, link_type)
+                nodes_on_stack[related_node_] = None
+                stack.append(
+                    (
+                        related_node_,
+                        self._get_related_nodes(related_node_, link_type),
+                    )
+                )
+                break
+            else:
+                stack.pop()
+                del nodes_on_stack[current_node]
+                current_reachable_nodes: ReachableNodes = {}
+                for related_node_ in self._get_related_nodes(
+                    current_node, link_type
+                ):
+                    current_reachable_nodes[related_node_] = None
+                    current_reachable_nodes.update(cache[related_node_])
+                cache[current_node] = current_reachable_nodes
+                computed_nodes.append(current_node)
+        return cache[node]
+
+    def _traverse(self, node: Any, link_type: GraphLinkType) -> ReachableNodes:
+        reachable_nodes: ReachableNodes = {}
+        stack: List[Iterator[Any]] = [self._get_related_nodes(node, link_type)]
+        while len(stack) > 0:
+            for related_node_ in stack[-1]:
+                if related_node_ in reachable_nodes:
+                    continue
+                reachable_nodes[related_node_] = None
+                stack.append(self._get_related_nodes(related_node_, link_type))
+                break
+            else:
+                stack.pop()
+        return reachable_nodes
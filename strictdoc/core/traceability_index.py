@@ -23,11 +23,13 @@ from strictdoc.core.file_traceability_index import FileTraceabilityIndex
 from strictdoc.core.graph.abstract_bucket import ALL_EDGES
 from strictdoc.core.graph_database import GraphDatabase
 from strictdoc.core.project_config import ProjectConfig
+from strictdoc.core.query_engine.query_node_index import QueryNodeIndex
+from strictdoc.core.reachability_index import ReachabilityIndex
 from strictdoc.core.source_tree import SourceFile
 from strictdoc.core.transforms.validation_error import (
     SingleValidationError,
 )
-from strictdoc.core.tree_cycle_detector import TreeCycleDetector
+from strictdoc.core.tree_cycle_detector import SingleShotTreeCycleDetector
 from strictdoc.helpers.cast import assert_cast, assert_optional_cast
 from strictdoc.helpers.file_modification_time import set_file_modification_time
 from strictdoc.helpers.mid import MID
@@ -52,6 +54,10 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
         )
 
         self.graph_database: GraphDatabase = graph_database
+        self.reachability_index: ReachabilityIndex = ReachabilityIndex(
+            graph_database
+        )
+        self._query_node_index: Optional[QueryNodeIndex] = None
         self.document_tree: Optional[DocumentTree] = None
         self.asset_manager: Optional[AssetManager] = None
         self.file_dependency_manager: FileDependencyManager = (
@@ -154,6 +160,31 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
     def get_document_iterator(self, document) -> DocumentCachingIterator:
         return self.document_iterators[document]
 
+    def invalidate_document_iterators(self) -> None:
+        """
+        Drops the cached node lists of all documents. All documents are
+        invalidated, not only the edited one, because the nodes of a document
+        are also iterated by the documents that include it. The query node
+        index is built from the same node lists and is dropped as well.
+        """
+
+        for document_iterator_ in self._document_iterators.values():
+            document_iterator_.invalidate_cache()
+        self.invalidate_query_node_index()
+
+    def get_query_node_index(self) -> QueryNodeIndex:
+        if self._query_node_index is None:
+            self._query_node_index = QueryNodeIndex(self)
+        return self._query_node_index
+
+    def invalidate_query_node_index(self) -> None:
+        """
+        Must be called when a field of a node is edited in place, e.g., the
+        title of a section, without invalidating the document iterators.
+        """
+
+        self._query_node_index = None
+
     def get_parent_requirements(self, requirement: SDocNode) -> List[SDocNode]:
         assert isinstance(requirement, SDocNode)
         if not isinstance(requirement.reserved_uid, str):
@@ -170,6 +201,36 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             )
         )
 
+    def get_ancestor_requirements(
+        self, requirement: SDocNode
+    ) -> List[SDocNode]:
+        """
+        Returns the parent requirements, their parent requirements and so on.
+        Every ancestor is returned once even if it is reachable through
+        several parents.
+        """
+
+        assert isinstance(requirement, SDocNode)
+        return self.reachability_index.get_ancestors(requirement)
+
+    def get_descendant_requirements(
+        self, requirement: SDocNode
+    ) -> List[SDocNode]:
+        assert isinstance(requirement, SDocNode)
+        return self.reachability_index.get_descendants(requirement)
+
+    def has_ancestor_requirement(
+        self, requirement: SDocNode, ancestor: SDocNode
+    ) -> bool:
+        assert isinstance(requirement, SDocNode)
+        return self.reachability_index.has_ancestor(requirement, ancestor)
+
+    def has_descendant_requirement(
+        self, requirement: SDocNode, descendant: SDocNode
+    ) -> bool:
+        assert isinstance(requirement, SDocNode)
+        return self.reachability_index.has_descendant(requirement, descendant)
+
     def get_parent_relations_with_roles(self, requirement: SDocNode):
         assert isinstance(requirement, SDocNode)
         if (
@@ -520,6 +581,9 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             parent_requirement.get_document(), SDocDocument
         )
 
+        self.reachability_index.invalidate_relation(
+            requirement, parent_requirement
+        )
         self.graph_database.create_link(
             link_type=GraphLinkType.NODE_TO_PARENT_NODES,
             lhs_node=requirement,
@@ -533,26 +597,8 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             edge=role,
         )
 
-        cycle_detector = TreeCycleDetector()
-
-        def parent_cycle_traverse_(node_id):
-            node = self.graph_database.get_link_value(
-                link_type=GraphLinkType.UID_TO_NODE,
-                lhs_node=node_id,
-            )
-            return list(
-                map(
-                    lambda node_: node_.reserved_uid,
-                    self.graph_database.get_link_values(
-                        link_type=GraphLinkType.NODE_TO_PARENT_NODES,
-                        lhs_node=node,
-                    ),
-                )
-            )
-
-        cycle_detector.check_node(
-            requirement.reserved_uid,
-            parent_cycle_traverse_,
+        self._check_new_relation_for_cycle(
+            GraphLinkType.NODE_TO_PARENT_NODES, requirement, parent_uid, role
         )
 
         # Mark document and parent document (if different) for re-generation.
@@ -591,6 +637,9 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             child_requirement.get_document(), SDocDocument
         )
 
+        self.reachability_index.invalidate_relation(
+            child_requirement, requirement
+        )
         self.graph_database.create_link(
             link_type=GraphLinkType.NODE_TO_PARENT_NODES,
             lhs_node=child_requirement,
@@ -604,9 +653,44 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             edge=role,
         )
 
-        cycle_detector = TreeCycleDetector()
+        self._check_new_relation_for_cycle(
+            GraphLinkType.NODE_TO_CHILD_NODES, requirement, child_uid, role
+        )
 
-        def child_cycle_traverse_(node_id):
+        # Mark document and parent document (if different) for re-generation.
+        set_file_modification_time(
+            document.meta.input_doc_full_path, datetime.datetime.today()
+        )
+        if child_requirement_document != document:
+            set_file_modification_time(
+                child_requirement_document.meta.input_doc_full_path,
+                datetime.datetime.today(),
+            )
+
+    def _check_new_relation_for_cycle(
+        self,
+        link_type: GraphLinkType,
+        requirement: SDocNode,
+        related_uid: str,
+        role: Optional[str],
+    ) -> None:
+        """
+        Checks that the relation just created from the requirement to the
+        related requirement does not close a cycle.
+
+        The graph had no cycles before the relation was created, so a new
+        cycle has to go through the new relation. Only the requirements
+        reachable from the related requirement are traversed, looking for a
+        path back to the requirement.
+
+        Like the cycle detection of the traceability index builder, the
+        check follows the relations without a role.
+        """
+
+        if role is not None:
+            return
+
+        def cycle_traverse_(node_id):
             node = self.graph_database.get_link_value(
                 link_type=GraphLinkType.UID_TO_NODE,
                 lhs_node=node_id,
@@ -615,26 +699,17 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
                 map(
                     lambda node_: node_.reserved_uid,
                     self.graph_database.get_link_values(
-                        link_type=GraphLinkType.NODE_TO_CHILD_NODES,
+                        link_type=link_type,
                         lhs_node=node,
                     ),
                 )
             )
 
-        cycle_detector.check_node(
+        SingleShotTreeCycleDetector().check_node(
             requirement.reserved_uid,
-            child_cycle_traverse_,
-        )
-
-        # Mark document and parent document (if different) for re-generation.
-        set_file_modification_time(
-            document.meta.input_doc_full_path, datetime.datetime.today()
+            related_uid,
+            cycle_traverse_,
         )
-        if child_requirement_document != document:
-            set_file_modification_time(
-                child_requirement_document.meta.input_doc_full_path,
-                datetime.datetime.today(),
-            )
 
     def update_with_anchor(self, anchor: Anchor):
         # By this time, we know that the validations have passed just before.
@@ -754,6 +829,7 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
                 lhs_node=requirement.reserved_uid,
                 rhs_node=requirement,
             )
+            self.reachability_index.clear()
             self.graph_database.delete_all_links(
                 link_type=GraphLinkType.NODE_TO_PARENT_NODES,
                 lhs_node=requirement,
@@ -775,6 +851,9 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             lhs_node=parent_uid,
         )
 
+        self.reachability_index.invalidate_relation(
+            requirement, parent_requirement
+        )
         self.graph_database.delete_link(
             link_type=GraphLinkType.NODE_TO_PARENT_NODES,
             lhs_node=requirement,
@@ -828,6 +907,9 @@ class TraceabilityIndex:  # pylint: disable=too-many-public-methods, too-many-in
             child_requirement.get_document(), SDocDocument
         )
 
+        self.reachability_index.invalidate_relation(
+            child_requirement, requirement
+        )
         self.graph_database.delete_link(
             link_type=GraphLinkType.NODE_TO_CHILD_NODES,
             lhs_node=requirement,
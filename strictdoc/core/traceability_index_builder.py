@@ -3,17 +3,31 @@ import datetime
 import glob
 import os
 import sys
-from typing import Dict, Iterator, List, Optional, Set, Union
+from functools import partial
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from textx import TextXSyntaxError
 
+from strictdoc.backend.sdoc.cache_manifest import CacheManifest
 from strictdoc.backend.sdoc.error_handling import StrictDocSemanticError
 from strictdoc.backend.sdoc.models.anchor import Anchor
 from strictdoc.backend.sdoc.models.document import SDocDocument
 from strictdoc.backend.sdoc.models.document_from_file import DocumentFromFile
 from strictdoc.backend.sdoc.models.document_grammar import DocumentGrammar
 from strictdoc.backend.sdoc.models.inline_link import InlineLink
-from strictdoc.backend.sdoc.models.model import SDocDocumentFromFileIF
+from strictdoc.backend.sdoc.models.model import (
+    SDocDocumentFromFileIF,
+    SDocElementIF,
+)
 from strictdoc.backend.sdoc.models.node import SDocCompositeNode, SDocNode
 from strictdoc.backend.sdoc.models.reference import (
     ChildReqReference,
@@ -21,18 +35,25 @@ from strictdoc.backend.sdoc.models.reference import (
 )
 from strictdoc.backend.sdoc.models.section import SDocSection
 from strictdoc.backend.sdoc.models.type_system import ReferenceType
+from strictdoc.backend.sdoc.reader import SDReader
 from strictdoc.backend.sdoc.validations.sdoc_validator import SDocValidator
 from strictdoc.backend.sdoc_source_code.caching_reader import (
     SourceFileTraceabilityCachingReader,
 )
+from strictdoc.backend.sdoc_source_code.models.source_file_info import (
+    SourceFileTraceabilityInfo,
+)
+from strictdoc.core.asset_manager import AssetManager
 from strictdoc.core.document_finder import DocumentFinder
 from strictdoc.core.document_iterator import DocumentCachingIterator
 from strictdoc.core.document_tree import DocumentTree
 from strictdoc.core.file_dependency_manager import FileDependencyManager
+from strictdoc.core.file_tree import FileTree
 from strictdoc.core.finders.source_files_finder import (
     SourceFile,
     SourceFilesFinder,
 )
+from strictdoc.core.graph.abstract_bucket import ALL_EDGES
 from strictdoc.core.graph.many_to_many_set import ManyToManySet
 from strictdoc.core.graph.one_to_one_dictionary import OneToOneDictionary
 from strictdoc.core.graph.validations import RemoveNodeValidation
@@ -49,13 +70,20 @@ from strictdoc.core.traceability_index import (
     GraphLinkType,
     TraceabilityIndex,
 )
-from strictdoc.core.tree_cycle_detector import TreeCycleDetector
+from strictdoc.core.traceability_index_snapshot import (
+    TraceabilityIndexSnapshot,
+)
+from strictdoc.core.tree_cycle_detector import (
+    GraphCycleDetector,
+    TreeCycleDetector,
+)
 from strictdoc.helpers.cast import assert_cast
 from strictdoc.helpers.exception import StrictDocException
 from strictdoc.helpers.file_modification_time import (
     get_file_modification_time,
 )
 from strictdoc.helpers.mid import MID
+from strictdoc.helpers.textx import drop_textx_meta
 from strictdoc.helpers.timing import measure_performance, timing_decorator
 
 
@@ -94,10 +122,114 @@ class TraceabilityIndexBuilder:
         ):
             strictdoc_last_update = project_config.config_last_update
 
-        document_tree, asset_manager = DocumentFinder.find_sdoc_content(
-            project_config=project_config, parallelizer=parallelizer
+        file_trees, asset_manager = DocumentFinder.find_sdoc_files(
+            project_config
+        )
+
+        source_tree: Optional[SourceTree] = None
+        if not skip_source_files and project_config.is_feature_activated(
+            ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
+        ):
+            source_tree = SourceFilesFinder.find_source_files(
+                project_config=project_config
+            )
+
+        snapshot = TraceabilityIndexSnapshot.create(
+            project_config=project_config,
+            file_trees=file_trees,
+            asset_manager=asset_manager,
+            source_tree=source_tree,
+            build_options=(
+                auto_uid_mode,
+                skip_source_files,
+                strictdoc_last_update,
+            ),
+        )
+        with measure_performance("Load traceability index snapshot"):
+            previous_snapshot: Optional[
+                Tuple[Dict[str, str], TraceabilityIndex]
+            ] = snapshot.load_previous()
+
+        traceability_index_or_none: Optional[TraceabilityIndex] = None
+        if previous_snapshot is not None:
+            previous_input_hashes, previous_traceability_index = (
+                previous_snapshot
+            )
+            changed_documents: Optional[List[str]] = (
+                snapshot.get_changed_documents(previous_input_hashes)
+            )
+            if changed_documents is not None and len(changed_documents) == 0:
+                print(  # noqa: T201
+                    "Traceability index: no input files have changed, "
+                    "using the cached snapshot.",
+                    flush=True,
+                )
+                traceability_index_or_none = previous_traceability_index
+            elif changed_documents is not None and source_tree is None:
+                with measure_performance("Update traceability index"):
+                    traceability_index_or_none = (
+                        TraceabilityIndexBuilder._update_from_files(
+                            traceability_index=previous_traceability_index,
+                            changed_documents=changed_documents,
+                            project_config=project_config,
+                            auto_uid_mode=auto_uid_mode,
+                        )
+                    )
+                if traceability_index_or_none is not None:
+                    print(  # noqa: T201
+                        "Traceability index: updated the cached snapshot "
+                        f"with {len(changed_documents)} changed document(s).",
+                        flush=True,
+                    )
+                    with measure_performance(
+                        "Save traceability index snapshot"
+                    ):
+                        snapshot.save(traceability_index_or_none)
+
+        if traceability_index_or_none is not None:
+            traceability_index = traceability_index_or_none
+        else:
+            traceability_index = TraceabilityIndexBuilder._create_from_files(
+                file_trees=file_trees,
+                asset_manager=asset_manager,
+                source_tree=source_tree,
+                project_config=project_config,
+                parallelizer=parallelizer,
+                auto_uid_mode=auto_uid_mode,
+                strictdoc_last_update=strictdoc_last_update,
+            )
+            with measure_performance("Save traceability index snapshot"):
+                snapshot.save(traceability_index)
+        CacheManifest.get_instance(project_config).save()
+
+        """
+        Resolve all modification dates to support the incremental generation of
+        all artifacts.
+        """
+        file_dependency_manager = traceability_index.file_dependency_manager
+
+        file_dependency_manager.resolve_modification_dates(
+            traceability_index.strictdoc_last_update
         )
 
+        return traceability_index
+
+    @staticmethod
+    def _create_from_files(
+        *,
+        file_trees: List[FileTree],
+        asset_manager: AssetManager,
+        source_tree: Optional[SourceTree],
+        project_config: ProjectConfig,
+        parallelizer,
+        auto_uid_mode: bool,
+        strictdoc_last_update: datetime.datetime,
+    ) -> TraceabilityIndex:
+        with measure_performance("Find and read SDoc files"):
+            document_tree = DocumentFinder.read_sdoc_files(
+                file_trees, project_config, parallelizer
+            )
+
         # TODO: This is rather messy, but it is better than it used to be.
         # Currently, the traceability index holds everything that is later used
         # by HTML generators:
@@ -121,27 +253,30 @@ class TraceabilityIndexBuilder:
         )
 
         # File traceability
-        if not skip_source_files and project_config.is_feature_activated(
-            ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
-        ):
+        if source_tree is not None:
             file_tracability_index = (
                 traceability_index.get_file_traceability_index()
             )
-            source_tree: SourceTree = SourceFilesFinder.find_source_files(
-                project_config=project_config
-            )
             source_files = source_tree.source_files
-            source_file: SourceFile
-            for source_file in source_files:
-                with measure_performance(
-                    f"Reading source: {source_file.in_doctree_source_file_rel_path}"
-                ):
-                    traceability_info = (
-                        SourceFileTraceabilityCachingReader.read_from_file(
-                            source_file.full_path, project_config
-                        )
-                    )
+            with measure_performance("Completed reading all source files"):
+                traceability_infos = parallelizer.run_parallel(
+                    source_files,
+                    partial(
+                        TraceabilityIndexBuilder._process_worker_read_source_file,
+                        project_config=project_config,
+                    ),
+                    weight_func=lambda source_file_: os.path.getsize(
+                        source_file_.full_path
+                    ),
+                )
+            parallelizer.print_utilization()
 
+            # The results are in the order of the source files, so the index
+            # does not depend on which worker has read which file.
+            source_file: SourceFile
+            for source_file, traceability_info in zip(
+                source_files, traceability_infos
+            ):
                 if traceability_info:
                     traceability_index.create_traceability_info(
                         source_file,
@@ -152,6 +287,9 @@ class TraceabilityIndexBuilder:
                         source_file.is_referenced = True
 
             file_tracability_index.validate_and_resolve(traceability_index)
+            # The source files may have connected the requirements through
+            # the test reports.
+            traceability_index.reachability_index.clear()
 
             # Iterate again to resolve if the file is referenced.
             # FIXME: Not great to iterate two times.
@@ -190,19 +328,431 @@ class TraceabilityIndexBuilder:
 
             traceability_index.document_tree.attach_source_tree(source_tree)
 
+        return traceability_index
+
+    @staticmethod
+    def _process_worker_read_source_file(
+        source_file: SourceFile, project_config: ProjectConfig
+    ) -> Optional[SourceFileTraceabilityInfo]:
+        with measure_performance(
+            f"Reading source: {source_file.in_doctree_source_file_rel_path}"
+        ):
+            return SourceFileTraceabilityCachingReader.read_from_file(
+                source_file.full_path, project_config
+            )
+
+    @staticmethod
+    def _update_from_files(
+        *,
+        traceability_index: TraceabilityIndex,
+        changed_documents: List[str],
+        project_config: ProjectConfig,
+        auto_uid_mode: bool,
+    ) -> Optional[TraceabilityIndex]:
         """
-        Resolve all modification dates to support the incremental generation of
-        all artifacts.
+        Update the traceability index of the previous build with the documents
+        that have changed since then.
+
+        The nodes, anchors and links of the changed documents are removed from
+        the graph and the re-read documents are added instead. Only the new
+        nodes and the nodes of the other documents that were linked to the
+        removed nodes are linked and validated again.
+
+        None is returned if the documents cannot be updated one by one, i.e.,
+        when documents are included into other documents. The index has to be
+        built from scratch in this case.
         """
 
-        file_dependency_manager = traceability_index.file_dependency_manager
+        if traceability_index.contains_included_documents:
+            return None
 
-        file_dependency_manager.resolve_modification_dates(
-            traceability_index.strictdoc_last_update
+        document_tree: DocumentTree = assert_cast(
+            traceability_index.document_tree, DocumentTree
+        )
+        graph_database: GraphDatabase = traceability_index.graph_database
+
+        new_documents: Dict[str, SDocDocument] = {}
+        for path_to_document_ in changed_documents:
+            document = SDReader().read_from_file(
+                path_to_document_, project_config
+            )
+            assert isinstance(document, SDocDocument)
+            drop_textx_meta(document)
+            if len(document.fragments_from_files) > 0:
+                return None
+            new_documents[path_to_document_] = document
+
+        old_documents: List[SDocDocument] = [
+            document_tree.get_document_by_path(path_to_document_)
+            for path_to_document_ in changed_documents
+        ]
+
+        # The inline links of the changed documents are removed first, so that
+        # only the links from the unchanged documents are left pointing to the
+        # removed nodes.
+        for old_document_ in old_documents:
+            for node_ in traceability_index.get_document_iterator(
+                old_document_
+            ).all_content(
+                print_fragments=False,
+                print_fragments_from_files=False,
+            ):
+                if not node_.is_requirement:
+                    continue
+                for node_field_ in node_.enumerate_fields():
+                    for part_ in node_field_.parts:
+                        if isinstance(part_, InlineLink):
+                            traceability_index.remove_inline_link(part_)
+
+        linked_nodes: List[SDocNode] = []
+        incoming_links: List[InlineLink] = []
+        for old_document_ in old_documents:
+            TraceabilityIndexBuilder._remove_document(
+                traceability_index, old_document_, linked_nodes, incoming_links
+            )
+
+        for path_to_document_, old_document_ in zip(
+            changed_documents, old_documents
+        ):
+            new_document: SDocDocument = new_documents[path_to_document_]
+            new_document.assign_meta(old_document_.meta)
+            document_tree.document_list[
+                document_tree.document_list.index(old_document_)
+            ] = new_document
+            document_tree.map_docs_by_paths[path_to_document_] = new_document
+            for (
+                document_rel_path_,
+                document_,
+            ) in document_tree.map_docs_by_rel_paths.items():
+                if document_ is old_document_:
+                    document_tree.map_docs_by_rel_paths[document_rel_path_] = (
+                        new_document
+                    )
+                    break
+
+        for new_document_ in new_documents.values():
+            TraceabilityIndexBuilder._add_document(
+                traceability_index, document_tree, new_document_, auto_uid_mode
+            )
+
+        new_nodes: List[SDocNode] = []
+        for new_document_ in new_documents.values():
+            for node_ in traceability_index.get_document_iterator(
+                new_document_
+            ).all_content(
+                print_fragments=False,
+                print_fragments_from_files=False,
+            ):
+                if node_.is_requirement:
+                    TraceabilityIndexBuilder._link_requirement(
+                        traceability_index, new_document_, node_
+                    )
+                    new_nodes.append(node_)
+
+        # The nodes of the unchanged documents that were linked to the removed
+        # nodes are linked to the new nodes with the same UIDs. A relation to
+        # a UID that no longer exists is reported the same way as by a full
+        # build.
+        old_documents_set = set(old_documents)
+        new_documents_set = set(new_documents.values())
+        unique_linked_nodes: Dict[int, SDocNode] = {}
+        for linked_node_ in linked_nodes:
+            if linked_node_.get_document() not in old_documents_set:
+                unique_linked_nodes[id(linked_node_)] = linked_node_
+        for linked_node_ in unique_linked_nodes.values():
+            linked_node_document: SDocDocument = assert_cast(
+                linked_node_.get_document(), SDocDocument
+            )
+            for reference_ in linked_node_.relations:
+                if reference_.ref_type not in (
+                    ReferenceType.PARENT,
+                    ReferenceType.CHILD,
+                ):
+                    continue
+                referenced_node = graph_database.get_link_value_weak(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=reference_.ref_uid,
+                )
+                if (
+                    referenced_node is not None
+                    and referenced_node.get_document() not in new_documents_set
+                ):
+                    continue
+                TraceabilityIndexBuilder._link_reference(
+                    traceability_index,
+                    linked_node_document,
+                    linked_node_,
+                    reference_,
+                )
+
+        # The relations of the new nodes were linked after the relations of
+        # the unchanged documents, so the parents and children of the new
+        # nodes and of their related nodes are put back into the order of a
+        # full build.
+        nodes_to_reorder: Dict[int, SDocNode] = {}
+        for new_node_ in new_nodes:
+            nodes_to_reorder[id(new_node_)] = new_node_
+            for link_type_ in (
+                GraphLinkType.NODE_TO_PARENT_NODES,
+                GraphLinkType.NODE_TO_CHILD_NODES,
+            ):
+                for related_node_ in graph_database.get_link_values(
+                    link_type=link_type_, lhs_node=new_node_, edge=ALL_EDGES
+                ):
+                    nodes_to_reorder[id(related_node_)] = related_node_
+        TraceabilityIndexBuilder._restore_relation_order(
+            traceability_index, document_tree, nodes_to_reorder.values()
         )
 
+        for incoming_link_ in incoming_links:
+            TraceabilityIndexBuilder._validate_inline_link(
+                graph_database, incoming_link_
+            )
+            linked_node_or_anchor = graph_database.get_link_value(
+                link_type=GraphLinkType.UID_TO_NODE,
+                lhs_node=incoming_link_.link,
+            )
+            graph_database.create_link(
+                link_type=GraphLinkType.NODE_TO_INCOMING_LINKS,
+                lhs_node=linked_node_or_anchor.reserved_mid,
+                rhs_node=incoming_link_,
+            )
+
+        traceability_index.reachability_index.clear()
+
+        TraceabilityIndexBuilder._detect_cycles(
+            traceability_index,
+            new_nodes + list(unique_linked_nodes.values()),
+        )
+
+        TraceabilityIndexBuilder._filter_nodes(
+            project_config=project_config, traceability_index=traceability_index
+        )
+
+        # The documents that link to the changed documents have to be
+        # re-generated as well.
+        traceability_index.update_last_updated()
+
         return traceability_index
 
+    @staticmethod
+    def _restore_relation_order(
+        traceability_index: TraceabilityIndex,
+        document_tree: DocumentTree,
+        nodes: Iterable[SDocNode],
+    ) -> None:
+        """
+        Re-create the parent and child links of the nodes in the order in
+        which a full build creates them: the relations are linked in the
+        order of the documents, of the requirements within a document and of
+        the relations of a requirement. A Child relation creates the links of
+        both requirements, like a Parent relation does.
+        """
+
+        graph_database: GraphDatabase = traceability_index.graph_database
+        node_positions: Dict[SDocNode, int] = {}
+        for document_ in document_tree.document_list:
+            for node_ in traceability_index.get_document_iterator(
+                document_
+            ).all_content(
+                print_fragments=False,
+                print_fragments_from_files=False,
+            ):
+                if node_.is_requirement:
+                    node_positions[assert_cast(node_, SDocNode)] = len(
+                        node_positions
+                    )
+
+        for node_ in nodes:
+            for link_type_, own_reference_type, other_reference_type in (
+                (
+                    GraphLinkType.NODE_TO_PARENT_NODES,
+                    ReferenceType.PARENT,
+                    ReferenceType.CHILD,
+                ),
+                (
+                    GraphLinkType.NODE_TO_CHILD_NODES,
+                    ReferenceType.CHILD,
+                    ReferenceType.PARENT,
+                ),
+            ):
+                linked_nodes_with_roles = (
+                    graph_database.get_link_values_with_edges(
+                        link_type=link_type_, lhs_node=node_, edge=ALL_EDGES
+                    )
+                )
+                if len(linked_nodes_with_roles) < 2:
+                    continue
+
+                # Every link is created by exactly one relation, either of
+                # the node itself or of the linked node.
+                link_positions: Dict[
+                    Tuple[SDocNode, Optional[str]], Tuple[int, int]
+                ] = {}
+                for relation_idx_, reference_ in enumerate(node_.relations):
+                    if reference_.ref_type == own_reference_type:
+                        linked_node = graph_database.get_link_value(
+                            link_type=GraphLinkType.UID_TO_NODE,
+                            lhs_node=reference_.ref_uid,
+                        )
+                        link_positions[(linked_node, reference_.role)] = (
+                            node_positions[node_],
+                            relation_idx_,
+                        )
+                for linked_node_, _ in linked_nodes_with_roles:
+                    for relation_idx_, reference_ in enumerate(
+                        linked_node_.relations
+                    ):
+                        if (
+                            reference_.ref_type == other_reference_type
+                            and reference_.ref_uid == node_.reserved_uid
+                        ):
+                            link_positions[(linked_node_, reference_.role)] = (
+                                node_positions[linked_node_],
+                                relation_idx_,
+                            )
+
+                for linked_node_, role_ in linked_nodes_with_roles:
+                    graph_database.delete_link(
+                        link_type=link_type_,
+                        lhs_node=node_,
+                        rhs_node=linked_node_,
+                        edge=role_,
+                    )
+                for linked_node_, role_ in sorted(
+                    linked_nodes_with_roles, key=link_positions.__getitem__
+                ):
+                    graph_database.create_link(
+                        link_type=link_type_,
+                        lhs_node=node_,
+                        rhs_node=linked_node_,
+                        edge=role_,
+                    )
+
+    @staticmethod
+    def _remove_document(
+        traceability_index: TraceabilityIndex,
+        document: SDocDocument,
+        linked_nodes: List[SDocNode],
+        incoming_links: List[InlineLink],
+    ) -> None:
+        """
+        Remove the document, its nodes and anchors together with all their
+        links from the graph. The nodes on the other side of the removed
+        parent/child relations are collected to linked_nodes, and the inline
+        links that pointed to the removed nodes are collected to
+        incoming_links.
+        """
+
+        graph_database: GraphDatabase = traceability_index.graph_database
+        file_traceability_index: FileTraceabilityIndex = (
+            traceability_index.get_file_traceability_index()
+        )
+
+        def remove_incoming_links_(node_mid: MID) -> None:
+            for incoming_link_ in list(
+                graph_database.get_link_values(
+                    link_type=GraphLinkType.NODE_TO_INCOMING_LINKS,
+                    lhs_node=node_mid,
+                )
+            ):
+                graph_database.delete_link_weak(
+                    link_type=GraphLinkType.NODE_TO_INCOMING_LINKS,
+                    lhs_node=node_mid,
+                    rhs_node=incoming_link_,
+                )
+                incoming_links.append(incoming_link_)
+
+        graph_database.delete_link(
+            link_type=GraphLinkType.MID_TO_NODE,
+            lhs_node=document.reserved_mid,
+            rhs_node=document,
+        )
+        if document.uid:
+            graph_database.delete_link(
+                link_type=GraphLinkType.UID_TO_NODE,
+                lhs_node=document.uid,
+                rhs_node=document,
+            )
+        graph_database.delete_link(
+            link_type=GraphLinkType.DOCUMENT_TO_TAGS,
+            lhs_node=document.reserved_mid,
+            rhs_node=graph_database.get_link_value(
+                link_type=GraphLinkType.DOCUMENT_TO_TAGS,
+                lhs_node=document.reserved_mid,
+            ),
+        )
+        remove_incoming_links_(document.reserved_mid)
+
+        document_iterator: DocumentCachingIterator = (
+            traceability_index.document_iterators.pop(document)
+        )
+        for node in document_iterator.all_content(
+            print_fragments=False,
+            print_fragments_from_files=False,
+        ):
+            graph_database.delete_link(
+                link_type=GraphLinkType.MID_TO_NODE,
+                lhs_node=node.reserved_mid,
+                rhs_node=node,
+            )
+            if node.reserved_uid is not None:
+                graph_database.delete_link(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=node.reserved_uid,
+                    rhs_node=node,
+                )
+            remove_incoming_links_(node.reserved_mid)
+
+            if not node.is_requirement:
+                continue
+
+            for node_field_ in node.enumerate_fields():
+                for part_ in node_field_.parts:
+                    if isinstance(part_, Anchor):
+                        graph_database.delete_link(
+                            link_type=GraphLinkType.MID_TO_NODE,
+                            lhs_node=part_.mid,
+                            rhs_node=part_,
+                        )
+                        graph_database.delete_link(
+                            link_type=GraphLinkType.UID_TO_NODE,
+                            lhs_node=part_.value,
+                            rhs_node=part_,
+                        )
+                        remove_incoming_links_(part_.mid)
+
+            for link_type_ in (
+                GraphLinkType.NODE_TO_PARENT_NODES,
+                GraphLinkType.NODE_TO_CHILD_NODES,
+            ):
+                for linked_node_ in list(
+                    graph_database.get_link_values(
+                        link_type=link_type_, lhs_node=node, edge=ALL_EDGES
+                    )
+                ):
+                    graph_database.delete_link_weak(
+                        link_type=link_type_,
+                        lhs_node=node,
+                        rhs_node=linked_node_,
+                    )
+                    linked_nodes.append(linked_node_)
+                for linked_node_ in list(
+                    graph_database.get_link_values_reverse(
+                        link_type=link_type_, rhs_node=node
+                    )
+                ):
+                    graph_database.delete_link_weak(
+                        link_type=link_type_,
+                        lhs_node=linked_node_,
+                        rhs_node=node,
+                    )
+                    linked_nodes.append(linked_node_)
+
+            file_traceability_index.requirements_with_forward_links.discard(
+                node
+            )
+
     @staticmethod
     @timing_decorator("Build traceability graph")
     def create_from_document_tree(
@@ -304,387 +854,39 @@ class TraceabilityIndexBuilder:
                 print(exc.to_print_message())  # noqa: T201
                 sys.exit(1)
 
-        document: SDocDocument
         for document in document_tree.document_list:
-            """
-            First, resolve all grammars that are imported from grammar files.
-            """
-            if document.grammar.import_from_file is not None:
-                document_grammar: Optional[DocumentGrammar] = (
-                    document_tree.get_grammar_by_filename(
-                        document.grammar.import_from_file
-                    )
-                )
-                if document_grammar is None:
-                    raise StrictDocException(
-                        "TraceabilityIndex: "
-                        f'the document "{document.reserved_title}" '
-                        "imports a grammar from a file that does not exist: "
-                        f'"{document.grammar.import_from_file}".'
-                    )
-                document.grammar.update_with_elements(document_grammar.elements)
-
-            # This is important because due to the difference between the
-            # normal grammar vs imported grammar, the parent may not be set at
-            # this point.
-            document.grammar.parent = document
-
-            try:
-                SDocValidator.validate_document(document)
-            except StrictDocSemanticError as exc:
-                print(exc.to_print_message())  # noqa: T201
-                sys.exit(1)
-
-            if graph_database.has_link(
-                link_type=GraphLinkType.MID_TO_NODE,
-                lhs_node=document.reserved_mid,
-            ):
-                other_document: SDocDocument = graph_database.get_link_value(
-                    link_type=GraphLinkType.MID_TO_NODE,
-                    lhs_node=document.reserved_mid,
-                )
-                raise StrictDocException(
-                    "TraceabilityIndex: "
-                    "the document MID is not unique: "
-                    f"{document.reserved_mid}. "
-                    "All machine identifiers (MID) must be unique values. "
-                    f"Affected documents:\n"
-                    f"{other_document.get_debug_info()}\n"
-                    f"and\n"
-                    f"{document.get_debug_info()}."
-                )
-
-            graph_database.create_link(
-                link_type=GraphLinkType.MID_TO_NODE,
-                lhs_node=document.reserved_mid,
-                rhs_node=document,
+            TraceabilityIndexBuilder._add_document(
+                traceability_index, document_tree, document, auto_uid_mode
             )
-            if document.uid:
-                graph_database.create_link(
-                    link_type=GraphLinkType.UID_TO_NODE,
-                    lhs_node=document.uid,
-                    rhs_node=document,
-                )
-
-            document_tags: Dict[str, int] = {}
-            graph_database.create_link(
-                link_type=GraphLinkType.DOCUMENT_TO_TAGS,
-                lhs_node=document.reserved_mid,
-                rhs_node=document_tags,
-            )
-
-            document_iterator = DocumentCachingIterator(document)
-            d_01_document_iterators[document] = document_iterator
-
-            for node in document_iterator.all_content(
-                print_fragments=False,
-                print_fragments_from_files=False,
-            ):
-                if isinstance(node, SDocNode):
-                    try:
-                        SDocValidator.validate_node(
-                            node,
-                            document_grammar=document.grammar,
-                            path_to_sdoc_file=document.meta.input_doc_full_path,
-                            auto_uid_mode=auto_uid_mode,
-                        )
-                    except StrictDocSemanticError as exc:
-                        print(exc.to_print_message())  # noqa: T201
-                        sys.exit(1)
-
-                if graph_database.has_link(
-                    link_type=GraphLinkType.MID_TO_NODE,
-                    lhs_node=node.reserved_mid,
-                ):
-                    other_node: SDocDocument = graph_database.get_link_value(
-                        link_type=GraphLinkType.MID_TO_NODE,
-                        lhs_node=node.reserved_mid,
-                    )
-                    raise StrictDocException(
-                        "TraceabilityIndex: "
-                        "the node MID is not unique: "
-                        f"{node.reserved_mid}. "
-                        "All machine identifiers (MID) must be unique values. "
-                        f"Affected nodes:\n"
-                        f"{other_node.get_debug_info()}\n"
-                        f"and\n"
-                        f"{node.get_debug_info()}."
-                    )
-                graph_database.create_link(
-                    link_type=GraphLinkType.MID_TO_NODE,
-                    lhs_node=node.reserved_mid,
-                    rhs_node=node,
-                )
-
-                if node.reserved_uid is not None:
-                    # @relation(SDOC-SRS-29, scope=range_start)
-                    if traceability_index.graph_database.has_link(
-                        link_type=GraphLinkType.UID_TO_NODE,
-                        lhs_node=node.reserved_uid,
-                    ):
-                        already_existing_node: SDocNode = (
-                            traceability_index.graph_database.get_link_value(
-                                link_type=GraphLinkType.UID_TO_NODE,
-                                lhs_node=node.reserved_uid,
-                            )
-                        )
-                        other_req_doc = assert_cast(
-                            already_existing_node.get_document(), SDocDocument
-                        )
-                        if other_req_doc == document:
-                            print(  # noqa: T201
-                                "error: DocumentIndex: "
-                                "two nodes with the same UID "
-                                "exist in the same document: "
-                                f'{node.reserved_uid} in "{document.title}".'
-                            )
-                        else:
-                            print(  # noqa: T201
-                                "error: DocumentIndex: "
-                                "two nodes with the same UID "
-                                "exist in two different documents: "
-                                f'{node.reserved_uid} in "{other_req_doc.title}" '
-                                f'and "{document.title}".'
-                            )
-                        sys.exit(1)
-                    # @relation(SDOC-SRS-29, scope=range_end)
-
-                    traceability_index.graph_database.create_link(
-                        link_type=GraphLinkType.UID_TO_NODE,
-                        lhs_node=node.reserved_uid,
-                        rhs_node=node,
-                    )
-
-                if node.is_requirement:
-                    requirement: SDocNode = assert_cast(node, SDocNode)
-                    if requirement.reserved_tags is not None:
-                        for tag in requirement.reserved_tags:
-                            document_tags.setdefault(tag, 0)
-                            document_tags[tag] += 1
-                    for node_field_ in node.enumerate_fields():
-                        for part in node_field_.parts:
-                            # The inline links are handled at the next big
-                            # For loop pass because the information about
-                            # all Nodes and Anchors have not been
-                            # collected yet at this point.
-                            # see create_inline_link below.
-                            if isinstance(part, Anchor):
-                                graph_database.create_link(
-                                    link_type=GraphLinkType.MID_TO_NODE,
-                                    lhs_node=part.mid,
-                                    rhs_node=part,
-                                )
-                                graph_database.create_link(
-                                    link_type=GraphLinkType.UID_TO_NODE,
-                                    lhs_node=part.value,
-                                    rhs_node=part,
-                                )
 
         # Now iterate over the requirements again to build an in-depth map of
         # parents and children.
         for document in document_tree.document_list:
-            document_iterator = d_01_document_iterators[document]
-
-            for node in document_iterator.all_content(
+            for node in d_01_document_iterators[document].all_content(
                 print_fragments=False,
                 print_fragments_from_files=False,
             ):
-                if not node.is_requirement:
-                    continue
-
-                requirement: SDocNode = node
-
-                """
-                At this point, we resolve LINKs, and the expectation is that
-                all UIDs or ANCHORS (they also have UIDs) are registered at the
-                previous pass.
-                """
-                for node_field_ in node.enumerate_fields():
-                    for part in node_field_.parts:
-                        if isinstance(part, InlineLink):
-                            if not graph_database.has_link(
-                                link_type=GraphLinkType.UID_TO_NODE,
-                                lhs_node=part.link,
-                            ):
-                                raise StrictDocException(
-                                    "DocumentIndex: "
-                                    "the inline link references an "
-                                    "object with an UID "
-                                    "that does not exist: "
-                                    f"{part.link}."
-                                )
-                            traceability_index.create_inline_link(part)
-                if requirement.reserved_uid is None:
-                    continue
-
-                # Now it is possible to resolve parents first checking if they
-                # indeed exist.
-                for reference in requirement.relations:
-                    if reference.ref_type == ReferenceType.FILE:
-                        d_07_file_traceability_index.create_requirement_with_forward_source_links(
-                            requirement
-                        )
-                    elif reference.ref_type == ReferenceType.PARENT:
-                        parent_reference: ParentReqReference = assert_cast(
-                            reference, ParentReqReference
-                        )
-                        parent_requirement = traceability_index.graph_database.get_link_value_weak(
-                            link_type=GraphLinkType.UID_TO_NODE,
-                            lhs_node=parent_reference.ref_uid,
-                        )
-                        if parent_requirement is None:
-                            raise StrictDocException(
-                                f"[DocumentIndex.create] "
-                                f"Requirement {requirement.reserved_uid} "
-                                f"references "
-                                f"parent requirement which doesn't exist: "
-                                f"{parent_reference.ref_uid}."
-                            )
-                        traceability_index.graph_database.create_link(
-                            link_type=GraphLinkType.NODE_TO_PARENT_NODES,
-                            lhs_node=requirement,
-                            rhs_node=parent_requirement,
-                            edge=parent_reference.role,
-                        )
-                        traceability_index.graph_database.create_link(
-                            link_type=GraphLinkType.NODE_TO_CHILD_NODES,
-                            lhs_node=parent_requirement,
-                            rhs_node=requirement,
-                            edge=parent_reference.role,
-                        )
+                if node.is_requirement:
+                    TraceabilityIndexBuilder._link_requirement(
+                        traceability_index, document, node
+                    )
 
-                        # Set document dependencies.
-                        parent_document: SDocDocument = assert_cast(
-                            parent_requirement.get_document(), SDocDocument
-                        )
-                        if document != parent_document:
-                            # This is where we help the incremental generation to
-                            # understand that the related documents must be
-                            # re-generated together.
-                            file_dependency_manager.add_dependency(
-                                document.meta.input_doc_full_path,
-                                document.meta.output_document_full_path,
-                                parent_document.meta.input_doc_full_path,
-                            )
-                            file_dependency_manager.add_dependency(
-                                parent_document.meta.input_doc_full_path,
-                                parent_document.meta.output_document_full_path,
-                                document.meta.input_doc_full_path,
-                            )
-                    elif reference.ref_type == ReferenceType.CHILD:
-                        child_reference: ChildReqReference = assert_cast(
-                            reference, ChildReqReference
-                        )
-                        child_requirement = traceability_index.graph_database.get_link_value_weak(
-                            link_type=GraphLinkType.UID_TO_NODE,
-                            lhs_node=child_reference.ref_uid,
-                        )
-                        if child_requirement is None:
-                            raise StrictDocException(
-                                f"[DocumentIndex.create] "
-                                f"Requirement {requirement.reserved_uid} "
-                                f"references a "
-                                f"child requirement that doesn't exist: "
-                                f"{child_reference.ref_uid}."
-                            )
-                        traceability_index.graph_database.create_link(
-                            link_type=GraphLinkType.NODE_TO_PARENT_NODES,
-                            lhs_node=child_requirement,
-                            rhs_node=requirement,
-                            edge=child_reference.role,
-                        )
-                        traceability_index.graph_database.create_link(
-                            link_type=GraphLinkType.NODE_TO_CHILD_NODES,
-                            lhs_node=requirement,
-                            rhs_node=child_requirement,
-                            edge=child_reference.role,
-                        )
-                        # Set document dependencies.
-                        child_requirement_document = assert_cast(
-                            child_requirement.get_document(), SDocDocument
-                        )
-                        if document != child_requirement_document:
-                            # This is where we help the incremental generation to
-                            # understand that the related documents must be
-                            # re-generated together.
-                            file_dependency_manager.add_dependency(
-                                document.meta.input_doc_full_path,
-                                document.meta.output_document_full_path,
-                                child_requirement_document.meta.input_doc_full_path,
-                            )
-                            file_dependency_manager.add_dependency(
-                                child_requirement_document.meta.input_doc_full_path,
-                                child_requirement_document.meta.output_document_full_path,
-                                document.meta.input_doc_full_path,
-                            )
-                    else:
-                        raise AssertionError(reference.ref_type)
+        # All relations are known at this point.
+        traceability_index.reachability_index.clear()
 
         # Iterate for the third time to validate the graph against
         # requirement cycles.
-        parents_cycle_detector = TreeCycleDetector()
-        children_cycle_detector = TreeCycleDetector()
-        for document in document_tree.document_list:
-            document_iterator = d_01_document_iterators[document]
-
-            for node in document_iterator.all_content(
-                print_fragments=False,
-                print_fragments_from_files=False,
-            ):
-                if not node.is_requirement:
-                    continue
-                requirement: Union[SDocNode, SDocCompositeNode] = assert_cast(
-                    node, (SDocNode, SDocCompositeNode)
-                )
-                if requirement.reserved_uid is None:
-                    continue
-
-                # @relation(SDOC-SRS-30, scope=range_start)
-                # Detect cycles
-                def parent_cycle_traverse_(node_id):
-                    current_node = (
-                        traceability_index.graph_database.get_link_value(
-                            link_type=GraphLinkType.UID_TO_NODE,
-                            lhs_node=node_id,
-                        )
-                    )
-                    return list(
-                        map(
-                            lambda node_: node_.reserved_uid,
-                            traceability_index.graph_database.get_link_values(
-                                link_type=GraphLinkType.NODE_TO_PARENT_NODES,
-                                lhs_node=current_node,
-                            ),
-                        )
-                    )
-
-                parents_cycle_detector.check_node(
-                    requirement.reserved_uid,
-                    parent_cycle_traverse_,
+        TraceabilityIndexBuilder._detect_cycles(
+            traceability_index,
+            (
+                node_
+                for document_ in document_tree.document_list
+                for node_ in d_01_document_iterators[document_].all_content(
+                    print_fragments=False,
+                    print_fragments_from_files=False,
                 )
-
-                def child_cycle_traverse_(node_id):
-                    current_node = (
-                        traceability_index.graph_database.get_link_value(
-                            link_type=GraphLinkType.UID_TO_NODE,
-                            lhs_node=node_id,
-                        )
-                    )
-                    return list(
-                        map(
-                            lambda node_: node_.reserved_uid,
-                            traceability_index.graph_database.get_link_values(
-                                link_type=GraphLinkType.NODE_TO_CHILD_NODES,
-                                lhs_node=current_node,
-                            ),
-                        )
-                    )
-
-                children_cycle_detector.check_node(
-                    requirement.reserved_uid,
-                    child_cycle_traverse_,
-                )
-                # @relation(SDOC-SRS-30, scope=range_end)
+            ),
+        )
 
         map_documents_by_input_rel_path: Dict[str, SDocDocument] = {}
         for document_ in document_tree.document_list:
@@ -749,6 +951,450 @@ class TraceabilityIndexBuilder:
 
         return traceability_index
 
+    @staticmethod
+    def _add_document(
+        traceability_index: TraceabilityIndex,
+        document_tree: DocumentTree,
+        document: SDocDocument,
+        auto_uid_mode: bool,
+    ) -> None:
+        """
+        Validate the document and register the document, its nodes and
+        anchors in the graph.
+        """
+        graph_database = traceability_index.graph_database
+
+        """
+        First, resolve all grammars that are imported from grammar files.
+        """
+        if document.grammar.import_from_file is not None:
+            document_grammar: Optional[DocumentGrammar] = (
+                document_tree.get_grammar_by_filename(
+                    document.grammar.import_from_file
+                )
+            )
+            if document_grammar is None:
+                raise StrictDocException(
+                    "TraceabilityIndex: "
+                    f'the document "{document.reserved_title}" '
+                    "imports a grammar from a file that does not exist: "
+                    f'"{document.grammar.import_from_file}".'
+                )
+            document.grammar.update_with_elements(document_grammar.elements)
+
+        # This is important because due to the difference between the
+        # normal grammar vs imported grammar, the parent may not be set at
+        # this point.
+        document.grammar.parent = document
+
+        try:
+            SDocValidator.validate_document(document)
+        except StrictDocSemanticError as exc:
+            print(exc.to_print_message())  # noqa: T201
+            sys.exit(1)
+
+        if graph_database.has_link(
+            link_type=GraphLinkType.MID_TO_NODE,
+            lhs_node=document.reserved_mid,
+        ):
+            other_document: SDocDocument = graph_database.get_link_value(
+                link_type=GraphLinkType.MID_TO_NODE,
+                lhs_node=document.reserved_mid,
+            )
+            raise StrictDocException(
+                "TraceabilityIndex: "
+                "the document MID is not unique: "
+                f"{document.reserved_mid}. "
+                "All machine identifiers (MID) must be unique values. "
+                f"Affected documents:\n"
+                f"{other_document.get_debug_info()}\n"
+                f"and\n"
+                f"{document.get_debug_info()}."
+            )
+
+        graph_database.create_link(
+            link_type=GraphLinkType.MID_TO_NODE,
+            lhs_node=document.reserved_mid,
+            rhs_node=document,
+        )
+        if document.uid:
+            graph_database.create_link(
+                link_type=GraphLinkType.UID_TO_NODE,
+                lhs_node=document.uid,
+                rhs_node=document,
+            )
+
+        document_tags: Dict[str, int] = {}
+        graph_database.create_link(
+            link_type=GraphLinkType.DOCUMENT_TO_TAGS,
+            lhs_node=document.reserved_mid,
+            rhs_node=document_tags,
+        )
+
+        document_iterator = DocumentCachingIterator(document)
+        traceability_index.document_iterators[document] = document_iterator
+
+        for node in document_iterator.all_content(
+            print_fragments=False,
+            print_fragments_from_files=False,
+        ):
+            if isinstance(node, SDocNode):
+                try:
+                    SDocValidator.validate_node(
+                        node,
+                        document_grammar=document.grammar,
+                        path_to_sdoc_file=document.meta.input_doc_full_path,
+                        auto_uid_mode=auto_uid_mode,
+                    )
+                except StrictDocSemanticError as exc:
+                    print(exc.to_print_message())  # noqa: T201
+                    sys.exit(1)
+
+            if graph_database.has_link(
+                link_type=GraphLinkType.MID_TO_NODE,
+                lhs_node=node.reserved_mid,
+            ):
+                other_node: SDocDocument = graph_database.get_link_value(
+                    link_type=GraphLinkType.MID_TO_NODE,
+                    lhs_node=node.reserved_mid,
+                )
+                raise StrictDocException(
+                    "TraceabilityIndex: "
+                    "the node MID is not unique: "
+                    f"{node.reserved_mid}. "
+                    "All machine identifiers (MID) must be unique values. "
+                    f"Affected nodes:\n"
+                    f"{other_node.get_debug_info()}\n"
+                    f"and\n"
+                    f"{node.get_debug_info()}."
+                )
+            graph_database.create_link(
+                link_type=GraphLinkType.MID_TO_NODE,
+                lhs_node=node.reserved_mid,
+                rhs_node=node,
+            )
+
+            if node.reserved_uid is not None:
+                # @relation(SDOC-SRS-29, scope=range_start)
+                if traceability_index.graph_database.has_link(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=node.reserved_uid,
+                ):
+                    already_existing_node: SDocNode = (
+                        traceability_index.graph_database.get_link_value(
+                            link_type=GraphLinkType.UID_TO_NODE,
+                            lhs_node=node.reserved_uid,
+                        )
+                    )
+                    other_req_doc = assert_cast(
+                        already_existing_node.get_document(), SDocDocument
+                    )
+                    if other_req_doc == document:
+                        print(  # noqa: T201
+                            "error: DocumentIndex: "
+                            "two nodes with the same UID "
+                            "exist in the same document: "
+                            f'{node.reserved_uid} in "{document.title}".'
+                        )
+                    else:
+                        print(  # noqa: T201
+                            "error: DocumentIndex: "
+                            "two nodes with the same UID "
+                            "exist in two different documents: "
+                            f'{node.reserved_uid} in "{other_req_doc.title}" '
+                            f'and "{document.title}".'
+                        )
+                    sys.exit(1)
+                # @relation(SDOC-SRS-29, scope=range_end)
+
+                traceability_index.graph_database.create_link(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=node.reserved_uid,
+                    rhs_node=node,
+                )
+
+            if node.is_requirement:
+                requirement: SDocNode = assert_cast(node, SDocNode)
+                if requirement.reserved_tags is not None:
+                    for tag in requirement.reserved_tags:
+                        document_tags.setdefault(tag, 0)
+                        document_tags[tag] += 1
+                for node_field_ in node.enumerate_fields():
+                    for part in node_field_.parts:
+                        # The inline links are handled at the next big
+                        # For loop pass because the information about
+                        # all Nodes and Anchors have not been
+                        # collected yet at this point.
+                        # see create_inline_link below.
+                        if isinstance(part, Anchor):
+                            graph_database.create_link(
+                                link_type=GraphLinkType.MID_TO_NODE,
+                                lhs_node=part.mid,
+                                rhs_node=part,
+                            )
+                            graph_database.create_link(
+                                link_type=GraphLinkType.UID_TO_NODE,
+                                lhs_node=part.value,
+                                rhs_node=part,
+                            )
+
+    @staticmethod
+    def _link_requirement(
+        traceability_index: TraceabilityIndex,
+        document: SDocDocument,
+        requirement: SDocNode,
+    ) -> None:
+        graph_database = traceability_index.graph_database
+
+        """
+        At this point, we resolve LINKs, and the expectation is that
+        all UIDs or ANCHORS (they also have UIDs) are registered at the
+        previous pass.
+        """
+        for node_field_ in requirement.enumerate_fields():
+            for part in node_field_.parts:
+                if isinstance(part, InlineLink):
+                    TraceabilityIndexBuilder._validate_inline_link(
+                        graph_database, part
+                    )
+                    traceability_index.create_inline_link(part)
+        if requirement.reserved_uid is None:
+            return
+
+        # Now it is possible to resolve parents first checking if they
+        # indeed exist.
+        for reference in requirement.relations:
+            TraceabilityIndexBuilder._link_reference(
+                traceability_index, document, requirement, reference
+            )
+
+    @staticmethod
+    def _validate_inline_link(
+        graph_database: GraphDatabase, inline_link: InlineLink
+    ) -> None:
+        if not graph_database.has_link(
+            link_type=GraphLinkType.UID_TO_NODE,
+            lhs_node=inline_link.link,
+        ):
+            raise StrictDocException(
+                "DocumentIndex: "
+                "the inline link references an "
+                "object with an UID "
+                "that does not exist: "
+                f"{inline_link.link}."
+            )
+
+    @staticmethod
+    def _link_reference(
+        traceability_index: TraceabilityIndex,
+        document: SDocDocument,
+        requirement: SDocNode,
+        reference,
+    ) -> None:
+        file_traceability_index = (
+            traceability_index.get_file_traceability_index()
+        )
+        file_dependency_manager = traceability_index.file_dependency_manager
+
+        if reference.ref_type == ReferenceType.FILE:
+            file_traceability_index.create_requirement_with_forward_source_links(
+                requirement
+            )
+        elif reference.ref_type == ReferenceType.PARENT:
+            parent_reference: ParentReqReference = assert_cast(
+                reference, ParentReqReference
+            )
+            parent_requirement = (
+                traceability_index.graph_database.get_link_value_weak(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=parent_reference.ref_uid,
+                )
+            )
+            if parent_requirement is None:
+                raise StrictDocException(
+                    f"[DocumentIndex.create] "
+                    f"Requirement {requirement.reserved_uid} "
+                    f"references "
+                    f"parent requirement which doesn't exist: "
+                    f"{parent_reference.ref_uid}."
+                )
+            traceability_index.graph_database.create_link(
+                link_type=GraphLinkType.NODE_TO_PARENT_NODES,
+                lhs_node=requirement,
+                rhs_node=parent_requirement,
+                edge=parent_reference.role,
+            )
+            traceability_index.graph_database.create_link(
+                link_type=GraphLinkType.NODE_TO_CHILD_NODES,
+                lhs_node=parent_requirement,
+                rhs_node=requirement,
+                edge=parent_reference.role,
+            )
+
+            # Set document dependencies.
+            parent_document: SDocDocument = assert_cast(
+                parent_requirement.get_document(), SDocDocument
+            )
+            if document != parent_document:
+                # This is where we help the incremental generation to
+                # understand that the related documents must be
+                # re-generated together.
+                file_dependency_manager.add_dependency(
+                    document.meta.input_doc_full_path,
+                    document.meta.output_document_full_path,
+                    parent_document.meta.input_doc_full_path,
+                )
+                file_dependency_manager.add_dependency(
+                    parent_document.meta.input_doc_full_path,
+                    parent_document.meta.output_document_full_path,
+                    document.meta.input_doc_full_path,
+                )
+        elif reference.ref_type == ReferenceType.CHILD:
+            child_reference: ChildReqReference = assert_cast(
+                reference, ChildReqReference
+            )
+            child_requirement = (
+                traceability_index.graph_database.get_link_value_weak(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=child_reference.ref_uid,
+                )
+            )
+            if child_requirement is None:
+                raise StrictDocException(
+                    f"[DocumentIndex.create] "
+                    f"Requirement {requirement.reserved_uid} "
+                    f"references a "
+                    f"child requirement that doesn't exist: "
+                    f"{child_reference.ref_uid}."
+                )
+            traceability_index.graph_database.create_link(
+                link_type=GraphLinkType.NODE_TO_PARENT_NODES,
+                lhs_node=child_requirement,
+                rhs_node=requirement,
+                edge=child_reference.role,
+            )
+            traceability_index.graph_database.create_link(
+                link_type=GraphLinkType.NODE_TO_CHILD_NODES,
+                lhs_node=requirement,
+                rhs_node=child_requirement,
+                edge=child_reference.role,
+            )
+            # Set document dependencies.
+            child_requirement_document = assert_cast(
+                child_requirement.get_document(), SDocDocument
+            )
+            if document != child_requirement_document:
+                # This is where we help the incremental generation to
+                # understand that the related documents must be
+                # re-generated together.
+                file_dependency_manager.add_dependency(
+                    document.meta.input_doc_full_path,
+                    document.meta.output_document_full_path,
+                    child_requirement_document.meta.input_doc_full_path,
+                )
+                file_dependency_manager.add_dependency(
+                    child_requirement_document.meta.input_doc_full_path,
+                    child_requirement_document.meta.output_document_full_path,
+                    document.meta.input_doc_full_path,
+                )
+        else:
+            raise AssertionError(reference.ref_type)
+
+    @staticmethod
+    def _detect_cycles(
+        traceability_index: TraceabilityIndex, nodes: Iterable[SDocElementIF]
+    ) -> None:
+        requirements: List[Union[SDocNode, SDocCompositeNode]] = []
+        for node in nodes:
+            if not node.is_requirement:
+                continue
+            requirement: Union[SDocNode, SDocCompositeNode] = assert_cast(
+                node, (SDocNode, SDocCompositeNode)
+            )
+            if requirement.reserved_uid is None:
+                continue
+            requirements.append(requirement)
+
+        # @relation(SDOC-SRS-30, scope=range_start)
+        # Detect cycles
+        graph_database: GraphDatabase = traceability_index.graph_database
+
+        def parent_links_(node_):
+            return graph_database.get_link_values(
+                link_type=GraphLinkType.NODE_TO_PARENT_NODES, lhs_node=node_
+            )
+
+        def child_links_(node_):
+            return graph_database.get_link_values(
+                link_type=GraphLinkType.NODE_TO_CHILD_NODES, lhs_node=node_
+            )
+
+        for links_function_ in (parent_links_, child_links_):
+            cycles = GraphCycleDetector.find_cycles(
+                requirements, links_function_
+            )
+            if len(cycles) > 0:
+                TraceabilityIndexBuilder._report_cycle(
+                    traceability_index, requirements
+                )
+        # @relation(SDOC-SRS-30, scope=range_end)
+
+    @staticmethod
+    def _report_cycle(
+        traceability_index: TraceabilityIndex,
+        requirements: List[Union[SDocNode, SDocCompositeNode]],
+    ) -> None:
+        """
+        Raises the error of the first cycle that is reached by a depth-first
+        traversal of the parent and child relations of the requirements, so
+        that the error shows the full path of the cycle.
+        """
+
+        parents_cycle_detector = TreeCycleDetector()
+        children_cycle_detector = TreeCycleDetector()
+        for requirement in requirements:
+
+            def parent_cycle_traverse_(node_id):
+                current_node = traceability_index.graph_database.get_link_value(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=node_id,
+                )
+                return list(
+                    map(
+                        lambda node_: node_.reserved_uid,
+                        traceability_index.graph_database.get_link_values(
+                            link_type=GraphLinkType.NODE_TO_PARENT_NODES,
+                            lhs_node=current_node,
+                        ),
+                    )
+                )
+
+            parents_cycle_detector.check_node(
+                requirement.reserved_uid,
+                parent_cycle_traverse_,
+            )
+
+            def child_cycle_traverse_(node_id):
+                current_node = traceability_index.graph_database.get_link_value(
+                    link_type=GraphLinkType.UID_TO_NODE,
+                    lhs_node=node_id,
+                )
+                return list(
+                    map(
+                        lambda node_: node_.reserved_uid,
+                        traceability_index.graph_database.get_link_values(
+                            link_type=GraphLinkType.NODE_TO_CHILD_NODES,
+                            lhs_node=current_node,
+                        ),
+                    )
+                )
+
+            children_cycle_detector.check_node(
+                requirement.reserved_uid,
+                child_cycle_traverse_,
+            )
+        raise AssertionError("A cycle has been found but not reported.")
+
     @staticmethod
     def _filter_nodes(
         project_config: ProjectConfig, traceability_index: TraceabilityIndex
@@ -782,15 +1428,26 @@ class TraceabilityIndexBuilder:
             except TextXSyntaxError:
                 print("error: Cannot parse filter query.")  # noqa: T201
                 sys.exit(1)
+            # The nodes that are not candidates of a query are filtered out
+            # without evaluating the query.
+            requirements_candidate_nodes = (
+                requirements_query_object.get_candidate_nodes()
+            )
+            sections_candidate_nodes = (
+                sections_query_object.get_candidate_nodes()
+            )
             try:
                 for document in traceability_index.document_tree.document_list:
                     document_iterator = (
                         traceability_index.get_document_iterator(document)
                     )
                     for node in document_iterator.all_content():
-                        if (
-                            node.is_section
-                            and not sections_query_object.evaluate(node)
+                        if node.is_section and (
+                            (
+                                sections_candidate_nodes is not None
+                                and node not in sections_candidate_nodes
+                            )
+                            or not sections_query_object.evaluate(node)
                         ):
                             node.ng_whitelisted = False
                             # If the node is the last one, we check if all other
@@ -805,9 +1462,12 @@ class TraceabilityIndexBuilder:
                                 if isinstance(node.parent, SDocSection):
                                     node.parent.blacklist_if_needed()
 
-                        elif (
-                            node.is_requirement
-                            and not requirements_query_object.evaluate(node)
+                        elif node.is_requirement and (
+                            (
+                                requirements_candidate_nodes is not None
+                                and node not in requirements_candidate_nodes
+                            )
+                            or not requirements_query_object.evaluate(node)
                         ):
                             node.ng_whitelisted = False
                             # If the node is the last one, we check if all other
@@ -828,3 +1488,5 @@ class TraceabilityIndexBuilder:
                     f"{attribute_error_}"
                 )
                 sys.exit(1)
+            # The filtered out nodes must not be iterated anymore.
+            traceability_index.invalidate_document_iterators()
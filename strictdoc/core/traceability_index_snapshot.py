@@ -0,0 +1,182 @@
+import hashlib
+import pickle
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from strictdoc.backend.sdoc.cache_format import CacheFormat
+from strictdoc.backend.sdoc.cache_manifest import CacheManifest
+from strictdoc.core.asset_manager import AssetManager
+from strictdoc.core.cache_backend import CacheBackend
+from strictdoc.core.file_tree import FileTree
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.core.source_tree import SourceTree
+from strictdoc.core.traceability_index import TraceabilityIndex
+
+
+class TraceabilityIndexSnapshot:
+    """
+    A snapshot of a fully built traceability index: the document tree, the
+    graph database, the document iterators and the file traceability.
+
+    Every combination of the project configuration and the command-line
+    options, e.g., the input paths, the output folder or the filters, has
+    its own snapshot slot in the cache. A slot holds the snapshot together
+    with the content hashes of all input files it was built from. When none
+    of the input files has changed, the traceability index is loaded from
+    the snapshot instead of being built again. When only some documents have
+    changed, the snapshot is the starting point of an incremental update, see
+    TraceabilityIndexBuilder.
+    """
+
+    CACHE_NAMESPACE = "traceability_index"
+
+    # The snapshot pickles the traceability index with its graph database,
+    # document iterators and other helper objects of the core, in addition to
+    # the document models covered by the schema key of the cache format.
+    SCHEMA_SOURCE_GLOBS = ("core/**/*.py",)
+
+    _schema_key: Optional[bytes] = None
+
+    # The types of the project config options that are a part of the
+    # snapshot slot key. Objects such as the runtime environment are skipped.
+    CONFIG_VALUE_TYPES = (
+        str,
+        int,
+        float,
+        bool,
+        list,
+        tuple,
+        dict,
+        datetime,
+        type(None),
+    )
+
+    def __init__(
+        self,
+        project_config: ProjectConfig,
+        slot_key: str,
+        input_hashes: Dict[str, str],
+    ) -> None:
+        self.project_config: ProjectConfig = project_config
+        self.slot_key: str = slot_key
+        self.input_hashes: Dict[str, str] = input_hashes
+
+    @staticmethod
+    def create(
+        *,
+        project_config: ProjectConfig,
+        file_trees: List[FileTree],
+        asset_manager: AssetManager,
+        source_tree: Optional[SourceTree],
+        build_options: Tuple[object, ...],
+    ) -> "TraceabilityIndexSnapshot":
+        slot_hash = hashlib.md5(TraceabilityIndexSnapshot.get_schema_key())
+        for option_name_, option_value_ in sorted(vars(project_config).items()):
+            if isinstance(
+                option_value_, TraceabilityIndexSnapshot.CONFIG_VALUE_TYPES
+            ):
+                slot_hash.update(f"{option_name_}={option_value_!r}\n".encode())
+        slot_hash.update(repr(build_options).encode())
+
+        cache_manifest = CacheManifest.get_instance(project_config)
+        input_hashes: Dict[str, str] = {}
+        for file_tree_ in file_trees:
+            for _, doc_file_, _ in file_tree_.iterate():
+                path_to_doc_file = doc_file_.get_full_path()
+                input_hashes[path_to_doc_file] = cache_manifest.get_file_md5(
+                    path_to_doc_file
+                )
+        # Only the locations of the asset folders are used by the index.
+        for asset_dir_ in asset_manager.iterate():
+            input_hashes[asset_dir_.full_path] = ""
+        if source_tree is not None:
+            for source_file_ in source_tree.source_files:
+                input_hashes[source_file_.full_path] = (
+                    cache_manifest.get_file_md5(source_file_.full_path)
+                )
+
+        return TraceabilityIndexSnapshot(
+            project_config, slot_hash.hexdigest(), input_hashes
+        )
+
+    @staticmethod
+    def get_schema_key() -> bytes:
+        if TraceabilityIndexSnapshot._schema_key is None:
+            schema_hash = hashlib.md5(CacheFormat.get_schema_key())
+            CacheFormat.hash_source_files(
+                schema_hash, TraceabilityIndexSnapshot.SCHEMA_SOURCE_GLOBS
+            )
+            TraceabilityIndexSnapshot._schema_key = (
+                schema_hash.hexdigest().encode("ascii")
+            )
+        return TraceabilityIndexSnapshot._schema_key
+
+    def load(self) -> Optional[TraceabilityIndex]:
+        previous_snapshot = self.load_previous()
+        if previous_snapshot is None:
+            return None
+        input_hashes, traceability_index = previous_snapshot
+        if input_hashes != self.input_hashes:
+            return None
+        return traceability_index
+
+    def load_previous(
+        self,
+    ) -> Optional[Tuple[Dict[str, str], TraceabilityIndex]]:
+        """
+        Returns the snapshot stored in the slot together with the content
+        hashes of the input files it was built from, no matter whether the
+        input files have changed since then.
+        """
+
+        blob: Optional[bytes] = CacheBackend.get_instance(
+            self.project_config
+        ).get(TraceabilityIndexSnapshot.CACHE_NAMESPACE, self.slot_key)
+        if blob is None:
+            return None
+        try:
+            snapshot = CacheFormat.decode(blob)
+        except Exception:
+            # A damaged snapshot only means that the index is built again.
+            return None
+        if snapshot is None:
+            return None
+        input_hashes, traceability_index = snapshot
+        assert isinstance(traceability_index, TraceabilityIndex)
+        return input_hashes, traceability_index
+
+    def get_changed_documents(
+        self, previous_input_hashes: Dict[str, str]
+    ) -> Optional[List[str]]:
+        """
+        Returns the paths to the SDoc documents whose content has changed
+        since the previous snapshot. None is returned if anything else has
+        changed: a file or an asset folder was added or removed, or a grammar,
+        a JUnit XML report or a source file was modified. Such changes can
+        only be handled by building the index from scratch.
+        """
+
+        if previous_input_hashes.keys() != self.input_hashes.keys():
+            return None
+        changed_documents: List[str] = []
+        for path_to_input_file_, input_hash_ in self.input_hashes.items():
+            if previous_input_hashes[path_to_input_file_] == input_hash_:
+                continue
+            if not path_to_input_file_.endswith(".sdoc"):
+                return None
+            changed_documents.append(path_to_input_file_)
+        return changed_documents
+
+    def save(self, traceability_index: TraceabilityIndex) -> None:
+        try:
+            blob: bytes = CacheFormat.encode(
+                (self.input_hashes, traceability_index),
+                self.project_config.cache_compression,
+            )
+        except (RecursionError, pickle.PicklingError, TypeError):
+            # Very deep document trees can exceed the recursion limit of the
+            # pickle module. Such trees are simply not snapshotted.
+            return
+        CacheBackend.get_instance(self.project_config).put(
+            TraceabilityIndexSnapshot.CACHE_NAMESPACE, self.slot_key, blob
+        )
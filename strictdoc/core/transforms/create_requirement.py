@@ -288,4 +288,5 @@ class CreateRequirementTransform:
                 elif isinstance(part, InlineLink):
                     traceability_index.create_inline_link(part)
 
+        traceability_index.invalidate_document_iterators()
         traceability_index.update_last_updated()
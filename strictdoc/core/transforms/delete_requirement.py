@@ -55,4 +55,5 @@ class DeleteRequirementCommand:
         else:
             requirement_parent.section_contents.remove(self.requirement)
 
+        self.traceability_index.invalidate_document_iterators()
         self.traceability_index.update_last_updated()
@@ -42,4 +42,5 @@ class DeleteSectionCommand:
         )
         section_parent.section_contents.remove(section)
 
+        self.traceability_index.invalidate_document_iterators()
         self.traceability_index.update_last_updated()
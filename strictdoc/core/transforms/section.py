@@ -117,6 +117,7 @@ class UpdateSectionCommand:
             section.reserved_uid = None
 
         traceability_index.create_section(section)
+        traceability_index.invalidate_query_node_index()
 
 
 class CreateSectionCommand:
@@ -273,6 +274,7 @@ class CreateSectionCommand:
         )
 
         parent.section_contents.insert(insert_to_idx, section)
+        traceability_index.invalidate_document_iterators()
 
         traceability_index.create_section(section)
 
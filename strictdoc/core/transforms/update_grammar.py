@@ -55,5 +55,6 @@ class UpdateGrammarCommand:
             parent=document, elements=updated_grammar_elements
         )
         document.grammar = new_grammar
+        self.traceability_index.invalidate_document_iterators()
 
         return True
@@ -139,4 +139,7 @@ class UpdateGrammarElementCommand:
                 requirement.relations = new_relations
             requirement.ordered_fields_lookup = new_ordered_fields_lookup
 
+        # The renamed fields may have changed the titles of the nodes.
+        self.traceability_index.invalidate_document_iterators()
+
         return True
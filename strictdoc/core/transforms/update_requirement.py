@@ -415,6 +415,7 @@ class CreateOrUpdateNodeCommand:
             requirement, existing_node_fields
         )
 
+        traceability_index.invalidate_document_iterators()
         traceability_index.update_last_updated()
 
         return CreateOrUpdateNodeResult(
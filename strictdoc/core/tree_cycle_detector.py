@@ -1,5 +1,6 @@
 # mypy: disable-error-code="no-untyped-call,no-untyped-def,var-annotated"
 from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
 
 from strictdoc.backend.sdoc.errors.document_tree_error import DocumentTreeError
 
@@ -71,3 +72,77 @@ class SingleShotTreeCycleDetector:
                 visited.remove(current_node)
                 checked.add(current_node)
                 stack.pop()
+
+
+class GraphCycleDetector:
+    """
+    Finds all cycles of a graph in a single pass with Tarjan's algorithm of
+    strongly connected components: every node and every link is visited once,
+    no matter how many paths lead to a node.
+
+    A strongly connected component is cyclic if it has more than one node or
+    if its only node links to itself. The detector only finds the cycles. The
+    error with the path of a cycle is produced by TreeCycleDetector, which is
+    only run when a cycle is found.
+    """
+
+    @staticmethod
+    def find_cycles(
+        nodes: Iterable[Any], links_function: Callable[[Any], Iterable[Any]]
+    ) -> List[List[Any]]:
+        next_index = 0
+        indexes: Dict[Any, int] = {}
+        low_links: Dict[Any, int] = {}
+        component_stack: List[Any] = []
+        nodes_on_component_stack: Set[Any] = set()
+        self_linked_nodes: Set[Any] = set()
+        cycles: List[List[Any]] = []
+
+        for root_node_ in nodes:
+            if root_node_ in indexes:
+                continue
+            indexes[root_node_] = low_links[root_node_] = next_index
+            next_index += 1
+            component_stack.append(root_node_)
+            nodes_on_component_stack.add(root_node_)
+            stack: List[Tuple[Any, Iterator[Any]]] = [
+                (root_node_, iter(links_function(root_node_)))
+            ]
+            while stack:
+                current_node, node_links = stack[-1]
+                for node_link_ in node_links:
+                    if node_link_ not in indexes:
+                        indexes[node_link_] = low_links[node_link_] = next_index
+                        next_index += 1
+                        component_stack.append(node_link_)
+                        nodes_on_component_stack.add(node_link_)
+                        stack.append(
+                            (node_link_, iter(links_function(node_link_)))
+                        )
+                        break
+                    if node_link_ in nodes_on_component_stack:
+                        if node_link_ == current_node:
+                            self_linked_nodes.add(current_node)
+                        low_links[current_node] = min(
+                            low_links[current_node], indexes[node_link_]
+                        )
+                else:
+                    stack.pop()
+                    if stack:
+                        previous_node = stack[-1][0]
+                        low_links[previous_node] = min(
+                            low_links[previous_node], low_links[current_node]
+                        )
+                    if low_links[current_node] != indexes[current_node]:
+                        continue
+                    component: List[Any] = []
+                    while True:
+                        component_node = component_stack.pop()
+                        nodes_on_component_stack.remove(component_node)
+                        component.append(component_node)
+                        if component_node == current_node:
+                            break
+                    if len(component) > 1 or current_node in self_linked_nodes:
+                        component.reverse()
+                        cycles.append(component)
+        return cycles
@@ -7,6 +7,7 @@ from strictdoc.core.document_iterator import DocumentCachingIterator
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.core.traceability_index import TraceabilityIndex
 from strictdoc.export.html.renderers.link_renderer import LinkRenderer
+from strictdoc.helpers.output_writer import OutputWriter
 
 
 class DoxygenGenerator:
@@ -59,5 +60,4 @@ class DoxygenGenerator:
 {template_all_nodes.rstrip()}
 </tagfile>
 """
-        with open(output_path, "w", encoding="utf8") as file:
-            file.write(template_xml)
+        OutputWriter.get_instance().write(output_path, template_xml)
@@ -1,7 +1,8 @@
 # mypy: disable-error-code="no-untyped-call,no-untyped-def,operator"
+import glob
+import hashlib
 import os
-from pathlib import Path
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 from markupsafe import Markup
 from pygments import highlight
@@ -17,6 +18,9 @@ from pygments.lexers.special import TextLexer
 from pygments.lexers.templates import HtmlDjangoLexer
 from pygments.util import ClassNotFound
 
+import strictdoc
+from strictdoc.backend.sdoc.cache_format import CacheFormat
+from strictdoc.backend.sdoc.cache_manifest import CacheManifest
 from strictdoc.backend.sdoc_source_code.models.function_range_marker import (
     ForwardFunctionRangeMarker,
     FunctionRangeMarker,
@@ -29,6 +33,7 @@ from strictdoc.backend.sdoc_source_code.models.range_marker import (
 from strictdoc.backend.sdoc_source_code.models.source_file_info import (
     SourceFileTraceabilityInfo,
 )
+from strictdoc.core.cache_backend import CacheBackend
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.core.source_tree import SourceFile
 from strictdoc.core.traceability_index import TraceabilityIndex
@@ -42,10 +47,21 @@ from strictdoc.export.html.renderers.link_renderer import LinkRenderer
 from strictdoc.export.html.renderers.markup_renderer import MarkupRenderer
 from strictdoc.helpers.cast import assert_cast
 from strictdoc.helpers.file_modification_time import get_file_modification_time
+from strictdoc.helpers.output_writer import OutputWriter
 from strictdoc.helpers.timing import measure_performance
 
 
 class SourceFileViewHTMLGenerator:
+    CACHE_NAMESPACE = "source_file_view"
+
+    # The templates and the code that a source file page is rendered with.
+    RENDERING_SOURCE_GLOBS = (
+        "export/html/generators/source_file_view_generator.py",
+        "export/html/generators/view_objects/source_file_view_object.py",
+        "export/html/templates/**/*.jinja*",
+    )
+    _rendering_key: Optional[bytes] = None
+
     @staticmethod
     def export_to_file(
         *,
@@ -53,18 +69,48 @@ class SourceFileViewHTMLGenerator:
         source_file: SourceFile,
         traceability_index: TraceabilityIndex,
         html_templates: HTMLTemplates,
-    ) -> None:
-        if os.path.isfile(source_file.output_file_full_path) and (
-            get_file_modification_time(source_file.full_path)
-            < get_file_modification_time(source_file.output_file_full_path)
-            and not traceability_index.file_dependency_manager.must_generate(
-                source_file.full_path
+    ) -> bool:
+        """
+        Returns False if the page is up-to-date and was skipped.
+
+        A page is skipped when it is newer than the source file and the
+        documents that the file is linked with, or when the fingerprint of
+        its inputs is the same as the one of the existing page. The latter
+        also holds after a fresh checkout or a cache restore in CI, when the
+        modification times of all files are new.
+        """
+
+        cache_backend = CacheBackend.get_instance(project_config)
+        cache_key = hashlib.md5(
+            source_file.output_file_full_path.encode()
+        ).hexdigest()
+        fingerprint: bytes = SourceFileViewHTMLGenerator.get_fingerprint(
+            project_config=project_config,
+            source_file=source_file,
+            traceability_index=traceability_index,
+        )
+
+        if os.path.isfile(source_file.output_file_full_path):
+            previous_fingerprint: Optional[bytes] = cache_backend.get(
+                SourceFileViewHTMLGenerator.CACHE_NAMESPACE, cache_key
             )
-        ):
-            with measure_performance(
-                f"Skip: {source_file.in_doctree_source_file_rel_path}"
+            if previous_fingerprint == fingerprint or (
+                get_file_modification_time(source_file.full_path)
+                < get_file_modification_time(source_file.output_file_full_path)
+                and not traceability_index.file_dependency_manager.must_generate(
+                    source_file.full_path
+                )
             ):
-                return
+                with measure_performance(
+                    f"Skip: {source_file.in_doctree_source_file_rel_path}"
+                ):
+                    if previous_fingerprint != fingerprint:
+                        cache_backend.put(
+                            SourceFileViewHTMLGenerator.CACHE_NAMESPACE,
+                            cache_key,
+                            fingerprint,
+                        )
+                    return False
 
         with measure_performance(
             f"File: {source_file.in_doctree_source_file_rel_path}"
@@ -75,13 +121,96 @@ class SourceFileViewHTMLGenerator:
                 traceability_index=traceability_index,
                 html_templates=html_templates,
             )
-            Path(source_file.output_dir_full_path).mkdir(
-                parents=True, exist_ok=True
+            OutputWriter.get_instance().write(
+                source_file.output_file_full_path, document_content
+            )
+        cache_backend.put(
+            SourceFileViewHTMLGenerator.CACHE_NAMESPACE, cache_key, fingerprint
+        )
+        return True
+
+    @staticmethod
+    def get_fingerprint(
+        *,
+        project_config: ProjectConfig,
+        source_file: SourceFile,
+        traceability_index: TraceabilityIndex,
+    ) -> bytes:
+        """
+        The content hashes of everything a source file page is rendered from:
+        the source file, its markers, the documents it is linked with, the
+        project config, and StrictDoc's own templates. The modification
+        times are not a part of the fingerprint.
+        """
+
+        cache_manifest = CacheManifest.get_instance(project_config)
+        fingerprint = hashlib.md5(
+            SourceFileViewHTMLGenerator._get_rendering_key()
+        )
+        for option_name_, option_value_ in sorted(vars(project_config).items()):
+            # The modification time of the config changes with every checkout.
+            if option_name_ == "config_last_update":
+                continue
+            if isinstance(option_value_, (str, int, float, bool, list, dict)):
+                fingerprint.update(
+                    f"{option_name_}={option_value_!r}\n".encode()
+                )
+
+        fingerprint.update(
+            cache_manifest.get_file_md5(source_file.full_path).encode()
+        )
+        trace_info: SourceFileTraceabilityInfo = (
+            traceability_index.get_coverage_info(
+                source_file.in_doctree_source_file_rel_path_posix
+            )
+        )
+        for marker_ in trace_info.markers:
+            fingerprint.update(
+                repr(
+                    (
+                        marker_.__class__.__name__,
+                        marker_.ng_source_line_begin,
+                        marker_.ng_range_line_begin,
+                        marker_.ng_range_line_end,
+                        marker_.reqs,
+                        marker_.role,
+                    )
+                ).encode()
+            )
+
+        dependency_entry = (
+            traceability_index.file_dependency_manager.dependencies_now.get(
+                source_file.full_path
+            )
+        )
+        if dependency_entry is not None:
+            for path_to_document_ in sorted(dependency_entry.dependencies):
+                fingerprint.update(path_to_document_.encode())
+                fingerprint.update(
+                    cache_manifest.get_file_md5(path_to_document_).encode()
+                )
+        return fingerprint.hexdigest().encode("ascii")
+
+    @staticmethod
+    def _get_rendering_key() -> bytes:
+        if SourceFileViewHTMLGenerator._rendering_key is None:
+            rendering_hash = hashlib.md5(CacheFormat.get_schema_key())
+            path_to_strictdoc = os.path.dirname(strictdoc.__file__)
+            for (
+                source_glob_
+            ) in SourceFileViewHTMLGenerator.RENDERING_SOURCE_GLOBS:
+                for path_to_source_ in sorted(
+                    glob.glob(
+                        os.path.join(path_to_strictdoc, source_glob_),
+                        recursive=True,
+                    )
+                ):
+                    with open(path_to_source_, "rb") as source_file_:
+                        rendering_hash.update(source_file_.read())
+            SourceFileViewHTMLGenerator._rendering_key = (
+                rendering_hash.hexdigest().encode("ascii")
             )
-            with open(
-                source_file.output_file_full_path, "w", encoding="utf-8"
-            ) as file:
-                file.write(document_content)
+        return SourceFileViewHTMLGenerator._rendering_key
 
     @staticmethod
     def export(
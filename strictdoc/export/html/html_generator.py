@@ -10,7 +10,7 @@ from strictdoc.backend.sdoc.models.document import SDocDocument
 from strictdoc.core.asset_manager import AssetDir
 from strictdoc.core.document_meta import DocumentMeta
 from strictdoc.core.project_config import ProjectConfig, ProjectFeature
-from strictdoc.core.source_tree import SourceTree
+from strictdoc.core.source_tree import SourceFile, SourceTree
 from strictdoc.core.traceability_index import TraceabilityIndex
 from strictdoc.export.html.document_type import DocumentType
 from strictdoc.export.html.generators.document import DocumentHTMLGenerator
@@ -47,11 +47,17 @@ from strictdoc.export.html.generators.traceability_matrix import (
 from strictdoc.export.html.html_templates import HTMLTemplates
 from strictdoc.export.html.renderers.link_renderer import LinkRenderer
 from strictdoc.export.html.renderers.markup_renderer import MarkupRenderer
+from strictdoc.export.html.renderers.rst_fragment_prerenderer import (
+    RstFragmentPrerenderer,
+)
 from strictdoc.export.html.tools.html_embedded import HTMLEmbedder
+from strictdoc.helpers.exception import StrictDocException
 from strictdoc.helpers.file_modification_time import get_file_modification_time
 from strictdoc.helpers.file_system import sync_dir
 from strictdoc.helpers.git_client import GitClient
+from strictdoc.helpers.output_writer import OutputWriter
 from strictdoc.helpers.paths import SDocRelativePath
+from strictdoc.helpers.shard import get_shard_items
 from strictdoc.helpers.timing import measure_performance
 
 
@@ -68,7 +74,15 @@ class HTMLGenerator:
         *,
         traceability_index: TraceabilityIndex,
         parallelizer,
+        shard: Optional[Tuple[int, int]] = None,
     ):
+        """
+        With a shard K/N, only the K-th of N slices of the documents and
+        source files is exported. The pages that cover the whole project,
+        e.g., the project tree, are exported by export_merged_tree() after all
+        shards are exported.
+        """
+
         Path(self.project_config.export_output_html_root).mkdir(
             parents=True, exist_ok=True
         )
@@ -80,27 +94,134 @@ class HTMLGenerator:
             export_output_html_root=self.project_config.export_output_html_root,
         )
 
-        # Export all documents in parallel.
+        # Export all documents in parallel. The workers are forked after the
+        # traceability index has been built: they inherit the index and only
+        # receive the paths to the documents.
         export_binding = partial(
-            self.export_single_document_with_performance,
+            self.export_single_document_by_path,
             traceability_index=traceability_index,
         )
 
-        # By default, do not export included documents. Only, if the option to
-        # include is provided.
-        documents_to_export: List[SDocDocument] = []
+        documents_to_export: List[SDocDocument] = self.get_documents_to_export(
+            traceability_index
+        )
+        if shard is not None:
+            documents_to_export = get_shard_items(documents_to_export, *shard)
+
+        # Render the RST fragments of the documents that are going to be
+        # generated into the fragment cache first, so that the page generation
+        # is not interleaved with docutils work.
+        with measure_performance("Pre-render RST fragments"):
+            RstFragmentPrerenderer.prerender(
+                documents=[
+                    document_
+                    for document_ in documents_to_export
+                    if not self.is_document_up_to_date(
+                        document_, traceability_index
+                    )
+                ],
+                traceability_index=traceability_index,
+                project_config=self.project_config,
+                html_templates=self.html_templates,
+                parallelizer=parallelizer,
+            )
 
-        if self.project_config.export_included_documents:
-            documents_to_export[:] = (
-                traceability_index.document_tree.document_list
+        parallelizer.run_parallel_forked(
+            [
+                document_.meta.input_doc_full_path
+                for document_ in documents_to_export
+            ],
+            export_binding,
+            weight_func=os.path.getsize,
+        )
+        parallelizer.print_utilization()
+
+        if shard is not None:
+            if self.project_config.is_feature_activated(
+                ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
+            ):
+                self.export_source_file_screens(
+                    traceability_index=traceability_index,
+                    parallelizer=parallelizer,
+                    shard=shard,
+                )
+            print(  # noqa: T201
+                f"Export of shard {shard[0]}/{shard[1]} completed: "
+                f"{len(documents_to_export)} document(s). Documentation "
+                "tree can be found at:\n"
+                f"{self.project_config.export_output_html_root}"
             )
-        else:
-            for document_ in traceability_index.document_tree.document_list:
-                if document_.document_is_included():
-                    continue
-                documents_to_export.append(document_)
+            return
+
+        self.export_project_screens(
+            traceability_index=traceability_index,
+            parallelizer=parallelizer,
+        )
 
-        parallelizer.run_parallel(documents_to_export, export_binding)
+        print(  # noqa: T201
+            "Export completed. Documentation tree can be found at:\n"
+            f"{self.project_config.export_output_html_root}"
+        )
+
+    def export_merged_tree(
+        self,
+        *,
+        traceability_index: TraceabilityIndex,
+    ):
+        """
+        Completes an export whose documents and source files have been
+        exported by shards, see export_complete_tree(), and copied to the
+        output folder.
+        """
+
+        missing_files: List[str] = [
+            document_.meta.output_document_full_path
+            for document_ in self.get_documents_to_export(traceability_index)
+            if not os.path.isfile(document_.meta.output_document_full_path)
+        ]
+        if self.project_config.is_feature_activated(
+            ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
+        ):
+            missing_files.extend(
+                source_file_.output_file_full_path
+                for source_file_ in self.get_source_files_to_export(
+                    traceability_index
+                )
+                if not os.path.isfile(source_file_.output_file_full_path)
+            )
+        if len(missing_files) > 0:
+            raise StrictDocException(
+                "export-merge: The output of some documents or source files "
+                "is missing. Make sure that every shard has been exported "
+                "and its output has been copied. Missing files:\n"
+                + "\n".join(missing_files)
+            )
+
+        HTMLGenerator.export_assets(
+            traceability_index=traceability_index,
+            project_config=self.project_config,
+            export_output_html_root=self.project_config.export_output_html_root,
+        )
+        self.export_project_screens(
+            traceability_index=traceability_index, parallelizer=None
+        )
+
+        print(  # noqa: T201
+            "Merge completed. Documentation tree can be found at:\n"
+            f"{self.project_config.export_output_html_root}"
+        )
+
+    def export_project_screens(
+        self,
+        *,
+        traceability_index: TraceabilityIndex,
+        parallelizer,
+    ):
+        """
+        Exports the pages that cover the whole project. Without a
+        parallelizer, the source file pages are expected to be exported
+        already.
+        """
 
         # Export document tree.
         # FIXME: It is important that this export is **after** the parallelized
@@ -130,14 +251,43 @@ class HTMLGenerator:
         if self.project_config.is_feature_activated(
             ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
         ):
-            self.export_source_coverage_screen(
-                traceability_index=traceability_index,
-            )
+            if parallelizer is not None:
+                self.export_source_coverage_screen(
+                    traceability_index=traceability_index,
+                    parallelizer=parallelizer,
+                )
+            else:
+                self.export_source_coverage_index(
+                    traceability_index=traceability_index
+                )
 
-        print(  # noqa: T201
-            "Export completed. Documentation tree can be found at:\n"
-            f"{self.project_config.export_output_html_root}"
-        )
+    def get_documents_to_export(
+        self, traceability_index: TraceabilityIndex
+    ) -> List[SDocDocument]:
+        # By default, do not export included documents. Only, if the option to
+        # include is provided.
+        if self.project_config.export_included_documents:
+            return list(traceability_index.document_tree.document_list)
+        return [
+            document_
+            for document_ in traceability_index.document_tree.document_list
+            if not document_.document_is_included()
+        ]
+
+    @staticmethod
+    def get_source_files_to_export(
+        traceability_index: TraceabilityIndex,
+    ) -> List[SourceFile]:
+        assert isinstance(
+            traceability_index.document_tree.source_tree, SourceTree
+        ), traceability_index.document_tree.source_tree
+        return [
+            source_file_
+            for source_file_ in (
+                traceability_index.document_tree.source_tree.source_files
+            )
+            if source_file_.is_referenced
+        ]
 
     @staticmethod
     def export_assets(
@@ -295,33 +445,57 @@ class HTMLGenerator:
                         message=f'Copying project assets "{output_relative_path.relative_path}"',
                     )
 
+    def export_single_document_by_path(
+        self,
+        path_to_input_document: str,
+        traceability_index: TraceabilityIndex,
+    ) -> bool:
+        document: SDocDocument = (
+            traceability_index.document_tree.get_document_by_path(
+                path_to_input_document
+            )
+        )
+        return self.export_single_document_with_performance(
+            document, traceability_index
+        )
+
     def export_single_document_with_performance(
         self,
         document: SDocDocument,
         traceability_index: TraceabilityIndex,
         specific_documents: Optional[Tuple[DocumentType]] = None,
-    ):
+    ) -> bool:
+        """
+        Returns False if the document is up-to-date and was skipped.
+        """
+
         if specific_documents is None:
             specific_documents = DocumentType.all()
 
-        input_doc_full_path = document.meta.input_doc_full_path
-        output_doc_full_path = document.meta.output_document_full_path
-
-        if os.path.isfile(output_doc_full_path) and (
-            get_file_modification_time(input_doc_full_path)
-            < get_file_modification_time(output_doc_full_path)
-            and not traceability_index.file_dependency_manager.must_generate(
-                document.meta.input_doc_full_path
-            )
-        ):
+        if self.is_document_up_to_date(document, traceability_index):
             with measure_performance(f"Skip: {document.title}"):
-                return
+                return False
         with measure_performance(f"Published: {document.title}"):
             self.export_single_document(
                 document,
                 traceability_index,
                 specific_documents=specific_documents,
             )
+        return True
+
+    @staticmethod
+    def is_document_up_to_date(
+        document: SDocDocument, traceability_index: TraceabilityIndex
+    ) -> bool:
+        input_doc_full_path = document.meta.input_doc_full_path
+        output_doc_full_path = document.meta.output_document_full_path
+        return os.path.isfile(output_doc_full_path) and (
+            get_file_modification_time(input_doc_full_path)
+            < get_file_modification_time(output_doc_full_path)
+            and not traceability_index.file_dependency_manager.must_generate(
+                document.meta.input_doc_full_path
+            )
+        )
 
     def export_single_document(
         self,
@@ -368,8 +542,9 @@ class HTMLGenerator:
                 html_templates=self.html_templates,
             )
             document_out_file = document_meta.get_html_doc_path()
-            with open(document_out_file, "w", encoding="utf8") as file:
-                file.write(document_content)
+            OutputWriter.get_instance().write(
+                document_out_file, document_content
+            )
 
         # Single Document Table pages
         if (
@@ -388,8 +563,9 @@ class HTMLGenerator:
                 html_templates=self.html_templates,
             )
             document_out_file = document_meta.get_html_table_path()
-            with open(document_out_file, "w", encoding="utf8") as file:
-                file.write(document_content)
+            OutputWriter.get_instance().write(
+                document_out_file, document_content
+            )
 
         # Single Document Traceability pages
         if (
@@ -408,8 +584,9 @@ class HTMLGenerator:
                 html_templates=self.html_templates,
             )
             document_out_file = document_meta.get_html_traceability_path()
-            with open(document_out_file, "w", encoding="utf8") as file:
-                file.write(document_content)
+            OutputWriter.get_instance().write(
+                document_out_file, document_content
+            )
 
         # Single Document Deep Traceability pages
         if (
@@ -428,8 +605,9 @@ class HTMLGenerator:
                 html_templates=self.html_templates,
             )
             document_out_file = document_meta.get_html_deep_traceability_path()
-            with open(document_out_file, "w", encoding="utf8") as file:
-                file.write(document_content)
+            OutputWriter.get_instance().write(
+                document_out_file, document_content
+            )
 
         # Single Document PDF pages
         if (
@@ -447,8 +625,9 @@ class HTMLGenerator:
                 html_templates=self.html_templates,
             )
             document_out_file = document_meta.get_html_pdf_path()
-            with open(document_out_file, "w", encoding="utf8") as file:
-                file.write(document_content)
+            OutputWriter.get_instance().write(
+                document_out_file, document_content
+            )
 
         if self.project_config.is_feature_activated(
             ProjectFeature.STANDALONE_DOCUMENT_SCREEN
@@ -468,8 +647,9 @@ class HTMLGenerator:
             document_content_with_embedded_assets = HTMLEmbedder.embed_assets(
                 document_content, document_out_file
             )
-            with open(document_out_file, "w", encoding="utf8") as file:
-                file.write(document_content_with_embedded_assets)
+            OutputWriter.get_instance().write(
+                document_out_file, document_content_with_embedded_assets
+            )
 
         return document
 
@@ -490,8 +670,7 @@ class HTMLGenerator:
             traceability_index=traceability_index,
             html_templates=self.html_templates,
         )
-        with open(output_file, "w", encoding="utf8") as file:
-            file.write(output)
+        OutputWriter.get_instance().write(output_file, output)
 
     def export_project_map(
         self,
@@ -509,8 +688,7 @@ class HTMLGenerator:
             traceability_index=traceability_index,
             html_templates=self.html_templates,
         )
-        with open(output_file, "w", encoding="utf8") as file:
-            file.write(output)
+        OutputWriter.get_instance().write(output_file, output)
 
     def export_requirements_coverage_screen(
         self,
@@ -526,33 +704,58 @@ class HTMLGenerator:
             self.project_config.export_output_html_root,
             "traceability_matrix.html",
         )
-        with open(
-            output_html_requirements_coverage, "w", encoding="utf8"
-        ) as file:
-            file.write(requirements_coverage_content)
+        OutputWriter.get_instance().write(
+            output_html_requirements_coverage, requirements_coverage_content
+        )
 
     def export_source_coverage_screen(
         self,
         *,
         traceability_index: TraceabilityIndex,
+        parallelizer,
+    ):
+        self.export_source_file_screens(
+            traceability_index=traceability_index, parallelizer=parallelizer
+        )
+        self.export_source_coverage_index(traceability_index=traceability_index)
+
+    def export_source_file_screens(
+        self,
+        *,
+        traceability_index: TraceabilityIndex,
+        parallelizer,
+        shard: Optional[Tuple[int, int]] = None,
     ):
-        assert isinstance(
-            traceability_index.document_tree.source_tree, SourceTree
-        ), traceability_index.document_tree.source_tree
         print("Generating source files:")  # noqa: T201
-        for (
-            source_file
-        ) in traceability_index.document_tree.source_tree.source_files:
-            if not source_file.is_referenced:
-                continue
 
-            SourceFileViewHTMLGenerator.export_to_file(
-                project_config=self.project_config,
-                source_file=source_file,
-                traceability_index=traceability_index,
-                html_templates=self.html_templates,
-            )
+        source_files: List[SourceFile] = self.get_source_files_to_export(
+            traceability_index
+        )
+        if shard is not None:
+            source_files = get_shard_items(source_files, *shard)
+
+        # Like the documents, the source file pages are exported by forked
+        # workers that inherit the traceability index.
+        source_files_by_path: Dict[str, SourceFile] = {
+            source_file_.full_path: source_file_
+            for source_file_ in source_files
+        }
+        export_binding = partial(
+            self.export_source_file_by_path,
+            source_files_by_path=source_files_by_path,
+            traceability_index=traceability_index,
+        )
+        parallelizer.run_parallel_forked(
+            list(source_files_by_path.keys()),
+            export_binding,
+            weight_func=os.path.getsize,
+        )
 
+    def export_source_coverage_index(
+        self,
+        *,
+        traceability_index: TraceabilityIndex,
+    ):
         source_coverage_content = SourceFileCoverageHTMLGenerator.export(
             project_config=self.project_config,
             traceability_index=traceability_index,
@@ -561,8 +764,22 @@ class HTMLGenerator:
         output_html_source_coverage = os.path.join(
             self.project_config.export_output_html_root, "source_coverage.html"
         )
-        with open(output_html_source_coverage, "w", encoding="utf8") as file:
-            file.write(source_coverage_content)
+        OutputWriter.get_instance().write(
+            output_html_source_coverage, source_coverage_content
+        )
+
+    def export_source_file_by_path(
+        self,
+        path_to_source_file: str,
+        source_files_by_path: Dict[str, SourceFile],
+        traceability_index: TraceabilityIndex,
+    ) -> bool:
+        return SourceFileViewHTMLGenerator.export_to_file(
+            project_config=self.project_config,
+            source_file=source_files_by_path[path_to_source_file],
+            traceability_index=traceability_index,
+            html_templates=self.html_templates,
+        )
 
     def export_project_statistics(
         self,
@@ -582,5 +799,6 @@ class HTMLGenerator:
             self.project_config.export_output_html_root,
             "project_statistics.html",
         )
-        with open(output_html_source_coverage, "w", encoding="utf8") as file:
-            file.write(document_content)
+        OutputWriter.get_instance().write(
+            output_html_source_coverage, document_content
+        )
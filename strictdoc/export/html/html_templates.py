@@ -4,6 +4,7 @@ import glob
 import hashlib
 import os.path
 import shutil
+import tempfile
 from pathlib import Path
 from typing import Any, List, Optional
 
@@ -19,7 +20,10 @@ from jinja2 import (
 from jinja2.ext import Extension
 from markupsafe import Markup
 
+import strictdoc
 from strictdoc import environment
+from strictdoc.core.cache_backend import CacheBackend
+from strictdoc.core.cache_index import CacheIndex
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.helpers.file_modification_time import get_file_modification_time
 from strictdoc.helpers.timing import measure_performance
@@ -100,11 +104,20 @@ class HTMLTemplates:
         assert isinstance(strictdoc_last_update, datetime.datetime)
         if enable_caching:
             cacheable_templates = CompiledHTMLTemplates(project_config)
-            cacheable_templates.reset_jinja_environment_if_outdated(
-                strictdoc_last_update
-            )
-            cacheable_templates.compile_jinja_templates()
-            return CompiledHTMLTemplates(project_config)
+            if not CacheBackend.is_read_only(
+                project_config.get_path_to_cache_dir()
+            ):
+                cacheable_templates.reset_jinja_environment_if_outdated(
+                    strictdoc_last_update
+                )
+                cacheable_templates.compile_jinja_templates()
+                return CompiledHTMLTemplates(project_config)
+            # A read-only cache is only used if it already contains the
+            # compiled templates.
+            if os.path.isdir(
+                cacheable_templates.path_to_jinja_cache_bucket_dir
+            ):
+                return cacheable_templates
 
         return NormalHTMLTemplates()
 
@@ -142,18 +155,23 @@ class NormalHTMLTemplates(HTMLTemplates):
 
 class CompiledHTMLTemplates(HTMLTemplates):
     def __init__(self, project_config: ProjectConfig):
-        path_to_output_dir_hash = hashlib.md5(
-            project_config.output_dir.encode("utf-8")
+        # The compiled templates do not depend on the output folder, so all
+        # builds that use the same StrictDoc installation share them.
+        path_to_templates_hash = hashlib.md5(
+            (
+                environment.get_path_to_html_templates() + strictdoc.__version__
+            ).encode("utf-8")
         ).hexdigest()
         self.path_to_jinja_cache_bucket_dir = os.path.join(
             project_config.get_path_to_cache_dir(),
             "jinja",
-            path_to_output_dir_hash,
+            path_to_templates_hash,
         )
         self._jinja_environment: Optional[JinjaEnvironment] = None
 
     def compile_jinja_templates(self):
         if os.path.isdir(self.path_to_jinja_cache_bucket_dir):
+            CacheIndex.touch(self.path_to_jinja_cache_bucket_dir)
             return
         jinja_environment = Environment(
             loader=FileSystemLoader(environment.get_path_to_html_templates()),
@@ -173,15 +191,25 @@ class CompiledHTMLTemplates(HTMLTemplates):
                     return False
                 return True
 
-            Path(self.path_to_jinja_cache_bucket_dir).mkdir(
-                parents=True, exist_ok=True
+            # Parallel StrictDoc runs may share the cache folder. The templates
+            # are compiled to a temporary folder which is then renamed, so
+            # that a parallel run never loads a partially compiled folder.
+            path_to_jinja_cache_dir = os.path.dirname(
+                self.path_to_jinja_cache_bucket_dir
             )
+            Path(path_to_jinja_cache_dir).mkdir(parents=True, exist_ok=True)
+            path_to_tmp_dir = tempfile.mkdtemp(dir=path_to_jinja_cache_dir)
             jinja_environment.compile_templates(
-                self.path_to_jinja_cache_bucket_dir,
+                path_to_tmp_dir,
                 zip=None,
                 filter_func=filter_function_,
                 ignore_errors=False,
             )
+            try:
+                os.rename(path_to_tmp_dir, self.path_to_jinja_cache_bucket_dir)
+            except OSError:
+                # A parallel run has compiled the same templates first.
+                shutil.rmtree(path_to_tmp_dir, ignore_errors=True)
 
     def jinja_environment(self) -> JinjaEnvironment:
         if self._jinja_environment is not None:
@@ -123,6 +123,21 @@ class MarkupRenderer:
         if (document_type, node_field) in self.cache:
             return self.cache[(document_type, node_field)]
 
+        output = self.fragment_writer.write(
+            self.render_node_field_source(document_type, node_field)
+        )
+        self.cache[(document_type, node_field)] = output
+
+        return output
+
+    def render_node_field_source(
+        self, document_type: DocumentType, node_field: SDocNodeField
+    ) -> str:
+        """
+        Returns the markup of a field with the links and anchors resolved,
+        before it is converted to HTML.
+        """
+
         prev_part = None
         parts_output = ""
         for part in node_field.parts:
@@ -152,7 +167,4 @@ class MarkupRenderer:
                 raise NotImplementedError
             prev_part = part
 
-        output = self.fragment_writer.write(parts_output)
-        self.cache[(document_type, node_field)] = output
-
-        return output
+        return parts_output
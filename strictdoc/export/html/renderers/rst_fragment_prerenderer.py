@@ -0,0 +1,248 @@
+# mypy: disable-error-code="no-untyped-call"
+from functools import partial
+from typing import Dict, Iterator, List, Tuple
+
+from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.backend.sdoc.models.node import SDocNode, SDocNodeField
+from strictdoc.backend.sdoc.models.type_system import RequirementFieldName
+from strictdoc.core.cache_backend import CacheBackend
+from strictdoc.core.document_tree import DocumentTree
+from strictdoc.core.project_config import ProjectConfig, ProjectFeature
+from strictdoc.core.traceability_index import TraceabilityIndex
+from strictdoc.export.html.document_type import DocumentType
+from strictdoc.export.html.html_templates import HTMLTemplates
+from strictdoc.export.html.renderers.link_renderer import LinkRenderer
+from strictdoc.export.html.renderers.markup_renderer import MarkupRenderer
+from strictdoc.export.rst.rst_to_html_fragment_writer import (
+    RstToHtmlFragmentWriter,
+)
+from strictdoc.helpers.cast import assert_cast
+from strictdoc.helpers.parallelizer import Parallelizer
+
+
+class RstFragmentPrerenderer:
+    """
+    Renders the RST fragments of the documents into the fragment cache before
+    the HTML pages are generated.
+
+    Without this stage, every fragment is converted by docutils when Jinja
+    reaches it, and the pages with many large fragments keep a worker busy
+    while the others are idle. Here, the fragments of all documents are
+    collected first: the statements, rationales, comments and multiline
+    fields of every node, for every page type that a document is exported
+    to. The fragments are deduplicated by their cache keys, the cached ones
+    are skipped, and the rest are rendered in parallel. The page generation
+    then finds the fragments in the cache.
+
+    The fragments that are only rendered on the pages of other documents,
+    e.g., the parent requirements on a traceability page, are not collected
+    and are still rendered when a page needs them.
+    """
+
+    @staticmethod
+    def prerender(
+        *,
+        documents: List[SDocDocument],
+        traceability_index: TraceabilityIndex,
+        project_config: ProjectConfig,
+        html_templates: HTMLTemplates,
+        parallelizer: Parallelizer,
+    ) -> None:
+        number_of_fragments = 0
+        # Cache key -> (path to the context document, RST fragment).
+        unique_fragments: Dict[str, Tuple[str, str]] = {}
+        for document_ in documents:
+            for (
+                rst_fragment_,
+                cache_key_,
+            ) in RstFragmentPrerenderer._collect_document_fragments(
+                document_,
+                traceability_index,
+                project_config,
+                html_templates,
+            ):
+                number_of_fragments += 1
+                assert document_.meta is not None
+                unique_fragments.setdefault(
+                    cache_key_,
+                    (document_.meta.input_doc_full_path, rst_fragment_),
+                )
+
+        cached_fragments = CacheBackend.get_instance(project_config).get_many(
+            "rst", unique_fragments.keys()
+        )
+        fragments_to_render: List[Tuple[str, str]] = [
+            fragment_
+            for cache_key_, fragment_ in unique_fragments.items()
+            if cache_key_ not in cached_fragments
+        ]
+
+        results = parallelizer.run_parallel_forked(
+            fragments_to_render,
+            partial(
+                RstFragmentPrerenderer._render_fragment,
+                traceability_index=traceability_index,
+                project_config=project_config,
+            ),
+            weight_func=lambda fragment_: len(fragment_[1]),
+        )
+        number_of_errors = sum(1 for result_ in results if not result_)
+
+        print(  # noqa: T201
+            RstFragmentPrerenderer.get_statistics_message(
+                number_of_fragments,
+                len(unique_fragments),
+                len(cached_fragments),
+                len(fragments_to_render),
+                number_of_errors,
+            ),
+            flush=True,
+        )
+
+    @staticmethod
+    def get_statistics_message(
+        number_of_fragments: int,
+        number_of_unique_fragments: int,
+        number_of_cached_fragments: int,
+        number_of_rendered_fragments: int,
+        number_of_errors: int,
+    ) -> str:
+        dedup_ratio = (
+            number_of_fragments / number_of_unique_fragments
+            if number_of_unique_fragments > 0
+            else 1.0
+        )
+        message = (
+            f"RST fragments: {number_of_fragments} collected, "
+            f"{number_of_unique_fragments} unique "
+            f"(dedup ratio {dedup_ratio:.2f}), "
+            f"{number_of_cached_fragments} cached, "
+            f"{number_of_rendered_fragments} pre-rendered."
+        )
+        if number_of_errors > 0:
+            message += (
+                f" {number_of_errors} fragment(s) with RST errors are left "
+                "to the page generation."
+            )
+        return message
+
+    @staticmethod
+    def get_document_types(
+        document: SDocDocument, project_config: ProjectConfig
+    ) -> List[DocumentType]:
+        """
+        The page types that a document is exported to, see
+        HTMLGenerator.export_single_document().
+        """
+
+        document_types: List[DocumentType] = [DocumentType.document()]
+        if document.config.layout == "Website":
+            return document_types
+        if project_config.is_feature_activated(ProjectFeature.TABLE_SCREEN):
+            document_types.append(DocumentType.table())
+        if project_config.is_feature_activated(
+            ProjectFeature.TRACEABILITY_SCREEN
+        ):
+            document_types.append(DocumentType.trace())
+        if project_config.is_feature_activated(
+            ProjectFeature.DEEP_TRACEABILITY_SCREEN
+        ):
+            document_types.append(DocumentType.deeptrace())
+        if project_config.is_feature_activated(ProjectFeature.HTML2PDF):
+            document_types.append(DocumentType.pdf())
+        return document_types
+
+    @staticmethod
+    def _collect_document_fragments(
+        document: SDocDocument,
+        traceability_index: TraceabilityIndex,
+        project_config: ProjectConfig,
+        html_templates: HTMLTemplates,
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yields the RST fragments of a document with their cache keys. The
+        markup renderer is created exactly as it is for the document's pages,
+        so the fragments and their keys are the same as during the page
+        generation.
+        """
+
+        if document.config.markup not in (None, "RST"):
+            return
+
+        assert document.meta is not None
+        link_renderer = LinkRenderer(
+            root_path=document.meta.get_root_path_prefix(),
+            static_path=project_config.dir_for_sdoc_assets,
+        )
+        markup_renderer = MarkupRenderer.create(
+            document.config.markup,
+            traceability_index,
+            link_renderer,
+            html_templates,
+            project_config,
+            document,
+        )
+        fragment_writer = assert_cast(
+            markup_renderer.fragment_writer, RstToHtmlFragmentWriter
+        )
+        document_types = RstFragmentPrerenderer.get_document_types(
+            document, project_config
+        )
+
+        for node_ in traceability_index.get_document_iterator(
+            document
+        ).all_content(print_fragments=True, print_fragments_from_files=False):
+            if not isinstance(node_, SDocNode):
+                continue
+            for node_field_ in RstFragmentPrerenderer._get_rendered_fields(
+                node_
+            ):
+                for document_type_ in document_types:
+                    rst_fragment = markup_renderer.render_node_field_source(
+                        document_type_, node_field_
+                    )
+                    yield (
+                        rst_fragment,
+                        fragment_writer.get_cache_key(rst_fragment),
+                    )
+
+    @staticmethod
+    def _get_rendered_fields(node: SDocNode) -> Iterator[SDocNodeField]:
+        """
+        The fields that the templates render as markup: the content field,
+        the rationale, the comments and the multiline fields.
+        """
+
+        content_field_name = node.get_content_field_name()
+        if content_field_name in node.ordered_fields_lookup:
+            yield node.get_content_field()
+        if RequirementFieldName.RATIONALE in node.ordered_fields_lookup:
+            yield node.get_field_by_name(RequirementFieldName.RATIONALE)
+        yield from node.get_comment_fields()
+        for _, node_field_ in node.enumerate_meta_fields(
+            skip_single_lines=True
+        ):
+            if node_field_.field_name not in (
+                content_field_name,
+                RequirementFieldName.RATIONALE,
+                RequirementFieldName.COMMENT,
+            ):
+                yield node_field_
+
+    @staticmethod
+    def _render_fragment(
+        fragment: Tuple[str, str],
+        traceability_index: TraceabilityIndex,
+        project_config: ProjectConfig,
+    ) -> bool:
+        path_to_document, rst_fragment = fragment
+        document_tree = assert_cast(
+            traceability_index.document_tree, DocumentTree
+        )
+        context_document: SDocDocument = document_tree.get_document_by_path(
+            path_to_document
+        )
+        return RstToHtmlFragmentWriter(
+            project_config=project_config,
+            context_document=context_document,
+        ).prerender(rst_fragment)
@@ -1,8 +1,13 @@
 # mypy: disable-error-code="no-untyped-def,union-attr"
+import hashlib
 import os
+import re
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
+from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.core.cache_backend import CacheBackend
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.core.traceability_index import TraceabilityIndex
 from strictdoc.export.html.generators.document_pdf import (
@@ -15,10 +20,25 @@ from strictdoc.export.html.renderers.markup_renderer import MarkupRenderer
 from strictdoc.export.html2pdf.pdf_print_driver import PDFPrintDriver
 from strictdoc.helpers.exception import StrictDocException
 from strictdoc.helpers.git_client import GitClient
+from strictdoc.helpers.output_writer import OutputWriter
+from strictdoc.helpers.parallelizer import Parallelizer
 from strictdoc.helpers.timing import measure_performance
 
+# The path to the printable HTML document, the path to the PDF document and
+# the fingerprint of the printable HTML document.
+PrintableDocumentType = Tuple[str, str, bytes]
+
 
 class HTML2PDFGenerator:
+    CACHE_NAMESPACE = "html2pdf"
+
+    # The footer of a printable HTML document contains the current date, see
+    # footer.jinja. The date is left out of the fingerprint, so that the
+    # documents are not printed again only because the day has changed.
+    FOOTER_DATE_REGEX = re.compile(
+        r'(<div class="html2pdf-footer-left">)[^<]*(</div>)'
+    )
+
     @staticmethod
     def export_tree(
         project_config: ProjectConfig,
@@ -26,7 +46,17 @@ class HTML2PDFGenerator:
         html_templates: HTMLTemplates,
         output_html2pdf_root: str,
         flat_assets: bool = False,
+        *,
+        parallelizer: Parallelizer,
     ):
+        """
+        The printable HTML documents are generated in parallel. A document is
+        printed to PDF only if its printable HTML or the assets have changed
+        since its existing PDF was printed. The documents to print are split
+        into batches, and every batch is printed by its own html2print
+        process with its own Chrome.
+        """
+
         if not project_config.is_activated_html2pdf():
             raise StrictDocException("HTML2PDF feature is not enabled")
 
@@ -41,77 +71,206 @@ class HTML2PDFGenerator:
             export_output_html_root=path_to_output_pdf_html_dir,
             flat_assets=flat_assets,
         )
+        assets_fingerprint: bytes = HTML2PDFGenerator.get_assets_fingerprint(
+            path_to_output_pdf_html_dir
+        )
 
-        paths_to_print: List[Tuple[str, str]] = []
-
+        documents: List[SDocDocument] = []
         for document_ in traceability_index.document_tree.document_list:
             # Skip generating the included documents, unless the option is provided.
             if not project_config.export_included_documents:
                 if document_.document_is_included():
                     continue
+            documents.append(document_)
 
-            root_path = document_.meta.get_root_path_prefix()
-
-            link_renderer = LinkRenderer(
-                root_path=root_path,
-                static_path=project_config.dir_for_sdoc_assets,
-            )
-            markup_renderer = MarkupRenderer.create(
-                "RST",
-                traceability_index,
-                link_renderer,
-                html_templates,
-                project_config,
-                document_,
-            )
-
-            with measure_performance("Generating printable HTML document"):
-                document_content = DocumentHTML2PDFGenerator.export(
-                    project_config,
-                    document_,
-                    traceability_index,
-                    markup_renderer,
-                    link_renderer,
-                    git_client=git_client,
-                    standalone=False,
+        printable_documents: List[PrintableDocumentType] = list(
+            parallelizer.run_parallel_forked(
+                documents,
+                partial(
+                    HTML2PDFGenerator._export_printable_document,
+                    project_config=project_config,
+                    traceability_index=traceability_index,
                     html_templates=html_templates,
-                )
-
-            path_to_output_html_doc_dir = os.path.join(
-                path_to_output_pdf_html_dir,
-                document_.meta.output_document_dir_rel_path.relative_path,
-            )
-            Path(path_to_output_html_doc_dir).mkdir(parents=True, exist_ok=True)
-            Path(path_to_output_pdf_pdf_dir).mkdir(parents=True, exist_ok=True)
-
-            path_to_output_html_doc = os.path.join(
-                path_to_output_html_doc_dir,
-                document_.meta.document_filename_base + ".html",
+                    git_client=git_client,
+                    path_to_output_pdf_html_dir=path_to_output_pdf_html_dir,
+                    path_to_output_pdf_pdf_dir=path_to_output_pdf_pdf_dir,
+                    assets_fingerprint=assets_fingerprint,
+                ),
+                weight_func=lambda document_: os.path.getsize(
+                    document_.meta.input_doc_full_path
+                ),
             )
+        )
 
-            with open(
-                path_to_output_html_doc, "w", encoding="utf8"
-            ) as output_html_doc_file_:
-                output_html_doc_file_.write(document_content)
-
-            path_to_output_pdf_dir = os.path.join(
-                path_to_output_pdf_pdf_dir,
-                document_.meta.input_doc_dir_rel_path.relative_path,
+        cache_backend = CacheBackend.get_instance(project_config)
+        previous_fingerprints: Dict[str, bytes] = cache_backend.get_many(
+            HTML2PDFGenerator.CACHE_NAMESPACE,
+            (
+                HTML2PDFGenerator.get_cache_key(path_to_output_pdf_)
+                for _, path_to_output_pdf_, _ in printable_documents
+            ),
+        )
+        paths_to_print: List[Tuple[str, str]] = []
+        fingerprints: Dict[str, bytes] = {}
+        for (
+            path_to_output_html_doc_,
+            path_to_output_pdf_,
+            fingerprint_,
+        ) in printable_documents:
+            if os.path.isfile(path_to_output_pdf_) and (
+                previous_fingerprints.get(
+                    HTML2PDFGenerator.get_cache_key(path_to_output_pdf_)
+                )
+                == fingerprint_
+            ):
+                continue
+            paths_to_print.append(
+                (path_to_output_html_doc_, path_to_output_pdf_)
             )
-            Path(path_to_output_pdf_dir).mkdir(parents=True, exist_ok=True)
+            fingerprints[path_to_output_pdf_] = fingerprint_
 
-            path_to_output_pdf = os.path.join(
-                path_to_output_pdf_dir,
-                document_.meta.document_filename_base + ".pdf",
-            )
+        print(  # noqa: T201
+            f"HTML2PDF: {len(paths_to_print)} of {len(printable_documents)} "
+            "document(s) to print, the other PDF documents are up-to-date.",
+            flush=True,
+        )
+        if len(paths_to_print) == 0:
+            return
 
-            paths_to_print.append((path_to_output_html_doc, path_to_output_pdf))
+        # Chrome reads the printable HTML documents from the output folder.
+        OutputWriter.flush_and_report()
 
         pdf_print_driver = PDFPrintDriver()
         try:
-            pdf_print_driver.get_pdf_from_html(
+            printed_paths: List[str] = pdf_print_driver.get_pdf_from_html(
                 project_config,
                 paths_to_print,
+                jobs=parallelizer.jobs,
             )
         except TimeoutError:
             print("error: HTML2PDF: timeout error.")  # noqa: T201
+            return
+
+        # A PDF that failed to print is printed again by the next export.
+        for path_to_output_pdf_ in printed_paths:
+            cache_backend.put(
+                HTML2PDFGenerator.CACHE_NAMESPACE,
+                HTML2PDFGenerator.get_cache_key(path_to_output_pdf_),
+                fingerprints[path_to_output_pdf_],
+            )
+        cache_backend.flush()
+
+    @staticmethod
+    def get_cache_key(path_to_output_pdf: str) -> str:
+        return hashlib.md5(path_to_output_pdf.encode()).hexdigest()
+
+    @staticmethod
+    def get_fingerprint(
+        document_content: str, assets_fingerprint: bytes
+    ) -> bytes:
+        fingerprint = hashlib.md5(assets_fingerprint)
+        fingerprint.update(
+            HTML2PDFGenerator.FOOTER_DATE_REGEX.sub(
+                r"\1\2", document_content
+            ).encode("utf8")
+        )
+        return fingerprint.hexdigest().encode("ascii")
+
+    @staticmethod
+    def get_assets_fingerprint(path_to_output_pdf_html_dir: str) -> bytes:
+        """
+        The fingerprint of all files that the printable HTML documents refer
+        to: StrictDoc's own assets, MathJax, Mermaid and the documents'
+        assets, e.g., images. The printable HTML documents themselves are
+        not included.
+        """
+
+        fingerprint = hashlib.md5()
+        for root_, dirs_, files_ in os.walk(path_to_output_pdf_html_dir):
+            dirs_.sort()
+            for file_ in sorted(files_):
+                if file_.endswith(".html"):
+                    continue
+                path_to_file = os.path.join(root_, file_)
+                fingerprint.update(
+                    os.path.relpath(
+                        path_to_file, path_to_output_pdf_html_dir
+                    ).encode()
+                )
+                with open(path_to_file, "rb") as asset_file_:
+                    fingerprint.update(asset_file_.read())
+        return fingerprint.hexdigest().encode("ascii")
+
+    @staticmethod
+    def _export_printable_document(
+        document: SDocDocument,
+        *,
+        project_config: ProjectConfig,
+        traceability_index: TraceabilityIndex,
+        html_templates: HTMLTemplates,
+        git_client: GitClient,
+        path_to_output_pdf_html_dir: str,
+        path_to_output_pdf_pdf_dir: str,
+        assets_fingerprint: bytes,
+    ) -> PrintableDocumentType:
+        root_path = document.meta.get_root_path_prefix()
+
+        link_renderer = LinkRenderer(
+            root_path=root_path,
+            static_path=project_config.dir_for_sdoc_assets,
+        )
+        markup_renderer = MarkupRenderer.create(
+            "RST",
+            traceability_index,
+            link_renderer,
+            html_templates,
+            project_config,
+            document,
+        )
+
+        with measure_performance("Generating printable HTML document"):
+            document_content = DocumentHTML2PDFGenerator.export(
+                project_config,
+                document,
+                traceability_index,
+                markup_renderer,
+                link_renderer,
+                git_client=git_client,
+                standalone=False,
+                html_templates=html_templates,
+            )
+
+        path_to_output_html_doc_dir = os.path.join(
+            path_to_output_pdf_html_dir,
+            document.meta.output_document_dir_rel_path.relative_path,
+        )
+        Path(path_to_output_html_doc_dir).mkdir(parents=True, exist_ok=True)
+        Path(path_to_output_pdf_pdf_dir).mkdir(parents=True, exist_ok=True)
+
+        path_to_output_html_doc = os.path.join(
+            path_to_output_html_doc_dir,
+            document.meta.document_filename_base + ".html",
+        )
+
+        OutputWriter.get_instance().write(
+            path_to_output_html_doc, document_content
+        )
+
+        path_to_output_pdf_dir = os.path.join(
+            path_to_output_pdf_pdf_dir,
+            document.meta.input_doc_dir_rel_path.relative_path,
+        )
+        Path(path_to_output_pdf_dir).mkdir(parents=True, exist_ok=True)
+
+        path_to_output_pdf = os.path.join(
+            path_to_output_pdf_dir,
+            document.meta.document_filename_base + ".pdf",
+        )
+
+        return (
+            path_to_output_html_doc,
+            path_to_output_pdf,
+            HTML2PDFGenerator.get_fingerprint(
+                document_content, assets_fingerprint
+            ),
+        )
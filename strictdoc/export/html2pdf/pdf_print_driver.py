@@ -1,5 +1,5 @@
 import os.path
-from subprocess import CompletedProcess, TimeoutExpired, run
+from subprocess import Popen, TimeoutExpired, run
 from typing import List, Tuple
 
 from strictdoc.core.project_config import ProjectConfig
@@ -11,11 +11,104 @@ class PDFPrintDriver:
     def get_pdf_from_html(
         project_config: ProjectConfig,
         paths_to_print: List[Tuple[str, str]],
-    ) -> None:
+        jobs: int = 1,
+    ) -> List[str]:
+        """
+        Prints the (HTML, PDF) pairs of paths with up to the given number of
+        html2print processes running at the same time, each printing its own
+        batch of documents with its own Chrome. All processes share one
+        html2print cache directory. If there is more than one batch, the
+        Chrome Driver is downloaded into it before the batches are started,
+        so that the processes do not download it at the same time. Returns
+        the paths to the PDF documents that have been printed.
+        """
+
         assert isinstance(paths_to_print, list), paths_to_print
-        path_to_html2print_cache = os.path.join(
-            project_config.get_path_to_cache_dir(), "html2pdf"
+        batches: List[List[Tuple[str, str]]] = PDFPrintDriver.create_batches(
+            paths_to_print, jobs
         )
+
+        # The outdated PDF documents are removed, so that a document that
+        # fails to print is not mistaken for a printed one.
+        for _, path_to_pdf_ in paths_to_print:
+            if os.path.isfile(path_to_pdf_):
+                os.remove(path_to_pdf_)
+
+        with measure_performance(
+            "PDFPrintDriver: printing HTML to PDF using HTML2PDF and Chrome Driver "
+            f"({len(batches)} batch(es))"
+        ):
+            if len(batches) > 1 and project_config.chromedriver is None:
+                run(
+                    PDFPrintDriver.get_driver_command(project_config),
+                    check=False,
+                )
+            processes: List[Popen[bytes]] = [
+                Popen(PDFPrintDriver.get_command(project_config, batch_))
+                for batch_ in batches
+            ]
+            try:
+                for process_ in processes:
+                    process_.wait()
+            except TimeoutExpired:
+                raise TimeoutError from None
+
+        return [
+            path_to_pdf_
+            for _, path_to_pdf_ in paths_to_print
+            if os.path.isfile(path_to_pdf_)
+        ]
+
+    @staticmethod
+    def create_batches(
+        paths_to_print: List[Tuple[str, str]], jobs: int
+    ) -> List[List[Tuple[str, str]]]:
+        """
+        Splits the documents into at most as many batches as there are jobs.
+        The documents are assigned from the largest to the smallest HTML
+        file, each to the batch with the smallest total size so far, so that
+        the batches finish at about the same time.
+        """
+
+        assert jobs > 0, jobs
+        number_of_batches = min(jobs, len(paths_to_print))
+        batches: List[List[Tuple[str, str]]] = [
+            [] for _ in range(number_of_batches)
+        ]
+        batch_sizes: List[int] = [0] * number_of_batches
+        for path_to_print_ in sorted(
+            paths_to_print,
+            key=lambda path_to_print_: (
+                -PDFPrintDriver._get_size(path_to_print_[0])
+            ),
+        ):
+            batch_idx = min(
+                range(number_of_batches),
+                key=lambda batch_idx_: (
+                    batch_sizes[batch_idx_],
+                    len(batches[batch_idx_]),
+                ),
+            )
+            batches[batch_idx].append(path_to_print_)
+            batch_sizes[batch_idx] += PDFPrintDriver._get_size(
+                path_to_print_[0]
+            )
+        return batches
+
+    @staticmethod
+    def get_driver_command(project_config: ProjectConfig) -> List[str]:
+        return [
+            "html2print",
+            "get_driver",
+            "--cache-dir",
+            PDFPrintDriver.get_path_to_html2print_cache(project_config),
+        ]
+
+    @staticmethod
+    def get_command(
+        project_config: ProjectConfig,
+        paths_to_print: List[Tuple[str, str]],
+    ) -> List[str]:
         cmd: List[str] = [
             # Using sys.executable instead of "python" is important because
             # venv subprocess call to python resolves to wrong interpreter,
@@ -23,7 +116,7 @@ class PDFPrintDriver:
             "html2print",
             "print",
             "--cache-dir",
-            path_to_html2print_cache,
+            PDFPrintDriver.get_path_to_html2print_cache(project_config),
         ]
         if project_config.chromedriver is not None:
             cmd.extend(
@@ -35,15 +128,15 @@ class PDFPrintDriver:
         for path_to_print_ in paths_to_print:
             cmd.append(path_to_print_[0])
             cmd.append(path_to_print_[1])
+        return cmd
 
-        with measure_performance(
-            "PDFPrintDriver: printing HTML to PDF using HTML2PDF and Chrome Driver"
-        ):
-            try:
-                _: CompletedProcess[bytes] = run(
-                    cmd,
-                    capture_output=False,
-                    check=False,
-                )
-            except TimeoutExpired:
-                raise TimeoutError from None
+    @staticmethod
+    def get_path_to_html2print_cache(project_config: ProjectConfig) -> str:
+        return os.path.join(project_config.get_path_to_cache_dir(), "html2pdf")
+
+    @staticmethod
+    def _get_size(path_to_file: str) -> int:
+        try:
+            return os.path.getsize(path_to_file)
+        except OSError:
+            return 0
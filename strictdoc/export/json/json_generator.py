@@ -24,6 +24,7 @@ from strictdoc.backend.sdoc.models.type_system import (
 )
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.core.traceability_index import TraceabilityIndex
+from strictdoc.helpers.output_writer import OutputWriter
 
 
 class TAG(Enum):
@@ -64,8 +65,9 @@ class JSONGenerator:
 
         path_output_json_file = os.path.join(output_json_root, "index.json")
         project_tree_json = json.dumps(project_tree_dict, indent=4)
-        with open(path_output_json_file, "w") as output_json_file:
-            output_json_file.write(project_tree_json)
+        OutputWriter.get_instance().write(
+            path_output_json_file, project_tree_json
+        )
 
     @classmethod
     def _write_document(cls, document: SDocDocument) -> Dict:
@@ -5,6 +5,7 @@ from pathlib import Path
 from strictdoc.backend.sdoc.models.document import SDocDocument
 from strictdoc.core.traceability_index import TraceabilityIndex
 from strictdoc.export.rst.writer import RSTWriter
+from strictdoc.helpers.output_writer import OutputWriter
 
 
 def get_path_components(folder_path):
@@ -32,8 +33,7 @@ class DocumentRSTGenerator:
             document_out_file = f"{document.meta.document_filename_base}.rst"
             output_path = os.path.join(output_folder, document_out_file)
 
-            with open(output_path, "w", encoding="utf8") as file:
-                file.write(document_content)
+            OutputWriter.get_instance().write(output_path, document_content)
 
     @staticmethod
     def export(document, traceability_index):
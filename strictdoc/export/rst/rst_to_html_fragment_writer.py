@@ -4,8 +4,7 @@ import io
 import os
 import re
 import sys
-from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from docutils.core import publish_parts
 from docutils.parsers.rst import directives, roles
@@ -13,6 +12,7 @@ from docutils.utils import SystemMessage
 from markupsafe import Markup
 
 from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.core.cache_backend import CacheBackend
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.export.rst.directives.raw_html_role import raw_html_role
 from strictdoc.export.rst.directives.wildcard_enhanced_image import (
@@ -31,13 +31,20 @@ class RstToHtmlFragmentWriter:
         project_config: ProjectConfig,
         context_document: Optional[SDocDocument],
     ):
-        path_to_output_dir_md5: str = hashlib.md5(
-            project_config.output_dir.encode("utf-8")
+        # The rendered HTML only depends on the location of the document
+        # relative to the output folder, for example, when an image path is
+        # resolved. The output folder itself is not a part of the cache key,
+        # so that the builds into different output folders share the cache.
+        context_document_path: str = (
+            context_document.meta.output_document_dir_rel_path.relative_path
+            if context_document is not None
+            else ""
+        )
+        self.context_md5: str = hashlib.md5(
+            context_document_path.encode("utf-8")
         ).hexdigest()
-
-        path_to_tmp_dir = project_config.get_path_to_cache_dir()
-        self.path_to_rst_cache_dir = os.path.join(
-            path_to_tmp_dir, "rst", path_to_output_dir_md5
+        self.cache_backend: CacheBackend = CacheBackend.get_instance(
+            project_config
         )
 
         if context_document is not None:
@@ -70,34 +77,48 @@ class RstToHtmlFragmentWriter:
         if len(rst_fragment) < 0:
             return Markup(self._write_no_cache(rst_fragment))
 
-        path_to_rst_fragment_bucket_dir = os.path.join(
-            self.path_to_rst_cache_dir, str(len(rst_fragment))
-        )
-        fragment_md5 = hashlib.md5(rst_fragment.encode("utf-8")).hexdigest()
-        path_to_cached_fragment = os.path.join(
-            path_to_rst_fragment_bucket_dir, fragment_md5
-        )
-        if use_cache and os.path.isdir(path_to_rst_fragment_bucket_dir):
-            if os.path.isfile(path_to_cached_fragment):
-                with open(
-                    path_to_cached_fragment, "rb"
-                ) as cached_fragment_file_:
-                    return Markup(cached_fragment_file_.read().decode("UTF-8"))
-        else:
-            Path(path_to_rst_fragment_bucket_dir).mkdir(
-                parents=True, exist_ok=True
+        cache_key = self.get_cache_key(rst_fragment)
+        if use_cache:
+            cached_fragment: Optional[bytes] = self.cache_backend.get(
+                "rst", cache_key
             )
+            if cached_fragment is not None:
+                return Markup(cached_fragment.decode("UTF-8"))
 
         rendered_html: str = self._write_no_cache(rst_fragment)
-        rendered_html_bytes = rendered_html.encode("UTF-8")
 
         if use_cache:
-            with open(path_to_cached_fragment, "wb") as cached_fragment_file_:
-                cached_fragment_file_.write(rendered_html_bytes)
+            self.cache_backend.put(
+                "rst", cache_key, rendered_html.encode("UTF-8")
+            )
 
         return Markup(rendered_html)
 
-    def _write_no_cache(self, rst_fragment: str) -> str:
+    def prerender(self, rst_fragment: str) -> bool:
+        """
+        Renders a fragment into the cache ahead of the page that contains it.
+        Returns False if the fragment has RST errors. Such a fragment is not
+        cached, and the error is reported when the page is rendered.
+        """
+
+        try:
+            rendered_html, warnings = self._publish(rst_fragment)
+        except SystemMessage:
+            return False
+        if warnings is not None:
+            return False
+        self.cache_backend.put(
+            "rst",
+            self.get_cache_key(rst_fragment),
+            rendered_html.encode("UTF-8"),
+        )
+        return True
+
+    def get_cache_key(self, rst_fragment: str) -> str:
+        fragment_md5 = hashlib.md5(rst_fragment.encode("utf-8")).hexdigest()
+        return f"{self.context_md5}/{len(rst_fragment)}/{fragment_md5}"
+
+    def _publish(self, rst_fragment: str) -> Tuple[str, Optional[str]]:
         assert isinstance(rst_fragment, str), rst_fragment
 
         # How do I convert a docutils document tree into an HTML string?
@@ -114,9 +135,17 @@ class RstToHtmlFragmentWriter:
             settings_overrides=settings,
             source_path=self.source_path,
         )
+        warnings: Optional[str] = (
+            warning_stream.getvalue().rstrip("\n")
+            if warning_stream.tell() > 0
+            else None
+        )
+        return output["html_body"], warnings
+
+    def _write_no_cache(self, rst_fragment: str) -> str:
+        html, warnings = self._publish(rst_fragment)
 
-        if warning_stream.tell() > 0:
-            warnings = warning_stream.getvalue().rstrip("\n")
+        if warnings is not None:
             # A typical RST warning:
             # """
             # path-to-output-folder/file.rst:4: (WARNING/2) Bullet list ends
@@ -140,8 +169,6 @@ class RstToHtmlFragmentWriter:
             print("<<<")  # noqa: T201
             sys.exit(1)
 
-        html: str = output["html_body"]
-
         return html
 
     def write_with_validation(self, rst_fragment):
@@ -1,4 +1,5 @@
 # mypy: disable-error-code="arg-type,no-redef,no-untyped-call,no-untyped-def,union-attr"
+import io
 import os.path
 import re
 from datetime import datetime
@@ -51,6 +52,7 @@ from strictdoc.core.traceability_index import TraceabilityIndex
 from strictdoc.export.spdx.spdx_sdoc_container import SPDXSDocContainer
 from strictdoc.export.spdx.spdx_to_sdoc_converter import SPDXToSDocConverter
 from strictdoc.helpers.cast import assert_cast
+from strictdoc.helpers.output_writer import OutputWriter
 from strictdoc.helpers.sha256 import get_sha256
 
 RELATION_ID_HOW_TO = "SPDXRef-Relationship-How-to-form-ID?"
@@ -397,7 +399,7 @@ class SPDXGenerator:
         """Output SPDX to a file"""
 
         output_path = os.path.join(output_spdx_root, "output.spdx")
-        with open(output_path, "w", encoding="utf8") as file:
+        with io.StringIO() as file:
             write_spdx_document(spdx_document, text_output=file)
             file.write("\n")
 
@@ -416,6 +418,8 @@ class SPDXGenerator:
                 write_relationship(relationship_, text_output=file)
                 file.write("\n")
 
+            OutputWriter.get_instance().write(output_path, file.getvalue())
+
         if True:
             payload: Payload = Payload()
 
@@ -430,6 +434,8 @@ class SPDXGenerator:
                 output_spdx_root, "output.spdx"
             )
 
+            # spdx-tools opens and writes the .jsonld file itself, so this
+            # file is not written through the OutputWriter.
             write_payload(payload, path_to_output_spdx_json)
 
         if True:
@@ -440,5 +446,4 @@ class SPDXGenerator:
             sdoc_output_path = os.path.join(
                 output_spdx_root, "output.spdx.sdoc"
             )
-            with open(sdoc_output_path, "w", encoding="utf8") as file_:
-                file_.write(sdoc_output)
+            OutputWriter.get_instance().write(sdoc_output_path, sdoc_output)
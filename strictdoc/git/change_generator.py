@@ -1,4 +1,11 @@
 # mypy: disable-error-code="no-untyped-call,no-untyped-def"
+import os
+import pickle
+import tempfile
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from strictdoc.core.cache_backend import CacheBackend
 from strictdoc.core.document_tree_iterator import DocumentTreeIterator
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.core.traceability_index import TraceabilityIndex
@@ -8,7 +15,12 @@ from strictdoc.git.project_diff_analyzer import (
     ProjectDiffAnalyzer,
     ProjectTreeDiffStats,
 )
-from strictdoc.helpers.parallelizer import NullParallelizer
+from strictdoc.helpers.parallelizer import (
+    NullParallelizer,
+    Parallelizer,
+    TaskResult,
+)
+from strictdoc.helpers.pickle import pickle_dump, pickle_load
 
 
 class ChangeContainer:
@@ -37,36 +49,42 @@ class ChangeGenerator:
     def generate(
         lhs_project_config: ProjectConfig,
         rhs_project_config: ProjectConfig,
+        parallelizer: Optional[Parallelizer] = None,
     ) -> ChangeContainer:
         assert isinstance(lhs_project_config, ProjectConfig)
         assert isinstance(rhs_project_config, ProjectConfig)
 
-        parallelizer = NullParallelizer()
-
-        traceability_index_lhs: TraceabilityIndex = (
-            TraceabilityIndexBuilder.create(
-                project_config=lhs_project_config,
-                parallelizer=parallelizer,
-                # We don't want to deal with source files for Diff.
-                skip_source_files=True,
-            )
-        )
+        if parallelizer is None:
+            parallelizer = NullParallelizer()
 
-        traceability_index_rhs: TraceabilityIndex = (
-            TraceabilityIndexBuilder.create(
-                project_config=rhs_project_config,
-                parallelizer=parallelizer,
-                # We don't want to deal with source files for Diff.
-                skip_source_files=True,
+        # With a read-only cache, e.g., shared by a CI job, the trees are built
+        # from the cached documents, so they are built in this process.
+        results: Dict[str, Tuple[TraceabilityIndex, ProjectTreeDiffStats]] = {}
+        if parallelizer.parallelization_enabled and not any(
+            CacheBackend.is_read_only(project_config_.get_path_to_cache_dir())
+            for project_config_ in (lhs_project_config, rhs_project_config)
+        ):
+            results = ChangeGenerator._build_and_analyze_trees_forked(
+                {"lhs": lhs_project_config, "rhs": rhs_project_config},
+                parallelizer,
             )
-        )
+        for name_, project_config_ in (
+            ("lhs", lhs_project_config),
+            ("rhs", rhs_project_config),
+        ):
+            if name_ not in results:
+                traceability_index = ChangeGenerator._build_traceability_index(
+                    project_config_, parallelizer
+                )
+                results[name_] = (
+                    traceability_index,
+                    ProjectDiffAnalyzer.analyze_document_tree(
+                        traceability_index
+                    ),
+                )
 
-        lhs_stats: ProjectTreeDiffStats = (
-            ProjectDiffAnalyzer.analyze_document_tree(traceability_index_lhs)
-        )
-        rhs_stats: ProjectTreeDiffStats = (
-            ProjectDiffAnalyzer.analyze_document_tree(traceability_index_rhs)
-        )
+        traceability_index_lhs, lhs_stats = results["lhs"]
+        traceability_index_rhs, rhs_stats = results["rhs"]
         change_stats: ChangeStats = ChangeStats.create_from_two_indexes(
             traceability_index_lhs, traceability_index_rhs, lhs_stats, rhs_stats
         )
@@ -87,3 +105,95 @@ class ChangeGenerator:
             traceability_index_lhs=traceability_index_lhs,
             traceability_index_rhs=traceability_index_rhs,
         )
+
+    @staticmethod
+    def _build_traceability_index(
+        project_config: ProjectConfig, parallelizer: Parallelizer
+    ) -> TraceabilityIndex:
+        return TraceabilityIndexBuilder.create(
+            project_config=project_config,
+            parallelizer=parallelizer,
+            # We don't want to deal with source files for Diff.
+            skip_source_files=True,
+        )
+
+    @staticmethod
+    def _build_and_analyze_trees_forked(
+        project_configs: Dict[str, ProjectConfig], parallelizer: Parallelizer
+    ) -> Dict[str, Tuple[TraceabilityIndex, ProjectTreeDiffStats]]:
+        """
+        Builds and analyzes the trees at the same time, each in its own forked
+        process with its own share of the parallel workers. The processes
+        pass the indexes and their stats back through pickled files. The
+        trees that could not be passed back are missing from the result.
+        """
+
+        results: Dict[str, Tuple[TraceabilityIndex, ProjectTreeDiffStats]] = {}
+        jobs_per_tree = max(1, parallelizer.jobs // len(project_configs))
+        with tempfile.TemporaryDirectory() as path_to_tmp_dir:
+            task_results: List[TaskResult] = parallelizer.run_tasks_forked(
+                [
+                    (
+                        name_,
+                        partial(
+                            ChangeGenerator._build_and_analyze_tree_forked,
+                            project_config_,
+                            jobs_per_tree,
+                            os.path.join(path_to_tmp_dir, f"{name_}.pickle"),
+                        ),
+                    )
+                    for name_, project_config_ in project_configs.items()
+                ]
+            )
+            for task_result_ in task_results:
+                result: Optional[
+                    Tuple[TraceabilityIndex, ProjectTreeDiffStats]
+                ] = None
+                if task_result_.succeeded:
+                    with open(
+                        os.path.join(
+                            path_to_tmp_dir, f"{task_result_.name}.pickle"
+                        ),
+                        "rb",
+                    ) as file:
+                        result = pickle_load(file.read())
+                if result is None:
+                    print(  # noqa: T201
+                        f"ChangeGenerator: the {task_result_.name} "
+                        "traceability index could not be passed from "
+                        "a separate process and is built again.",
+                        flush=True,
+                    )
+                    continue
+                results[task_result_.name] = result
+        return results
+
+    @staticmethod
+    def _build_and_analyze_tree_forked(
+        project_config: ProjectConfig, jobs: int, path_to_result: str
+    ) -> bool:
+        """
+        Returns True if the index and its stats are written to path_to_result.
+        """
+
+        # The workers of the main process's parallelizer cannot be shared
+        # between the forked processes.
+        parallelizer = Parallelizer.create(True, jobs)
+        try:
+            traceability_index = ChangeGenerator._build_traceability_index(
+                project_config, parallelizer
+            )
+        finally:
+            parallelizer.shutdown()
+        stats: ProjectTreeDiffStats = ProjectDiffAnalyzer.analyze_document_tree(
+            traceability_index
+        )
+        try:
+            content: bytes = pickle_dump((traceability_index, stats))
+        except (RecursionError, pickle.PicklingError, TypeError):
+            # Very deep document trees can exceed the recursion limit of the
+            # pickle module.
+            return False
+        with open(path_to_result, "wb") as file:
+            file.write(content)
+        return True
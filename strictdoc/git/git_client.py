@@ -4,6 +4,7 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
+from strictdoc.core.cache_index import CacheIndex
 from strictdoc.core.project_config import ProjectConfig
 from strictdoc.helpers.timing import measure_performance
 
@@ -37,6 +38,7 @@ class GitClient:
                 git_client = GitClient(path_to_sandbox_git_repo)
 
                 if git_client.is_clean_branch():
+                    CacheIndex.touch(path_to_sandbox_git_repo)
                     return git_client
 
             Path(path_to_sandbox).mkdir(parents=True, exist_ok=True)
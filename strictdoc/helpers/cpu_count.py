@@ -0,0 +1,70 @@
+import math
+import multiprocessing
+import os
+from typing import Optional
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def get_available_cpu_count(cgroup_root: str = CGROUP_ROOT) -> int:
+    """
+    The number of CPUs that the current process can actually use.
+
+    multiprocessing.cpu_count() returns the number of CPUs of the host. In a
+    container, e.g., in a Kubernetes CI runner, the process is often limited
+    to a few CPUs by its CPU affinity or by a CFS quota of its cgroup. Starting
+    a worker per host CPU then only causes contention.
+    """
+
+    cpu_count: int
+    if hasattr(os, "sched_getaffinity"):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = multiprocessing.cpu_count()
+
+    cgroup_cpu_limit: Optional[int] = get_cgroup_cpu_limit(cgroup_root)
+    if cgroup_cpu_limit is not None:
+        cpu_count = min(cpu_count, cgroup_cpu_limit)
+    return max(1, cpu_count)
+
+
+def get_cgroup_cpu_limit(cgroup_root: str = CGROUP_ROOT) -> Optional[int]:
+    """
+    Returns the CFS quota of the cgroup rounded up to whole CPUs, or None if
+    the cgroup has no quota.
+    """
+
+    # cgroup v2: "<quota> <period>" or "max <period>".
+    cpu_max = _read_file(os.path.join(cgroup_root, "cpu.max"))
+    if cpu_max is not None:
+        parts = cpu_max.split()
+        if len(parts) != 2 or parts[0] == "max":
+            return None
+        return _quota_to_cpus(parts[0], parts[1])
+
+    # cgroup v1: the quota is -1 if there is no limit.
+    cfs_quota = _read_file(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us"))
+    cfs_period = _read_file(
+        os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us")
+    )
+    if cfs_quota is None or cfs_period is None:
+        return None
+    return _quota_to_cpus(cfs_quota, cfs_period)
+
+
+def _quota_to_cpus(quota: str, period: str) -> Optional[int]:
+    try:
+        quota_value, period_value = int(quota), int(period)
+    except ValueError:
+        return None
+    if quota_value <= 0 or period_value <= 0:
+        return None
+    return max(1, math.ceil(quota_value / period_value))
+
+
+def _read_file(path_to_file: str) -> Optional[str]:
+    try:
+        with open(path_to_file, encoding="utf8") as file:
+            return file.read().strip()
+    except OSError:
+        return None
@@ -2,12 +2,13 @@
 import hashlib
 import os
 import platform
-import shutil
 import stat
 import tempfile
 from pathlib import Path
 from typing import Optional
 
+from strictdoc.helpers.output_writer import OutputWriter
+
 
 def sync_dir(src_dir, dst_dir, message: Optional[str]):
     assert os.path.isabs(src_dir), f"Expected {src_dir} to be an absolute path"
@@ -38,7 +39,9 @@ def sync_dir(src_dir, dst_dir, message: Optional[str]):
     if message is not None:
         print(f"{message}: {len(source_files)} files", end="")  # noqa: T201
 
-    # Iterate through the files to be copied and copy them one by one.
+    # Iterate through the files to be copied and copy them, several at a time
+    # in the write-behind mode.
+    output_writer = OutputWriter.get_instance()
     skipped = 0
     for (
         filename,
@@ -59,9 +62,13 @@ def sync_dir(src_dir, dst_dir, message: Optional[str]):
         ) or os.path.getmtime(full_path_to_file) > os.path.getmtime(
             full_path_to_destination_file
         ):
-            shutil.copyfile(full_path_to_file, full_path_to_destination_file)
+            output_writer.copy_file(
+                full_path_to_file, full_path_to_destination_file
+            )
         else:
             skipped += 1
+    # The copied files are often read right away, e.g., by the HTML embedder.
+    output_writer.flush()
 
     if message is not None:
         if skipped > 0:
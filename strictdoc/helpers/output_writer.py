@@ -0,0 +1,186 @@
+import os
+import shutil
+import sys
+import threading
+from queue import Queue
+from typing import List, Optional, Tuple, Union
+
+from strictdoc.helpers.parallelizer import Parallelizer
+
+# The path to the output file, the content to write or None, and the path to
+# the file to copy or None.
+WriteTaskType = Tuple[str, Optional[Union[str, bytes]], Optional[str]]
+
+
+class OutputWriter:
+    """
+    Writes the generated files, e.g., the HTML pages, to the output folder.
+
+    Every file is written atomically: the content is written to a temporary
+    file next to the output file, which is then renamed to the output file.
+    A reader, e.g., a web server serving the output folder, never sees a
+    partially written file.
+
+    In the write-behind mode, which is enabled by the export command, the
+    files are written by a pool of threads while the generators continue
+    rendering. The queue of pending writes is bounded, so a generator waits
+    when it gets too far ahead of a slow output folder, e.g., a
+    network-mounted one. A failed write does not stop the export. The errors
+    are collected and reported by flush_and_report() when a process has
+    completed its work. Without the write-behind mode, e.g., in the server,
+    a file is written before write() returns.
+
+    Every process has its own writer. The forked workers inherit the writer
+    object of the main process but not its threads, so a new writer is
+    created in each worker. The pending writes are completed before every
+    fork, so that the child does not inherit a lock held by a thread.
+    """
+
+    THREADS = 4
+    QUEUE_SIZE = 64
+
+    write_behind: bool = False
+    _instance: Optional["OutputWriter"] = None
+
+    def __init__(self, write_behind: bool) -> None:
+        self.pid: int = os.getpid()
+        self.write_behind: bool = write_behind
+        self.queue: Queue[WriteTaskType] = Queue(
+            maxsize=OutputWriter.QUEUE_SIZE
+        )
+        self.threads: List[threading.Thread] = []
+        self.errors: List[str] = []
+        self.errors_lock = threading.Lock()
+
+    @staticmethod
+    def get_instance() -> "OutputWriter":
+        instance: Optional[OutputWriter] = OutputWriter._instance
+        if (
+            instance is None
+            or instance.pid != os.getpid()
+            or instance.write_behind != OutputWriter.write_behind
+        ):
+            instance = OutputWriter(OutputWriter.write_behind)
+            OutputWriter._instance = instance
+        return instance
+
+    @staticmethod
+    def enable_write_behind() -> None:
+        OutputWriter.write_behind = True
+        # The workers are terminated without waiting for the daemon threads.
+        Parallelizer.register_after_task_hook(OutputWriter.flush_and_report)
+
+    @staticmethod
+    def flush_and_report() -> None:
+        """
+        Completes the pending writes of the current process and exits with
+        an error if any of the writes has failed.
+        """
+
+        instance: Optional[OutputWriter] = OutputWriter._instance
+        if instance is None or instance.pid != os.getpid():
+            return
+        instance.flush()
+        errors: List[str] = instance.pop_errors()
+        if len(errors) == 0:
+            return
+        for error_ in errors:
+            print(  # noqa: T201
+                f"error: Could not write the output file: {error_}"
+            )
+        sys.stdout.flush()
+        sys.exit(1)
+
+    def write(self, path_to_file: str, content: Union[str, bytes]) -> None:
+        self._submit((path_to_file, content, None))
+
+    def copy_file(self, path_to_source_file: str, path_to_file: str) -> None:
+        self._submit((path_to_file, None, path_to_source_file))
+
+    def flush(self) -> None:
+        """
+        Waits until all pending writes are completed. The errors are kept
+        until pop_errors() is called.
+        """
+
+        if len(self.threads) > 0:
+            self.queue.join()
+
+    def pop_errors(self) -> List[str]:
+        with self.errors_lock:
+            errors, self.errors = self.errors, []
+        return errors
+
+    def _submit(self, write_task: WriteTaskType) -> None:
+        if not self.write_behind:
+            OutputWriter._write_file(*write_task)
+            return
+        if len(self.threads) == 0:
+            self._start()
+        self.queue.put(write_task)
+
+    def _start(self) -> None:
+        self.threads = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(OutputWriter.THREADS)
+        ]
+        for thread_ in self.threads:
+            thread_.start()
+
+    def _run(self) -> None:
+        while True:
+            write_task: WriteTaskType = self.queue.get()
+            try:
+                OutputWriter._write_file(*write_task)
+            except Exception as exception_:
+                with self.errors_lock:
+                    self.errors.append(f"{write_task[0]}: {exception_}")
+            finally:
+                self.queue.task_done()
+
+    @staticmethod
+    def _write_file(
+        path_to_file: str,
+        content: Optional[Union[str, bytes]],
+        path_to_source_file: Optional[str],
+    ) -> None:
+        path_to_dir = os.path.dirname(path_to_file)
+        if len(path_to_dir) > 0:
+            os.makedirs(path_to_dir, exist_ok=True)
+        path_to_temp_file = os.path.join(
+            path_to_dir,
+            f".{os.path.basename(path_to_file)}."
+            f"{os.getpid()}.{threading.get_ident()}.tmp",
+        )
+        try:
+            if path_to_source_file is not None:
+                shutil.copyfile(path_to_source_file, path_to_temp_file)
+            elif isinstance(content, bytes):
+                with open(path_to_temp_file, "wb") as temp_file_:
+                    temp_file_.write(content)
+            else:
+                assert content is not None
+                with open(
+                    path_to_temp_file, "w", encoding="utf8"
+                ) as temp_file_:
+                    temp_file_.write(content)
+            os.replace(path_to_temp_file, path_to_file)
+        except BaseException:
+            # The outdated output file is removed as well, so that it is not
+            # mistaken for an up-to-date one by the next export.
+            for path_ in (path_to_temp_file, path_to_file):
+                try:
+                    os.remove(path_)
+                except OSError:
+                    pass
+            raise
+
+    @staticmethod
+    def _before_fork() -> None:
+        instance: Optional[OutputWriter] = OutputWriter._instance
+        if instance is not None and instance.pid == os.getpid():
+            instance.flush()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=OutputWriter._before_fork)
@@ -1,17 +1,81 @@
 import multiprocessing
+import os
 import sys
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from multiprocessing.connection import wait
 from queue import Empty
-from typing import Any, Callable, Iterable, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from strictdoc.helpers.cpu_count import get_available_cpu_count
 
 MultiprocessingLambdaType = Callable[[Any], Any]
 
+# Returns a relative cost of processing a content, e.g., the size of a file.
+WeightFunctionType = Callable[[Any], int]
+
+# The PID of a worker, the time it spent on processing a chunk, and the
+# (index, result) pairs of the chunk's contents.
+ChunkResultType = Tuple[int, float, List[Tuple[int, Any]]]
+
+# A named task that is run by run_tasks_forked(), e.g., an export format.
+# A task fails if it raises an exception or returns False.
+NamedTaskType = Tuple[str, Callable[[], Optional[bool]]]
+
+
+@dataclass
+class TaskResult:
+    name: str
+    duration: float
+    # The exit code of the process that has run the task, 0 on success.
+    exitcode: int
+
+    @property
+    def succeeded(self) -> bool:
+        return self.exitcode == 0
+
 
 class Parallelizer(ABC):
+    # The number of the worker processes that run at the same time.
+    jobs: int
+
+    # The worker processes are terminated without running the atexit
+    # handlers. The components that buffer their output, e.g., the cache
+    # backends, register a hook to flush it after every task.
+    after_task_hooks: List[Callable[[], None]] = []
+
+    @staticmethod
+    def register_after_task_hook(hook: Callable[[], None]) -> None:
+        Parallelizer.after_task_hooks.append(hook)
+
+    # The worker utilization of the latest run_parallel() or
+    # run_parallel_forked() call, if it was run by worker processes.
+    last_utilization_message: Optional[str] = None
+
+    def print_utilization(self) -> None:
+        """
+        Prints the worker utilization of the latest parallel run. Only the
+        main parallel steps, such as parsing the documents or exporting them
+        to HTML, report it. The small internal runs are not reported.
+        """
+
+        if self.last_utilization_message is not None:
+            print(self.last_utilization_message, flush=True)  # noqa: T201
+
     @staticmethod
-    def create(parallelize: bool) -> "Parallelizer":
+    def create(parallelize: bool, jobs: Optional[int] = None) -> "Parallelizer":
         if parallelize:
-            return MultiprocessingParallelizer()
+            return MultiprocessingParallelizer(jobs)
         return NullParallelizer()
 
     @property
@@ -19,27 +83,115 @@ class Parallelizer(ABC):
     def parallelization_enabled(self) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def set_jobs(self, jobs: int) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     def run_parallel(
         self,
         contents: Iterable[Any],
         processing_func: MultiprocessingLambdaType,
+        weight_func: Optional[WeightFunctionType] = None,
+    ) -> Iterable[Any]:
+        """
+        Returns the results of processing_func in the order of the contents.
+        The optional weight function estimates the relative cost of each
+        content and is used for scheduling the heavy contents first.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def run_parallel_forked(
+        self,
+        contents: Iterable[Any],
+        processing_func: MultiprocessingLambdaType,
+        weight_func: Optional[WeightFunctionType] = None,
     ) -> Iterable[Any]:
+        """
+        Same as run_parallel but the workers are forked at the time of the
+        call. The processing function and everything it refers to, e.g., a
+        fully built traceability index, are inherited by the workers
+        copy-on-write instead of being pickled for every task. Only the
+        contents and the results are sent between the processes, so both
+        should be small, e.g., paths to documents and status records.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def run_tasks_forked(self, tasks: List[NamedTaskType]) -> List[TaskResult]:
+        """
+        Runs independent tasks at the same time, each in its own forked
+        process that inherits the state of the main process, e.g., a fully
+        built traceability index. A task may use the parallelizer itself,
+        but only through run_parallel_forked(). A failing task does not stop
+        the other tasks. The results are in the order of the tasks.
+        """
         raise NotImplementedError
 
+    @staticmethod
+    def _run_task(task: NamedTaskType) -> TaskResult:
+        start_time = time.perf_counter()
+        task_succeeded = task[1]() is not False
+        return TaskResult(
+            task[0],
+            time.perf_counter() - start_time,
+            0 if task_succeeded else 1,
+        )
+
     @abstractmethod
     def shutdown(self) -> None:
         raise NotImplementedError
 
 
 class MultiprocessingParallelizer(Parallelizer):
-    def __init__(self) -> None:
+    # The number of chunks per worker. More chunks balance the load better,
+    # fewer chunks mean fewer round trips through the queues.
+    CHUNKS_PER_JOB = 4
+
+    def __init__(self, jobs: Optional[int] = None) -> None:
+        self.jobs: int = jobs if jobs is not None else get_available_cpu_count()
+        self.processes: List[multiprocessing.Process] = []
+
+    def __del__(self) -> None:
+        self.shutdown()
+
+    def set_jobs(self, jobs: int) -> None:
+        assert jobs > 0, jobs
+        assert len(self.processes) == 0, (
+            "The number of jobs must be set before the workers are started."
+        )
+        self.jobs = jobs
+
+    def shutdown(self) -> None:
+        # @sdoc[SDOC_IMPL_2]
+        # macOS edge case: If the __init__ fails to initialize itself, we may
+        # end up having no self.processes attribute at all.
+        was_fully_initialized = hasattr(self, "processes")
+        # @sdoc[/SDOC_IMPL_2]
+
+        if was_fully_initialized:
+            for process in self.processes:
+                process.terminate()
+
+    @property
+    def parallelization_enabled(self) -> bool:
+        return True
+
+    def _start(self) -> None:
+        """
+        The workers are started on first use, so that they inherit the state
+        that the main process has built by then, e.g., the cache manifest.
+        """
+
+        if len(self.processes) > 0:
+            return
         # @sdoc[SDOC_IMPL_2]
         try:
             self.input_queue: multiprocessing.Queue[
-                Tuple[int, Any, MultiprocessingLambdaType]
+                Tuple[List[Tuple[int, Any]], MultiprocessingLambdaType]
             ] = multiprocessing.Queue()
-            self.output_queue: multiprocessing.Queue[Tuple[int, Any]] = (
+            self.output_queue: multiprocessing.Queue[ChunkResultType] = (
                 multiprocessing.Queue()
             )
 
@@ -48,7 +200,7 @@ class MultiprocessingParallelizer(Parallelizer):
                     target=MultiprocessingParallelizer._run,
                     args=(self.input_queue, self.output_queue),
                 )
-                for _ in range(0, multiprocessing.cpu_count())
+                for _ in range(0, self.jobs)
             ]
 
             for process in self.processes:
@@ -60,48 +212,257 @@ class MultiprocessingParallelizer(Parallelizer):
             ) from None
         # @sdoc[/SDOC_IMPL_2]
 
-    def __del__(self) -> None:
-        self.shutdown()
-
-    def shutdown(self) -> None:
-        # @sdoc[SDOC_IMPL_2]
-        # macOS edge case: If the __init__ fails to initialize itself, we may
-        # end up having no self.processes attribute at all.
-        was_fully_initialized = hasattr(self, "processes")
-        # @sdoc[/SDOC_IMPL_2]
-
-        if was_fully_initialized:
-            for process in self.processes:
-                process.terminate()
+    def run_parallel(
+        self,
+        contents: Iterable[Any],
+        processing_func: MultiprocessingLambdaType,
+        weight_func: Optional[WeightFunctionType] = None,
+    ) -> Iterable[Any]:
+        self.last_utilization_message = None
+        contents_list = list(contents)
+        if len(contents_list) == 0:
+            return []
+        self._start()
 
-    @property
-    def parallelization_enabled(self) -> bool:
-        return True
+        start_time = time.perf_counter()
+        chunks = MultiprocessingParallelizer.create_chunks(
+            contents_list, self.jobs, weight_func
+        )
+        for chunk_ in chunks:
+            self.input_queue.put((chunk_, processing_func))
+        return self._collect_results(
+            self.output_queue,
+            self.processes,
+            len(contents_list),
+            len(chunks),
+            start_time,
+        )
 
-    def run_parallel(
+    def run_parallel_forked(
         self,
         contents: Iterable[Any],
         processing_func: MultiprocessingLambdaType,
+        weight_func: Optional[WeightFunctionType] = None,
     ) -> Iterable[Any]:
-        size = 0
-        for content_idx, content in enumerate(contents):
-            self.input_queue.put((content_idx, content, processing_func))
-            size += 1
-        results = []
+        if "fork" not in multiprocessing.get_all_start_methods():
+            return self.run_parallel(contents, processing_func, weight_func)
+
+        self.last_utilization_message = None
+        contents_list = list(contents)
+        if len(contents_list) == 0:
+            return []
+
+        start_time = time.perf_counter()
+        chunks = MultiprocessingParallelizer.create_chunks(
+            contents_list, self.jobs, weight_func
+        )
+        context = multiprocessing.get_context("fork")
+        input_queue: multiprocessing.Queue[Optional[List[Tuple[int, Any]]]] = (
+            context.Queue()
+        )
+        output_queue: multiprocessing.Queue[ChunkResultType] = context.Queue()
+        for chunk_ in chunks:
+            input_queue.put(chunk_)
+
+        # The processing function is passed to the forked processes as is,
+        # it is never pickled.
+        processes = [
+            context.Process(
+                target=MultiprocessingParallelizer._run_forked,
+                args=(input_queue, output_queue, processing_func),
+            )
+            for _ in range(0, min(self.jobs, len(chunks)))
+        ]
+        for process in processes:
+            process.start()
+            input_queue.put(None)
+
+        results = self._collect_results(
+            output_queue, processes, len(contents_list), len(chunks), start_time
+        )
+        for process in processes:
+            process.join()
+        return results
+
+    def run_tasks_forked(self, tasks: List[NamedTaskType]) -> List[TaskResult]:
+        if (
+            len(tasks) < 2
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            return [Parallelizer._run_task(task_) for task_ in tasks]
+
+        context = multiprocessing.get_context("fork")
+        start_time = time.perf_counter()
+        # The task processes must not be daemonic: a task can fork its own
+        # workers.
+        processes = [
+            context.Process(
+                target=MultiprocessingParallelizer._run_task_forked,
+                args=(task_,),
+                name=task_[0],
+            )
+            for task_ in tasks
+        ]
+        for process in processes:
+            process.start()
+
+        durations: Dict[int, float] = {}
+        while len(durations) < len(processes):
+            sentinels = [
+                process_.sentinel
+                for process_idx_, process_ in enumerate(processes)
+                if process_idx_ not in durations
+            ]
+            wait(sentinels)
+            for process_idx_, process_ in enumerate(processes):
+                if process_idx_ not in durations and not process_.is_alive():
+                    durations[process_idx_] = time.perf_counter() - start_time
+
+        results: List[TaskResult] = []
+        for process_idx_, process_ in enumerate(processes):
+            process_.join()
+            results.append(
+                TaskResult(
+                    tasks[process_idx_][0],
+                    durations[process_idx_],
+                    process_.exitcode if process_.exitcode is not None else 1,
+                )
+            )
+        return results
+
+    @staticmethod
+    def _run_task_forked(task: NamedTaskType) -> None:
+        try:
+            task_result = Parallelizer._run_task(task)
+        finally:
+            # The process exits without running the atexit handlers. The
+            # output of a failed task, e.g., the files that were written
+            # before the error, is flushed as well.
+            for hook_ in Parallelizer.after_task_hooks:
+                hook_()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        if not task_result.succeeded:
+            sys.exit(task_result.exitcode)
+
+    @staticmethod
+    def create_chunks(
+        contents: List[Any],
+        jobs: int,
+        weight_func: Optional[WeightFunctionType],
+    ) -> List[List[Tuple[int, Any]]]:
+        """
+        Splits the contents into the chunks that are sent to the workers.
+        Every content is paired with its index in the contents.
+
+        The contents are ordered from the heaviest to the lightest, e.g., by
+        the size of a document, so that a huge document is started first
+        instead of being picked up last and extending the whole run. Without
+        the weights, the original order is kept. A chunk carries up to a
+        1 / (CHUNKS_PER_JOB * jobs) share of the total weight: the heavy
+        contents get a chunk of their own and the light ones are grouped
+        together.
+        """
+
+        weights: List[int] = [
+            max(1, weight_func(content_)) if weight_func is not None else 1
+            for content_ in contents
+        ]
+        max_chunk_weight = sum(weights) / (
+            MultiprocessingParallelizer.CHUNKS_PER_JOB * jobs
+        )
+
+        chunks: List[List[Tuple[int, Any]]] = []
+        chunk: List[Tuple[int, Any]] = []
+        chunk_weight = 0
+        for content_idx_ in sorted(
+            range(len(contents)), key=lambda idx_: -weights[idx_]
+        ):
+            weight = weights[content_idx_]
+            if len(chunk) > 0 and chunk_weight + weight > max_chunk_weight:
+                chunks.append(chunk)
+                chunk, chunk_weight = [], 0
+            chunk.append((content_idx_, contents[content_idx_]))
+            chunk_weight += weight
+        if len(chunk) > 0:
+            chunks.append(chunk)
+        return chunks
+
+    def _collect_results(
+        self,
+        output_queue: "multiprocessing.Queue[ChunkResultType]",
+        processes: Sequence[multiprocessing.process.BaseProcess],
+        size: int,
+        number_of_chunks: int,
+        start_time: float,
+    ) -> List[Any]:
+        results: List[Tuple[int, Any]] = []
+        busy_time_per_worker: Dict[int, float] = {}
         while size > 0:
             try:
-                result = self.output_queue.get(block=True, timeout=0.1)
-                results.append(result)
-                size -= 1
+                worker_pid, busy_time, chunk_results = output_queue.get(
+                    block=True, timeout=0.1
+                )
+                results.extend(chunk_results)
+                busy_time_per_worker[worker_pid] = (
+                    busy_time_per_worker.get(worker_pid, 0.0) + busy_time
+                )
+                size -= len(chunk_results)
             except Empty:
-                if any(process.exitcode for process in self.processes):
+                if any(process.exitcode for process in processes):
                     print(  # noqa: T201
                         "error: Parallelizer: One of the child processes "
                         "has exited prematurely."
                     )
-                    self.shutdown()
+                    # Only the given processes are terminated: a forked task
+                    # inherits the persistent workers of the main process.
+                    for process in processes:
+                        process.terminate()
                     sys.exit(1)
-        return map(lambda r: r[1], sorted(results, key=lambda r: r[0]))
+
+        self.last_utilization_message = (
+            MultiprocessingParallelizer.get_utilization_message(
+                len(results),
+                number_of_chunks,
+                len(processes),
+                busy_time_per_worker,
+                time.perf_counter() - start_time,
+            )
+        )
+        return list(map(lambda r: r[1], sorted(results, key=lambda r: r[0])))
+
+    @staticmethod
+    def get_utilization_message(
+        number_of_tasks: int,
+        number_of_chunks: int,
+        number_of_workers: int,
+        busy_time_per_worker: Dict[int, float],
+        wall_time: float,
+    ) -> str:
+        """
+        The utilization of a worker is the share of the wall time of a run
+        that the worker spent processing its tasks. The workers that did not
+        get any chunk are reported as idle.
+        """
+
+        utilizations: List[float] = sorted(
+            (
+                min(1.0, busy_time_ / wall_time) if wall_time > 0 else 1.0
+                for busy_time_ in busy_time_per_worker.values()
+            ),
+            reverse=True,
+        )
+        utilizations.extend(
+            [0.0] * max(0, number_of_workers - len(utilizations))
+        )
+        utilizations_string = ", ".join(
+            f"{utilization_:.0%}" for utilization_ in utilizations
+        )
+        return (
+            f"Parallelizer: {number_of_tasks} tasks in {number_of_chunks} "
+            f"chunks, {number_of_workers} workers, {wall_time:.2f}s. "
+            f"Worker utilization: {utilizations_string}."
+        )
 
     # This version doesn't handle the following cases properly:
     # - when a child process exists unexpectedly
@@ -110,36 +471,82 @@ class MultiprocessingParallelizer(Parallelizer):
     #     with concurrent.futures.ProcessPoolExecutor() as executor:
     #         return executor.map(processing_func, contents)  # noqa: ERA001
 
+    @staticmethod
+    def _process_chunk(
+        chunk: List[Tuple[int, Any]], processing_func: MultiprocessingLambdaType
+    ) -> ChunkResultType:
+        start_time = time.perf_counter()
+        chunk_results: List[Tuple[int, Any]] = []
+        for content_idx, content in chunk:
+            chunk_results.append((content_idx, processing_func(content)))
+            for hook_ in Parallelizer.after_task_hooks:
+                hook_()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        return os.getpid(), time.perf_counter() - start_time, chunk_results
+
     @staticmethod
     def _run(
-        input_queue: "multiprocessing.Queue[Tuple[int, Any, MultiprocessingLambdaType]]",
-        output_queue: "multiprocessing.Queue[Tuple[int, Any]]",
+        input_queue: "multiprocessing.Queue[Tuple[List[Tuple[int, Any]], MultiprocessingLambdaType]]",
+        output_queue: "multiprocessing.Queue[ChunkResultType]",
     ) -> None:
         while True:
             try:
-                content_idx, content, processing_func = input_queue.get(
-                    block=True
+                chunk, processing_func = input_queue.get(block=True)
+                output_queue.put(
+                    MultiprocessingParallelizer._process_chunk(
+                        chunk, processing_func
+                    )
                 )
-                result = processing_func(content)
-                sys.stdout.flush()
-                sys.stderr.flush()
-                output_queue.put((content_idx, result))
             except KeyboardInterrupt:
                 sys.stdout.flush()
                 sys.stderr.flush()
 
+    @staticmethod
+    def _run_forked(
+        input_queue: "multiprocessing.Queue[Optional[List[Tuple[int, Any]]]]",
+        output_queue: "multiprocessing.Queue[ChunkResultType]",
+        processing_func: MultiprocessingLambdaType,
+    ) -> None:
+        while True:
+            chunk = input_queue.get(block=True)
+            if chunk is None:
+                break
+            output_queue.put(
+                MultiprocessingParallelizer._process_chunk(
+                    chunk, processing_func
+                )
+            )
+
 
 class NullParallelizer(Parallelizer):
+    jobs: int = 1
+
+    def set_jobs(self, jobs: int) -> None:
+        pass
+
     def run_parallel(
         self,
         contents: Iterable[Any],
         processing_func: MultiprocessingLambdaType,
+        weight_func: Optional[WeightFunctionType] = None,  # noqa: ARG002
     ) -> Iterable[Any]:
         results = []
         for content in contents:
             results.append(processing_func(content))
         return results
 
+    def run_parallel_forked(
+        self,
+        contents: Iterable[Any],
+        processing_func: MultiprocessingLambdaType,
+        weight_func: Optional[WeightFunctionType] = None,
+    ) -> Iterable[Any]:
+        return self.run_parallel(contents, processing_func, weight_func)
+
+    def run_tasks_forked(self, tasks: List[NamedTaskType]) -> List[TaskResult]:
+        return [Parallelizer._run_task(task_) for task_ in tasks]
+
     def shutdown(self) -> None:
         pass
 
@@ -1,12 +1,12 @@
 import pickle
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 
 def pickle_dump(obj: Any) -> bytes:
-    return pickle.dumps(obj, 0)
+    return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
 
 
-def pickle_load(content: bytes) -> Optional[Any]:
+def pickle_load(content: Union[bytes, memoryview]) -> Optional[Any]:
     try:
         return pickle.loads(content)
     except AttributeError:
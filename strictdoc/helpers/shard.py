@@ -1,4 +1,6 @@
-from typing import Tuple
+from typing import List, Tuple, TypeVar
+
+T = TypeVar("T")
 
 
 def get_shard(total: int, shards: int, shard: int) -> Tuple[int, int]:
@@ -15,3 +17,16 @@ def get_shard(total: int, shards: int, shard: int) -> Tuple[int, int]:
         right += shard_size_remainder
 
     return left, right
+
+
+def get_shard_items(items: List[T], shard: int, shards: int) -> List[T]:
+    """
+    Like get_shard() but also accepts fewer items than shards, in which case
+    the last shards are empty.
+    """
+
+    assert 0 < shard <= shards, (shard, shards)
+    if len(items) < shards:
+        return items[shard - 1 : shard]
+    left, right = get_shard(len(items), shards, shard)
+    return items[left:right]
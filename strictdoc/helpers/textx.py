@@ -1,6 +1,58 @@
-from typing import Any
+import threading
+from typing import Any, Callable, List, Mapping, Optional
 
-from textx import get_model
+from textx import get_model, metamodel_from_str
+from textx.metamodel import TextXMetaModel
+
+
+class LazyMetaModel:
+    """
+    A class-level descriptor that compiles a textX metamodel on first access.
+
+    Compiling a grammar is not free, and many code paths never parse
+    anything: the version/about/dump-grammar commands, or the workers that
+    only render HTML. The compiled metamodel is shared by all users of the
+    owner class for the lifetime of the process. Processes created with
+    fork() inherit a metamodel that the parent has already compiled.
+
+    The object processors are registered on the shared metamodel, so a
+    reader that binds them to its own parse context must parse with
+    model_from_str_with_processors().
+    """
+
+    def __init__(
+        self, create_grammar: Callable[[], str], classes: List[Any]
+    ) -> None:
+        self.create_grammar: Callable[[], str] = create_grammar
+        self.classes: List[Any] = classes
+        self.meta_model: Optional[TextXMetaModel] = None
+
+    def __get__(self, instance: Any, owner: Any) -> TextXMetaModel:
+        if self.meta_model is None:
+            self.meta_model = metamodel_from_str(
+                self.create_grammar(),
+                classes=self.classes,
+                use_regexp_group=True,
+            )
+        return self.meta_model
+
+
+# Guards the object processors of the shared metamodels: the processors
+# registered by one read must not be used by a read in another thread, e.g.,
+# in the server. The lock is reentrant because an object processor may read
+# another input, e.g., a grammar file.
+TEXTX_PARSING_LOCK = threading.RLock()
+
+
+def model_from_str_with_processors(
+    meta_model: TextXMetaModel,
+    obj_processors: Mapping[str, Callable[[Any], Any]],
+    input_string: str,
+    file_name: Optional[str] = None,
+) -> Any:
+    with TEXTX_PARSING_LOCK:
+        meta_model.register_obj_processors(obj_processors)
+        return meta_model.model_from_str(input_string, file_name=file_name)
 
 
 def drop_textx_meta(textx_object: Any) -> None:
@@ -1517,6 +1517,7 @@ def create_main_router(project_config: ProjectConfig) -> APIRouter:
             moved_node.parent = target_node.parent
         else:
             raise NotImplementedError
+        export_action.traceability_index.invalidate_document_iterators()
 
         # Saving new content to .SDoc file.
         SDWriter(project_config).write_to_file(moved_node.document)
@@ -2639,6 +2640,9 @@ def create_main_router(project_config: ProjectConfig) -> APIRouter:
         if node_query is not None:
             result = []
             try:
+                # The nodes are still iterated in the order of the documents,
+                # but only the candidate nodes are evaluated.
+                candidate_nodes = node_query.get_candidate_nodes()
                 for document in (
                     export_action.traceability_index.document_tree.document_list
                 ):
@@ -2650,6 +2654,11 @@ def create_main_router(project_config: ProjectConfig) -> APIRouter:
                     for node in document_iterator.all_content(
                         print_fragments=False, print_fragments_from_files=False
                     ):
+                        if (
+                            candidate_nodes is not None
+                            and node not in candidate_nodes
+                        ):
+                            continue
                         if node_query.evaluate(node):
                             result.append(node)
                 search_results = result
@@ -2830,6 +2839,7 @@ def create_main_router(project_config: ProjectConfig) -> APIRouter:
                 # requested file.
                 html_generator.export_source_coverage_screen(
                     traceability_index=export_action.traceability_index,
+                    parallelizer=parallelizer,
                 )
             elif document_relative_path.relative_path == "index.html":
                 html_generator.export_project_tree_screen(
@@ -2855,6 +2865,7 @@ def create_main_router(project_config: ProjectConfig) -> APIRouter:
                     )
                 html_generator.export_source_coverage_screen(
                     traceability_index=export_action.traceability_index,
+                    parallelizer=parallelizer,
                 )
             elif (
                 document_relative_path.relative_path
@@ -0,0 +1,42 @@
+import pickle
+
+import pytest
+
+from strictdoc.backend.sdoc.cache_format import CacheCompression, CacheFormat
+from strictdoc.backend.sdoc.reader import SDReader
+
+
+@pytest.mark.parametrize("compression", CacheCompression.ALL)
+def test_roundtrip(compression):
+    document = SDReader().read(
+        """\
+[DOCUMENT]
+TITLE: Test Doc
+
+[REQUIREMENT]
+UID: REQ-1
+STATEMENT: Hello world
+"""
+    )
+
+    blob = CacheFormat.encode(document, compression)
+    decoded_document = CacheFormat.decode(blob)
+
+    assert decoded_document.title == "Test Doc"
+    assert decoded_document.section_contents[0].reserved_uid == "REQ-1"
+
+
+def test_blob_without_header_is_a_miss():
+    legacy_blob = pickle.dumps({"key": "value"}, 0)
+
+    assert CacheFormat.decode(legacy_blob) is None
+    assert CacheFormat.decode(b"") is None
+
+
+def test_blob_with_other_schema_is_a_miss():
+    blob = bytearray(CacheFormat.encode({"key": "value"}))
+    assert CacheFormat.decode(bytes(blob)) == {"key": "value"}
+
+    schema_key_offset = CacheFormat.HEADER.size - 32
+    blob[schema_key_offset] ^= 1
+    assert CacheFormat.decode(bytes(blob)) is None
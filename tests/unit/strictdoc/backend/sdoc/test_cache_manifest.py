@@ -0,0 +1,63 @@
+import os
+
+from strictdoc.backend.sdoc.cache_manifest import CacheManifest
+from strictdoc.helpers.md5 import get_file_md5
+
+
+def create_file(path_to_file, content, mtime_ns=1_000_000_000):
+    with open(path_to_file, "w", encoding="utf8") as file_:
+        file_.write(content)
+    # Pretend the file was written long ago, outside the racy window.
+    os.utime(path_to_file, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_file_is_not_rehashed(tmp_path):
+    path_to_file = str(tmp_path / "input.sdoc")
+    create_file(path_to_file, "[DOCUMENT]\nTITLE: Hello\n")
+
+    manifest = CacheManifest(str(tmp_path / "cache" / "manifest.pickle"))
+    file_md5 = manifest.get_file_md5(path_to_file)
+    assert file_md5 == get_file_md5(path_to_file)
+    assert (manifest.hits, manifest.misses) == (0, 1)
+
+    manifest.save()
+
+    reloaded_manifest = CacheManifest(manifest.path_to_manifest)
+    reloaded_manifest.load()
+    assert reloaded_manifest.get_file_md5(path_to_file) == file_md5
+    assert (reloaded_manifest.hits, reloaded_manifest.misses) == (1, 0)
+
+
+def test_changed_file_is_rehashed(tmp_path):
+    path_to_file = str(tmp_path / "input.sdoc")
+    create_file(path_to_file, "[DOCUMENT]\nTITLE: Hello\n")
+
+    manifest = CacheManifest(str(tmp_path / "cache" / "manifest.pickle"))
+    manifest.get_file_md5(path_to_file)
+
+    create_file(
+        path_to_file, "[DOCUMENT]\nTITLE: World\n", mtime_ns=2_000_000_000
+    )
+    assert manifest.get_file_md5(path_to_file) == get_file_md5(path_to_file)
+    assert (manifest.hits, manifest.misses) == (0, 2)
+
+
+def test_recently_modified_file_is_not_recorded(tmp_path):
+    path_to_file = str(tmp_path / "input.sdoc")
+    with open(path_to_file, "w", encoding="utf8") as file_:
+        file_.write("[DOCUMENT]\nTITLE: Hello\n")
+
+    manifest = CacheManifest(str(tmp_path / "cache" / "manifest.pickle"))
+    manifest.get_file_md5(path_to_file)
+    manifest.get_file_md5(path_to_file)
+    assert (manifest.hits, manifest.misses) == (0, 2)
+    assert len(manifest.entries) == 0
+
+
+def test_damaged_manifest_is_ignored(tmp_path):
+    path_to_manifest = tmp_path / "manifest.pickle"
+    path_to_manifest.write_bytes(b"not a pickle")
+
+    manifest = CacheManifest(str(path_to_manifest))
+    manifest.load()
+    assert manifest.entries == {}
@@ -0,0 +1,163 @@
+"""
+The line parser must produce exactly the same document tree as the textX
+grammar for every SDoc file that exists in the test suite. The textX grammar
+stays the reference implementation, so the comparison is done against it.
+"""
+
+import glob
+import os
+from typing import Any, Optional, Set
+
+import pytest
+from textx import TextXSyntaxError
+
+from strictdoc.backend.sdoc.line_parser import (
+    SDocLineParser,
+    SDocLineParserError,
+)
+from strictdoc.backend.sdoc.models.document import SDocDocument
+from strictdoc.backend.sdoc.processor import ParseContext
+from strictdoc.backend.sdoc.reader import SDReader
+from strictdoc.helpers.mid import MID
+
+PATH_TO_TESTS = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "..")
+)
+
+SDOC_FILES = sorted(
+    os.path.relpath(path_, PATH_TO_TESTS)
+    for path_ in glob.glob(
+        os.path.join(PATH_TO_TESTS, "**", "*.sdoc"), recursive=True
+    )
+)
+
+# Back references and the textX bookkeeping are not part of the comparison.
+SKIPPED_ATTRIBUTES = {
+    "parent",
+    "ng_document_reference",
+    "ng_including_document_reference",
+    "_tx_parser",
+    "_tx_filename",
+    "_tx_metamodel",
+    "_tx_model_params",
+}
+
+
+def compare_trees(lhs: Any, rhs: Any, path: str, seen: Set[int]) -> None:
+    assert type(lhs) is type(rhs), path
+    if lhs is None or isinstance(lhs, (str, int, float, bool)):
+        assert lhs == rhs, path
+        return
+    if id(lhs) in seen:
+        return
+    if isinstance(lhs, (list, tuple)):
+        assert len(lhs) == len(rhs), path
+        for idx_, (lhs_item_, rhs_item_) in enumerate(zip(lhs, rhs)):
+            compare_trees(lhs_item_, rhs_item_, f"{path}[{idx_}]", seen)
+        return
+    if isinstance(lhs, dict):
+        assert list(lhs.keys()) == list(rhs.keys()), path
+        for key_, value_ in lhs.items():
+            compare_trees(value_, rhs[key_], f"{path}[{key_}]", seen)
+        return
+    if isinstance(lhs, (set, frozenset)):
+        assert lhs == rhs, path
+        return
+    seen.add(id(lhs))
+
+    lhs_attributes, rhs_attributes = vars(lhs), vars(rhs)
+    is_permanent_mid = lhs_attributes.get("mid_permanent", False)
+    for attribute_, value_ in lhs_attributes.items():
+        if attribute_ in SKIPPED_ATTRIBUTES:
+            continue
+        # textX does not assign positions to the default config and view
+        # objects that a document creates for itself.
+        if attribute_ not in rhs_attributes:
+            assert attribute_ in ("_tx_position", "_tx_position_end"), (
+                f"{path}.{attribute_}"
+            )
+            continue
+        if isinstance(value_, MID) and not is_permanent_mid:
+            continue
+        if (
+            attribute_ in ("ng_line_start", "ng_col_start")
+            and "_tx_position" not in rhs_attributes
+        ):
+            continue
+        compare_trees(
+            value_, rhs_attributes[attribute_], f"{path}.{attribute_}", seen
+        )
+
+
+def read_with_line_parser(input_sdoc: str, path_to_file: str) -> SDocDocument:
+    parse_context = ParseContext(path_to_sdoc_file=path_to_file)
+    document = SDocLineParser(input_sdoc, parse_context).parse()
+    document, _ = SDReader._finalize(document, parse_context)
+    return document
+
+
+@pytest.mark.parametrize("path_to_sdoc_file", SDOC_FILES)
+def test_line_parser_matches_textx(path_to_sdoc_file):
+    full_path = os.path.join(PATH_TO_TESTS, path_to_sdoc_file)
+    with open(full_path, encoding="utf8") as file_:
+        input_sdoc = file_.read()
+
+    textx_document: Optional[SDocDocument] = None
+    textx_error: Optional[Exception] = None
+    try:
+        textx_document, _ = SDReader._read(
+            input_sdoc, full_path, use_line_parser=False
+        )
+    except Exception as exception_:
+        textx_error = exception_
+
+    try:
+        line_parser_document = read_with_line_parser(input_sdoc, full_path)
+    except SDocLineParserError:
+        # Falling back to textX is always correct. The line parser must only
+        # never accept what textX rejects.
+        return
+    except Exception as exception_:
+        # Both parsers have parsed the file but a processor has rejected it.
+        assert textx_error is not None
+        assert type(exception_) is type(textx_error)
+        return
+
+    assert textx_error is None, textx_error
+    compare_trees(line_parser_document, textx_document, "document", set())
+
+
+def test_views_are_delegated_to_textx():
+    input_sdoc = """\
+[DOCUMENT]
+TITLE: Test Doc
+VIEWS:
+- ID: DEFAULT
+  TAGS:
+  - OBJECT_TYPE: REQUIREMENT
+    VISIBLE_FIELDS:
+    - NAME: TITLE
+"""
+
+    with pytest.raises(SDocLineParserError):
+        SDocLineParser(input_sdoc, ParseContext(None)).parse()
+
+    document = SDReader().read(input_sdoc)
+    assert isinstance(document, SDocDocument)
+
+
+def test_syntax_errors_are_reported_by_textx():
+    input_sdoc = """\
+[DOCUMENT]
+TITLE: Test Doc
+
+[REQUIREMENT]
+STATEMENT: >>>
+Unterminated
+"""
+
+    with pytest.raises(SDocLineParserError):
+        SDocLineParser(input_sdoc, ParseContext(None)).parse()
+
+    with pytest.raises(TextXSyntaxError):
+        SDReader().read(input_sdoc)
@@ -0,0 +1,186 @@
+import os
+import sys
+from functools import partial
+
+import pytest
+
+from strictdoc.backend.sdoc.pickle_cache import PickleCache
+from strictdoc.backend.sdoc.reader import SDReader
+from strictdoc.core.cache_backend import CacheBackend
+from strictdoc.core.document_finder import DocumentFinder
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.file_tree import File
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.helpers.parallelizer import MultiprocessingParallelizer
+from strictdoc.helpers.paths import SDocRelativePath
+
+DOCUMENT_WITH_INCLUDE = """
+[DOCUMENT]
+TITLE: Document
+
+[DOCUMENT_FROM_FILE]
+FILE: included.sdoc
+""".lstrip()
+
+INCLUDED_DOCUMENT = """
+[DOCUMENT]
+TITLE: Included document
+""".lstrip()
+
+
+def create_project_config(path_to_cache_dir, output_dir):
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    project_config.dir_for_sdoc_cache = str(path_to_cache_dir)
+    project_config.output_dir = str(output_dir)
+    return project_config
+
+
+def create_tree(path_to_tree):
+    os.makedirs(path_to_tree)
+    with open(path_to_tree / "input.sdoc", "w", encoding="utf8") as file_:
+        file_.write(DOCUMENT_WITH_INCLUDE)
+    with open(path_to_tree / "included.sdoc", "w", encoding="utf8") as file_:
+        file_.write(INCLUDED_DOCUMENT)
+    return str(path_to_tree / "input.sdoc")
+
+
+def test_cache_key_does_not_depend_on_path_or_output_dir(tmp_path):
+    path_to_first_file = create_tree(tmp_path / "first")
+    path_to_second_file = create_tree(tmp_path / "second")
+
+    assert PickleCache.get_cache_key(
+        path_to_first_file,
+        create_project_config(tmp_path / "cache", tmp_path / "output/html"),
+        "",
+    ) == PickleCache.get_cache_key(
+        path_to_second_file,
+        create_project_config(tmp_path / "cache", tmp_path / "output/pdf"),
+        "",
+    )
+
+
+def test_cached_document_is_relocated_to_the_read_file(tmp_path):
+    path_to_first_file = create_tree(tmp_path / "first")
+    path_to_second_file = create_tree(tmp_path / "second")
+    project_config = create_project_config(
+        tmp_path / "cache", tmp_path / "output"
+    )
+
+    SDReader().read_from_file(path_to_first_file, project_config)
+    document = SDReader().read_from_file(path_to_second_file, project_config)
+
+    assert document.fragments_from_files[
+        0
+    ].resolved_full_path_to_document_file == str(
+        tmp_path / "second" / "included.sdoc"
+    )
+
+
+def test_cached_document_is_parsed_again_if_include_is_missing(
+    tmp_path, monkeypatch
+):
+    path_to_first_file = create_tree(tmp_path / "first")
+    project_config = create_project_config(
+        tmp_path / "cache", tmp_path / "output"
+    )
+    SDReader().read_from_file(path_to_first_file, project_config)
+
+    os.makedirs(tmp_path / "second")
+    path_to_second_file = str(tmp_path / "second" / "input.sdoc")
+    with open(path_to_second_file, "w", encoding="utf8") as file_:
+        file_.write(DOCUMENT_WITH_INCLUDE)
+
+    parsed_files = []
+
+    def read_with_parse_context(input_string, file_path=None):
+        parsed_files.append(file_path)
+        return SDReader._read(input_string, file_path)
+
+    monkeypatch.setattr(
+        SDReader,
+        "read_with_parse_context",
+        staticmethod(read_with_parse_context),
+    )
+    try:
+        SDReader().read_from_file(path_to_second_file, project_config)
+    except SystemExit:
+        pass
+
+    assert parsed_files == [path_to_second_file]
+
+
+def test_document_read_again_is_taken_from_memo(tmp_path, monkeypatch):
+    path_to_file = create_tree(tmp_path / "first")
+    project_config = create_project_config(
+        tmp_path / "cache", tmp_path / "output"
+    )
+    first_document = SDReader().read_from_file(path_to_file, project_config)
+
+    def read_with_parse_context(*_args, **_kwargs):
+        raise AssertionError("The document must not be parsed again.")
+
+    monkeypatch.setattr(
+        SDReader,
+        "read_with_parse_context",
+        staticmethod(read_with_parse_context),
+    )
+    monkeypatch.setattr(
+        CacheBackend, "get_instance", staticmethod(lambda _: None)
+    )
+    PickleCache.memo.reset_statistics()
+
+    second_document = SDReader().read_from_file(path_to_file, project_config)
+
+    assert PickleCache.memo.hits == 1
+    assert second_document is not first_document
+    assert second_document.reserved_title == first_document.reserved_title
+
+
+def test_changed_document_is_not_taken_from_memo(tmp_path):
+    path_to_file = create_tree(tmp_path / "first")
+    project_config = create_project_config(
+        tmp_path / "cache", tmp_path / "output"
+    )
+    SDReader().read_from_file(path_to_file, project_config)
+
+    with open(path_to_file, "w", encoding="utf8") as file_:
+        file_.write(INCLUDED_DOCUMENT.replace("Included", "Changed"))
+    PickleCache.memo.reset_statistics()
+    document = SDReader().read_from_file(path_to_file, project_config)
+
+    assert PickleCache.memo.hits == 0
+    assert document.reserved_title == "Changed document"
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_memo_statistics_are_returned_by_parallel_workers(tmp_path):
+    path_to_file = create_tree(tmp_path / "first")
+    project_config = create_project_config(
+        tmp_path / "cache", tmp_path / "output"
+    )
+    doc_file = File(0, path_to_file, SDocRelativePath("input.sdoc"))
+    process_document = partial(
+        DocumentFinder._process_worker_parse_document,
+        project_config=project_config,
+    )
+    SDReader().read_from_file(path_to_file, project_config)
+
+    # The forked workers inherit the memo of the main process, but their
+    # counters are only visible in the results of the tasks.
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        results = parallelizer.run_parallel(
+            [(doc_file, doc_file, "")] * 3, process_document
+        )
+    finally:
+        parallelizer.shutdown()
+
+    assert [memo_statistics_ for *_, memo_statistics_ in results] == [
+        (1, 0),
+        (1, 0),
+        (1, 0),
+    ]
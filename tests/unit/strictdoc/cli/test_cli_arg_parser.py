@@ -1,6 +1,9 @@
 import os
 
+import pytest
+
 from strictdoc.cli.cli_arg_parser import (
+    CLIValidationError,
     CommandParserBuilder,
     create_sdoc_args_parser,
 )
@@ -8,7 +11,7 @@ from strictdoc.cli.cli_arg_parser import (
 FAKE_STRICTDOC_ROOT_PATH = "/tmp/strictdoc-123"
 
 
-TOTAL_EXPORT_ARGS = 18
+TOTAL_EXPORT_ARGS = 20
 
 
 def cli_args_parser():
@@ -178,6 +181,61 @@ def test_export_09_config():
     assert export_config.get_path_to_config() == "/path/to/strictdoc.toml"
 
 
+def test_export_10_shard():
+    parser = cli_args_parser()
+
+    args = parser.parse_args(["export", "docs", "--shard", "2/8"])
+
+    assert len(args._get_kwargs()) == TOTAL_EXPORT_ARGS
+    assert args.shard == (2, 8)
+
+    config_parser = create_sdoc_args_parser(args)
+    export_config = config_parser.get_export_config()
+    assert export_config.shard == (2, 8)
+
+
+def test_export_11_shard_validation():
+    parser = cli_args_parser()
+
+    for invalid_shard_ in ("0/8", "9/8", "2", "a/b"):
+        with pytest.raises(SystemExit):
+            parser.parse_args(["export", "docs", "--shard", invalid_shard_])
+
+    args = parser.parse_args(
+        ["export", "docs", "--shard", "1/2", "--formats", "html,json"]
+    )
+    export_config = create_sdoc_args_parser(args).get_export_config()
+    with pytest.raises(CLIValidationError):
+        export_config.validate()
+
+
+def test_export_merge_01_minimal():
+    parser = cli_args_parser()
+
+    args = parser.parse_args(
+        [
+            "export-merge",
+            "docs",
+            "--shard-output-dir",
+            "shard-1",
+            "--shard-output-dir",
+            "shard-2",
+        ]
+    )
+
+    # The export arguments and the shard output folders.
+    assert len(args._get_kwargs()) == TOTAL_EXPORT_ARGS + 1
+    assert args.command == "export-merge"
+    assert args.shard is None
+    assert args.shard_output_dirs == ["shard-1", "shard-2"]
+
+    config_parser = create_sdoc_args_parser(args)
+    assert config_parser.is_export_merge_command
+    export_config = config_parser.get_export_config()
+    assert export_config.shard is None
+    assert export_config.formats == ["html"]
+
+
 def test_passthrough_01_minimal():
     parser = cli_args_parser()
 
@@ -195,12 +253,14 @@ def test_passthrough_01_minimal():
         ("generate_bundle_document", False),
         ("included_documents", False),
         ("input_paths", ["input.sdoc"]),
+        ("jobs", None),
         ("no_parallelization", False),
         ("output_dir", None),
         ("project_title", None),
         ("reqif_enable_mid", False),
         ("reqif_multiline_is_xhtml", False),
         ("reqif_profile", None),
+        ("shard", None),
         ("view", None),
     ]
 
@@ -224,11 +284,30 @@ def test_passthrough_02_minimal():
         ("generate_bundle_document", False),
         ("included_documents", False),
         ("input_paths", ["input.sdoc"]),
+        ("jobs", None),
         ("no_parallelization", False),
         ("output_dir", "SANDBOX/"),
         ("project_title", None),
         ("reqif_enable_mid", False),
         ("reqif_multiline_is_xhtml", False),
         ("reqif_profile", None),
+        ("shard", None),
         ("view", None),
     ]
+
+
+def test_cache_01_subcommands():
+    parser = cli_args_parser()
+
+    for subcommand_ in ("stats", "prune", "clear"):
+        args = parser.parse_args(["cache", subcommand_])
+        assert args.command == "cache"
+        assert args.subcommand == subcommand_
+
+        cache_config = create_sdoc_args_parser(args).get_cache_config()
+        assert cache_config.subcommand == subcommand_
+        assert cache_config.get_path_to_config() == os.getcwd()
+
+    args = parser.parse_args(["cache", "prune", "--config", "docs"])
+    cache_config = create_sdoc_args_parser(args).get_cache_config()
+    assert cache_config.get_path_to_config() == "docs"
@@ -0,0 +1,188 @@
+import pytest
+
+from strictdoc.backend.sdoc.reader import SDReader
+from strictdoc.core.document_tree import DocumentTree
+from strictdoc.core.query_engine.query_object import QueryObject
+from strictdoc.core.query_engine.query_reader import QueryReader
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from tests.unit.helpers.test_document_builder import DocumentBuilder
+
+
+def create_traceability_index():
+    document_builder = DocumentBuilder()
+    document = SDReader().read(
+        """
+[DOCUMENT]
+TITLE: Test Doc
+
+[SECTION]
+UID: SECT-1
+TITLE: Section 1
+
+[REQUIREMENT]
+UID: REQ-1
+STATUS: Draft
+TITLE: Requirement 1
+
+[REQUIREMENT]
+UID: REQ-2
+STATUS: Approved
+TITLE: Requirement 2
+
+[TEXT]
+STATEMENT: Text
+
+[/SECTION]
+
+[SECTION]
+TITLE: Section 2
+
+[REQUIREMENT]
+UID: REQ-3
+STATUS: Approved
+TITLE: Requirement 3
+
+[REQUIREMENT]
+TITLE: Requirement 4
+
+[/SECTION]
+""".lstrip()
+    )
+    document.meta = document_builder.build().meta
+    document_tree = DocumentTree(
+        file_tree=[],
+        document_list=[document],
+        map_docs_by_paths={},
+        map_docs_by_rel_paths={},
+        map_grammars_by_filenames={},
+    )
+    traceability_index = TraceabilityIndexBuilder.create_from_document_tree(
+        document_tree, project_config=document_builder.project_config
+    )
+    traceability_index.document_tree = document_tree
+    document_iterator = traceability_index.get_document_iterator(document)
+    return traceability_index, list(document_iterator.all_content())
+
+
+def get_title(node):
+    return node.title if node.is_section else node.reserved_title
+
+
+@pytest.mark.parametrize(
+    "query, expected_titles, expected_candidate_titles",
+    [
+        (
+            '(node.is_requirement and node["STATUS"] == "Approved")',
+            ["Requirement 2", "Requirement 3"],
+            ["Requirement 2", "Requirement 3"],
+        ),
+        (
+            '(node.is_requirement and node["STATUS"] == None)',
+            ["Requirement 4"],
+            ["Requirement 4"],
+        ),
+        (
+            '(node.is_section and node["TITLE"] == "Section 2")',
+            ["Section 2"],
+            ["Section 2"],
+        ),
+        (
+            '(node.is_requirement and "Appr" in node["STATUS"])',
+            ["Requirement 2", "Requirement 3"],
+            ["Requirement 2", "Requirement 3"],
+        ),
+        (
+            (
+                '((node.is_requirement and node["UID"] == "REQ-1") or '
+                '(node.is_section and node["UID"] == "SECT-1"))'
+            ),
+            ["Section 1", "Requirement 1"],
+            ["Section 1", "Requirement 1"],
+        ),
+        (
+            '(node.is_requirement and node["STATUS"] != "Approved")',
+            ["Requirement 1", "Requirement 4"],
+            [
+                "Requirement 1",
+                "Requirement 2",
+                "Requirement 3",
+                "Requirement 4",
+            ],
+        ),
+        (
+            '(node.is_requirement and node.contains("Draft"))',
+            ["Requirement 1"],
+            [
+                "Requirement 1",
+                "Requirement 2",
+                "Requirement 3",
+                "Requirement 4",
+            ],
+        ),
+        ('(node["STATUS"] == "Approved" and node.is_requirement)', None, None),
+        ("not node.is_section", None, None),
+    ],
+)
+def test_01_compiled_query_and_candidate_nodes(
+    query, expected_titles, expected_candidate_titles
+):
+    traceability_index, nodes = create_traceability_index()
+    query_object = QueryObject(QueryReader.read(query), traceability_index)
+
+    candidate_nodes = query_object.get_candidate_nodes()
+    if expected_candidate_titles is None:
+        assert candidate_nodes is None
+        return
+    assert [
+        get_title(node_) for node_ in nodes if node_ in candidate_nodes
+    ] == expected_candidate_titles
+    assert [
+        get_title(node_)
+        for node_ in nodes
+        if node_ in candidate_nodes and query_object.evaluate(node_)
+    ] == expected_titles
+
+    # The nodes that are not candidates do not match the query.
+    for node_ in nodes:
+        if node_ not in candidate_nodes:
+            assert not query_object.evaluate(node_)
+
+
+def test_02_candidate_nodes_do_not_hide_errors():
+    traceability_index, nodes = create_traceability_index()
+
+    # The evaluation of the sections raises an error that must not be hidden
+    # by narrowing the query to the requirements with a given status.
+    query_object = QueryObject(
+        QueryReader.read(
+            '(node.has_parent_requirements and node["STATUS"] == "Approved")'
+        ),
+        traceability_index,
+    )
+    assert query_object.get_candidate_nodes() is None
+    with pytest.raises(TypeError):
+        for node_ in nodes:
+            query_object.evaluate(node_)
+
+    # REQ-4 has no STATUS, so it has to be evaluated to raise the error.
+    query_object = QueryObject(
+        QueryReader.read('(node.is_requirement and node["STATUS"] in "Draft")'),
+        traceability_index,
+    )
+    assert query_object.get_candidate_nodes() == set(
+        traceability_index.get_query_node_index().requirements
+    )
+    with pytest.raises(TypeError):
+        for node_ in nodes:
+            query_object.evaluate(node_)
+
+
+def test_03_query_node_index_is_invalidated():
+    traceability_index, nodes = create_traceability_index()
+    query_node_index = traceability_index.get_query_node_index()
+    assert traceability_index.get_query_node_index() is query_node_index
+    assert len(query_node_index.requirements) == 4
+    assert len(query_node_index.sections) == 2
+
+    traceability_index.invalidate_document_iterators()
+    assert traceability_index.get_query_node_index() is not query_node_index
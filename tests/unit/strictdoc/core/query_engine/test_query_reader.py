@@ -3,6 +3,8 @@ from strictdoc.core.query_engine.query_object import (
     InExpression,
     NodeContainsAnyFreeTextExpression,
     NodeFieldExpression,
+    NodeHasAncestorExpression,
+    NodeHasDescendantExpression,
     NodeHasParentRequirementsExpression,
     NodeIsRequirementExpression,
     NodeIsSectionExpression,
@@ -187,3 +189,17 @@ node.contains_any_text\
     assert isinstance(
         query_object.root_expression, NodeContainsAnyFreeTextExpression
     )
+
+
+def test_96_has_ancestor_and_has_descendant():
+    query = """\
+(node.has_ancestor("REQ-1") or node.has_descendant("REQ 2"))\
+"""
+    query_object = QueryReader.read(query)
+    assert isinstance(query_object, Query)
+    assert isinstance(query_object.root_expression, OrExpression)
+    has_ancestor, has_descendant = query_object.root_expression.expressions
+    assert isinstance(has_ancestor, NodeHasAncestorExpression)
+    assert has_ancestor.uid == "REQ-1"
+    assert isinstance(has_descendant, NodeHasDescendantExpression)
+    assert has_descendant.uid == "REQ 2"
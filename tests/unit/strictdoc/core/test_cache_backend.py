@@ -0,0 +1,183 @@
+import os
+import sys
+
+import pytest
+
+from strictdoc.core.cache_backend import (
+    CacheBackend,
+    DirectoryCacheBackend,
+    SQLiteCacheBackend,
+)
+from strictdoc.core.cache_index import CacheIndex
+from strictdoc.core.project_config import CacheBackendType
+
+
+@pytest.mark.parametrize("backend_type", CacheBackendType.ALL)
+def test_put_and_get(tmp_path, backend_type):
+    backend = CacheBackend.create(str(tmp_path), backend_type)
+
+    assert backend.get("rst", "md5/10/fragment") is None
+
+    backend.put("rst", "md5/10/fragment", b"<p>Fragment</p>")
+    backend.put("sdoc", "document.sdoc_1_2", b"\x00\x01")
+    backend.put("sdoc", "document.sdoc_1_2", b"\x00\x02")
+
+    assert backend.get("rst", "md5/10/fragment") == b"<p>Fragment</p>"
+    assert backend.get("sdoc", "document.sdoc_1_2") == b"\x00\x02"
+    assert backend.get("sdoc", "md5/10/fragment") is None
+
+    backend.flush()
+    assert backend.get("sdoc", "document.sdoc_1_2") == b"\x00\x02"
+    assert backend.get_many("rst", ["md5/10/fragment", "missing"]) == {
+        "md5/10/fragment": b"<p>Fragment</p>"
+    }
+
+
+def test_create_returns_the_same_instance(tmp_path):
+    backend = CacheBackend.create(str(tmp_path), CacheBackendType.SQLITE)
+
+    assert backend is CacheBackend.create(
+        str(tmp_path), CacheBackendType.SQLITE
+    )
+    assert isinstance(backend, SQLiteCacheBackend)
+    assert isinstance(
+        CacheBackend.create(str(tmp_path), CacheBackendType.DIRECTORY),
+        DirectoryCacheBackend,
+    )
+
+
+def test_directory_backend_keeps_one_file_per_entry(tmp_path):
+    backend = CacheBackend.create(str(tmp_path), CacheBackendType.DIRECTORY)
+
+    backend.put("rst", "md5/10/fragment", b"<p>Fragment</p>")
+
+    assert os.listdir(tmp_path / "rst" / "md5" / "10") == ["fragment"]
+
+
+def test_sqlite_backend_is_visible_to_other_connections_after_flush(
+    tmp_path,
+):
+    path_to_database = str(tmp_path / SQLiteCacheBackend.FILE_NAME)
+    writer = SQLiteCacheBackend(path_to_database)
+    reader = SQLiteCacheBackend(path_to_database)
+
+    writer.put("sdoc", "key", b"value")
+    assert reader.get("sdoc", "key") is None
+
+    writer.flush()
+    assert reader.get("sdoc", "key") == b"value"
+    assert writer.get_connection().execute(
+        "PRAGMA journal_mode"
+    ).fetchone() == ("wal",)
+
+
+def test_sqlite_backend_get_many_reads_in_chunks(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / SQLiteCacheBackend.FILE_NAME))
+    keys = [
+        f"key_{idx_}"
+        for idx_ in range(SQLiteCacheBackend.MAX_KEYS_PER_QUERY * 2 + 1)
+    ]
+    for key_ in keys:
+        backend.put("source_file", key_, key_.encode("utf8"))
+    backend.flush()
+
+    values = backend.get_many("source_file", keys)
+
+    assert len(values) == len(keys)
+    assert values["key_0"] == b"key_0"
+
+
+def test_sqlite_backend_get_many_returns_pending_writes(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / SQLiteCacheBackend.FILE_NAME))
+    backend.put("rst", "flushed", b"flushed")
+    backend.put("rst", "overwritten", b"old")
+    backend.flush()
+
+    backend.put("rst", "pending", b"pending")
+    backend.put("rst", "overwritten", b"new")
+    backend.put("sdoc", "pending", b"other namespace")
+
+    assert backend.get_many(
+        "rst", ["flushed", "overwritten", "pending", "missing"]
+    ) == {
+        "flushed": b"flushed",
+        "overwritten": b"new",
+        "pending": b"pending",
+    }
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_sqlite_backend_opens_new_connection_after_fork(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / SQLiteCacheBackend.FILE_NAME))
+    backend.put("sdoc", "parent", b"parent")
+    backend.flush()
+
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            if backend.get("sdoc", "parent") == b"parent":
+                backend.put("sdoc", "child", b"child")
+                backend.flush()
+                exit_code = 0
+        finally:
+            os._exit(exit_code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WEXITSTATUS(status) == 0
+    assert backend.get("sdoc", "child") == b"child"
+
+
+def test_cache_index_prunes_sqlite_entries(tmp_path):
+    backend = CacheBackend.create(str(tmp_path), CacheBackendType.SQLITE)
+    for idx_ in range(5):
+        backend.put("rst", str(idx_), b"x" * 10)
+    backend.flush()
+
+    cache_index = CacheIndex.create(str(tmp_path))
+    assert cache_index.get_statistics() == {"rst": (5, 50)}
+
+    # All entries have almost the same access time, so only the number of the
+    # removed entries is checked.
+    assert cache_index.prune(max_size=None, max_entries=2) == (3, 30)
+    assert CacheIndex.create(str(tmp_path)).get_statistics() == {"rst": (2, 20)}
+
+
+def test_read_only_directory_backend_is_never_written(tmp_path):
+    DirectoryCacheBackend(str(tmp_path)).put("sdoc", "existing", b"value")
+    os.utime(tmp_path / "sdoc" / "existing", (1000, 1000))
+
+    backend = DirectoryCacheBackend(str(tmp_path), read_only=True)
+
+    assert backend.get("sdoc", "existing") == b"value"
+    assert os.path.getmtime(tmp_path / "sdoc" / "existing") == 1000
+    backend.put("sdoc", "new", b"value")
+    assert backend.get("sdoc", "new") is None
+
+
+def test_read_only_sqlite_backend_is_never_written(tmp_path):
+    path_to_database = str(tmp_path / SQLiteCacheBackend.FILE_NAME)
+    writer = SQLiteCacheBackend(path_to_database)
+    writer.put("sdoc", "existing", b"value")
+    writer.close()
+    # Closing the last connection checkpoints and removes the WAL files.
+    assert os.listdir(tmp_path) == [SQLiteCacheBackend.FILE_NAME]
+
+    backend = SQLiteCacheBackend(path_to_database, read_only=True)
+
+    assert backend.get("sdoc", "existing") == b"value"
+    backend.put("sdoc", "new", b"value")
+    backend.flush()
+    assert backend.get("sdoc", "new") is None
+    assert os.listdir(tmp_path) == [SQLiteCacheBackend.FILE_NAME]
+
+
+def test_read_only_sqlite_backend_without_database(tmp_path):
+    backend = SQLiteCacheBackend(
+        str(tmp_path / SQLiteCacheBackend.FILE_NAME), read_only=True
+    )
+
+    assert backend.get("sdoc", "missing") is None
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,68 @@
+import os
+
+from strictdoc.core.cache_index import CacheIndex
+
+
+def create_entry(path_to_entry, size, last_access):
+    os.makedirs(os.path.dirname(path_to_entry), exist_ok=True)
+    with open(path_to_entry, "wb") as entry_file_:
+        entry_file_.write(b"x" * size)
+    os.utime(path_to_entry, (last_access, last_access))
+
+
+def test_index_lists_entries_per_kind(tmp_path):
+    create_entry(str(tmp_path / "sdoc" / "a.sdoc_1"), 10, 1000)
+    create_entry(str(tmp_path / "rst" / "md5" / "20" / "fragment"), 20, 1000)
+    create_entry(str(tmp_path / "jinja" / "md5" / "template.py"), 30, 1000)
+    create_entry(str(tmp_path / "jinja" / "md5" / "other.py"), 30, 1000)
+    create_entry(str(tmp_path / "html2pdf" / "chromedriver"), 40, 1000)
+    create_entry(str(tmp_path / "manifest.pickle"), 50, 1000)
+
+    cache_index = CacheIndex.create(str(tmp_path))
+
+    assert cache_index.get_statistics() == {
+        "jinja": (1, 60),
+        "rst": (1, 20),
+        "sdoc": (1, 10),
+    }
+    assert cache_index.get_total_size() == 90
+
+
+def test_prune_removes_least_recently_used_entries_first(tmp_path):
+    create_entry(str(tmp_path / "sdoc" / "old"), 100, 1000)
+    create_entry(str(tmp_path / "sdoc" / "recent"), 100, 3000)
+    create_entry(str(tmp_path / "source_file" / "middle"), 100, 2000)
+
+    CacheIndex.touch(str(tmp_path / "sdoc" / "old"))
+
+    cache_index = CacheIndex.create(str(tmp_path))
+    removed_entries, removed_size = cache_index.prune(
+        max_size=150, max_entries=None
+    )
+
+    assert (removed_entries, removed_size) == (2, 200)
+    assert os.path.isfile(tmp_path / "sdoc" / "old")
+    assert not os.path.exists(tmp_path / "sdoc" / "recent")
+    assert not os.path.exists(tmp_path / "source_file" / "middle")
+
+
+def test_prune_respects_entry_limit(tmp_path):
+    for idx_ in range(5):
+        create_entry(str(tmp_path / "rst" / str(idx_)), 1, 1000 + idx_)
+
+    cache_index = CacheIndex.create(str(tmp_path))
+    cache_index.prune(max_size=None, max_entries=2)
+
+    assert sorted(os.listdir(tmp_path / "rst")) == ["3", "4"]
+    assert os.path.isfile(tmp_path / CacheIndex.PRUNE_STAMP_FILE_NAME)
+
+
+def test_clear_keeps_html2pdf_folder(tmp_path):
+    create_entry(str(tmp_path / "sdoc" / "a"), 1, 1000)
+    create_entry(str(tmp_path / "git" / "HEAD~1" / "README.md"), 1, 1000)
+    create_entry(str(tmp_path / "html2pdf" / "chromedriver"), 1, 1000)
+    create_entry(str(tmp_path / "manifest.pickle"), 1, 1000)
+
+    CacheIndex.create(str(tmp_path)).clear()
+
+    assert os.listdir(tmp_path) == ["html2pdf"]
@@ -0,0 +1,93 @@
+import pickle
+
+from strictdoc.backend.sdoc.reader import SDReader
+from strictdoc.core.document_iterator import DocumentCachingIterator
+
+
+def read_document():
+    return SDReader().read(
+        """
+[DOCUMENT]
+TITLE: Test Doc
+
+[SECTION]
+TITLE: Section 1
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: Requirement 1
+
+[TEXT]
+STATEMENT: Text
+
+[REQUIREMENT]
+UID: REQ-2
+TITLE: Requirement 2
+
+[/SECTION]
+
+[SECTION]
+TITLE: Section 2
+
+[/SECTION]
+""".lstrip()
+    )
+
+
+def get_numbered_titles(document_iterator):
+    return [
+        (
+            node_.title if node_.is_section else node_.node_type,
+            node_.ng_level,
+            node_.context.title_number_string,
+        )
+        for node_ in document_iterator.all_content()
+    ]
+
+
+def test_01_levels_and_title_numbers():
+    document = read_document()
+    document_iterator = DocumentCachingIterator(document)
+
+    assert get_numbered_titles(document_iterator) == [
+        ("Section 1", 1, "1"),
+        ("REQUIREMENT", 2, "1.1"),
+        ("TEXT", 2, ""),
+        ("REQUIREMENT", 2, "1.2"),
+        ("Section 2", 1, "2"),
+    ]
+
+
+def test_02_cache_and_invalidation():
+    document = read_document()
+    document_iterator = DocumentCachingIterator(document)
+    nodes = list(document_iterator.all_content())
+
+    # The title numbers are assigned again by every iteration.
+    nodes[0].context.title_number_string = "CHANGED"
+    assert list(document_iterator.all_content()) == nodes
+    assert nodes[0].context.title_number_string == "1"
+
+    # The cached list is used until it is invalidated.
+    section_1, section_2 = document.section_contents
+    document.section_contents = [section_2, section_1]
+    assert list(document_iterator.all_content()) == nodes
+
+    document_iterator.invalidate_cache()
+    assert get_numbered_titles(document_iterator) == [
+        ("Section 2", 1, "1"),
+        ("Section 1", 1, "2"),
+        ("REQUIREMENT", 2, "2.1"),
+        ("TEXT", 2, ""),
+        ("REQUIREMENT", 2, "2.2"),
+    ]
+
+
+def test_03_cache_is_not_pickled():
+    document_iterator = DocumentCachingIterator(read_document())
+    list(document_iterator.all_content())
+    assert len(document_iterator._cache) == 1
+
+    document_iterator_copy = pickle.loads(pickle.dumps(document_iterator))
+    assert document_iterator_copy._cache == {}
+    assert len(list(document_iterator_copy.all_content())) == 5
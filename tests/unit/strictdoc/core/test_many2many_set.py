@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from strictdoc.core.graph.abstract_bucket import ALL_EDGES
@@ -90,3 +92,67 @@ def test_12_working_with_all_edges():
     assert many2many_set.get_count(edge="refines") == 0
     assert many2many_set.get_count(edge="verifies") == 0
     assert many2many_set.get_count(edge=ALL_EDGES) == 0
+
+
+def test_20_reads_do_not_store_anything():
+    many2many_set = ManyToManySet(int, int)
+
+    assert many2many_set.get_link_values(lhs_node=1) == OrderedSet()
+    assert many2many_set.get_link_values(lhs_node=1, edge="refines") == (
+        OrderedSet()
+    )
+    assert many2many_set.get_link_values_with_edges(lhs_node=1) == []
+    assert many2many_set.get_link_values_reverse(rhs_node=1) == OrderedSet()
+    assert not many2many_set.has_link(lhs_node=1)
+
+    # A node without links has nothing to delete.
+    many2many_set.delete_all_links(lhs_node=1)
+    assert not many2many_set.has_link(lhs_node=1)
+
+
+def test_30_counts_are_maintained():
+    random_generator = random.Random(2)
+    many2many_set = ManyToManySet(int, int)
+
+    for _ in range(5000):
+        lhs_node = random_generator.randrange(30)
+        rhs_node = random_generator.randrange(30)
+        edge = random_generator.choice((None, "refines", "verifies"))
+        if lhs_node == rhs_node:
+            continue
+        operation = random_generator.random()
+        if operation < 0.6:
+            many2many_set.create_link_weak(
+                lhs_node=lhs_node, rhs_node=rhs_node, edge=edge
+            )
+        elif operation < 0.8:
+            many2many_set.delete_link_weak(
+                lhs_node=lhs_node, rhs_node=rhs_node, edge=edge
+            )
+        elif operation < 0.95:
+            many2many_set.delete_link_weak(
+                lhs_node=lhs_node, rhs_node=rhs_node, edge=ALL_EDGES
+            )
+        else:
+            many2many_set.delete_all_links(lhs_node=lhs_node)
+
+        all_links = [
+            (lhs_node_, rhs_node_, edge_)
+            for lhs_node_ in range(30)
+            for rhs_node_, edge_ in many2many_set.get_link_values_with_edges(
+                lhs_node=lhs_node_
+            )
+        ]
+        for edge_ in (None, "refines", "verifies"):
+            assert many2many_set.get_count(edge=edge_) == len(
+                [link_ for link_ in all_links if link_[2] == edge_]
+            )
+        assert many2many_set.get_count(edge=ALL_EDGES) == len(all_links)
+        assert {
+            (lhs_node_, rhs_node_, edge_)
+            for rhs_node_ in range(30)
+            for edge_ in (None, "refines", "verifies")
+            for lhs_node_ in many2many_set.get_link_values_reverse(
+                rhs_node=rhs_node_, edge=edge_
+            )
+        } == set(all_links)
@@ -0,0 +1,189 @@
+from strictdoc.core.constants import GraphLinkType
+from strictdoc.core.document_tree import DocumentTree
+from strictdoc.core.graph.many_to_many_set import ManyToManySet
+from strictdoc.core.graph_database import GraphDatabase
+from strictdoc.core.query_engine.query_object import QueryObject
+from strictdoc.core.query_engine.query_reader import QueryReader
+from strictdoc.core.reachability_index import ReachabilityIndex
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from tests.unit.helpers.test_document_builder import DocumentBuilder
+
+
+def create_graph_database():
+    return GraphDatabase(
+        [
+            (
+                GraphLinkType.NODE_TO_PARENT_NODES,
+                ManyToManySet(int, int),
+            ),
+            (
+                GraphLinkType.NODE_TO_CHILD_NODES,
+                ManyToManySet(int, int),
+            ),
+        ]
+    )
+
+
+def create_relation(graph_database, child, parent):
+    graph_database.create_link(
+        link_type=GraphLinkType.NODE_TO_PARENT_NODES,
+        lhs_node=child,
+        rhs_node=parent,
+        edge="Refines",
+    )
+    graph_database.create_link(
+        link_type=GraphLinkType.NODE_TO_CHILD_NODES,
+        lhs_node=parent,
+        rhs_node=child,
+        edge="Refines",
+    )
+
+
+def delete_relation(graph_database, child, parent):
+    graph_database.delete_link(
+        link_type=GraphLinkType.NODE_TO_PARENT_NODES,
+        lhs_node=child,
+        rhs_node=parent,
+        edge="Refines",
+    )
+    graph_database.delete_link(
+        link_type=GraphLinkType.NODE_TO_CHILD_NODES,
+        lhs_node=parent,
+        rhs_node=child,
+        edge="Refines",
+    )
+
+
+def test_01_diamond():
+    graph_database = create_graph_database()
+    create_relation(graph_database, 2, 1)
+    create_relation(graph_database, 3, 1)
+    create_relation(graph_database, 4, 2)
+    create_relation(graph_database, 4, 3)
+    create_relation(graph_database, 5, 4)
+
+    reachability_index = ReachabilityIndex(graph_database)
+    assert reachability_index.get_ancestors(5) == [4, 2, 1, 3]
+    assert reachability_index.get_ancestors(1) == []
+    assert reachability_index.get_descendants(1) == [2, 4, 5, 3]
+    assert reachability_index.get_descendants(5) == []
+    assert reachability_index.has_ancestor(5, 1)
+    assert not reachability_index.has_ancestor(1, 5)
+    assert reachability_index.has_descendant(3, 5)
+    assert not reachability_index.has_descendant(2, 3)
+
+
+def test_02_invalidate_relation():
+    graph_database = create_graph_database()
+    create_relation(graph_database, 2, 1)
+    create_relation(graph_database, 3, 2)
+    create_relation(graph_database, 5, 4)
+
+    reachability_index = ReachabilityIndex(graph_database)
+    assert reachability_index.get_ancestors(3) == [2, 1]
+    assert reachability_index.get_descendants(4) == [5]
+
+    reachability_index.invalidate_relation(4, 3)
+    create_relation(graph_database, 4, 3)
+    assert reachability_index.get_ancestors(5) == [4, 3, 2, 1]
+    assert reachability_index.get_descendants(1) == [2, 3, 4, 5]
+
+    reachability_index.invalidate_relation(3, 2)
+    delete_relation(graph_database, 3, 2)
+    assert reachability_index.get_ancestors(5) == [4, 3]
+    assert reachability_index.get_descendants(1) == [2]
+    assert reachability_index.get_descendants(3) == [4, 5]
+
+
+def test_03_cycle():
+    graph_database = create_graph_database()
+    create_relation(graph_database, 2, 1)
+    create_relation(graph_database, 3, 2)
+    create_relation(graph_database, 1, 3)
+    create_relation(graph_database, 4, 3)
+
+    reachability_index = ReachabilityIndex(graph_database)
+    assert reachability_index.get_ancestors(4) == [3, 2, 1]
+    assert reachability_index.get_ancestors(1) == [3, 2, 1]
+    assert reachability_index.get_descendants(1) == [2, 3, 1, 4]
+
+    reachability_index.invalidate_relation(1, 3)
+    delete_relation(graph_database, 1, 3)
+    assert reachability_index.get_ancestors(4) == [3, 2, 1]
+    assert reachability_index.get_descendants(1) == [2, 3, 4]
+
+
+def test_10_traceability_index_and_query():
+    document_builder = DocumentBuilder()
+    requirement1 = document_builder.add_requirement("REQ-001")
+    requirement2 = document_builder.add_requirement("REQ-002")
+    requirement3 = document_builder.add_requirement("REQ-003")
+    requirement4 = document_builder.add_requirement("REQ-004")
+    for source_requirement_id_, target_requirement_id_ in (
+        ("REQ-002", "REQ-001"),
+        ("REQ-003", "REQ-002"),
+    ):
+        document_builder.add_requirement_relation(
+            relation_type="Parent",
+            source_requirement_id=source_requirement_id_,
+            target_requirement_id=target_requirement_id_,
+            role=None,
+        )
+    document_1 = document_builder.build()
+
+    document_tree = DocumentTree(
+        file_tree=[],
+        document_list=[document_1],
+        map_docs_by_paths={},
+        map_docs_by_rel_paths={},
+        map_grammars_by_filenames={},
+    )
+    traceability_index = TraceabilityIndexBuilder.create_from_document_tree(
+        document_tree, project_config=document_builder.project_config
+    )
+
+    assert traceability_index.get_ancestor_requirements(requirement3) == [
+        requirement2,
+        requirement1,
+    ]
+    assert traceability_index.get_descendant_requirements(requirement1) == [
+        requirement2,
+        requirement3,
+    ]
+    assert traceability_index.has_ancestor_requirement(
+        requirement3, requirement1
+    )
+    assert not traceability_index.has_descendant_requirement(
+        requirement1, requirement4
+    )
+
+    query_object = QueryObject(
+        QueryReader.read('node.has_ancestor("REQ-001")'), traceability_index
+    )
+    assert [
+        query_object.evaluate(requirement_)
+        for requirement_ in (
+            requirement1,
+            requirement2,
+            requirement3,
+            requirement4,
+        )
+    ] == [False, True, True, False]
+
+    query_object = QueryObject(
+        QueryReader.read('node.has_descendant("REQ-003")'), traceability_index
+    )
+    assert [
+        query_object.evaluate(requirement_)
+        for requirement_ in (
+            requirement1,
+            requirement2,
+            requirement3,
+            requirement4,
+        )
+    ] == [True, True, False, False]
+
+    query_object = QueryObject(
+        QueryReader.read('node.has_ancestor("REQ-404")'), traceability_index
+    )
+    assert not query_object.evaluate(requirement3)
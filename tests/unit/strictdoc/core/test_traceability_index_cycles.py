@@ -297,3 +297,50 @@ def test__adding_parent_link__03__two_requirements_disallow_cycle():
     exception: DocumentTreeError = exc_info.value
     assert exception.problem_uid == "REQ-001"
     assert exception.cycled_uids == ["REQ-001", "REQ-002"]
+
+
+def test__adding_parent_link__04__four_requirements_disallow_cycle():
+    document_builder = DocumentBuilder()
+    requirement1 = document_builder.add_requirement("REQ-001")
+    requirement2 = document_builder.add_requirement("REQ-002")
+    requirement3 = document_builder.add_requirement("REQ-003")
+    requirement4 = document_builder.add_requirement("REQ-004")
+    document_1 = document_builder.build()
+
+    document_tree = DocumentTree(
+        file_tree=[],
+        document_list=[document_1],
+        map_docs_by_paths={},
+        map_docs_by_rel_paths={},
+        map_grammars_by_filenames={},
+    )
+    traceability_index: TraceabilityIndex = (
+        TraceabilityIndexBuilder.create_from_document_tree(
+            document_tree, project_config=document_builder.project_config
+        )
+    )
+    traceability_index.update_requirement_parent_uid(
+        requirement2, "REQ-001", None
+    )
+    traceability_index.update_requirement_parent_uid(
+        requirement3, "REQ-002", None
+    )
+    traceability_index.update_requirement_child_uid(
+        requirement3, "REQ-004", None
+    )
+
+    with pytest.raises(DocumentTreeError) as exc_info:
+        traceability_index.update_requirement_parent_uid(
+            requirement1, "REQ-004", role=None
+        )
+    exception: DocumentTreeError = exc_info.value
+    assert exception.problem_uid == "REQ-001"
+    assert exception.cycled_uids == ["REQ-001", "REQ-004", "REQ-003", "REQ-002"]
+
+    with pytest.raises(DocumentTreeError) as exc_info:
+        traceability_index.update_requirement_child_uid(
+            requirement4, "REQ-002", role=None
+        )
+    exception = exc_info.value
+    assert exception.problem_uid == "REQ-004"
+    assert exception.cycled_uids == ["REQ-004", "REQ-002", "REQ-003"]
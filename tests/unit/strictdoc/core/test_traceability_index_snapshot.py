@@ -0,0 +1,331 @@
+import os
+
+import pytest
+
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from strictdoc.helpers.exception import StrictDocException
+from strictdoc.helpers.parallelizer import NullParallelizer
+
+DOCUMENT = """
+[DOCUMENT]
+TITLE: Document
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: {title}
+
+[REQUIREMENT]
+UID: REQ-2
+TITLE: Child requirement
+RELATIONS:
+- TYPE: Parent
+  VALUE: REQ-1
+""".lstrip()
+
+OTHER_DOCUMENT = """
+[DOCUMENT]
+TITLE: Other document
+
+[REQUIREMENT]
+UID: REQ-3
+TITLE: Other requirement
+RELATIONS:
+- TYPE: Parent
+  VALUE: {parent_uid}
+""".lstrip()
+
+
+def create_project_config(tmp_path):
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    project_config.dir_for_sdoc_cache = str(tmp_path / "cache")
+    project_config.input_paths = [str(tmp_path / "input")]
+    project_config.output_dir = str(tmp_path / "output")
+    project_config.export_output_html_root = str(tmp_path / "output" / "html")
+    return project_config
+
+
+def write_document(tmp_path, title, file_name="document.sdoc", content=None):
+    os.makedirs(tmp_path / "input", exist_ok=True)
+    path_to_document = tmp_path / "input" / file_name
+    with open(path_to_document, "w", encoding="utf8") as document_file:
+        document_file.write(
+            content if content is not None else DOCUMENT.format(title=title)
+        )
+    # Move the modification time out of the racy window of the manifest.
+    os.utime(path_to_document, (1_000_000, 1_000_000))
+
+
+def get_relations(traceability_index):
+    relations = {}
+    for document_ in traceability_index.document_tree.document_list:
+        for node_ in traceability_index.get_document_iterator(
+            document_
+        ).all_content():
+            if not node_.is_requirement:
+                continue
+            relations[node_.reserved_uid] = (
+                node_.reserved_title,
+                [
+                    parent_.reserved_uid
+                    for parent_ in traceability_index.get_parent_requirements(
+                        node_
+                    )
+                ],
+                [
+                    child_.reserved_uid
+                    for child_ in traceability_index.get_children_requirements(
+                        node_
+                    )
+                ],
+            )
+    return relations
+
+
+@pytest.fixture
+def count_builds(monkeypatch):
+    builds = []
+    create_from_files = TraceabilityIndexBuilder._create_from_files
+
+    def counting_create_from_files(**kwargs):
+        builds.append(kwargs["project_config"])
+        return create_from_files(**kwargs)
+
+    monkeypatch.setattr(
+        TraceabilityIndexBuilder,
+        "_create_from_files",
+        staticmethod(counting_create_from_files),
+    )
+    return builds
+
+
+def test_unchanged_input_is_loaded_from_snapshot(tmp_path, count_builds):
+    write_document(tmp_path, "Requirement")
+
+    TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+    traceability_index = TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    assert len(count_builds) == 1
+    requirement = traceability_index.get_node_by_uid("REQ-2")
+    assert [
+        parent_.reserved_uid
+        for parent_ in traceability_index.get_parent_requirements(requirement)
+    ] == ["REQ-1"]
+
+
+def test_changed_input_or_config_is_built_again(tmp_path, count_builds):
+    write_document(tmp_path, "Requirement")
+    TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    # A new document is a structural change that is not handled by the
+    # incremental update.
+    write_document(
+        tmp_path,
+        None,
+        file_name="other.sdoc",
+        content=OTHER_DOCUMENT.format(parent_uid="REQ-2"),
+    )
+    write_document(tmp_path, "Changed requirement")
+    traceability_index = TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+    assert len(count_builds) == 2
+    assert (
+        traceability_index.get_node_by_uid("REQ-1").reserved_title
+        == "Changed requirement"
+    )
+
+    project_config = create_project_config(tmp_path)
+    project_config.filter_requirements = '"REQ" in node["UID"]'
+    TraceabilityIndexBuilder.create(
+        project_config=project_config, parallelizer=NullParallelizer()
+    )
+    assert len(count_builds) == 3
+
+
+def test_skip_source_files_has_its_own_slot(tmp_path, count_builds):
+    write_document(tmp_path, "Requirement")
+
+    for skip_source_files_ in (False, True, False, True):
+        TraceabilityIndexBuilder.create(
+            project_config=create_project_config(tmp_path),
+            parallelizer=NullParallelizer(),
+            skip_source_files=skip_source_files_,
+        )
+
+    assert len(count_builds) == 2
+
+
+def test_changed_document_is_updated_in_snapshot(tmp_path, count_builds):
+    write_document(tmp_path, "Requirement")
+    write_document(
+        tmp_path,
+        None,
+        file_name="other.sdoc",
+        content=OTHER_DOCUMENT.format(parent_uid="REQ-1"),
+    )
+    TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    write_document(tmp_path, "Changed requirement")
+    traceability_index = TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    assert len(count_builds) == 1
+    assert get_relations(traceability_index) == {
+        "REQ-1": ("Changed requirement", [], ["REQ-2", "REQ-3"]),
+        "REQ-2": ("Child requirement", ["REQ-1"], []),
+        "REQ-3": ("Other requirement", ["REQ-1"], []),
+    }
+    # The updated index must be the same as the one built from scratch.
+    project_config = create_project_config(tmp_path)
+    project_config.dir_for_sdoc_cache = str(tmp_path / "other_cache")
+    assert get_relations(traceability_index) == get_relations(
+        TraceabilityIndexBuilder.create(
+            project_config=project_config, parallelizer=NullParallelizer()
+        )
+    )
+
+
+def test_updated_relations_keep_the_order_of_a_full_build(
+    tmp_path, count_builds
+):
+    # REQ-C1 comes first in the document tree, so a full build lists it
+    # before REQ-C2 among the children of REQ-P, even though the relations of
+    # REQ-C1 are linked again after those of the unchanged document.
+    first_document = """
+[DOCUMENT]
+TITLE: First document
+
+[REQUIREMENT]
+UID: REQ-C1
+TITLE: {title}
+RELATIONS:
+- TYPE: Parent
+  VALUE: REQ-P
+""".lstrip()
+    second_document = """
+[DOCUMENT]
+TITLE: Second document
+
+[GRAMMAR]
+ELEMENTS:
+- TAG: REQUIREMENT
+  FIELDS:
+  - TITLE: UID
+    TYPE: String
+    REQUIRED: False
+  - TITLE: TITLE
+    TYPE: String
+    REQUIRED: False
+  - TITLE: STATEMENT
+    TYPE: String
+    REQUIRED: False
+  RELATIONS:
+  - TYPE: Parent
+  - TYPE: Child
+
+[REQUIREMENT]
+UID: REQ-P
+TITLE: Parent requirement
+
+[REQUIREMENT]
+UID: REQ-C2
+TITLE: Second child requirement
+RELATIONS:
+- TYPE: Parent
+  VALUE: REQ-P
+
+[REQUIREMENT]
+UID: REQ-Q
+TITLE: Other parent requirement
+RELATIONS:
+- TYPE: Child
+  VALUE: REQ-C1
+""".lstrip()
+    write_document(
+        tmp_path,
+        None,
+        file_name="a_first.sdoc",
+        content=first_document.format(title="First child requirement"),
+    )
+    write_document(
+        tmp_path, None, file_name="b_second.sdoc", content=second_document
+    )
+    TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    write_document(
+        tmp_path,
+        None,
+        file_name="a_first.sdoc",
+        content=first_document.format(title="Changed child requirement"),
+    )
+    traceability_index = TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    assert len(count_builds) == 1
+    assert get_relations(traceability_index)["REQ-P"] == (
+        "Parent requirement",
+        [],
+        ["REQ-C1", "REQ-C2"],
+    )
+    project_config = create_project_config(tmp_path)
+    project_config.dir_for_sdoc_cache = str(tmp_path / "other_cache")
+    assert get_relations(traceability_index) == get_relations(
+        TraceabilityIndexBuilder.create(
+            project_config=project_config, parallelizer=NullParallelizer()
+        )
+    )
+
+
+def test_relation_to_removed_uid_is_reported(tmp_path, count_builds):
+    write_document(tmp_path, "Requirement")
+    write_document(
+        tmp_path,
+        None,
+        file_name="other.sdoc",
+        content=OTHER_DOCUMENT.format(parent_uid="REQ-1"),
+    )
+    TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path),
+        parallelizer=NullParallelizer(),
+    )
+
+    write_document(
+        tmp_path,
+        None,
+        content=DOCUMENT.format(title="Requirement").replace("REQ-1", "REQ-10"),
+    )
+    with pytest.raises(StrictDocException) as exc_info:
+        TraceabilityIndexBuilder.create(
+            project_config=create_project_config(tmp_path),
+            parallelizer=NullParallelizer(),
+        )
+
+    assert len(count_builds) == 1
+    assert (
+        "REQ-3 references parent requirement which doesn't exist: REQ-1"
+        in (exc_info.value.args[0])
+    )
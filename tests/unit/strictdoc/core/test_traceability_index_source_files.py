@@ -0,0 +1,110 @@
+import os
+import sys
+
+import pytest
+
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.project_config import ProjectConfig, ProjectFeature
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from strictdoc.helpers.parallelizer import (
+    MultiprocessingParallelizer,
+    NullParallelizer,
+)
+
+DOCUMENT = """
+[DOCUMENT]
+TITLE: Document
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: Requirement 1
+
+[REQUIREMENT]
+UID: REQ-2
+TITLE: Requirement 2
+""".lstrip()
+
+SOURCE_FILE = """
+# @sdoc[{uid}]
+def function_{idx}():
+    pass
+# @sdoc[/{uid}]
+""".lstrip()
+
+
+def create_input(tmp_path):
+    path_to_input = tmp_path / "input"
+    os.makedirs(path_to_input)
+    with open(path_to_input / "document.sdoc", "w", encoding="utf8") as file:
+        file.write(DOCUMENT)
+    for idx_ in range(12):
+        with open(
+            path_to_input / f"file_{idx_:02}.py", "w", encoding="utf8"
+        ) as file:
+            file.write(
+                SOURCE_FILE.format(uid=f"REQ-{idx_ % 2 + 1}", idx=idx_)
+                # Files of different sizes are scheduled out of order.
+                + "#" * (idx_ * 100)
+            )
+
+
+def create_project_config(tmp_path, build_name):
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    project_config.project_features = [
+        ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
+    ]
+    project_config.source_root_path = str(tmp_path / "input")
+    project_config.dir_for_sdoc_cache = str(tmp_path / build_name / "cache")
+    project_config.input_paths = [str(tmp_path / "input")]
+    project_config.output_dir = str(tmp_path / build_name / "output")
+    project_config.export_output_html_root = str(
+        tmp_path / build_name / "output" / "html"
+    )
+    return project_config
+
+
+def get_source_file_markers(traceability_index):
+    file_traceability_index = traceability_index.get_file_traceability_index()
+    return [
+        (
+            path_,
+            [
+                (marker_.ng_range_line_begin, marker_.ng_range_line_end)
+                for marker_ in traceability_info_.markers
+            ],
+            sorted(traceability_info_.ng_map_reqs_to_markers.keys()),
+        )
+        for path_, traceability_info_ in (
+            file_traceability_index.map_paths_to_source_file_traceability_info.items()
+        )
+    ]
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_source_files_are_read_in_parallel_in_deterministic_order(tmp_path):
+    create_input(tmp_path)
+
+    serial_index = TraceabilityIndexBuilder.create(
+        project_config=create_project_config(tmp_path, "serial"),
+        parallelizer=NullParallelizer(),
+    )
+    parallelizer = MultiprocessingParallelizer(jobs=3)
+    try:
+        parallel_index = TraceabilityIndexBuilder.create(
+            project_config=create_project_config(tmp_path, "parallel"),
+            parallelizer=parallelizer,
+        )
+    finally:
+        parallelizer.shutdown()
+
+    serial_markers = get_source_file_markers(serial_index)
+    # The document is a source file as well.
+    assert len(serial_markers) == 13
+    assert [path_ for path_, _, _ in serial_markers] == sorted(
+        path_ for path_, _, _ in serial_markers
+    )
+    assert get_source_file_markers(parallel_index) == serial_markers
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from strictdoc.backend.sdoc.errors.document_tree_error import DocumentTreeError
+from strictdoc.core.tree_cycle_detector import (
+    GraphCycleDetector,
+    TreeCycleDetector,
+)
+
+
+def test_01_no_cycles():
+    links = {1: [2, 3], 2: [4], 3: [4], 4: []}
+
+    assert GraphCycleDetector.find_cycles(links.keys(), links.__getitem__) == []
+
+
+def test_02_cycles():
+    links = {1: [2], 2: [3], 3: [1, 4], 4: [4], 5: [1], 6: [7], 7: [6]}
+
+    assert GraphCycleDetector.find_cycles(links.keys(), links.__getitem__) == [
+        [4],
+        [1, 2, 3],
+        [6, 7],
+    ]
+
+
+def test_03_only_reachable_nodes_are_checked():
+    links = {1: [2], 2: [], 3: [4], 4: [3]}
+
+    assert GraphCycleDetector.find_cycles([1], links.__getitem__) == []
+    assert GraphCycleDetector.find_cycles([2, 4], links.__getitem__) == [[4, 3]]
+
+
+def test_10_same_cycles_as_tree_cycle_detector():
+    random_generator = random.Random(3)
+    for _ in range(300):
+        number_of_nodes = random_generator.randrange(1, 12)
+        links = {
+            node_: random_generator.sample(
+                range(number_of_nodes),
+                random_generator.randrange(min(3, number_of_nodes + 1)),
+            )
+            for node_ in range(number_of_nodes)
+        }
+
+        has_cycles = False
+        tree_cycle_detector = TreeCycleDetector()
+        try:
+            for node_ in links:
+                tree_cycle_detector.check_node(node_, links.__getitem__)
+        except DocumentTreeError:
+            has_cycles = True
+
+        cycles = GraphCycleDetector.find_cycles(links.keys(), links.__getitem__)
+        assert (len(cycles) > 0) == has_cycles
+        for cycle_ in cycles:
+            # Every node of a cycle is reachable from every other node.
+            with pytest.raises(DocumentTreeError):
+                TreeCycleDetector().check_node(cycle_[0], links.__getitem__)
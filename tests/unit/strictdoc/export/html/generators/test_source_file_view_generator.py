@@ -0,0 +1,95 @@
+import os
+from datetime import datetime
+
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.project_config import ProjectConfig, ProjectFeature
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from strictdoc.export.html.generators.source_file_view_generator import (
+    SourceFileViewHTMLGenerator,
+)
+from strictdoc.export.html.html_templates import HTMLTemplates
+from strictdoc.helpers.parallelizer import NullParallelizer
+
+DOCUMENT = """
+[DOCUMENT]
+TITLE: Document
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: Requirement 1
+""".lstrip()
+
+SOURCE_FILE = """
+# @sdoc[REQ-1]
+def function():
+    pass
+# @sdoc[/REQ-1]
+""".lstrip()
+
+
+def write_file(path_to_file, content):
+    with open(path_to_file, "w", encoding="utf8") as file:
+        file.write(content)
+    # Move the modification time out of the racy window of the manifest.
+    os.utime(path_to_file, (1_000_000, 1_000_000))
+
+
+def create_project_config(tmp_path):
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    project_config.project_features = [
+        ProjectFeature.REQUIREMENT_TO_SOURCE_TRACEABILITY
+    ]
+    project_config.source_root_path = str(tmp_path / "input")
+    project_config.dir_for_sdoc_cache = str(tmp_path / "cache")
+    project_config.input_paths = [str(tmp_path / "input")]
+    project_config.output_dir = str(tmp_path / "output")
+    project_config.export_output_html_root = str(tmp_path / "output" / "html")
+    return project_config
+
+
+def export_source_file(tmp_path):
+    project_config = create_project_config(tmp_path)
+    traceability_index = TraceabilityIndexBuilder.create(
+        project_config=project_config, parallelizer=NullParallelizer()
+    )
+    html_templates = HTMLTemplates.create(
+        project_config,
+        enable_caching=False,
+        strictdoc_last_update=datetime.now(),
+    )
+    source_file = next(
+        source_file_
+        for source_file_ in (
+            traceability_index.document_tree.source_tree.source_files
+        )
+        if source_file_.file_name == "file.py"
+    )
+    return SourceFileViewHTMLGenerator.export_to_file(
+        project_config=project_config,
+        source_file=source_file,
+        traceability_index=traceability_index,
+        html_templates=html_templates,
+    ), source_file.output_file_full_path
+
+
+def test_unchanged_source_file_with_new_mtime_is_skipped(tmp_path):
+    os.makedirs(tmp_path / "input")
+    write_file(tmp_path / "input" / "document.sdoc", DOCUMENT)
+    write_file(tmp_path / "input" / "file.py", SOURCE_FILE)
+
+    was_exported, path_to_output = export_source_file(tmp_path)
+    assert was_exported
+    assert os.path.isfile(path_to_output)
+
+    # A fresh checkout: all input files are newer than the output.
+    os.utime(path_to_output, (1_000, 1_000))
+    was_exported, _ = export_source_file(tmp_path)
+    assert not was_exported
+
+    # The source file has new content, and the marker set has changed.
+    write_file(tmp_path / "input" / "file.py", SOURCE_FILE + SOURCE_FILE)
+    os.utime(path_to_output, (1_000, 1_000))
+    was_exported, _ = export_source_file(tmp_path)
+    assert was_exported
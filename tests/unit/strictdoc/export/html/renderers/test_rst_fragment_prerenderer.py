@@ -0,0 +1,89 @@
+import os
+from datetime import datetime
+
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from strictdoc.export.html.html_templates import HTMLTemplates
+from strictdoc.export.html.renderers.rst_fragment_prerenderer import (
+    RstFragmentPrerenderer,
+)
+from strictdoc.helpers.parallelizer import NullParallelizer
+
+DOCUMENT = """
+[DOCUMENT]
+TITLE: Document
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: Requirement 1
+STATEMENT: >>>
+Shared **statement**.
+<<<
+RATIONALE: Rationale with a link to [LINK: REQ-2].
+COMMENT: >>>
+- Item
+<<<
+
+[REQUIREMENT]
+UID: REQ-2
+TITLE: Requirement 2
+STATEMENT: >>>
+Shared **statement**.
+<<<
+""".lstrip()
+
+
+def test_prerender_renders_unique_fragments_into_cache(tmp_path, capsys):
+    os.makedirs(tmp_path / "input")
+    with open(
+        tmp_path / "input" / "document.sdoc", "w", encoding="utf8"
+    ) as file:
+        file.write(DOCUMENT)
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    project_config.dir_for_sdoc_cache = str(tmp_path / "cache")
+    project_config.input_paths = [str(tmp_path / "input")]
+    project_config.output_dir = str(tmp_path / "output")
+    project_config.export_output_html_root = str(tmp_path / "output" / "html")
+    traceability_index = TraceabilityIndexBuilder.create(
+        project_config=project_config, parallelizer=NullParallelizer()
+    )
+    html_templates = HTMLTemplates.create(
+        project_config,
+        enable_caching=False,
+        strictdoc_last_update=datetime.now(),
+    )
+
+    def prerender():
+        capsys.readouterr()
+        RstFragmentPrerenderer.prerender(
+            documents=traceability_index.document_tree.document_list,
+            traceability_index=traceability_index,
+            project_config=project_config,
+            html_templates=html_templates,
+            parallelizer=NullParallelizer(),
+        )
+        return capsys.readouterr().out
+
+    # The default features export the DOCUMENT, TABLE, TRACE and DEEPTRACE
+    # pages. There are 4 fields, each rendered once per page type. Both
+    # statements are the same, and the link to REQ-2 in the rationale is a
+    # local anchor that is the same on every page.
+    assert (
+        "RST fragments: 16 collected, 3 unique (dedup ratio 5.33), "
+        "0 cached, 3 pre-rendered."
+    ) in prerender()
+    assert (
+        "RST fragments: 16 collected, 3 unique (dedup ratio 5.33), "
+        "3 cached, 0 pre-rendered."
+    ) in prerender()
+
+
+def test_statistics_message_reports_errors():
+    assert RstFragmentPrerenderer.get_statistics_message(4, 2, 0, 2, 1) == (
+        "RST fragments: 4 collected, 2 unique (dedup ratio 2.00), "
+        "0 cached, 2 pre-rendered. 1 fragment(s) with RST errors are left "
+        "to the page generation."
+    )
@@ -0,0 +1,80 @@
+import os
+
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.export.html2pdf.pdf_print_driver import PDFPrintDriver
+
+
+def test_create_batches_balances_sizes_of_documents(tmp_path):
+    paths_to_print = []
+    for name_, size_ in (("a", 10), ("b", 70), ("c", 40), ("d", 30)):
+        path_to_html = tmp_path / f"{name_}.html"
+        path_to_html.write_text("x" * size_)
+        paths_to_print.append(
+            (str(path_to_html), str(tmp_path / f"{name_}.pdf"))
+        )
+
+    batches = PDFPrintDriver.create_batches(paths_to_print, jobs=2)
+
+    assert [
+        [os.path.basename(path_to_html_) for path_to_html_, _ in batch_]
+        for batch_ in batches
+    ] == [["b.html", "a.html"], ["c.html", "d.html"]]
+
+
+def test_create_batches_does_not_create_empty_batches():
+    paths_to_print = [("a.html", "a.pdf"), ("b.html", "b.pdf")]
+
+    batches = PDFPrintDriver.create_batches(paths_to_print, jobs=8)
+
+    assert len(batches) == 2
+    assert sorted(batch_[0] for batch_ in batches) == paths_to_print
+
+
+def test_get_command_uses_one_cache_directory_for_all_batches():
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+
+    command_0 = PDFPrintDriver.get_command(
+        project_config, [("a.html", "a.pdf")]
+    )
+    command_1 = PDFPrintDriver.get_command(
+        project_config, [("b.html", "b.pdf")]
+    )
+    driver_command = PDFPrintDriver.get_driver_command(project_config)
+
+    assert command_0[:2] == ["html2print", "print"]
+    assert command_0[-2:] == ["a.html", "a.pdf"]
+    assert driver_command[:2] == ["html2print", "get_driver"]
+    assert command_0[3] == command_1[3] == driver_command[3]
+
+
+def test_driver_is_downloaded_once_before_the_batches(tmp_path, monkeypatch):
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    paths_to_print = [
+        (str(tmp_path / f"{name_}.html"), str(tmp_path / f"{name_}.pdf"))
+        for name_ in ("a", "b", "c")
+    ]
+    commands = []
+
+    class PopenStub:
+        def __init__(self, command):
+            commands.append(command[1])
+
+        def wait(self):
+            pass
+
+    monkeypatch.setattr(
+        "strictdoc.export.html2pdf.pdf_print_driver.Popen", PopenStub
+    )
+    monkeypatch.setattr(
+        "strictdoc.export.html2pdf.pdf_print_driver.run",
+        lambda command, **_kwargs: commands.append(command[1]),
+    )
+
+    PDFPrintDriver.get_pdf_from_html(project_config, paths_to_print, jobs=3)
+
+    assert commands == ["get_driver", "print", "print", "print"]
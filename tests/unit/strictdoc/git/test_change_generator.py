@@ -0,0 +1,168 @@
+import os
+import sys
+
+import pytest
+
+from strictdoc.core.cache_backend import CacheBackend
+from strictdoc.core.environment import SDocRuntimeEnvironment
+from strictdoc.core.project_config import ProjectConfig
+from strictdoc.core.traceability_index_builder import TraceabilityIndexBuilder
+from strictdoc.core.traceability_index_snapshot import TraceabilityIndexSnapshot
+from strictdoc.git.change_generator import ChangeGenerator
+from strictdoc.helpers.parallelizer import (
+    MultiprocessingParallelizer,
+    NullParallelizer,
+)
+
+DOCUMENT_LHS = """
+[DOCUMENT]
+TITLE: Document
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: Requirement 1
+STATEMENT: The system shall do A.
+
+[REQUIREMENT]
+UID: REQ-2
+TITLE: Requirement 2
+STATEMENT: The system shall do B.
+""".lstrip()
+
+DOCUMENT_RHS = """
+[DOCUMENT]
+TITLE: Document
+
+[REQUIREMENT]
+UID: REQ-1
+TITLE: Requirement 1
+STATEMENT: The system shall do A quickly.
+
+[REQUIREMENT]
+UID: REQ-3
+TITLE: Requirement 3
+STATEMENT: The system shall do C.
+""".lstrip()
+
+
+def create_project_config(tmp_path, side, content, build_name):
+    path_to_input = tmp_path / side
+    os.makedirs(path_to_input, exist_ok=True)
+    with open(path_to_input / "document.sdoc", "w", encoding="utf8") as file:
+        file.write(content)
+
+    project_config = ProjectConfig.default_config(
+        SDocRuntimeEnvironment(os.getcwd())
+    )
+    project_config.dir_for_sdoc_cache = str(tmp_path / build_name / "cache")
+    project_config.input_paths = [str(path_to_input)]
+    project_config.output_dir = str(tmp_path / build_name / "output")
+    return project_config
+
+
+def generate_changes(tmp_path, parallelizer, build_name):
+    return ChangeGenerator.generate(
+        lhs_project_config=create_project_config(
+            tmp_path, "lhs", DOCUMENT_LHS, build_name
+        ),
+        rhs_project_config=create_project_config(
+            tmp_path, "rhs", DOCUMENT_RHS, build_name
+        ),
+        parallelizer=parallelizer,
+    )
+
+
+def get_changes_summary(change_container):
+    change_stats = change_container.change_stats
+    return (
+        change_stats.get_total_changes(),
+        change_stats.get_changes_requirements_stats_string(),
+        [
+            document_.title
+            for document_ in (
+                change_container.traceability_index_rhs.document_tree.document_list
+            )
+        ],
+    )
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_trees_built_concurrently_have_same_changes_as_serial(tmp_path):
+    serial_changes = generate_changes(tmp_path, NullParallelizer(), "serial")
+
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        parallel_changes = generate_changes(tmp_path, parallelizer, "parallel")
+    finally:
+        parallelizer.shutdown()
+
+    assert serial_changes.change_stats.get_total_changes() == 3
+    assert get_changes_summary(parallel_changes) == get_changes_summary(
+        serial_changes
+    )
+
+
+def count_main_process_builds(monkeypatch):
+    main_process_id = os.getpid()
+    main_process_builds = []
+    create_from_files = TraceabilityIndexBuilder._create_from_files
+
+    def create_from_files_counted(**kwargs):
+        if os.getpid() == main_process_id:
+            main_process_builds.append(kwargs["project_config"].input_paths)
+        return create_from_files(**kwargs)
+
+    monkeypatch.setattr(
+        TraceabilityIndexBuilder,
+        "_create_from_files",
+        staticmethod(create_from_files_counted),
+    )
+    return main_process_builds
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_main_process_does_not_build_trees_built_concurrently(
+    tmp_path, monkeypatch
+):
+    main_process_builds = count_main_process_builds(monkeypatch)
+    # The trees are passed from the forked processes without the cache.
+    monkeypatch.setattr(
+        TraceabilityIndexSnapshot, "save", lambda self, traceability_index: None
+    )
+
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        change_container = generate_changes(tmp_path, parallelizer, "parallel")
+    finally:
+        parallelizer.shutdown()
+
+    assert change_container.change_stats.get_total_changes() == 3
+    assert main_process_builds == []
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_trees_are_built_once_in_main_process_with_read_only_cache(
+    tmp_path, monkeypatch
+):
+    main_process_builds = count_main_process_builds(monkeypatch)
+    monkeypatch.setattr(
+        CacheBackend, "is_read_only", staticmethod(lambda path: True)
+    )
+
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        change_container = generate_changes(tmp_path, parallelizer, "parallel")
+    finally:
+        parallelizer.shutdown()
+
+    assert change_container.change_stats.get_total_changes() == 3
+    assert main_process_builds == [
+        [str(tmp_path / "lhs")],
+        [str(tmp_path / "rhs")],
+    ]
@@ -0,0 +1,45 @@
+import os
+
+from strictdoc.helpers.cpu_count import (
+    get_available_cpu_count,
+    get_cgroup_cpu_limit,
+)
+
+
+def _write(path_to_file, content):
+    os.makedirs(os.path.dirname(path_to_file), exist_ok=True)
+    with open(path_to_file, "w", encoding="utf8") as file:
+        file.write(content)
+
+
+def test_cgroup_v2_quota(tmp_path):
+    _write(os.path.join(tmp_path, "cpu.max"), "250000 100000\n")
+
+    assert get_cgroup_cpu_limit(str(tmp_path)) == 3
+    assert get_available_cpu_count(str(tmp_path)) <= 3
+
+
+def test_cgroup_v2_no_quota(tmp_path):
+    _write(os.path.join(tmp_path, "cpu.max"), "max 100000\n")
+
+    assert get_cgroup_cpu_limit(str(tmp_path)) is None
+
+
+def test_cgroup_v1_quota(tmp_path):
+    _write(os.path.join(tmp_path, "cpu", "cpu.cfs_quota_us"), "50000\n")
+    _write(os.path.join(tmp_path, "cpu", "cpu.cfs_period_us"), "100000\n")
+
+    assert get_cgroup_cpu_limit(str(tmp_path)) == 1
+    assert get_available_cpu_count(str(tmp_path)) == 1
+
+
+def test_cgroup_v1_no_quota(tmp_path):
+    _write(os.path.join(tmp_path, "cpu", "cpu.cfs_quota_us"), "-1\n")
+    _write(os.path.join(tmp_path, "cpu", "cpu.cfs_period_us"), "100000\n")
+
+    assert get_cgroup_cpu_limit(str(tmp_path)) is None
+
+
+def test_no_cgroup(tmp_path):
+    assert get_cgroup_cpu_limit(str(tmp_path)) is None
+    assert get_available_cpu_count(str(tmp_path)) >= 1
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+from strictdoc.helpers.output_writer import OutputWriter
+from strictdoc.helpers.parallelizer import (
+    MultiprocessingParallelizer,
+    Parallelizer,
+)
+
+
+@pytest.fixture
+def write_behind(monkeypatch):
+    monkeypatch.setattr(Parallelizer, "after_task_hooks", [])
+    monkeypatch.setattr(OutputWriter, "_instance", None)
+    monkeypatch.setattr(OutputWriter, "write_behind", False)
+    OutputWriter.enable_write_behind()
+    yield
+    OutputWriter.get_instance().flush()
+
+
+def test_write_without_write_behind_writes_file_immediately(tmp_path):
+    path_to_file = str(tmp_path / "output" / "index.html")
+
+    OutputWriter.get_instance().write(path_to_file, "<html></html>")
+
+    with open(path_to_file, encoding="utf8") as file:
+        assert file.read() == "<html></html>"
+    assert os.listdir(tmp_path / "output") == ["index.html"]
+
+
+@pytest.mark.usefixtures("write_behind")
+def test_write_behind_writes_all_files_after_flush(tmp_path):
+    output_writer = OutputWriter.get_instance()
+    path_to_source_file = tmp_path / "source.css"
+    path_to_source_file.write_text("body {}")
+    for idx_ in range(200):
+        output_writer.write(
+            str(tmp_path / "output" / f"{idx_:03}.html"), f"page {idx_}"
+        )
+    output_writer.write(str(tmp_path / "output" / "data.bin"), b"\x00\x01")
+    output_writer.copy_file(
+        str(path_to_source_file), str(tmp_path / "output" / "style.css")
+    )
+
+    OutputWriter.flush_and_report()
+
+    files = sorted(os.listdir(tmp_path / "output"))
+    assert len(files) == 202
+    assert (tmp_path / "output" / "123.html").read_text() == "page 123"
+    assert (tmp_path / "output" / "data.bin").read_bytes() == b"\x00\x01"
+    assert (tmp_path / "output" / "style.css").read_text() == "body {}"
+
+
+@pytest.mark.usefixtures("write_behind")
+def test_write_behind_reports_failed_writes_at_flush(tmp_path, capsys):
+    # A file cannot be written into a path that is a file.
+    (tmp_path / "not_a_folder").write_text("")
+    output_writer = OutputWriter.get_instance()
+    output_writer.write(str(tmp_path / "not_a_folder" / "index.html"), "")
+    output_writer.write(str(tmp_path / "index.html"), "index")
+
+    with pytest.raises(SystemExit) as exc_info:
+        OutputWriter.flush_and_report()
+
+    assert exc_info.value.code == 1
+    assert "error: Could not write the output file:" in capsys.readouterr().out
+    assert (tmp_path / "index.html").read_text() == "index"
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+@pytest.mark.usefixtures("write_behind")
+def test_write_behind_flushes_writes_of_forked_workers(tmp_path):
+    def export_page(idx):
+        OutputWriter.get_instance().write(
+            str(tmp_path / f"{idx}.html"), f"page {idx}"
+        )
+        return idx
+
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        results = parallelizer.run_parallel_forked(range(10), export_page)
+    finally:
+        parallelizer.shutdown()
+
+    assert list(results) == list(range(10))
+    for idx_ in range(10):
+        assert (tmp_path / f"{idx_}.html").read_text() == f"page {idx_}"
@@ -0,0 +1,174 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from strictdoc.helpers.parallelizer import (
+    MultiprocessingParallelizer,
+    NullParallelizer,
+    Parallelizer,
+)
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_run_parallel_forked_does_not_pickle_processing_function():
+    # A lock cannot be pickled, so the function can only reach the workers
+    # through fork().
+    shared_state = {"lock": threading.Lock(), "offset": 100}
+
+    def processing_func(content):
+        with shared_state["lock"]:
+            return content + shared_state["offset"]
+
+    parallelizer = MultiprocessingParallelizer()
+    try:
+        results = parallelizer.run_parallel_forked(range(20), processing_func)
+        assert list(results) == list(range(100, 120))
+        assert list(parallelizer.run_parallel_forked([], processing_func)) == []
+    finally:
+        parallelizer.shutdown()
+
+
+def test_null_parallelizer_run_parallel_forked():
+    results = NullParallelizer().run_parallel_forked(
+        [1, 2, 3], lambda content: content * 2
+    )
+
+    assert list(results) == [2, 4, 6]
+
+
+def test_run_parallel_keeps_order_of_contents_with_weights():
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        results = parallelizer.run_parallel(
+            range(10), abs, weight_func=lambda content: content
+        )
+        assert list(results) == list(range(10))
+    finally:
+        parallelizer.shutdown()
+
+
+def test_utilization_is_printed_only_on_request(capsys):
+    parallelizer = MultiprocessingParallelizer(jobs=2)
+    try:
+        parallelizer.run_parallel(range(4), abs)
+        assert "Worker utilization" not in capsys.readouterr().out
+
+        parallelizer.print_utilization()
+        assert "Parallelizer: 4 tasks" in capsys.readouterr().out
+    finally:
+        parallelizer.shutdown()
+
+    NullParallelizer().print_utilization()
+    assert capsys.readouterr().out == ""
+
+
+def test_create_chunks_schedules_heaviest_contents_first():
+    contents = ["small", "huge", "medium", "small2"]
+    weights = {"small": 1, "huge": 100, "medium": 10, "small2": 1}
+
+    chunks = MultiprocessingParallelizer.create_chunks(
+        contents, 2, weights.__getitem__
+    )
+
+    # The limit of a chunk is 112 / (4 * 2) = 14.
+    assert chunks == [
+        [(1, "huge")],
+        [(2, "medium"), (0, "small"), (3, "small2")],
+    ]
+
+
+def test_create_chunks_groups_contents_without_weights():
+    chunks = MultiprocessingParallelizer.create_chunks(list(range(16)), 2, None)
+
+    assert len(chunks) == MultiprocessingParallelizer.CHUNKS_PER_JOB * 2
+    assert [idx_ for chunk_ in chunks for idx_, _ in chunk_] == list(range(16))
+
+
+def test_get_utilization_message_reports_idle_workers():
+    message = MultiprocessingParallelizer.get_utilization_message(
+        number_of_tasks=3,
+        number_of_chunks=2,
+        number_of_workers=3,
+        busy_time_per_worker={101: 2.0, 102: 1.0},
+        wall_time=2.0,
+    )
+
+    assert message == (
+        "Parallelizer: 3 tasks in 2 chunks, 3 workers, 2.00s. "
+        "Worker utilization: 100%, 50%, 0%."
+    )
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_run_tasks_forked_reports_failed_task_separately(tmp_path):
+    def write_file():
+        (tmp_path / "html.txt").write_text("done")
+
+    def fail():
+        sys.exit(1)
+
+    parallelizer = MultiprocessingParallelizer()
+    try:
+        results = parallelizer.run_tasks_forked(
+            [("html", write_file), ("json", fail)]
+        )
+    finally:
+        parallelizer.shutdown()
+
+    assert [result_.name for result_ in results] == ["html", "json"]
+    assert [result_.exitcode for result_ in results] == [0, 1]
+    assert results[0].succeeded
+    assert not results[1].succeeded
+    assert (tmp_path / "html.txt").read_text() == "done"
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="The fork start method is POSIX only."
+)
+def test_run_tasks_forked_runs_hooks_after_failed_task(tmp_path, monkeypatch):
+    def flush_output():
+        (tmp_path / f"flushed_{os.getpid()}.txt").write_text("flushed")
+
+    def fail():
+        raise RuntimeError("Task failed.")
+
+    monkeypatch.setattr(Parallelizer, "after_task_hooks", [flush_output])
+    parallelizer = MultiprocessingParallelizer()
+    try:
+        results = parallelizer.run_tasks_forked(
+            [("html", lambda: None), ("json", fail)]
+        )
+    finally:
+        parallelizer.shutdown()
+
+    assert [result_.succeeded for result_ in results] == [True, False]
+    assert len(list(tmp_path.glob("flushed_*.txt"))) == 2
+
+
+def test_null_parallelizer_run_tasks_forked():
+    executed_tasks = []
+
+    results = NullParallelizer().run_tasks_forked(
+        [
+            ("html", lambda: executed_tasks.append("html")),
+            ("json", lambda: executed_tasks.append("json")),
+        ]
+    )
+
+    assert executed_tasks == ["html", "json"]
+    assert [result_.name for result_ in results] == ["html", "json"]
+    assert all(result_.succeeded for result_ in results)
+
+
+def test_task_that_returns_false_has_failed():
+    results = NullParallelizer().run_tasks_forked(
+        [("html", lambda: None), ("json", lambda: False)]
+    )
+
+    assert [result_.succeeded for result_ in results] == [True, False]
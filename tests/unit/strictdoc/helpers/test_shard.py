@@ -1,4 +1,4 @@
-from strictdoc.helpers.shard import get_shard
+from strictdoc.helpers.shard import get_shard, get_shard_items
 
 
 def test_get_shard():
@@ -21,3 +21,16 @@ def test_get_shard():
     assert get_shard(181, 5, 3) == (72, 108)
     assert get_shard(181, 5, 4) == (108, 144)
     assert get_shard(181, 5, 5) == (144, 181)
+
+
+def test_get_shard_items():
+    items = list(range(11))
+    assert get_shard_items(items, 1, 3) == [0, 1, 2]
+    assert get_shard_items(items, 2, 3) == [3, 4, 5]
+    assert get_shard_items(items, 3, 3) == [6, 7, 8, 9, 10]
+
+    # Fewer items than shards: the last shards are empty.
+    assert get_shard_items([0, 1], 1, 4) == [0]
+    assert get_shard_items([0, 1], 2, 4) == [1]
+    assert get_shard_items([0, 1], 3, 4) == []
+    assert get_shard_items([], 1, 4) == []
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from textx.metamodel import TextXMetaModel
+
+from strictdoc.helpers.textx import (
+    LazyMetaModel,
+    model_from_str_with_processors,
+)
+
+
+class Greeting:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_meta_model_is_compiled_once_on_first_access():
+    compilations = []
+
+    def create_grammar():
+        compilations.append(1)
+        return "Greeting: 'Hello' name=ID;"
+
+    class Reader:
+        meta_model = LazyMetaModel(create_grammar, classes=[Greeting])
+
+    assert len(compilations) == 0
+
+    meta_model = Reader.meta_model
+    assert isinstance(meta_model, TextXMetaModel)
+    assert Reader().meta_model is meta_model
+    assert len(compilations) == 1
+
+    greeting = meta_model.model_from_str("Hello World")
+    assert isinstance(greeting, Greeting)
+    assert greeting.name == "World"
+
+
+def test_model_from_str_with_processors_in_threads():
+    class Reader:
+        meta_model = LazyMetaModel(
+            lambda: "Greeting: 'Hello' name=ID;", classes=[Greeting]
+        )
+
+    def read(name):
+        names = []
+        for _ in range(0, 50):
+            model_from_str_with_processors(
+                Reader.meta_model,
+                {"Greeting": lambda greeting_: names.append(greeting_.name)},
+                f"Hello {name}",
+            )
+        return names
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(read, ["A", "B", "C", "D"]))
+
+    # Every read has called its own processor.
+    assert results == [[name_] * 50 for name_ in ["A", "B", "C", "D"]]
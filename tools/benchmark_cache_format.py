@@ -0,0 +1,143 @@
+"""
+Benchmark of the parse cache format.
+
+Generates a synthetic tree of SDoc documents and measures, for every cache
+compression option:
+
+- cold: parsing all documents and writing them to an empty cache,
+- warm: reading all documents back from the populated cache.
+
+The legacy format (protocol 0 pickles without a header) is measured for
+comparison.
+
+Usage:
+
+    python tools/benchmark_cache_format.py --documents 200 --requirements 200
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+from typing import List
+
+STRICTDOC_ROOT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+sys.path.insert(0, STRICTDOC_ROOT_PATH)
+
+from strictdoc.backend.sdoc.cache_format import CacheCompression  # noqa: E402
+from strictdoc.backend.sdoc.reader import SDReader  # noqa: E402
+from strictdoc.core.environment import SDocRuntimeEnvironment  # noqa: E402
+from strictdoc.core.project_config import ProjectConfig  # noqa: E402
+
+
+def create_synthetic_tree(
+    path_to_tree: str, number_of_documents: int, number_of_requirements: int
+) -> List[str]:
+    paths_to_documents = []
+    for document_idx_ in range(number_of_documents):
+        lines = ["[DOCUMENT]", f"TITLE: Document {document_idx_}", ""]
+        for requirement_idx_ in range(number_of_requirements):
+            uid = f"REQ-{document_idx_}-{requirement_idx_}"
+            lines.extend(
+                [
+                    "[REQUIREMENT]",
+                    f"UID: {uid}",
+                    f"TITLE: Requirement {uid}",
+                    "STATEMENT: >>>",
+                    f"The system shall do {uid}. " * 5,
+                    "<<<",
+                    "",
+                ]
+            )
+        path_to_document = os.path.join(
+            path_to_tree, f"document_{document_idx_}.sdoc"
+        )
+        with open(path_to_document, "w", encoding="utf8") as document_file:
+            document_file.write("\n".join(lines))
+        paths_to_documents.append(path_to_document)
+    return paths_to_documents
+
+
+def get_dir_size(path_to_dir: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root_, file_))
+        for root_, _, files_ in os.walk(path_to_dir)
+        for file_ in files_
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--requirements", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path_to_tmp_dir:
+        path_to_tree = os.path.join(path_to_tmp_dir, "tree")
+        os.mkdir(path_to_tree)
+        paths_to_documents = create_synthetic_tree(
+            path_to_tree, args.documents, args.requirements
+        )
+
+        print(  # noqa: T201
+            f"{args.documents} documents x {args.requirements} requirements"
+        )
+        print(  # noqa: T201
+            f"{'format':<16}{'size, MB':>10}{'cold, s':>10}{'warm, s':>10}"
+        )
+
+        for compression_ in CacheCompression.ALL:
+            project_config = ProjectConfig.default_config(
+                SDocRuntimeEnvironment(STRICTDOC_ROOT_PATH)
+            )
+            project_config.dir_for_sdoc_cache = os.path.join(
+                path_to_tmp_dir, "cache", compression_
+            )
+            project_config.cache_compression = compression_
+
+            reader = SDReader()
+            time_start = time.time()
+            documents = [
+                reader.read_from_file(path_, project_config)
+                for path_ in paths_to_documents
+            ]
+            time_cold = time.time() - time_start
+
+            time_start = time.time()
+            for path_ in paths_to_documents:
+                reader.read_from_file(path_, project_config)
+            time_warm = time.time() - time_start
+
+            cache_size = get_dir_size(project_config.dir_for_sdoc_cache)
+            print(  # noqa: T201
+                f"{'v2-' + compression_:<16}"
+                f"{cache_size / 1_000_000:>10.2f}"
+                f"{time_cold:>10.2f}"
+                f"{time_warm:>10.2f}"
+            )
+
+        time_start = time.time()
+        legacy_blobs = [pickle.dumps(document_, 0) for document_ in documents]
+        time_dump = time.time() - time_start
+        time_start = time.time()
+        for blob_ in legacy_blobs:
+            pickle.loads(blob_)
+        time_load = time.time() - time_start
+        legacy_size = sum(len(blob_) for blob_ in legacy_blobs)
+        print(  # noqa: T201
+            f"{'legacy (pickle)':<16}"
+            f"{legacy_size / 1_000_000:>10.2f}"
+            f"{'+' + format(time_dump, '.2f'):>10}"
+            f"{time_load:>10.2f}"
+        )
+        print(  # noqa: T201
+            "The legacy cold time only includes pickling, parsing excluded."
+        )
+
+
+if __name__ == "__main__":
+    main()
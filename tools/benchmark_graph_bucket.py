@@ -0,0 +1,131 @@
+"""
+Benchmark of the graph database bucket for the many-to-many relations.
+
+Creates a synthetic parent-child graph in ManyToManySet and measures:
+
+- the memory allocated by the bucket after all links are created,
+- creating all links,
+- reading the links of every node in both directions,
+- counting the links.
+
+Usage:
+
+    python tools/benchmark_graph_bucket.py --links 500000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+STRICTDOC_ROOT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+sys.path.insert(0, STRICTDOC_ROOT_PATH)
+
+from strictdoc.core.graph.abstract_bucket import (  # noqa: E402
+    ALL_EDGES,
+    AbstractBucket,
+)
+from strictdoc.core.graph.many_to_many_set import ManyToManySet  # noqa: E402
+
+
+class Node:
+    def __init__(self, uid: str) -> None:
+        self.uid: str = uid
+
+
+def create_synthetic_links(
+    number_of_links: int,
+) -> Tuple[List[Node], List[Tuple[Node, Node, str]]]:
+    # Every node has two parents among the previous nodes on average, the
+    # roles are distributed like in a typical requirements tree.
+    random_generator = random.Random(1)
+    nodes = [Node(f"REQ-{idx_}") for idx_ in range(number_of_links // 2 + 1)]
+    links = []
+    unique_links = set()
+    while len(links) < number_of_links:
+        child_idx = random_generator.randrange(1, len(nodes))
+        parent_idx = random_generator.randrange(child_idx)
+        role = random_generator.choice(("Refines", "Refines", "Verifies"))
+        if (child_idx, parent_idx, role) in unique_links:
+            continue
+        unique_links.add((child_idx, parent_idx, role))
+        links.append((nodes[child_idx], nodes[parent_idx], role))
+    return nodes, links
+
+
+def measure(function: Callable[[], None]) -> float:
+    time_start = time.perf_counter()
+    function()
+    return time.perf_counter() - time_start
+
+
+def benchmark_bucket(
+    bucket_class: type,
+    nodes: List[Node],
+    links: List[Tuple[Node, Node, str]],
+) -> None:
+    def create_links() -> AbstractBucket:
+        bucket_: AbstractBucket = bucket_class(Node, Node)
+        for lhs_node_, rhs_node_, role_ in links:
+            bucket_.create_link(
+                lhs_node=lhs_node_, rhs_node=rhs_node_, edge=role_
+            )
+        return bucket_
+
+    # The memory is measured separately because tracing the allocations slows
+    # down the creation.
+    gc.collect()
+    tracemalloc.start()
+    memory_before, _ = tracemalloc.get_traced_memory()
+    bucket = create_links()
+    memory_after, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del bucket
+    gc.collect()
+
+    time_start = time.perf_counter()
+    bucket = create_links()
+    time_create = time.perf_counter() - time_start
+
+    def read_links() -> None:
+        for node_ in nodes:
+            bucket.get_link_values(lhs_node=node_, edge=ALL_EDGES)
+            bucket.get_link_values(lhs_node=node_, edge="Refines")
+            bucket.get_link_values_reverse(rhs_node=node_)
+
+    def count_links() -> None:
+        for _ in range(100):
+            bucket.get_count(edge=ALL_EDGES)
+
+    time_read = measure(read_links)
+    time_count = measure(count_links)
+    print(  # noqa: T201
+        f"{bucket_class.__name__:<22} "
+        f"memory: {(memory_after - memory_before) / 1024 / 1024:7.1f} MB "
+        f"(peak {(memory_peak - memory_before) / 1024 / 1024:7.1f} MB), "
+        f"create: {time_create:6.2f}s, "
+        f"read {3 * len(nodes)} times: {time_read:6.2f}s, "
+        f"count 100 times: {time_count * 1000:8.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=500000)
+    args = parser.parse_args()
+
+    nodes, links = create_synthetic_links(args.links)
+    print(  # noqa: T201
+        f"Graph: {len(nodes)} nodes, {len(links)} links.", flush=True
+    )
+    benchmark_bucket(ManyToManySet, nodes, links)
+
+
+if __name__ == "__main__":
+    main()